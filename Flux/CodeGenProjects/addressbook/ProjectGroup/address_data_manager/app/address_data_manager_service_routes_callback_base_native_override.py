@@ -12,6 +12,8 @@ from Flux.CodeGenProjects.AddressBook.ProjectGroup.address_data_manager.app.addr
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.phone_book.app.phone_book_service_helper import (
     get_new_contact_limits)
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.address_data_manager.app.aggregate import *
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.address_data_manager.app.bar_data_rollup_store import (
+    BarDataRollupStore)
 from FluxPythonUtils.scripts.general_utility_functions import (
     except_n_log_alert)
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.phone_book.app.service_state import ServiceState
@@ -33,6 +35,15 @@ class AddressDataManagerServiceRoutesCallbackBaseNativeOverride(AddressDataManag
         self.min_refresh_interval: int = parse_to_int(config_yaml_dict.get("min_refresh_interval"))
         if self.min_refresh_interval is None:
             self.min_refresh_interval = 30
+        # materialized higher timeframe bars served to get_aggregated_bar_data instead of $dateTrunc pipeline
+        self.bar_rollup_store: BarDataRollupStore | None = None
+        if config_yaml_dict.get("use_bar_rollup_store"):
+            self.bar_rollup_store = BarDataRollupStore(
+                config_yaml_dict.get("bar_rollup_target_bar_types") or ["FiveMin", "OneHour", "OneDay"])
+        # else not required: aggregated bars always from pipeline
+        self.bar_rollup_initial_backfill_days: float = float(
+            config_yaml_dict.get("bar_rollup_initial_backfill_days") or 7)
+        self.bar_rollup_synced: bool = False
 
     @classmethod
     def initialize_underlying_http_callables(cls):
@@ -78,10 +89,72 @@ class AddressDataManagerServiceRoutesCallbackBaseNativeOverride(AddressDataManag
                 else:
                     should_sleep = True
                     # any periodic refresh code goes here
+                    if self.bar_rollup_store is not None:
+                        self.sync_bar_rollup_store()
+                    # else not required: rollup store not used
 
             else:
                 should_sleep = True
 
+    def sync_bar_rollup_store(self):
+        if not self.bar_rollup_synced:
+            run_coro = self._sync_bar_rollup_store()
+        else:
+            run_coro = self.bar_rollup_store.mark_synced()
+        future = asyncio.run_coroutine_threadsafe(run_coro, self.asyncio_loop)
+        # block for task to finish
+        try:
+            future.result()
+            self.bar_rollup_synced = True
+        except Exception as e:
+            logging.exception(f"sync_bar_rollup_store failed, retrying in next refresh;;; exception: {e}")
+
+    async def _sync_bar_rollup_store(self):
+        await self.bar_rollup_store.bind(BarData.collection_obj)
+        await self.bar_rollup_store.sync(self.bar_rollup_initial_backfill_days)
+
+    async def apply_bars_to_rollup_store(self, bar_data_obj_list: List[BarData | Dict[str, Any]],
+                                         is_update: bool = False):
+        if self.bar_rollup_store is None:
+            return
+        # else not required: rollup store used
+        try:
+            await self.bar_rollup_store.bind(BarData.collection_obj)
+            await self.bar_rollup_store.apply_bars(bar_data_obj_list, is_update)
+        except Exception as e:
+            # buckets of these bars are marked dirty by store (served from pipeline till recomputed) - this only
+            # reaches here if marking them failed too: next refresh re-syncs, saving unsaved dirty marks first
+            self.bar_rollup_synced = False
+            logging.exception(f"apply_bars_to_rollup_store failed for {len(bar_data_obj_list)} bars;;; "
+                              f"exception: {e}")
+
+    async def mark_bars_dirty_in_rollup_store(self, bar_data_obj_list: List[BarData | Dict[str, Any]] | None = None,
+                                              bar_id_list: List[int] | None = None):
+        # pre delete / update: buckets bars are leaving get served from source till recompute_rollup_dirty_buckets
+        if self.bar_rollup_store is None:
+            return
+        # else not required: rollup store used
+        try:
+            await self.bar_rollup_store.bind(BarData.collection_obj)
+            if bar_data_obj_list:
+                await self.bar_rollup_store.mark_bars_dirty(bar_data_obj_list)
+            if bar_id_list:
+                await self.bar_rollup_store.mark_stored_bars_dirty(bar_id_list)
+        except Exception as e:
+            # unsaved marks are saved by next recompute, unread bars' buckets only by next re-sync
+            self.bar_rollup_synced = False
+            logging.exception(f"mark_bars_dirty_in_rollup_store failed;;; exception: {e}")
+
+    async def recompute_rollup_dirty_buckets(self):
+        # post delete / update: rebuilds buckets marked dirty by pre callbacks without waiting for next refresh
+        if self.bar_rollup_store is None:
+            return
+        # else not required: rollup store used
+        try:
+            await self.bar_rollup_store.recompute_dirty_buckets()
+        except Exception as e:
+            logging.exception(f"recompute_rollup_dirty_buckets failed, retrying in next refresh;;; exception: {e}")
+
     @except_n_log_alert()
     def _view_app_launch_pre_thread_func(self):
         """
@@ -262,10 +335,93 @@ class AddressDataManagerServiceRoutesCallbackBaseNativeOverride(AddressDataManag
             get_latest_bar_data_agg(exch_id_list, bar_type_list, start_time, end_time))
         return bar_data_list
 
+    async def create_bar_data_post(self, bar_data_obj: BarData):
+        await self.apply_bars_to_rollup_store([bar_data_obj])
+
+    async def create_all_bar_data_post(self, bar_data_obj_list: List[BarData]):
+        await self.apply_bars_to_rollup_store(bar_data_obj_list)
+
+    async def update_bar_data_pre(self, updated_bar_data_obj: BarData):
+        # start_time / symbol may change - stored bar's bucket loses it
+        await self.mark_bars_dirty_in_rollup_store(bar_id_list=[updated_bar_data_obj.id])
+        return updated_bar_data_obj
+
+    async def update_bar_data_post(self, updated_bar_data_obj: BarData):
+        await self.apply_bars_to_rollup_store([updated_bar_data_obj], is_update=True)
+        await self.recompute_rollup_dirty_buckets()
+
+    async def update_all_bar_data_pre(self, updated_bar_data_obj_list: List[BarData]):
+        await self.mark_bars_dirty_in_rollup_store(
+            bar_id_list=[updated_bar_data_obj.id for updated_bar_data_obj in updated_bar_data_obj_list])
+        return updated_bar_data_obj_list
+
+    async def update_all_bar_data_post(self, updated_bar_data_obj_list: List[BarData]):
+        await self.apply_bars_to_rollup_store(updated_bar_data_obj_list, is_update=True)
+        await self.recompute_rollup_dirty_buckets()
+
+    async def partial_update_bar_data_pre(self, stored_bar_data_obj_json: Dict[str, Any],
+                                          updated_bar_data_obj_json: Dict[str, Any]):
+        await self.mark_bars_dirty_in_rollup_store([stored_bar_data_obj_json])
+        return updated_bar_data_obj_json
+
+    async def partial_update_bar_data_post(self, updated_bar_data_obj_json: Dict[str, Any]):
+        await self.apply_bars_to_rollup_store([updated_bar_data_obj_json], is_update=True)
+        await self.recompute_rollup_dirty_buckets()
+
+    async def partial_update_all_bar_data_pre(self, stored_bar_data_dict_list: List[Dict[str, Any]],
+                                              updated_bar_data_dict_list: List[Dict[str, Any]]):
+        await self.mark_bars_dirty_in_rollup_store(stored_bar_data_dict_list)
+        return updated_bar_data_dict_list
+
+    async def partial_update_all_bar_data_post(self, updated_bar_data_dict_list: List[Dict[str, Any]]):
+        await self.apply_bars_to_rollup_store(updated_bar_data_dict_list, is_update=True)
+        await self.recompute_rollup_dirty_buckets()
+
+    async def delete_bar_data_pre(self, obj_id: int):
+        await self.mark_bars_dirty_in_rollup_store(bar_id_list=[obj_id])
+
+    async def delete_bar_data_post(self, delete_web_response):
+        await self.recompute_rollup_dirty_buckets()
+
+    async def delete_by_id_list_bar_data_pre(self, obj_id_list: List[int]):
+        await self.mark_bars_dirty_in_rollup_store(bar_id_list=obj_id_list)
+
+    async def delete_by_id_list_bar_data_post(self, delete_web_response):
+        await self.recompute_rollup_dirty_buckets()
+
+    async def delete_all_bar_data_post(self, delete_web_response):
+        if self.bar_rollup_store is None:
+            return
+        # else not required: rollup store used
+        try:
+            await self.bar_rollup_store.bind(BarData.collection_obj)
+            await self.bar_rollup_store.drop_rollups()
+        except Exception as e:
+            # rollups of deleted bars may remain - next re-sync only covers buckets after synced_till
+            logging.exception(f"dropping bar rollups after delete_all_bar_data failed;;; exception: {e}")
+
     async def get_aggregated_bar_data_query_pre(
             self, bar_data_class_type: Type[BarData], target_bar_type: str, end_time: pendulum.DateTime | None = None,
             start_time: pendulum.DateTime | None = None, target_bar_counts: int | None = None,
             exch_id_list: List[str] | None = None, symbol_list: List[str] | None = None):
+        if self.bar_rollup_store is not None and (start_time is None) != (target_bar_counts is None):
+            # same param handling as get_bar_aggregation_pipeline, invalid combinations are left to it
+            end_time = pendulum.instance(end_time).in_timezone("UTC") if end_time is not None else pendulum.now("UTC")
+            await self.bar_rollup_store.bind(BarData.collection_obj)
+            if start_time is not None:
+                start_time = pendulum.instance(start_time).in_timezone("UTC")
+                if await self.bar_rollup_store.covers(target_bar_type, start_time):
+                    return await self.bar_rollup_store.read_time_range_bars(target_bar_type, start_time, end_time,
+                                                                            exch_id_list, symbol_list)
+                # else not required: range older than rollups - pipeline below
+            elif isinstance(target_bar_counts, int) and target_bar_counts > 0:
+                if await self.bar_rollup_store.covers(target_bar_type, BarDataRollupStore.get_latest_n_start_date_time(
+                        target_bar_type, end_time, target_bar_counts)):
+                    return await self.bar_rollup_store.read_latest_n_bars(target_bar_type, end_time,
+                                                                          target_bar_counts, exch_id_list, symbol_list)
+                # else not required: lookback older than rollups - pipeline below
+            # else not required: invalid count - pipeline raises
+        # else not required: rollup store not used or invalid params
         bar_data_list = await AddressDataManagerServiceRoutesCallbackBaseNativeOverride.underlying_read_bar_data_http(
             get_bar_aggregation_pipeline(target_bar_type, end_time, start_time, target_bar_counts,
                                          exch_id_list, symbol_list))
@@ -764,6 +764,43 @@ def _build_non_time_match_conditions(
     return conditions
 
 
+def _build_bar_group_spec(date_trunc_params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    $group spec bucketing sorted 1-minute bars into target intervals, shared by on-the-fly aggregation and
+    rollup store state pipeline so both accumulate identically.
+
+    Args:
+        date_trunc_params: Parameters for the $dateTrunc operator.
+
+    Returns:
+        The $group stage body.
+    """
+    return {
+        "_id": { # Composite group key
+            "exch_id": "$bar_meta_data.exch_id",
+            "symbol": "$bar_meta_data.symbol",
+            "interval_start_time": { # Time bucket for the aggregation
+                "$dateTrunc": {"date": "$start_time", **date_trunc_params}
+            }
+        },
+        # Accumulators for standard bar data fields
+        "first_bar_meta_data": { "$first": "$bar_meta_data" }, # Temp field for metadata
+        "start_time": { "$first": "$start_time" }, # Actual start of the first 1-min bar
+        "end_time": { "$last": "$end_time" },     # Actual end of the last 1-min bar
+        "open": { "$first": "$open" },
+        "high": { "$max": "$high" },
+        "low": { "$min": "$low" },
+        "close": { "$last": "$close" },
+        "volume": { "$sum": { "$ifNull": ["$volume", 0] } }, # Sum volumes, treat nulls as 0
+        # Numerator and denominator for VWAP calculation
+        "vwap_numerator": { "$sum": { "$multiply": [ { "$ifNull": ["$vwap", 0] }, { "$ifNull": ["$volume", 0] } ] } },
+        "vwap_denominator": { "$sum": { "$ifNull": ["$volume", 0] } },
+        "cum_volume": { "$last": "$cum_volume" }, # Last cumulative volume
+        "bar_count": { "$sum": 1 },             # Count of 1-min bars in this aggregate
+        "unique_sources": { "$addToSet": "$source" } # Collect all unique source strings
+    }
+
+
 def _build_core_aggregation_stages(
     target_bar_type: str,
     date_trunc_params: Dict[str, Any] # Result from get_date_trunc_params
@@ -802,30 +839,7 @@ def _build_core_aggregation_stages(
     # Stage 2: Grouping and Aggregation ($group)
     # This stage groups the 1-minute bars into the target intervals.
     stages.append({
-        "$group": {
-            "_id": { # Composite group key
-                "exch_id": "$bar_meta_data.exch_id",
-                "symbol": "$bar_meta_data.symbol",
-                "interval_start_time": { # Time bucket for the aggregation
-                    "$dateTrunc": {"date": "$start_time", **date_trunc_params}
-                }
-            },
-            # Accumulators for standard bar data fields
-            "first_bar_meta_data": { "$first": "$bar_meta_data" }, # Temp field for metadata
-            "start_time": { "$first": "$start_time" }, # Actual start of the first 1-min bar
-            "end_time": { "$last": "$end_time" },     # Actual end of the last 1-min bar
-            "open": { "$first": "$open" },
-            "high": { "$max": "$high" },
-            "low": { "$min": "$low" },
-            "close": { "$last": "$close" },
-            "volume": { "$sum": { "$ifNull": ["$volume", 0] } }, # Sum volumes, treat nulls as 0
-            # Numerator and denominator for VWAP calculation
-            "vwap_numerator": { "$sum": { "$multiply": [ { "$ifNull": ["$vwap", 0] }, { "$ifNull": ["$volume", 0] } ] } },
-            "vwap_denominator": { "$sum": { "$ifNull": ["$volume", 0] } },
-            "cum_volume": { "$last": "$cum_volume" }, # Last cumulative volume
-            "bar_count": { "$sum": 1 },             # Count of 1-min bars in this aggregate
-            "unique_sources": { "$addToSet": "$source" } # Collect all unique source strings
-        }
+        "$group": _build_bar_group_spec(date_trunc_params)
     })
 
     # Stage 3: $addFields to calculate the 'source' field based on 'unique_sources'
@@ -1152,6 +1166,72 @@ def get_bar_aggregation_pipeline(
          # This case should be unreachable due to the initial validation.
          raise ValueError("Internal logic error: No valid mode determined.")
 
+def get_bar_rollup_state_agg_pipeline(
+    target_bar_type: str,
+    start_time_param: datetime.datetime,
+    end_time_param: datetime.datetime,
+    exch_id_list: List[str] | None = None,
+    symbol_list: List[str] | None = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Aggregates 1-minute bars with start_time in [start_time_param, end_time_param) into rollup store state docs
+    of target_bar_type - same grouping as get_bar_aggregation_pipeline but keeps mergeable accumulators
+    (vwap numerator/denominator, sorted non-null sources, last source bar start) instead of final bar fields,
+    so live 1-min bars can be merged into them later.
+    Callers pass interval aligned bounds so every returned bucket is complete.
+
+    Args:
+        target_bar_type: The target granularity (e.g., "FiveMin").
+        start_time_param: Inclusive start, interval aligned.
+        end_time_param: Exclusive end, interval aligned.
+        exch_id_list: Optional list of exchange IDs.
+        symbol_list: Optional list of symbols.
+
+    Returns:
+        The MongoDB aggregation pipeline definition.
+    """
+    date_trunc_params = get_date_trunc_params(target_bar_type)
+    group_spec = _build_bar_group_spec(date_trunc_params)
+    group_spec["last_start_time"] = {"$last": "$start_time"}
+
+    time_match_condition = {"$gte": start_time_param, "$lt": end_time_param}
+    non_time_conditions = _build_non_time_match_conditions(exch_id_list, symbol_list)
+    all_match_conditions = [{"start_time": time_match_condition}] + non_time_conditions
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": {"$and": all_match_conditions}},
+        {"$sort": {"bar_meta_data.exch_id": 1, "bar_meta_data.symbol": 1, "start_time": 1}},
+        {"$group": group_spec},
+        {
+            "$project": {
+                "_id": 0,
+                "exch_id": "$_id.exch_id",
+                "symbol": "$_id.symbol",
+                "interval_start_time": "$_id.interval_start_time",
+                "start_time": 1,
+                "last_start_time": 1,
+                "end_time": 1,
+                "open": 1,
+                "high": 1,
+                "low": 1,
+                "close": 1,
+                "volume": 1,
+                "vwap_numerator": 1,
+                "vwap_denominator": 1,
+                "cum_volume": 1,
+                "bar_count": 1,
+                "sources": {
+                    "$sortArray": {
+                        "input": {"$filter": {"input": "$unique_sources", "as": "s",
+                                              "cond": {"$ne": ["$$s", None]}}},
+                        "sortBy": 1
+                    }
+                }
+            }
+        }
+    ]
+    return {"agg": pipeline}
+
+
 def get_latest_bar_data_agg(
     exch_id_list: List[str] | None = None,
     bar_type_list: List[str] | None = None,
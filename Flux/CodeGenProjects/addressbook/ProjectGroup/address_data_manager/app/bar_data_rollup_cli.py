@@ -0,0 +1,77 @@
+# standard imports
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from datetime import datetime
+
+# 3rd party imports
+import motor.motor_asyncio
+import pendulum
+
+# project imports
+from FluxPythonUtils.scripts.general_utility_functions import configure_logger
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.address_data_manager.app.address_data_manager_service_helper import (
+    config_yaml_dict, CURRENT_PROJECT_DIR)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.address_data_manager.app.bar_data_rollup_store import (
+    BarDataRollupStore)
+
+
+def get_bar_data_collection() -> motor.motor_asyncio.AsyncIOMotorCollection:
+    # same db as server's MongoDBInit
+    mongo_server = config_yaml_dict.get("mongo_server") or "mongodb://localhost:27017"
+    client = motor.motor_asyncio.AsyncIOMotorClient(mongo_server, tz_aware=True)
+    db_name = os.getenv("DB_NAME") or "address_data_manager"
+    return client.get_database(db_name)["BarData"]
+
+
+async def backfill(bar_rollup_store: BarDataRollupStore, start_time: pendulum.DateTime,
+                   end_time: pendulum.DateTime) -> None:
+    for target_bar_type in bar_rollup_store.target_bar_type_to_interval_dict:
+        rebuilt_count = await bar_rollup_store.backfill(target_bar_type, start_time, end_time)
+        await bar_rollup_store.extend_backfill_start(target_bar_type, start_time, end_time)
+        logging.info(f"backfilled {rebuilt_count} {target_bar_type} rollups of [{start_time}, {end_time})")
+
+
+async def check(bar_rollup_store: BarDataRollupStore, start_time: pendulum.DateTime, end_time: pendulum.DateTime,
+                exch_id_list: list[str] | None, symbol_list: list[str] | None) -> bool:
+    is_consistent = True
+    for target_bar_type in bar_rollup_store.target_bar_type_to_interval_dict:
+        mismatch_list = await bar_rollup_store.check_consistency(target_bar_type, start_time, end_time,
+                                                                 exch_id_list, symbol_list)
+        for mismatch in mismatch_list:
+            logging.error(mismatch)
+        logging.info(f"{target_bar_type} rollups of [{start_time}, {end_time}]: {len(mismatch_list)} mismatches")
+        is_consistent = is_consistent and not mismatch_list
+    return is_consistent
+
+
+async def main(args: argparse.Namespace) -> bool:
+    target_bar_type_list = (args.target_bar_types or config_yaml_dict.get("bar_rollup_target_bar_types") or
+                            ["FiveMin", "OneHour", "OneDay"])
+    bar_rollup_store = BarDataRollupStore(target_bar_type_list)
+    await bar_rollup_store.bind(get_bar_data_collection())
+    start_time = pendulum.parse(args.start_time).in_timezone("UTC")
+    end_time = pendulum.parse(args.end_time).in_timezone("UTC") if args.end_time else pendulum.now("UTC")
+    if args.cmd == "backfill":
+        await backfill(bar_rollup_store, start_time, end_time)
+        return True
+    return await check(bar_rollup_store, start_time, end_time, args.exch_id_list, args.symbol_list)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill BarData rollups from 1-min bars or check rollups "
+                                                 "against on the fly aggregation pipeline.")
+    parser.add_argument("cmd", choices=["backfill", "check"])
+    parser.add_argument("--start_time", required=True, help="UTC datetime, e.g. 2025-01-01T00:00:00")
+    parser.add_argument("--end_time", default=None, help="UTC datetime, default now.")
+    parser.add_argument("--target_bar_types", nargs="*", default=None,
+                        help="Default: bar_rollup_target_bar_types of config.yaml.")
+    parser.add_argument("--exch_id_list", nargs="*", default=None, help="check only.")
+    parser.add_argument("--symbol_list", nargs="*", default=None, help="check only.")
+    cli_args = parser.parse_args()
+
+    datetime_str: str = datetime.now().strftime("%Y%m%d")
+    configure_logger('info', str(CURRENT_PROJECT_DIR / "log"), f'bar_data_rollup_cli_{datetime_str}.log')
+    sys.exit(0 if asyncio.run(main(cli_args)) else 1)
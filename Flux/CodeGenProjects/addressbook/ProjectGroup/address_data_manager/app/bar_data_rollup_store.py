@@ -0,0 +1,661 @@
+# standard imports
+import datetime
+import logging
+import math
+import time
+from typing import List, Dict, Any, Tuple, Final, Iterable, Set
+
+# 3rd party imports
+import motor.motor_asyncio
+import pendulum
+from pymongo import ASCENDING
+from pymongo.errors import DuplicateKeyError
+
+# project imports
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.address_data_manager.app.aggregate import (
+    _parse_dynamic_target_bar_type, get_interval_duration, get_bar_aggregation_pipeline,
+    get_bar_rollup_state_agg_pipeline)
+
+# $dateTrunc binSize buckets are counted from these reference dates
+DATE_TRUNC_REFERENCE_MS: Final[int] = 946684800000  # 2000-01-01T00:00:00Z
+DATE_TRUNC_WEEK_REFERENCE_MS: Final[int] = 946857600000  # 2000-01-03T00:00:00Z - first Monday of 2000
+UNIT_TO_MS_DICT: Final[Dict[str, int]] = {"second": 1000, "minute": 60_000, "hour": 3_600_000,
+                                          "day": 86_400_000, "week": 604_800_000}
+# same as BarData ExpireAfterSeconds in proto - source bars older than this are gone, rollups too
+BAR_DATA_RETENTION_SECS: Final[int] = 31536000
+SOURCE_BAR_TYPE: Final[str] = "OneMin"
+ROLLUP_COLLECTION_NAME: Final[str] = "BarDataRollup"
+ROLLUP_STATE_COLLECTION_NAME: Final[str] = "BarDataRollupState"
+
+
+def get_utc_date_time(epoch_ms: int) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(epoch_ms / 1000, tz=datetime.timezone.utc)
+
+
+def get_epoch_ms(date_time: Any) -> int:
+    # pendulum/datetime or already epoch ms int (partial update json)
+    if isinstance(date_time, int):
+        return date_time
+    if date_time.tzinfo is None:
+        # naive datetime from mongo is UTC
+        date_time = date_time.replace(tzinfo=datetime.timezone.utc)
+    # else not required: tz aware datetime
+    return int(date_time.timestamp() * 1000)
+
+
+class BarInterval:
+    """
+    python side of $dateTrunc used by get_bar_aggregation_pipeline (UTC, binSize, startOfWeek Monday): maps a
+    1-min bar start to start of its target_bar_type bucket
+    """
+
+    def __init__(self, target_bar_type: str):
+        self.target_bar_type: str = target_bar_type
+        self.multiplier, self.unit, _ = _parse_dynamic_target_bar_type(target_bar_type)
+        self.interval_ms: int | None = (self.multiplier * UNIT_TO_MS_DICT[self.unit]
+                                        if self.unit != "month" else None)
+        self.reference_ms: int = (DATE_TRUNC_WEEK_REFERENCE_MS if self.unit == "week"
+                                  else DATE_TRUNC_REFERENCE_MS)
+
+    def get_start_ms(self, epoch_ms: int) -> int:
+        if self.interval_ms is not None:
+            return epoch_ms - (epoch_ms - self.reference_ms) % self.interval_ms
+        # else not required: month buckets have no fixed width
+        date_time = get_utc_date_time(epoch_ms)
+        month_index = (date_time.year - 2000) * 12 + date_time.month - 1
+        month_index -= month_index % self.multiplier
+        return get_epoch_ms(datetime.datetime(2000 + month_index // 12, month_index % 12 + 1, 1,
+                                              tzinfo=datetime.timezone.utc))
+
+    def get_next_start_ms(self, interval_start_ms: int) -> int:
+        if self.interval_ms is not None:
+            return interval_start_ms + self.interval_ms
+        # else not required: month buckets have no fixed width
+        date_time = get_utc_date_time(interval_start_ms)
+        month_index = (date_time.year - 2000) * 12 + date_time.month - 1 + self.multiplier
+        return get_epoch_ms(datetime.datetime(2000 + month_index // 12, month_index % 12 + 1, 1,
+                                              tzinfo=datetime.timezone.utc))
+
+
+def get_bar_source_field(source_list: List[str]) -> str | None:
+    # same as source $switch of _build_core_aggregation_stages - source_list is sorted and non-null
+    if not source_list:
+        return None
+    if len(source_list) == 1:
+        return source_list[0]
+    return "Mixed: " + " + ".join(source_list)
+
+
+def get_bar_dict(bar_data_obj: Any) -> Dict[str, Any]:
+    # BarData msgspec obj (create/update post) or its json (partial update post)
+    if isinstance(bar_data_obj, dict):
+        return bar_data_obj
+    # else not required: msgspec obj - picking fields rollup needs
+    bar_meta_data = bar_data_obj.bar_meta_data
+    return {"bar_meta_data": {"exch_id": bar_meta_data.exch_id, "symbol": bar_meta_data.symbol,
+                              "bar_type": bar_meta_data.bar_type},
+            "start_time": bar_data_obj.start_time, "end_time": bar_data_obj.end_time,
+            "open": bar_data_obj.open, "high": bar_data_obj.high, "low": bar_data_obj.low,
+            "close": bar_data_obj.close, "volume": bar_data_obj.volume, "vwap": bar_data_obj.vwap,
+            "cum_volume": bar_data_obj.cum_volume, "source": bar_data_obj.source}
+
+
+class BarDataRollupStore:
+    """
+    materialized higher timeframe bars (FiveMin, OneHour, ...) of 1-min BarData, kept in regular BarDataRollup
+    collection next to BarData time series collection:
+    - one doc per (exch_id, symbol, target_bar_type, interval) holding mergeable accumulators - same fields as
+      $group of get_bar_aggregation_pipeline plus start of its latest source bar (last_start_time)
+    - live 1-min bars are merged into their bucket docs (append only: bar newer than last_start_time); late,
+      duplicate or updated bars make bucket get recomputed from source instead, so docs never drift from pipeline;
+      buckets of deleted bars and pre-update buckets of updated bars are marked dirty before the write
+    - every doc write is conditional on last_start_time read before it - concurrent writers (live feed, backfill
+      cmd) never overwrite each other's bars, loser recomputes
+    - reads serve whole buckets from store, edge buckets partially outside queried range are aggregated
+      on the fly from source for just that span
+    BarDataRollupState holds per target_bar_type backfill_start_time (oldest rollup built from source),
+    synced_till (till when live feed kept rollups in sync) - query falls back to pipeline for older ranges - and
+    dirty_bucket_list: buckets whose bars failed to apply or whose recompute lost its write races; reads aggregate
+    them from source till recompute_dirty_buckets (every sync / mark_synced) rebuilds them
+    """
+    max_write_attempts: Final[int] = 3
+
+    def __init__(self, target_bar_type_list: List[str], state_refresh_secs: float = 30):
+        self.target_bar_type_to_interval_dict: Dict[str, BarInterval] = {
+            target_bar_type: BarInterval(target_bar_type) for target_bar_type in target_bar_type_list}
+        self.state_refresh_secs: float = state_refresh_secs
+        self.source_collection: motor.motor_asyncio.AsyncIOMotorCollection | None = None
+        self.rollup_collection: motor.motor_asyncio.AsyncIOMotorCollection | None = None
+        self.state_collection: motor.motor_asyncio.AsyncIOMotorCollection | None = None
+        self.target_bar_type_to_state_dict: Dict[str, Dict[str, Any]] = {}
+        self.state_refresh_time: float = 0
+        # dirty (exch_id, symbol, target_bar_type, interval_start_ms) keys not yet saved to state (save failed) to
+        # their mark time ms
+        self.unsaved_dirty_key_to_mark_ms_dict: Dict[Tuple[str, str, str, int], int] = {}
+
+    async def bind(self, source_collection: motor.motor_asyncio.AsyncIOMotorCollection):
+        if self.source_collection is not None:
+            return
+        # else not required: first use - binding collections of BarData db
+        db = source_collection.database
+        self.rollup_collection = db[ROLLUP_COLLECTION_NAME]
+        self.state_collection = db[ROLLUP_STATE_COLLECTION_NAME]
+        await self.rollup_collection.create_index(
+            [("bar_meta_data.bar_type", ASCENDING), ("interval_start_time", ASCENDING)])
+        await self.rollup_collection.create_index("interval_end_time", expireAfterSeconds=BAR_DATA_RETENTION_SECS)
+        self.source_collection = source_collection
+
+    @staticmethod
+    def get_rollup_id(exch_id: str, symbol: str, target_bar_type: str, interval_start_ms: int) -> str:
+        return f"{exch_id}~{symbol}~{target_bar_type}~{interval_start_ms}"
+
+    # --- state ---
+
+    async def refresh_state(self, force: bool = False):
+        if not force and time.time() - self.state_refresh_time < self.state_refresh_secs:
+            return
+        # else not required: cached state is stale
+        state_list = await self.state_collection.find().to_list(None)
+        self.target_bar_type_to_state_dict = {state["_id"]: state for state in state_list}
+        self.state_refresh_time = time.time()
+
+    async def set_state(self, target_bar_type: str, **state_fields):
+        await self.state_collection.update_one({"_id": target_bar_type}, {"$set": state_fields}, upsert=True)
+        self.target_bar_type_to_state_dict.setdefault(target_bar_type, {"_id": target_bar_type}).update(
+            state_fields)
+
+    async def mark_buckets_dirty(self, key_list: Iterable[Tuple[str, str, str, int]]):
+        mark_ms = int(time.time() * 1000)
+        for key in key_list:
+            self.unsaved_dirty_key_to_mark_ms_dict[key] = mark_ms
+        await self.save_dirty_buckets()
+
+    async def save_dirty_buckets(self):
+        # each mark is its own entry - recompute only pulls marks older than its own start
+        key_to_mark_ms_dict = dict(self.unsaved_dirty_key_to_mark_ms_dict)
+        target_bar_type_to_key_list_dict: Dict[str, List[Tuple[str, str, str, int]]] = {}
+        for key in key_to_mark_ms_dict:
+            target_bar_type_to_key_list_dict.setdefault(key[2], []).append(key)
+        for target_bar_type, key_list in target_bar_type_to_key_list_dict.items():
+            dirty_bucket_list = [{"exch_id": exch_id, "symbol": symbol,
+                                  "interval_start_time": get_utc_date_time(interval_start_ms),
+                                  "mark_time": get_utc_date_time(key_to_mark_ms_dict[
+                                      (exch_id, symbol, dirty_target_bar_type, interval_start_ms)])}
+                                 for exch_id, symbol, dirty_target_bar_type, interval_start_ms in key_list]
+            await self.state_collection.update_one(
+                {"_id": target_bar_type}, {"$push": {"dirty_bucket_list": {"$each": dirty_bucket_list}}}, upsert=True)
+            self.target_bar_type_to_state_dict.setdefault(target_bar_type, {"_id": target_bar_type}).setdefault(
+                "dirty_bucket_list", []).extend(dirty_bucket_list)
+            for key in key_list:
+                # key marked again while saving stays unsaved
+                if self.unsaved_dirty_key_to_mark_ms_dict.get(key) == key_to_mark_ms_dict[key]:
+                    del self.unsaved_dirty_key_to_mark_ms_dict[key]
+                # else not required: newer mark saved next time
+            logging.warning(f"marked {len(key_list)} {target_bar_type} rollup buckets dirty - served from "
+                            f"pipeline till recomputed;;; {key_list}")
+
+    def get_dirty_key_set(self, target_bar_type: str) -> Set[Tuple[str, str, int]]:
+        # (exch_id, symbol, interval_start_ms) of dirty buckets of target_bar_type, saved or not
+        state = self.target_bar_type_to_state_dict.get(target_bar_type) or {}
+        dirty_key_set = {(dirty_bucket["exch_id"], dirty_bucket["symbol"],
+                          get_epoch_ms(dirty_bucket["interval_start_time"]))
+                         for dirty_bucket in state.get("dirty_bucket_list") or []}
+        dirty_key_set.update((exch_id, symbol, interval_start_ms)
+                             for exch_id, symbol, dirty_target_bar_type, interval_start_ms in
+                             self.unsaved_dirty_key_to_mark_ms_dict if dirty_target_bar_type == target_bar_type)
+        return dirty_key_set
+
+    async def recompute_dirty_buckets(self) -> int:
+        """rebuilds dirty buckets of every target_bar_type from source, returns count of buckets left dirty"""
+        await self.save_dirty_buckets()
+        await self.refresh_state(force=True)
+        left_dirty_count = 0
+        for target_bar_type in self.target_bar_type_to_interval_dict:
+            for exch_id, symbol, interval_start_ms in self.get_dirty_key_set(target_bar_type):
+                recompute_start_time = get_utc_date_time(int(time.time() * 1000))
+                if await self.recompute_bucket(exch_id, symbol, target_bar_type, interval_start_ms):
+                    await self.state_collection.update_one(
+                        {"_id": target_bar_type},
+                        {"$pull": {"dirty_bucket_list": {
+                            "exch_id": exch_id, "symbol": symbol,
+                            "interval_start_time": get_utc_date_time(interval_start_ms),
+                            "mark_time": {"$lt": recompute_start_time}}}})
+                else:
+                    left_dirty_count += 1
+        await self.refresh_state(force=True)
+        return left_dirty_count
+
+    async def covers(self, target_bar_type: str, start_date_time: datetime.datetime) -> bool:
+        if target_bar_type not in self.target_bar_type_to_interval_dict:
+            return False
+        # else not required: target bar type is materialized
+        await self.refresh_state()
+        state = self.target_bar_type_to_state_dict.get(target_bar_type)
+        if state is None or not state.get("is_ready"):
+            return False
+        # else not required: rollups of this type are backfilled and fed live
+        start_ms = get_epoch_ms(start_date_time)
+        # older source bars may be expired while their rollup still exists
+        return (start_ms >= get_epoch_ms(state["backfill_start_time"]) and
+                start_ms >= int(time.time() * 1000) - BAR_DATA_RETENTION_SECS * 1000)
+
+    # --- live feed ---
+
+    def _get_key_to_bar_dict_list(self, bar_data_obj_list: Iterable[Any]
+                                  ) -> Dict[Tuple[str, str, str, int], List[Dict[str, Any]]]:
+        # 1-min bars grouped by every rollup bucket they fall in
+        key_to_bar_dict_list: Dict[Tuple[str, str, str, int], List[Dict[str, Any]]] = {}
+        for bar_data_obj in bar_data_obj_list:
+            bar_dict = get_bar_dict(bar_data_obj)
+            bar_meta_data = bar_dict.get("bar_meta_data")
+            if not bar_meta_data or bar_meta_data.get("bar_type") != SOURCE_BAR_TYPE or not bar_dict.get(
+                    "start_time"):
+                continue
+            # else not required: 1-min bar - rolled up
+            start_ms = get_epoch_ms(bar_dict["start_time"])
+            for target_bar_type, bar_interval in self.target_bar_type_to_interval_dict.items():
+                key = (bar_meta_data["exch_id"], bar_meta_data["symbol"], target_bar_type,
+                       bar_interval.get_start_ms(start_ms))
+                key_to_bar_dict_list.setdefault(key, []).append(bar_dict)
+        return key_to_bar_dict_list
+
+    async def apply_bars(self, bar_data_obj_list: Iterable[Any], is_update: bool = False):
+        """
+        merges created 1-min bars into their rollup buckets of every target_bar_type; is_update: bars were changed
+        after creation - their buckets are recomputed from source
+        """
+        key_to_bar_dict_list = self._get_key_to_bar_dict_list(bar_data_obj_list)
+        if not key_to_bar_dict_list:
+            return
+        # else not required: buckets to update
+
+        rollup_id_to_key_dict = {self.get_rollup_id(*key): key for key in key_to_bar_dict_list}
+        try:
+            rollup_id_to_doc_dict = {doc["_id"]: doc for doc in await self.rollup_collection.find(
+                {"_id": {"$in": list(rollup_id_to_key_dict.keys())}}).to_list(None)}
+        except Exception as e:
+            logging.exception(f"reading {len(rollup_id_to_key_dict)} rollup buckets failed, marking them dirty;;; "
+                              f"exception: {e}")
+            await self.mark_buckets_dirty(rollup_id_to_key_dict.values())
+            return
+        failed_key_list: List[Tuple[str, str, str, int]] = []
+        for rollup_id, key in rollup_id_to_key_dict.items():
+            rollup_doc = rollup_id_to_doc_dict.get(rollup_id)
+            try:
+                if is_update or not await self._merge_bars(key, rollup_doc, key_to_bar_dict_list[key]):
+                    await self.recompute_bucket(*key)
+                # else not required: bars merged
+            except Exception as e:
+                logging.exception(f"applying bars to rollup bucket {rollup_id} failed, marking it dirty;;; "
+                                  f"exception: {e}")
+                failed_key_list.append(key)
+        if failed_key_list:
+            await self.mark_buckets_dirty(failed_key_list)
+        # else not required: every bucket applied
+
+    async def mark_bars_dirty(self, bar_data_obj_list: Iterable[Any]):
+        """
+        bars about to be deleted, or moved by update (start_time / symbol changed): their current buckets are served
+        from source till recomputed - apply_bars of update only recomputes buckets of updated bars
+        """
+        if key_list := list(self._get_key_to_bar_dict_list(bar_data_obj_list)):
+            await self.mark_buckets_dirty(key_list)
+        # else not required: no 1-min bar
+
+    async def mark_stored_bars_dirty(self, bar_id_list: List[Any]):
+        # same as mark_bars_dirty for bars known by id only - reads them before their delete / update
+        await self.mark_bars_dirty(await self.source_collection.find(
+            {"_id": {"$in": bar_id_list}}, {"bar_meta_data": 1, "start_time": 1}).to_list(None))
+
+    async def drop_rollups(self):
+        # every source bar deleted - so is every rollup and dirty mark
+        await self.rollup_collection.delete_many({})
+        self.unsaved_dirty_key_to_mark_ms_dict.clear()
+        await self.state_collection.update_many({}, {"$set": {"dirty_bucket_list": []}})
+        await self.refresh_state(force=True)
+
+    async def _merge_bars(self, key: Tuple[str, str, str, int], rollup_doc: Dict[str, Any] | None,
+                          bar_dict_list: List[Dict[str, Any]]) -> bool:
+        # returns False if bars can't be appended to bucket (late/duplicate bar or concurrent write) - caller
+        # recomputes bucket
+        bar_dict_list = sorted(bar_dict_list, key=lambda bar_dict: get_epoch_ms(bar_dict["start_time"]))
+        exch_id, symbol, target_bar_type, interval_start_ms = key
+        if rollup_doc is None:
+            prev_last_start_ms = None
+            new_rollup_doc = {
+                "_id": self.get_rollup_id(*key),
+                "bar_meta_data": {"symbol": symbol, "exch_id": exch_id, "bar_type": target_bar_type},
+                "interval_start_time": get_utc_date_time(interval_start_ms),
+                "interval_end_time": get_utc_date_time(
+                    self.target_bar_type_to_interval_dict[target_bar_type].get_next_start_ms(interval_start_ms)),
+                "start_time": None, "last_start_time": None, "end_time": None, "open": None, "high": None,
+                "low": None, "close": None, "volume": 0, "vwap_numerator": 0, "vwap_denominator": 0,
+                "cum_volume": None, "bar_count": 0, "sources": []}
+        else:
+            prev_last_start_ms = get_epoch_ms(rollup_doc["last_start_time"])
+            new_rollup_doc = dict(rollup_doc)
+        last_start_ms = prev_last_start_ms
+        source_set = set(new_rollup_doc["sources"])
+        for bar_dict in bar_dict_list:
+            start_ms = get_epoch_ms(bar_dict["start_time"])
+            if last_start_ms is not None and start_ms <= last_start_ms:
+                return False
+            # else not required: bar is newer than every bar in bucket - appending
+            if last_start_ms is None:
+                new_rollup_doc["start_time"] = get_utc_date_time(start_ms)
+                new_rollup_doc["open"] = bar_dict.get("open")
+            # else not required: bucket already has its first bar
+            last_start_ms = start_ms
+            new_rollup_doc["last_start_time"] = get_utc_date_time(start_ms)
+            end_time = bar_dict.get("end_time")
+            new_rollup_doc["end_time"] = get_utc_date_time(get_epoch_ms(end_time)) if end_time is not None else None
+            # $max/$min skip nulls
+            if (high := bar_dict.get("high")) is not None:
+                new_rollup_doc["high"] = high if new_rollup_doc["high"] is None else max(new_rollup_doc["high"], high)
+            if (low := bar_dict.get("low")) is not None:
+                new_rollup_doc["low"] = low if new_rollup_doc["low"] is None else min(new_rollup_doc["low"], low)
+            new_rollup_doc["close"] = bar_dict.get("close")
+            volume = bar_dict.get("volume") or 0
+            new_rollup_doc["volume"] += volume
+            new_rollup_doc["vwap_numerator"] += (bar_dict.get("vwap") or 0) * volume
+            new_rollup_doc["vwap_denominator"] += volume
+            new_rollup_doc["cum_volume"] = bar_dict.get("cum_volume")
+            new_rollup_doc["bar_count"] += 1
+            if (source := bar_dict.get("source")) is not None:
+                source_set.add(source)
+        new_rollup_doc["sources"] = sorted(source_set)
+        return await self._write_rollup_doc(new_rollup_doc, prev_last_start_ms)
+
+    async def _write_rollup_doc(self, rollup_doc: Dict[str, Any], prev_last_start_ms: int | None) -> bool:
+        # conditional on bucket not written by anyone since it was read
+        if prev_last_start_ms is None:
+            try:
+                await self.rollup_collection.insert_one(rollup_doc)
+            except DuplicateKeyError:
+                return False
+            return True
+        # else not required: existing bucket - replacing if unchanged
+        update_result = await self.rollup_collection.replace_one(
+            {"_id": rollup_doc["_id"], "last_start_time": get_utc_date_time(prev_last_start_ms)}, rollup_doc)
+        return update_result.matched_count == 1
+
+    async def recompute_bucket(self, exch_id: str, symbol: str, target_bar_type: str, interval_start_ms: int
+                               ) -> bool:
+        # returns False if bucket couldn't be written - it's marked dirty
+        interval_end_ms = self.target_bar_type_to_interval_dict[target_bar_type].get_next_start_ms(
+            interval_start_ms)
+        rollup_id = self.get_rollup_id(exch_id, symbol, target_bar_type, interval_start_ms)
+        for _ in range(self.max_write_attempts):
+            rollup_doc = await self.rollup_collection.find_one({"_id": rollup_id})
+            prev_last_start_ms = get_epoch_ms(rollup_doc["last_start_time"]) if rollup_doc is not None else None
+            state_doc_list = await self.source_collection.aggregate(get_bar_rollup_state_agg_pipeline(
+                target_bar_type, get_utc_date_time(interval_start_ms), get_utc_date_time(interval_end_ms),
+                [exch_id], [symbol])["agg"]).to_list(None)
+            if not state_doc_list:
+                # source bars gone - dropping bucket
+                await self.rollup_collection.delete_one({"_id": rollup_id})
+                return True
+            # else not required: bucket has source bars
+            if await self._write_rollup_doc(self._get_rollup_doc(target_bar_type, interval_end_ms,
+                                                                 state_doc_list[0]), prev_last_start_ms):
+                return True
+            # else not required: concurrently written - retrying with latest bucket
+        # bucket may be behind source - reads aggregate it from source till recompute_dirty_buckets rebuilds it
+        logging.error(f"recompute of rollup bucket {rollup_id} lost {self.max_write_attempts} write races, "
+                      f"marking bucket dirty")
+        await self.mark_buckets_dirty([(exch_id, symbol, target_bar_type, interval_start_ms)])
+        return False
+
+    def _get_rollup_doc(self, target_bar_type: str, interval_end_ms: int,
+                        state_doc: Dict[str, Any]) -> Dict[str, Any]:
+        exch_id, symbol = state_doc.pop("exch_id"), state_doc.pop("symbol")
+        state_doc["_id"] = self.get_rollup_id(exch_id, symbol, target_bar_type,
+                                              get_epoch_ms(state_doc["interval_start_time"]))
+        state_doc["bar_meta_data"] = {"symbol": symbol, "exch_id": exch_id, "bar_type": target_bar_type}
+        state_doc["interval_end_time"] = get_utc_date_time(interval_end_ms)
+        return state_doc
+
+    # --- backfill ---
+
+    async def backfill(self, target_bar_type: str, start_date_time: datetime.datetime,
+                       end_date_time: datetime.datetime, chunk_secs: int = 86400) -> int:
+        """
+        rebuilds rollups of target_bar_type of buckets overlapping [start, end) from source in chunks of
+        ~chunk_secs; safe with live feed running. Returns rebuilt bucket count
+        """
+        bar_interval = self.target_bar_type_to_interval_dict[target_bar_type]
+        end_ms = get_epoch_ms(end_date_time)
+        chunk_start_ms = bar_interval.get_start_ms(get_epoch_ms(start_date_time))
+        rebuilt_count = 0
+        while chunk_start_ms < end_ms:
+            chunk_end_ms = bar_interval.get_next_start_ms(chunk_start_ms)
+            while chunk_end_ms < end_ms and chunk_end_ms - chunk_start_ms < chunk_secs * 1000:
+                chunk_end_ms = bar_interval.get_next_start_ms(chunk_end_ms)
+            rebuilt_count += await self._backfill_chunk(target_bar_type, chunk_start_ms, chunk_end_ms)
+            chunk_start_ms = chunk_end_ms
+        return rebuilt_count
+
+    async def _backfill_chunk(self, target_bar_type: str, chunk_start_ms: int, chunk_end_ms: int) -> int:
+        bar_interval = self.target_bar_type_to_interval_dict[target_bar_type]
+        chunk_filter = {"bar_meta_data.bar_type": target_bar_type,
+                        "interval_start_time": {"$gte": get_utc_date_time(chunk_start_ms),
+                                                "$lt": get_utc_date_time(chunk_end_ms)}}
+        # last_start_time read before source - guards replace against live bars merged meanwhile
+        rollup_id_to_prev_last_start_ms_dict = {
+            doc["_id"]: get_epoch_ms(doc["last_start_time"]) for doc in await self.rollup_collection.find(
+                chunk_filter, {"last_start_time": 1}).to_list(None)}
+        state_doc_list = await self.source_collection.aggregate(get_bar_rollup_state_agg_pipeline(
+            target_bar_type, get_utc_date_time(chunk_start_ms), get_utc_date_time(chunk_end_ms))["agg"]).to_list(None)
+        for state_doc in state_doc_list:
+            rollup_doc = self._get_rollup_doc(
+                target_bar_type,
+                bar_interval.get_next_start_ms(get_epoch_ms(state_doc["interval_start_time"])), state_doc)
+            prev_last_start_ms = rollup_id_to_prev_last_start_ms_dict.pop(rollup_doc["_id"], None)
+            if not await self._write_rollup_doc(rollup_doc, prev_last_start_ms):
+                await self.recompute_bucket(rollup_doc["bar_meta_data"]["exch_id"],
+                                            rollup_doc["bar_meta_data"]["symbol"], target_bar_type,
+                                            get_epoch_ms(rollup_doc["interval_start_time"]))
+            # else not required: bucket rebuilt
+        if rollup_id_to_prev_last_start_ms_dict:
+            # rollups without source bars left
+            await self.rollup_collection.delete_many(
+                {"_id": {"$in": list(rollup_id_to_prev_last_start_ms_dict.keys())}})
+        # else not required: every existing rollup of chunk rebuilt
+        return len(state_doc_list)
+
+    async def sync(self, initial_backfill_days: float) -> None:
+        """
+        startup of live feed: catches every target_bar_type up from its synced_till (bars may have been written
+        while feed was off), or backfills initial_backfill_days on first start, then marks rollups ready to serve
+        """
+        await self.refresh_state(force=True)
+        now_ms = int(time.time() * 1000)
+        for target_bar_type, bar_interval in self.target_bar_type_to_interval_dict.items():
+            state = self.target_bar_type_to_state_dict.get(target_bar_type)
+            if state is None or state.get("synced_till") is None:
+                backfill_start_ms = now_ms - int(initial_backfill_days * 86400 * 1000)
+                await self.set_state(target_bar_type, is_ready=False,
+                                     backfill_start_time=get_utc_date_time(backfill_start_ms))
+            else:
+                # bucket holding synced_till may have missed bars after it
+                backfill_start_ms = get_epoch_ms(state["synced_till"])
+                await self.set_state(target_bar_type, is_ready=False)
+            start_time = time.perf_counter()
+            rebuilt_count = await self.backfill(
+                target_bar_type, get_utc_date_time(backfill_start_ms),
+                get_utc_date_time(bar_interval.get_next_start_ms(bar_interval.get_start_ms(now_ms))))
+            await self.set_state(target_bar_type, is_ready=True, synced_till=get_utc_date_time(now_ms))
+            logging.info(f"bar rollups of {target_bar_type} synced from {get_utc_date_time(backfill_start_ms)}, "
+                         f"{rebuilt_count} buckets rebuilt in {time.perf_counter() - start_time:.3f} secs")
+        # buckets before synced_till whose bars failed to apply (or were applied late) aren't in above range
+        if left_dirty_count := await self.recompute_dirty_buckets():
+            logging.warning(f"{left_dirty_count} rollup buckets still dirty after sync - retried in next mark_synced")
+        # else not required: no dirty bucket left
+
+    async def mark_synced(self):
+        # live feed heartbeat - caught up rollups stay in sync till now, dirty buckets are retried
+        now_date_time = get_utc_date_time(int(time.time() * 1000))
+        await self.recompute_dirty_buckets()
+        for target_bar_type, state in list(self.target_bar_type_to_state_dict.items()):
+            if state.get("is_ready"):
+                await self.set_state(target_bar_type, synced_till=now_date_time)
+            # else not required: still catching up
+
+    async def extend_backfill_start(self, target_bar_type: str, start_date_time: datetime.datetime,
+                                    end_date_time: datetime.datetime):
+        # history backfill cmd: rollups of [start, end) now exist - reads may use them if range joins synced ones
+        await self.refresh_state(force=True)
+        state = self.target_bar_type_to_state_dict.get(target_bar_type)
+        if (state is not None and state.get("backfill_start_time") is not None and
+                get_epoch_ms(end_date_time) >= get_epoch_ms(state["backfill_start_time"]) and
+                get_epoch_ms(start_date_time) < get_epoch_ms(state["backfill_start_time"])):
+            await self.set_state(target_bar_type, backfill_start_time=start_date_time)
+        # else not required: backfilled range doesn't extend synced rollups
+
+    # --- read ---
+
+    async def read_time_range_bars(self, target_bar_type: str, start_date_time: datetime.datetime,
+                                   end_date_time: datetime.datetime, exch_id_list: List[str] | None = None,
+                                   symbol_list: List[str] | None = None) -> List[Dict[str, Any]]:
+        """
+        same result as get_bar_aggregation_pipeline time range mode (source bars with start_time in
+        [start, end], inclusive): buckets fully in range come from store, bucket at either edge with source bars
+        outside range is aggregated from source for its in-range span only, so is every dirty bucket in range
+        """
+        await self.refresh_state()
+        bar_interval = self.target_bar_type_to_interval_dict[target_bar_type]
+        start_ms, end_ms = get_epoch_ms(start_date_time), get_epoch_ms(end_date_time)
+        head_interval_start_ms = bar_interval.get_start_ms(start_ms)
+        tail_interval_start_ms = bar_interval.get_start_ms(end_ms)
+        rollup_filter: Dict[str, Any] = {
+            "bar_meta_data.bar_type": target_bar_type,
+            "interval_start_time": {"$gte": get_utc_date_time(head_interval_start_ms),
+                                    "$lte": get_utc_date_time(tail_interval_start_ms)}}
+        if exch_id_list:
+            rollup_filter["bar_meta_data.exch_id"] = {"$in": exch_id_list}
+        if symbol_list:
+            rollup_filter["bar_meta_data.symbol"] = {"$in": symbol_list}
+        rollup_doc_list = await self.rollup_collection.find(rollup_filter).to_list(None)
+
+        edge_interval_start_ms_set = set()
+        for rollup_doc in rollup_doc_list:
+            if (get_epoch_ms(rollup_doc["start_time"]) < start_ms or
+                    get_epoch_ms(rollup_doc["last_start_time"]) > end_ms):
+                edge_interval_start_ms_set.add(get_epoch_ms(rollup_doc["interval_start_time"]))
+            # else not required: every source bar of bucket is in range
+        # dirty buckets in range not already aggregated as edge - doc may be stale or missing
+        dirty_key_set = {(exch_id, symbol, interval_start_ms)
+                         for exch_id, symbol, interval_start_ms in self.get_dirty_key_set(target_bar_type)
+                         if head_interval_start_ms <= interval_start_ms <= tail_interval_start_ms and
+                         interval_start_ms not in edge_interval_start_ms_set and
+                         (not exch_id_list or exch_id in exch_id_list) and (not symbol_list or symbol in symbol_list)}
+        bar_dict_list = [self._get_bar_dict(rollup_doc) for rollup_doc in rollup_doc_list
+                         if get_epoch_ms(rollup_doc["interval_start_time"]) not in edge_interval_start_ms_set and
+                         (rollup_doc["bar_meta_data"]["exch_id"], rollup_doc["bar_meta_data"]["symbol"],
+                          get_epoch_ms(rollup_doc["interval_start_time"])) not in dirty_key_set]
+        for edge_interval_start_ms in edge_interval_start_ms_set:
+            edge_end_ms = min(end_ms, bar_interval.get_next_start_ms(edge_interval_start_ms) - 1)
+            bar_dict_list.extend(await self.source_collection.aggregate(get_bar_aggregation_pipeline(
+                target_bar_type, get_utc_date_time(edge_end_ms),
+                get_utc_date_time(max(start_ms, edge_interval_start_ms)),
+                exch_id_list=exch_id_list, symbol_list=symbol_list)["agg"]).to_list(None))
+        for exch_id, symbol, dirty_interval_start_ms in dirty_key_set:
+            dirty_end_ms = min(end_ms, bar_interval.get_next_start_ms(dirty_interval_start_ms) - 1)
+            bar_dict_list.extend(await self.source_collection.aggregate(get_bar_aggregation_pipeline(
+                target_bar_type, get_utc_date_time(dirty_end_ms),
+                get_utc_date_time(max(start_ms, dirty_interval_start_ms)),
+                exch_id_list=[exch_id], symbol_list=[symbol])["agg"]).to_list(None))
+        bar_dict_list.sort(key=lambda bar_dict: (bar_dict["bar_meta_data"]["exch_id"],
+                                                 bar_dict["bar_meta_data"]["symbol"],
+                                                 get_epoch_ms(bar_dict["start_time"])))
+        return bar_dict_list
+
+    async def read_latest_n_bars(self, target_bar_type: str, end_date_time: datetime.datetime,
+                                 target_bar_counts: int, exch_id_list: List[str] | None = None,
+                                 symbol_list: List[str] | None = None,
+                                 start_time_buffer_factor: float = 1.5) -> List[Dict[str, Any]]:
+        # same lookback estimate, ordering and limit as _generate_latest_n_bar_pipeline
+        bar_dict_list = await self.read_time_range_bars(
+            target_bar_type, self.get_latest_n_start_date_time(target_bar_type, end_date_time, target_bar_counts,
+                                                               start_time_buffer_factor),
+            end_date_time, exch_id_list, symbol_list)
+        # stable sorts: latest first, exch/symbol ascending among same start_time
+        bar_dict_list.sort(key=lambda bar_dict: get_epoch_ms(bar_dict["start_time"]), reverse=True)
+        bar_dict_list = bar_dict_list[:target_bar_counts]
+        bar_dict_list.sort(key=lambda bar_dict: (bar_dict["bar_meta_data"]["exch_id"],
+                                                 bar_dict["bar_meta_data"]["symbol"],
+                                                 get_epoch_ms(bar_dict["start_time"])))
+        return bar_dict_list
+
+    @staticmethod
+    def get_latest_n_start_date_time(target_bar_type: str, end_date_time: datetime.datetime,
+                                     target_bar_counts: int, start_time_buffer_factor: float = 1.5
+                                     ) -> datetime.datetime:
+        interval_duration = get_interval_duration(target_bar_type)
+        lookback_intervals = int(target_bar_counts * start_time_buffer_factor) + 1
+        return pendulum.instance(end_date_time).subtract(
+            seconds=interval_duration.total_seconds() * lookback_intervals)
+
+    @staticmethod
+    def _get_bar_dict(rollup_doc: Dict[str, Any]) -> Dict[str, Any]:
+        # same shape as $project of _build_core_aggregation_stages
+        return {
+            "bar_meta_data": rollup_doc["bar_meta_data"],
+            "start_time": rollup_doc["start_time"],
+            "end_time": rollup_doc["end_time"],
+            "open": rollup_doc["open"],
+            "high": rollup_doc["high"],
+            "low": rollup_doc["low"],
+            "close": rollup_doc["close"],
+            "volume": rollup_doc["volume"],
+            "vwap": (None if rollup_doc["vwap_denominator"] == 0 else
+                     rollup_doc["vwap_numerator"] / rollup_doc["vwap_denominator"]),
+            "cum_volume": rollup_doc["cum_volume"],
+            "bar_count": rollup_doc["bar_count"],
+            "source": get_bar_source_field(rollup_doc["sources"])
+        }
+
+    # --- consistency check ---
+
+    async def check_consistency(self, target_bar_type: str, start_date_time: datetime.datetime,
+                                end_date_time: datetime.datetime, exch_id_list: List[str] | None = None,
+                                symbol_list: List[str] | None = None,
+                                rel_tolerance: float = 1e-9) -> List[str]:
+        """
+        compares store reads against on the fly get_bar_aggregation_pipeline for [start, end], returns mismatch
+        descriptions (empty if consistent)
+        """
+        store_bar_dict_list = await self.read_time_range_bars(target_bar_type, start_date_time, end_date_time,
+                                                              exch_id_list, symbol_list)
+        pipeline_bar_dict_list = await self.source_collection.aggregate(get_bar_aggregation_pipeline(
+            target_bar_type, end_date_time, start_date_time, exch_id_list=exch_id_list,
+            symbol_list=symbol_list)["agg"]).to_list(None)
+
+        def get_key(bar_dict: Dict[str, Any]) -> Tuple[str, str, int]:
+            return (bar_dict["bar_meta_data"]["exch_id"], bar_dict["bar_meta_data"]["symbol"],
+                    get_epoch_ms(bar_dict["start_time"]))
+
+        key_to_store_bar_dict = {get_key(bar_dict): bar_dict for bar_dict in store_bar_dict_list}
+        key_to_pipeline_bar_dict = {get_key(bar_dict): bar_dict for bar_dict in pipeline_bar_dict_list}
+        mismatch_list: List[str] = []
+        for key in sorted(key_to_store_bar_dict.keys() | key_to_pipeline_bar_dict.keys()):
+            store_bar_dict = key_to_store_bar_dict.get(key)
+            pipeline_bar_dict = key_to_pipeline_bar_dict.get(key)
+            if store_bar_dict is None or pipeline_bar_dict is None:
+                mismatch_list.append(f"{target_bar_type} bar {key} missing in "
+                                     f"{'store' if store_bar_dict is None else 'pipeline'}")
+                continue
+            # else not required: bar in both
+            for field_name, pipeline_value in pipeline_bar_dict.items():
+                store_value = store_bar_dict.get(field_name)
+                if field_name in ("start_time", "end_time") and pipeline_value is not None:
+                    is_equal = store_value is not None and get_epoch_ms(store_value) == get_epoch_ms(pipeline_value)
+                elif isinstance(pipeline_value, float) and isinstance(store_value, (int, float)):
+                    is_equal = math.isclose(store_value, pipeline_value, rel_tol=rel_tolerance)
+                else:
+                    is_equal = store_value == pipeline_value
+                if not is_equal:
+                    mismatch_list.append(f"{target_bar_type} bar {key} {field_name} mismatch: "
+                                         f"store: {store_value}, pipeline: {pipeline_value}")
+                # else not required: field matches
+        return mismatch_list
@@ -1,6 +1,7 @@
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.bartering_link_base import BarteringLinkBase
 # from Flux.CodeGenProjects.AddressBook.ProjectGroup.street_book.app.barter_simulator import BarterSimulator
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.log_barter_simulator import LogBarterSimulator
+# from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.matching_barter_simulator import MatchingBarterSimulator
 # from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.ib_bartering_link import IBBarteringLink
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.phone_book.app.markets.market import Market, MarketID
 
@@ -9,6 +10,7 @@ market = Market([MarketID.IN])
 
 # barter_simulator: BarterSimulator = BarterSimulator() if market.is_test_run else None
 barter_simulator: LogBarterSimulator = LogBarterSimulator() if market.is_test_run else None
+# barter_simulator: MatchingBarterSimulator = MatchingBarterSimulator() if market.is_test_run else None
 # barter_simulator: IBBarteringLink = IBBarteringLink() if market.is_test_run else None
 
 
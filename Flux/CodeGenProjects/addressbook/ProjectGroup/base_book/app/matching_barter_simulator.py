@@ -0,0 +1,279 @@
+# standard imports
+import asyncio
+import logging
+import math
+from typing import ClassVar, List, Dict, Tuple, Final
+
+from pendulum import DateTime
+
+# project imports
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.bartering_link_base import (
+    BarteringLinkBase, add_to_texts)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.sim_matching_engine import (
+    SimMatchingEngine, SimLatencyModel, SimChore, SIM_ACK, SIM_CXL_ACK, SIM_CXL_REJ, SIM_AMD_ACK, SIM_AMD_REJ,
+    SIM_UNACK, SIM_ACKED, SIM_CXL_UNACK, SIM_FILLED, SIM_DOD)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.mobile_book_structures import MDContainer, TickType
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.mobile_book_np_view import (
+    get_market_depth_np_view, get_px_ladder, get_qty_ladder)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.street_book.app.executor_config_loader import (
+    executor_config_yaml_dict)
+from Flux.CodeGenProjects.AddressBook.ORMModel.street_book_n_post_book_n_basket_book_core_msgspec_model import *
+from Flux.CodeGenProjects.AddressBook.ORMModel.street_book_n_basket_book_core_msgspec_model import *
+
+# simulate config section of MatchingBarterSimulator: {ack|fill|cxl}_latency_ms, {ack|fill|cxl}_latency_jitter_ms,
+# latency_seed
+MATCHING_ENGINE_CONFIG_KEY: Final[str] = "matching_engine_config"
+
+sim_event_to_chore_event_dict: Final[Dict[str, ChoreEventType]] = {
+    SIM_ACK: ChoreEventType.OE_ACK,
+    SIM_CXL_ACK: ChoreEventType.OE_CXL_ACK,
+    SIM_CXL_REJ: ChoreEventType.OE_CXL_EXH_REJ,
+    SIM_AMD_ACK: ChoreEventType.OE_AMD_ACK,
+    SIM_AMD_REJ: ChoreEventType.OE_AMD_REJ
+}
+
+sim_state_to_chore_status_dict: Final[Dict[str, ChoreStatusType]] = {
+    SIM_UNACK: ChoreStatusType.OE_UNACK,
+    SIM_ACKED: ChoreStatusType.OE_ACKED,
+    SIM_CXL_UNACK: ChoreStatusType.OE_CXL_UNACK,
+    SIM_FILLED: ChoreStatusType.OE_FILLED,
+    SIM_DOD: ChoreStatusType.OE_DOD
+}
+
+
+class MatchingBarterSimulator(BarteringLinkBase):
+    """
+    in-process exchange simulator: chores are matched by SimMatchingEngine's per symbol price-time priority books
+    against each other and against market depth / last barters fed from shm (update_from_md_container, registered
+    as SymbolCacheContainer md update listener) or replay (update_market_depth / process_last_barter), with
+    configured ack/fill/cxl latencies and partial fills - chore
+    and fill ledgers are delivered straight to chore_create_async_callable / fill_create_async_callable, no log
+    round trip
+    """
+    int_id: ClassVar[int] = 1
+    matching_engine: ClassVar[SimMatchingEngine | None] = None
+    # loop owning matching_engine - shm reader thread hands its updates over to it
+    asyncio_loop: ClassVar[asyncio.AbstractEventLoop | None] = None
+    # symbol to (last_barter, bid depth, ask depth) section update counters last applied from shm
+    symbol_to_md_section_counters_dict: ClassVar[Dict[str, Tuple]] = {}
+
+    def __init__(self):
+        super(MatchingBarterSimulator, self).__init__(executor_config_yaml_dict.get("inst_id"))
+
+    @classmethod
+    def get_matching_engine(cls) -> SimMatchingEngine:
+        if cls.matching_engine is None:
+            matching_engine_config = BarteringLinkBase.simulate_config_dict.get(MATCHING_ENGINE_CONFIG_KEY) \
+                if BarteringLinkBase.simulate_config_dict is not None else None
+            cls.matching_engine = SimMatchingEngine(
+                cls._handle_sim_chore_event, cls._handle_sim_fill,
+                SimLatencyModel.from_config(matching_engine_config, "ack"),
+                SimLatencyModel.from_config(matching_engine_config, "fill"),
+                SimLatencyModel.from_config(matching_engine_config, "cxl"))
+        # else not required: engine already created
+        return cls.matching_engine
+
+    @classmethod
+    async def recover_cache(cls, **kwargs):
+        pass
+
+    @classmethod
+    def update_market_depth(cls, symbol: str, side: TickType, px_qty_list: List[Tuple[float, int]]):
+        """replayed (or any non-shm) depth snapshot of one side of symbol"""
+        cls.get_matching_engine().update_market_depth(symbol, side == TickType.BID, px_qty_list)
+
+    @classmethod
+    def process_last_barter(cls, symbol: str, px: float, qty: int):
+        cls.get_matching_engine().process_last_barter(symbol, px, qty)
+
+    @classmethod
+    def update_from_md_container(cls, md_container: MDContainer):
+        """
+        md update listener of shm reader - called with reader's md_container copy after every refresh: depth sides
+        and last barter whose section counter moved since last call are read here (container is reused by reader)
+        and applied on asyncio_loop, last barter seen on first call of symbol is taken as already processed
+        """
+        symbol = md_container.symbol
+        section_update_counters = md_container.section_update_counters
+        md_section_counters = (section_update_counters.last_barter,
+                               tuple(section_update_counters.bid_market_depth_list),
+                               tuple(section_update_counters.ask_market_depth_list))
+        last_md_section_counters = cls.symbol_to_md_section_counters_dict.get(symbol)
+        if last_md_section_counters == md_section_counters:
+            return
+        # else not required: some section moved
+        cls.symbol_to_md_section_counters_dict[symbol] = md_section_counters
+
+        side_n_px_qty_list: List[Tuple[TickType, List[Tuple[float, int]]]] = []
+        for side, section_index in ((TickType.BID, 1), (TickType.ASK, 2)):
+            if (last_md_section_counters is not None and
+                    last_md_section_counters[section_index] == md_section_counters[section_index]):
+                continue
+            # else not required: side changed (or first update) - re-snapshotting it from zero-copy view
+            depth_np_view = get_market_depth_np_view(md_container, side)
+            px_qty_list = [(float(px), int(qty)) for px, qty in zip(get_px_ladder(depth_np_view),
+                                                                    get_qty_ladder(depth_np_view))
+                           if not math.isnan(px) and qty > 0]
+            side_n_px_qty_list.append((side, px_qty_list))
+        last_barter_px_n_qty: Tuple[float, int] | None = None
+        if last_md_section_counters is not None and last_md_section_counters[0] != md_section_counters[0]:
+            last_barter_px_n_qty = (md_container.last_barter.px, md_container.last_barter.qty)
+        # else not required: no new barter
+
+        if cls.asyncio_loop is None:
+            # no loop handed over (replay / tests) - caller runs on engine's loop
+            cls._apply_md_update(symbol, side_n_px_qty_list, last_barter_px_n_qty)
+        else:
+            cls.asyncio_loop.call_soon_threadsafe(cls._apply_md_update, symbol, side_n_px_qty_list,
+                                                  last_barter_px_n_qty)
+
+    @classmethod
+    def _apply_md_update(cls, symbol: str, side_n_px_qty_list: List[Tuple[TickType, List[Tuple[float, int]]]],
+                         last_barter_px_n_qty: Tuple[float, int] | None):
+        try:
+            for side, px_qty_list in side_n_px_qty_list:
+                cls.update_market_depth(symbol, side, px_qty_list)
+            if last_barter_px_n_qty is not None:
+                cls.process_last_barter(symbol, *last_barter_px_n_qty)
+            # else not required: no new barter
+        except Exception as e:
+            logging.exception(f"matching engine md update failed;;; {symbol=}, exception: {e}")
+
+    @staticmethod
+    def _get_chore_brief(sim_chore: SimChore, msg: str) -> ChoreBrief:
+        context: Dict = sim_chore.context
+        chore_brief = ChoreBrief(chore_id=sim_chore.chore_id, security=context.get("security"),
+                                 bartering_security=context.get("bartering_security"), side=context.get("side"),
+                                 px=sim_chore.px, qty=sim_chore.qty, underlying_account=context.get("account"),
+                                 exchange=context.get("exchange"), user_data=context.get("client_ord_id"))
+        add_to_texts(chore_brief, msg)
+        return chore_brief
+
+    @classmethod
+    async def _handle_sim_chore_event(cls, sim_chore: SimChore, sim_event: str, text: str):
+        if MatchingBarterSimulator.chore_create_async_callable:
+            msg = f"SIM: {sim_event} for {sim_chore.symbol}, chore_id {sim_chore.chore_id}, qty {sim_chore.qty} " \
+                  f"and px {sim_chore.px}{f', {text}' if text else ''}"
+            chore_ledger = ChoreLedger(chore=cls._get_chore_brief(sim_chore, msg),
+                                       chore_event_date_time=DateTime.utcnow(),
+                                       chore_event=sim_event_to_chore_event_dict[sim_event])
+            await MatchingBarterSimulator.chore_create_async_callable(chore_ledger)
+
+    @classmethod
+    async def _handle_sim_fill(cls, sim_chore: SimChore, fill_px: float, fill_qty: int, fill_id: str):
+        if MatchingBarterSimulator.fill_create_async_callable:
+            context: Dict = sim_chore.context
+            fill_ledger = DealsLedger(chore_id=sim_chore.chore_id, fill_px=fill_px, fill_qty=fill_qty,
+                                      fill_symbol=sim_chore.symbol, fill_side=context.get("side"),
+                                      underlying_account=context.get("account"),
+                                      fill_date_time=DateTime.utcnow(), fill_id=fill_id)
+            await MatchingBarterSimulator.fill_create_async_callable(fill_ledger)
+
+    @classmethod
+    async def place_new_chore(cls, px: float, qty: int, side: Side, bartering_sec_id: str, system_sec_id: str,
+                              bartering_sec_type: str, account: str, exchange: str | None = None, text: List[str] | None = None,
+                              client_ord_id: str | None = None, **kwargs) -> Tuple[bool, str]:
+        """
+        return bool indicating success/fail and unique-id-str/err-description in second param
+        """
+        cls.int_id += 1
+        create_date_time = DateTime.utcnow()
+        chore_id: str = f"{bartering_sec_id}-{create_date_time}-{cls.int_id}"
+        # use system_sec_id to create system's internal chore brief / ledger
+        context: Dict = {"security": Security(sec_id=system_sec_id, sec_id_source=SecurityIdSource.TICKER),
+                         "bartering_security": Security(sec_id=bartering_sec_id,
+                                                        sec_id_source=SecurityIdSource.TICKER),
+                         "side": side, "account": account, "exchange": exchange, "client_ord_id": client_ord_id}
+        sim_chore = SimChore(chore_id, system_sec_id, side in (Side.BUY, Side.BTC), px, qty, context)
+        if MatchingBarterSimulator.chore_create_async_callable:
+            msg = f"SIM: Choreing {bartering_sec_id}/{system_sec_id}, qty {qty} and px {px}"
+            chore_ledger = ChoreLedger(chore=cls._get_chore_brief(sim_chore, msg),
+                                       chore_event_date_time=create_date_time, chore_event=ChoreEventType.OE_NEW)
+            await MatchingBarterSimulator.chore_create_async_callable(chore_ledger)
+        # else not required: no chore handler attached - chore is still matched
+        cls.get_matching_engine().submit_new(sim_chore)
+
+        sync_check = kwargs.get("sync_check")
+        if sync_check:
+            return True, f"placed_new_chore---{chore_id}"
+        else:
+            return True, chore_id
+
+    @classmethod
+    async def place_cxl_chore(cls, chore_id: str, side: Side | None = None, bartering_sec_id: str | None = None,
+                              system_sec_id: str | None = None, underlying_account: str | None = None) -> bool:
+        matching_engine = cls.get_matching_engine()
+        sim_chore = matching_engine.get_chore(chore_id)
+        if sim_chore is None:
+            # unknown to engine - cxl request and reject reported with caller's chore details
+            context: Dict = {"security": Security(sec_id=system_sec_id, sec_id_source=SecurityIdSource.TICKER),
+                             "side": side, "account": underlying_account}
+            sim_chore = SimChore(chore_id, system_sec_id, side in (Side.BUY, Side.BTC), 0.0, 0, context)
+        else:
+            context = sim_chore.context
+        if MatchingBarterSimulator.chore_create_async_callable:
+            msg = f"SIM:Cancel Request for {bartering_sec_id}/{system_sec_id}, chore_id {chore_id} and side {side}"
+            chore_ledger = ChoreLedger(chore=cls._get_chore_brief(sim_chore, msg),
+                                       chore_event_date_time=DateTime.utcnow(), chore_event=ChoreEventType.OE_CXL)
+            await MatchingBarterSimulator.chore_create_async_callable(chore_ledger)
+        # else not required: no chore handler attached
+        return matching_engine.submit_cxl(chore_id, context)
+
+    @classmethod
+    async def place_amend_chore(cls, chore_id: str, px: float | None = None, qty: int | None = None,
+                                bartering_sec_id: str | None = None, system_sec_id: str | None = None,
+                                bartering_sec_type: str | None = None) -> bool:
+        if px is None and qty is None:
+            logging.error(f"Both Px and Qty can't be None while placing amend chore - ignoring amend of {chore_id=}")
+            return False
+        matching_engine = cls.get_matching_engine()
+        sim_chore = matching_engine.get_chore(chore_id)
+        if sim_chore is None:
+            logging.error(f"amend of unknown chore ignored by MatchingBarterSimulator;;; {chore_id=}")
+            return False
+        # else not required: amending known chore
+        if MatchingBarterSimulator.chore_create_async_callable:
+            is_amend_up = (qty is not None and qty > sim_chore.qty) or (px is not None and px > sim_chore.px)
+            msg = f"SIM:Amend Request for {bartering_sec_id}/{system_sec_id}, chore_id {chore_id}, {px=}, {qty=}"
+            chore_brief = cls._get_chore_brief(sim_chore, msg)
+            chore_brief.px = px if px is not None else sim_chore.px
+            chore_brief.qty = qty if qty is not None else sim_chore.qty
+            chore_ledger = ChoreLedger(chore=chore_brief, chore_event_date_time=DateTime.utcnow(),
+                                       chore_event=ChoreEventType.OE_AMD_UP_UNACK if is_amend_up else
+                                       ChoreEventType.OE_AMD_DN_UNACK)
+            await MatchingBarterSimulator.chore_create_async_callable(chore_ledger)
+        # else not required: no chore handler attached
+        return matching_engine.submit_amend(chore_id, px, qty)
+
+    @classmethod
+    async def is_chore_open(cls, chore_id: str) -> bool:
+        sim_chore = cls.get_matching_engine().get_chore(chore_id)
+        return sim_chore is not None and sim_chore.is_open
+
+    @classmethod
+    async def get_chore_status(cls, chore_id: str) -> Tuple[ChoreStatusType | None, str | None, int | None, float | None, int | None] | None:
+        """
+        returns chore_status (ChoreStatusType), any_chore_text, filled-Qty, chore-px and chore-qty as seen by bartering
+        link, caller may use these for reconciliation
+        returns None if chore not found by Bartering Link
+        """
+        sim_chore = cls.get_matching_engine().get_chore(chore_id)
+        if sim_chore is None:
+            return None
+        return (sim_state_to_chore_status_dict[sim_chore.state], None, sim_chore.filled_qty, sim_chore.px,
+                sim_chore.qty)
+
+    @classmethod
+    async def is_kill_switch_enabled(cls) -> bool:
+        logging.info("Called BarteringLink.is_kill_switch_enabled from MatchingBarterSimulator")
+        return False
+
+    @classmethod
+    async def trigger_kill_switch(cls) -> bool:
+        logging.critical("Called BarteringLink.trigger_kill_switch from MatchingBarterSimulator")
+        return True
+
+    @classmethod
+    async def revoke_kill_switch_n_resume_bartering(cls) -> bool:
+        logging.critical("Called BarteringLink.revoke_kill_switch_n_resume_bartering from MatchingBarterSimulator")
+        return True
@@ -0,0 +1,96 @@
+# standard imports
+import ctypes
+from functools import lru_cache
+from typing import Final
+
+# 3rd party imports
+import numpy as np
+
+# project imports
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.mobile_book_structures import (
+    MarketDepth, TopOfBook, Quote, MDContainer, TickType, DEPTH_LVL)
+
+
+@lru_cache(maxsize=None)
+def get_np_dtype(ctypes_type) -> np.dtype:
+    """
+    numpy dtype with same field names, offsets and itemsize as passed ctypes type - built from _fields_ so
+    ndarray views over shm or ctypes buffers read exactly what ctypes structures read, char arrays become fixed
+    size bytes fields (S<N>) instead of per char sub-arrays
+    """
+    if issubclass(ctypes_type, ctypes.Structure):
+        names, formats, offsets = [], [], []
+        for field_name, field_type, *_ in ctypes_type._fields_:
+            names.append(field_name)
+            formats.append(get_np_dtype(field_type))
+            offsets.append(getattr(ctypes_type, field_name).offset)
+        dtype = np.dtype({"names": names, "formats": formats, "offsets": offsets,
+                          "itemsize": ctypes.sizeof(ctypes_type)})
+    elif issubclass(ctypes_type, ctypes.Array):
+        if ctypes_type._type_ is ctypes.c_char:
+            dtype = np.dtype(f"S{ctypes_type._length_}")
+        else:
+            dtype = np.dtype((get_np_dtype(ctypes_type._type_), (ctypes_type._length_,)))
+    else:
+        dtype = np.dtype(ctypes_type)
+
+    if dtype.itemsize != ctypes.sizeof(ctypes_type):
+        raise Exception(f"numpy dtype itemsize {dtype.itemsize} mismatches ctypes sizeof "
+                        f"{ctypes.sizeof(ctypes_type)} for {ctypes_type.__name__}")
+    # else not required: layouts match
+    return dtype
+
+
+MARKET_DEPTH_DTYPE: Final[np.dtype] = get_np_dtype(MarketDepth)
+TOP_OF_BOOK_DTYPE: Final[np.dtype] = get_np_dtype(TopOfBook)
+QUOTE_DTYPE: Final[np.dtype] = get_np_dtype(Quote)
+
+
+def get_market_depth_np_view(md_container: MDContainer, side: TickType) -> np.ndarray:
+    """
+    zero-copy (DEPTH_LVL,) structured array over side's depth list of passed MDContainer - md_container may be a
+    ctypes copy or a from_buffer view over shm mmap, view stays valid (and sees in-place updates) as long as
+    md_container's buffer does
+    """
+    depth_list_field = MDContainer.bid_market_depth_list if side == TickType.BID else MDContainer.ask_market_depth_list
+    return np.frombuffer(md_container, dtype=MARKET_DEPTH_DTYPE, count=DEPTH_LVL, offset=depth_list_field.offset)
+
+
+def get_top_of_book_np_view(md_container: MDContainer) -> np.ndarray:
+    # zero-copy 0-d structured array over MDContainer's top_of_book
+    return np.frombuffer(md_container, dtype=TOP_OF_BOOK_DTYPE, count=1,
+                         offset=MDContainer.top_of_book.offset).reshape(())
+
+
+def get_px_ladder(depth_np_view: np.ndarray) -> np.ndarray:
+    # per level px, nan where px not set
+    return np.where(depth_np_view["is_px_set_"], depth_np_view["px_"], np.nan)
+
+
+def get_qty_ladder(depth_np_view: np.ndarray) -> np.ndarray:
+    # per level qty, 0 where qty not set
+    return np.where(depth_np_view["is_qty_set_"], depth_np_view["qty_"], 0)
+
+
+def get_cumulative_notional(depth_np_view: np.ndarray) -> np.ndarray:
+    # running px * qty notional from level 0, levels without px or qty add nothing
+    is_set = depth_np_view["is_px_set_"] & depth_np_view["is_qty_set_"]
+    return np.cumsum(np.where(is_set, depth_np_view["px_"] * depth_np_view["qty_"], 0.0))
+
+
+def get_level_reaching_qty(depth_np_view: np.ndarray, qty: int) -> int | None:
+    # first level at which cumulative qty from level 0 reaches passed qty, None if whole book is short
+    reached_levels = np.flatnonzero(np.cumsum(get_qty_ladder(depth_np_view)) >= qty)
+    return int(reached_levels[0]) if reached_levels.size else None
+
+
+def get_px_by_max_level(depth_np_view: np.ndarray, max_level: int) -> float | None:
+    """
+    px of deepest populated level within first max_level levels - vectorized form of level search done in
+    ChoreControl._get_px_by_max_level, populated means depth has symbol set, None if no level is populated
+    """
+    populated_levels = np.flatnonzero(depth_np_view["symbol_"][:max_level] != b"")
+    if not populated_levels.size:
+        return None
+    depth = depth_np_view[populated_levels[-1]]
+    return float(depth["px_"]) if depth["is_px_set_"] else None
@@ -0,0 +1,84 @@
+# MobileBookNpViewBenchmark.py
+# compares per level ctypes attribute access vs numpy views over same MDContainer for common depth scans
+
+import argparse
+import logging
+import timeit
+
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.mobile_book_structures import (
+    MDContainer, TickType, DEPTH_LVL)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.mobile_book_np_view import (
+    get_market_depth_np_view, get_px_ladder, get_cumulative_notional, get_px_by_max_level)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def populate_md_container(md_container: MDContainer, symbol: str, populated_levels: int) -> None:
+    for level in range(populated_levels):
+        market_depth = md_container.bid_market_depth_list[level]
+        market_depth.symbol_ = symbol.encode()
+        market_depth.side_ = b"B"
+        market_depth.position = level
+        market_depth.px_ = 100.0 - level * 0.01
+        market_depth.is_px_set_ = True
+        market_depth.qty_ = 100 * (level + 1)
+        market_depth.is_qty_set_ = True
+
+
+def ctypes_px_ladder(market_depths):
+    return [market_depth.px for market_depth in market_depths]
+
+
+def ctypes_cumulative_notional(market_depths):
+    cumulative_notional = 0.0
+    cumulative_notional_list = []
+    for market_depth in market_depths:
+        px, qty = market_depth.px, market_depth.qty
+        if px is not None and qty is not None:
+            cumulative_notional += px * qty
+        cumulative_notional_list.append(cumulative_notional)
+    return cumulative_notional_list
+
+
+def ctypes_px_by_max_level(market_depths, max_level: int):
+    # same loop as ChoreControl._get_px_by_max_level
+    for lvl in range(max_level - 1, -1, -1):
+        market_depth = market_depths[lvl]
+        if market_depth is not None and market_depth.symbol_:
+            return market_depth.px
+    return None
+
+
+def run(populated_levels: int, max_level: int, iterations: int) -> None:
+    md_container = MDContainer()
+    populate_md_container(md_container, "NP_VIEW_BENCH", populated_levels)
+    market_depths = md_container.bid_market_depth_list
+    market_depth_np_view = get_market_depth_np_view(md_container, TickType.BID)
+
+    if ctypes_px_by_max_level(market_depths, max_level) != get_px_by_max_level(market_depth_np_view, max_level):
+        raise Exception("ctypes and numpy px_by_max_level results differ")
+    # else not required: both paths agree
+
+    scans = (
+        ("px ladder", lambda: ctypes_px_ladder(market_depths), lambda: get_px_ladder(market_depth_np_view)),
+        ("cumulative notional", lambda: ctypes_cumulative_notional(market_depths),
+         lambda: get_cumulative_notional(market_depth_np_view)),
+        ("px by max level", lambda: ctypes_px_by_max_level(market_depths, max_level),
+         lambda: get_px_by_max_level(market_depth_np_view, max_level))
+    )
+    for scan_name, ctypes_scan, np_scan in scans:
+        ctypes_sec = timeit.timeit(ctypes_scan, number=iterations)
+        np_sec = timeit.timeit(np_scan, number=iterations)
+        logging.info(f"{scan_name:>20}: ctypes={ctypes_sec / iterations * 1e6:.2f} us, "
+                     f"numpy={np_sec / iterations * 1e6:.2f} us, speedup={ctypes_sec / np_sec:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ctypes vs numpy view depth scans over MDContainer.")
+    parser.add_argument("--populated_levels", type=int, default=DEPTH_LVL,
+                        help="Number of bid levels populated, rest stay empty.")
+    parser.add_argument("--max_level", type=int, default=DEPTH_LVL, help="max_px_levels used for level search.")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    run(min(args.populated_levels, DEPTH_LVL), min(args.max_level, DEPTH_LVL), args.iterations)
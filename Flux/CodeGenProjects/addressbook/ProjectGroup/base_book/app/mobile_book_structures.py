@@ -372,9 +372,25 @@ class MarketDepth(Structure):
         return None
 
 
+class MDSectionUpdateCounters(Structure):
+    """
+    per-section update counters of MDContainer - writer bumps a section's counter after every change to that
+    section, readers compare against counters of their last copy and copy only the sections that moved
+    """
+    _fields_ = [
+        ("last_barter", c_uint64),
+        ("top_of_book", c_uint64),
+        ("bid_market_depth_list", c_uint64 * DEPTH_LVL),
+        ("ask_market_depth_list", c_uint64 * DEPTH_LVL)
+    ]
+
+
 class MDContainer(Structure):
     _fields_ = [
         ("update_counter", c_int64),
+        # seqlock version: odd while a writer is updating this container, even once the update is complete
+        ("seq_version", c_uint64),
+        ("section_update_counters", MDSectionUpdateCounters),
         ("symbol_", c_char * MAX_STRING_LENGTH),
         ("last_barter", LastBarter),
         ("top_of_book", TopOfBook),
@@ -0,0 +1,469 @@
+# standard imports
+import asyncio
+import heapq
+import logging
+import random
+from collections import deque, OrderedDict
+from typing import List, Dict, Deque, Tuple, Callable, Awaitable, Any, Final
+
+# sim chore events delivered to chore_event_async_callable - mapped to ChoreEventType by bartering link
+SIM_ACK: Final[str] = "ACK"
+SIM_CXL_ACK: Final[str] = "CXL_ACK"
+SIM_CXL_REJ: Final[str] = "CXL_REJ"
+SIM_AMD_ACK: Final[str] = "AMD_ACK"
+SIM_AMD_REJ: Final[str] = "AMD_REJ"
+
+# sim chore states - mapped to ChoreStatusType by bartering link
+SIM_UNACK: Final[str] = "UNACK"
+SIM_ACKED: Final[str] = "ACKED"
+SIM_CXL_UNACK: Final[str] = "CXL_UNACK"
+SIM_FILLED: Final[str] = "FILLED"
+SIM_DOD: Final[str] = "DOD"
+
+
+class SimLatencyModel:
+    """delay of one simulated hop: base_ms plus uniform [0, jitter_ms) jitter"""
+
+    def __init__(self, base_ms: float = 0.0, jitter_ms: float = 0.0, seed: int | None = None):
+        self.base_ms: float = base_ms
+        self.jitter_ms: float = jitter_ms
+        self.random: random.Random = random.Random(seed)
+
+    @classmethod
+    def from_config(cls, config_dict: Dict | None, hop: str) -> "SimLatencyModel":
+        # e.g. hop "ack" reads ack_latency_ms / ack_latency_jitter_ms of passed config
+        config_dict = config_dict or {}
+        return cls(float(config_dict.get(f"{hop}_latency_ms") or 0.0),
+                   float(config_dict.get(f"{hop}_latency_jitter_ms") or 0.0), config_dict.get("latency_seed"))
+
+    def get_delay_secs(self) -> float:
+        if self.jitter_ms:
+            return (self.base_ms + self.random.random() * self.jitter_ms) / 1000
+        return self.base_ms / 1000
+
+
+class SimChore:
+    __slots__ = ("chore_id", "symbol", "is_buy", "px", "qty", "filled_qty", "state", "priority_seq",
+                 "queue_ahead_qty", "last_due_time", "fill_count", "context")
+
+    def __init__(self, chore_id: str, symbol: str, is_buy: bool, px: float, qty: int, context: Any = None):
+        self.chore_id: str = chore_id
+        self.symbol: str = symbol
+        self.is_buy: bool = is_buy
+        self.px: float = px
+        self.qty: int = qty
+        self.filled_qty: int = 0
+        self.state: str = SIM_UNACK
+        self.priority_seq: int = 0
+        # market depth qty resting at same px ahead of this chore when it joined the level
+        self.queue_ahead_qty: int = 0
+        # due time of last scheduled action of this chore - keeps its events in order under jittered latencies
+        self.last_due_time: float = 0.0
+        self.fill_count: int = 0
+        # bartering link's per chore data (security, account, ...) - passed back with every callback
+        self.context: Any = context
+
+    @property
+    def leaves_qty(self) -> int:
+        return self.qty - self.filled_qty
+
+    @property
+    def is_open(self) -> bool:
+        return self.state in (SIM_ACKED, SIM_CXL_UNACK)
+
+
+class SimOrderBook:
+    """
+    price-time priority book of one symbol: simulated chores rest in per px FIFO deques (best px found via heap,
+    closed chores dropped lazily) and match against each other and against latest market depth snapshot of each
+    side - depth liquidity consumed by sim chores stays consumed until next snapshot of that side replaces it.
+    Depth at a px is ahead of sim chores joining that px, barters at px eat that queue before filling them
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol: str = symbol
+        # best first [px, qty] levels
+        self.bid_depth_level_list: List[List] = []
+        self.ask_depth_level_list: List[List] = []
+        # bid heap holds -px so best px of both sides is heap[0]
+        self.bid_px_heap: List[float] = []
+        self.ask_px_heap: List[float] = []
+        self.bid_px_to_chore_deque_dict: Dict[float, Deque[SimChore]] = {}
+        self.ask_px_to_chore_deque_dict: Dict[float, Deque[SimChore]] = {}
+        # chores with depth queued ahead per px - only these need queue updates on depth snapshots
+        self.bid_px_to_queued_chore_list_dict: Dict[float, List[SimChore]] = {}
+        self.ask_px_to_queued_chore_list_dict: Dict[float, List[SimChore]] = {}
+        self.priority_seq: int = 0
+
+    def _get_side_book(self, is_bid: bool) -> Tuple[List[List], List[float], Dict[float, Deque[SimChore]]]:
+        if is_bid:
+            return self.bid_depth_level_list, self.bid_px_heap, self.bid_px_to_chore_deque_dict
+        return self.ask_depth_level_list, self.ask_px_heap, self.ask_px_to_chore_deque_dict
+
+    def _get_best_resting_chore(self, is_bid: bool) -> SimChore | None:
+        _, px_heap, px_to_chore_deque_dict = self._get_side_book(is_bid)
+        while px_heap:
+            px = -px_heap[0] if is_bid else px_heap[0]
+            chore_deque = px_to_chore_deque_dict.get(px)
+            while chore_deque and not chore_deque[0].is_open:
+                chore_deque.popleft()
+            if chore_deque:
+                return chore_deque[0]
+            # else not required: level emptied - dropping it below
+            heapq.heappop(px_heap)
+            px_to_chore_deque_dict.pop(px, None)
+        return None
+
+    @staticmethod
+    def _is_crossing(is_buy: bool, px: float, opposite_px: float) -> bool:
+        return opposite_px <= px if is_buy else opposite_px >= px
+
+    def add_resting(self, chore: SimChore):
+        depth_level_list, px_heap, px_to_chore_deque_dict = self._get_side_book(chore.is_buy)
+        self.priority_seq += 1
+        chore.priority_seq = self.priority_seq
+        chore.queue_ahead_qty = next((qty for px, qty in depth_level_list if px == chore.px), 0)
+        if chore.queue_ahead_qty > 0:
+            px_to_queued_chore_list_dict = self.bid_px_to_queued_chore_list_dict if chore.is_buy else \
+                self.ask_px_to_queued_chore_list_dict
+            px_to_queued_chore_list_dict.setdefault(chore.px, []).append(chore)
+        # else not required: nothing ahead of chore
+        chore_deque = px_to_chore_deque_dict.get(chore.px)
+        if chore_deque is None:
+            chore_deque = px_to_chore_deque_dict[chore.px] = deque()
+            heapq.heappush(px_heap, -chore.px if chore.is_buy else chore.px)
+        # else not required: joining existing level
+        chore_deque.append(chore)
+
+    def remove_resting(self, chore: SimChore):
+        # closed chores need no removal (skipped lazily) - used when chore re-rests at new px / priority
+        _, _, px_to_chore_deque_dict = self._get_side_book(chore.is_buy)
+        chore_deque = px_to_chore_deque_dict.get(chore.px)
+        if chore_deque is not None and chore in chore_deque:
+            chore_deque.remove(chore)
+        # else not required: chore not resting
+
+    def match(self, chore: SimChore) -> List[Tuple[SimChore, float, int]]:
+        """
+        matches incoming chore against opposite depth and resting sim chores in px-then-time priority (depth
+        before sim chores at same px), returns (chore, fill_px, fill_qty) for both sides of every match
+        """
+        fill_list: List[Tuple[SimChore, float, int]] = []
+        depth_level_list, _, _ = self._get_side_book(not chore.is_buy)
+        while chore.leaves_qty > 0:
+            best_depth_level = depth_level_list[0] if depth_level_list else None
+            best_resting_chore = self._get_best_resting_chore(not chore.is_buy)
+            if best_depth_level is not None and (
+                    best_resting_chore is None or
+                    self._is_crossing(chore.is_buy, best_resting_chore.px, best_depth_level[0])):
+                if not self._is_crossing(chore.is_buy, chore.px, best_depth_level[0]):
+                    break
+                fill_qty = min(chore.leaves_qty, best_depth_level[1])
+                best_depth_level[1] -= fill_qty
+                if best_depth_level[1] <= 0:
+                    depth_level_list.pop(0)
+                # else not required: level partially consumed
+                chore.filled_qty += fill_qty
+                fill_list.append((chore, best_depth_level[0], fill_qty))
+            elif best_resting_chore is not None:
+                if not self._is_crossing(chore.is_buy, chore.px, best_resting_chore.px):
+                    break
+                fill_qty = min(chore.leaves_qty, best_resting_chore.leaves_qty)
+                chore.filled_qty += fill_qty
+                best_resting_chore.filled_qty += fill_qty
+                # passive chore's px
+                fill_list.append((chore, best_resting_chore.px, fill_qty))
+                fill_list.append((best_resting_chore, best_resting_chore.px, fill_qty))
+                if best_resting_chore.leaves_qty == 0:
+                    best_resting_chore.state = SIM_FILLED
+                # else not required: resting chore partially filled
+            else:
+                break
+        return fill_list
+
+    def update_market_depth(self, is_bid: bool, px_qty_list: List[Tuple[float, int]]
+                            ) -> List[Tuple[SimChore, float, int]]:
+        """
+        replaces depth snapshot of passed side (any level order, empty levels skipped), shrinks queue ahead of
+        same side resting chores to their level's new qty and fills opposite resting chores the new depth crosses
+        at their own px - returns fills
+        """
+        depth_level_list = sorted(([px, qty] for px, qty in px_qty_list if qty > 0), reverse=is_bid)
+        if is_bid:
+            self.bid_depth_level_list = depth_level_list
+        else:
+            self.ask_depth_level_list = depth_level_list
+
+        px_to_qty_dict = {px: qty for px, qty in depth_level_list}
+        px_to_queued_chore_list_dict = self.bid_px_to_queued_chore_list_dict if is_bid else \
+            self.ask_px_to_queued_chore_list_dict
+        for px, queued_chore_list in list(px_to_queued_chore_list_dict.items()):
+            level_qty = px_to_qty_dict.get(px, 0)
+            # chores closed or re-rested at other px (amend) meanwhile are dropped
+            queued_chore_list = [chore for chore in queued_chore_list if chore.is_open and chore.px == px]
+            for chore in queued_chore_list:
+                chore.queue_ahead_qty = min(chore.queue_ahead_qty, level_qty)
+            queued_chore_list = [chore for chore in queued_chore_list if chore.queue_ahead_qty > 0]
+            if queued_chore_list:
+                px_to_queued_chore_list_dict[px] = queued_chore_list
+            else:
+                del px_to_queued_chore_list_dict[px]
+
+        fill_list: List[Tuple[SimChore, float, int]] = []
+        while depth_level_list:
+            best_resting_chore = self._get_best_resting_chore(not is_bid)
+            if best_resting_chore is None or not self._is_crossing(
+                    best_resting_chore.is_buy, best_resting_chore.px, depth_level_list[0][0]):
+                break
+            best_depth_level = depth_level_list[0]
+            fill_qty = min(best_resting_chore.leaves_qty, best_depth_level[1])
+            best_depth_level[1] -= fill_qty
+            if best_depth_level[1] <= 0:
+                depth_level_list.pop(0)
+            # else not required: level partially consumed
+            best_resting_chore.filled_qty += fill_qty
+            fill_list.append((best_resting_chore, best_resting_chore.px, fill_qty))
+            if best_resting_chore.leaves_qty == 0:
+                best_resting_chore.state = SIM_FILLED
+            # else not required: resting chore partially filled
+        return fill_list
+
+    def process_last_barter(self, px: float, qty: int) -> List[Tuple[SimChore, float, int]]:
+        """
+        market barter of qty at px fills resting sim chores it trades through or reaches: both sides are tried
+        since a print doesn't say which side was aggressed, queue ahead at px is eaten first - returns fills
+        """
+        fill_list: List[Tuple[SimChore, float, int]] = []
+        for is_bid in (True, False):
+            remaining_qty = qty
+            _, _, px_to_chore_deque_dict = self._get_side_book(is_bid)
+            # px priority across levels, time priority (deque order) within level
+            crossed_px_list = sorted((chore_px for chore_px in px_to_chore_deque_dict
+                                      if self._is_crossing(is_bid, chore_px, px)), reverse=is_bid)
+            for chore_px in crossed_px_list:
+                if remaining_qty <= 0:
+                    break
+                is_barter_px = chore_px == px
+                # depth qty this barter traded at px so far - queue ahead of every later chore includes it
+                depth_traded_qty = 0
+                for chore in px_to_chore_deque_dict[chore_px]:
+                    if not chore.is_open:
+                        continue
+                    # else not required: open chore
+                    if not is_barter_px:
+                        # level traded through - whole queue ahead traded
+                        chore.queue_ahead_qty = 0
+                    else:
+                        # depth queued ahead of this chore (net of what was traded ahead of earlier chores)
+                        # trades first, in deque (time priority) order
+                        queue_ahead_qty = max(chore.queue_ahead_qty - depth_traded_qty, 0)
+                        eaten_qty = min(remaining_qty, queue_ahead_qty)
+                        depth_traded_qty += eaten_qty
+                        remaining_qty -= eaten_qty
+                        chore.queue_ahead_qty = queue_ahead_qty - eaten_qty
+                    if remaining_qty <= 0 or chore.queue_ahead_qty > 0:
+                        # barter used up - later chores still get their queue ahead reduced
+                        continue
+                    # else not required: chore at front of real queue gets rest of barter
+                    fill_qty = min(chore.leaves_qty, remaining_qty)
+                    chore.filled_qty += fill_qty
+                    remaining_qty -= fill_qty
+                    fill_list.append((chore, chore.px, fill_qty))
+                    if chore.leaves_qty == 0:
+                        chore.state = SIM_FILLED
+                    # else not required: resting chore partially filled
+        return fill_list
+
+
+class SimMatchingEngine:
+    """
+    in-process exchange for simulated bartering: new/cxl/amend requests reach symbol's SimOrderBook after ack
+    (cxl) latency, fills are delivered after fill latency - all through one in-order action queue so chore
+    handlers get each chore's events in sequence and never concurrently. Market depth / barters are applied
+    synchronously as fed (shm readers, replay) and deliver resulting fills after fill latency
+    """
+
+    def __init__(self, chore_event_async_callable: Callable[[SimChore, str, str], Awaitable[Any]],
+                 fill_async_callable: Callable[[SimChore, float, int, str], Awaitable[Any]],
+                 ack_latency_model: SimLatencyModel | None = None,
+                 fill_latency_model: SimLatencyModel | None = None,
+                 cxl_latency_model: SimLatencyModel | None = None, closed_chore_cache_size: int = 10_000):
+        self.chore_event_async_callable: Callable[[SimChore, str, str], Awaitable[Any]] = chore_event_async_callable
+        self.fill_async_callable: Callable[[SimChore, float, int, str], Awaitable[Any]] = fill_async_callable
+        self.ack_latency_model: SimLatencyModel = ack_latency_model or SimLatencyModel()
+        self.fill_latency_model: SimLatencyModel = fill_latency_model or SimLatencyModel()
+        self.cxl_latency_model: SimLatencyModel = cxl_latency_model or self.ack_latency_model
+        self.symbol_to_order_book_dict: Dict[str, SimOrderBook] = {}
+        # open (or unacked) chores; filled / cancelled ones move to bounded closed cache - late cxl / amend /
+        # status queries of recently closed chores still resolve, older ones are unknown
+        self.chore_id_to_chore_dict: Dict[str, SimChore] = {}
+        self.closed_chore_id_to_chore_dict: OrderedDict[str, SimChore] = OrderedDict()
+        self.closed_chore_cache_size: int = closed_chore_cache_size
+        # (due_time, seq, action_coro_func, args) min heap
+        self.action_heap: List[Tuple[float, int, Callable[..., Awaitable[Any]], Tuple]] = []
+        self.action_seq: int = 0
+        self.action_wake_event: asyncio.Event | None = None
+        self.dispatch_task: asyncio.Task | None = None
+        # metrics
+        self.placed_chore_count: int = 0
+        self.fill_count: int = 0
+        self.filled_qty: int = 0
+
+    def get_order_book(self, symbol: str) -> SimOrderBook:
+        order_book = self.symbol_to_order_book_dict.get(symbol)
+        if order_book is None:
+            order_book = self.symbol_to_order_book_dict[symbol] = SimOrderBook(symbol)
+        # else not required: using existing book of symbol
+        return order_book
+
+    def get_chore(self, chore_id: str) -> SimChore | None:
+        chore = self.chore_id_to_chore_dict.get(chore_id)
+        if chore is None:
+            chore = self.closed_chore_id_to_chore_dict.get(chore_id)
+        # else not required: open chore
+        return chore
+
+    def _close_chore(self, chore: SimChore):
+        if self.chore_id_to_chore_dict.pop(chore.chore_id, None) is None:
+            return  # already closed
+        # else not required: first close of chore
+        self.closed_chore_id_to_chore_dict[chore.chore_id] = chore
+        if len(self.closed_chore_id_to_chore_dict) > self.closed_chore_cache_size:
+            self.closed_chore_id_to_chore_dict.popitem(last=False)
+        # else not required: closed cache within bound
+
+    def _schedule(self, delay_secs: float, chore: SimChore | None, action: Callable[..., Awaitable[Any]], *args):
+        loop = asyncio.get_running_loop()
+        due_time = loop.time() + delay_secs
+        if chore is not None:
+            due_time = max(due_time, chore.last_due_time)
+            chore.last_due_time = due_time
+        # else not required: action not bound to a chore
+        self.action_seq += 1
+        heapq.heappush(self.action_heap, (due_time, self.action_seq, action, args))
+        if self.dispatch_task is None or self.dispatch_task.done():
+            self.action_wake_event = asyncio.Event()
+            self.dispatch_task = loop.create_task(self._dispatch_loop())
+        else:
+            self.action_wake_event.set()
+
+    async def _dispatch_loop(self):
+        loop = asyncio.get_running_loop()
+        while self.action_heap:
+            due_time, _, action, args = self.action_heap[0]
+            wait_secs = due_time - loop.time()
+            if wait_secs > 0:
+                # woken early if an earlier action gets scheduled meanwhile
+                self.action_wake_event.clear()
+                try:
+                    await asyncio.wait_for(self.action_wake_event.wait(), wait_secs)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            # else not required: head action is due
+            heapq.heappop(self.action_heap)
+            try:
+                await action(*args)
+            except Exception as e:
+                logging.exception(f"sim matching engine action {getattr(action, '__name__', action)} failed;;; "
+                                  f"{args=}, exception: {e}")
+        # idle - next scheduled action restarts dispatch
+
+    async def drain(self):
+        """waits until every scheduled action is delivered"""
+        while self.dispatch_task is not None and not self.dispatch_task.done():
+            await self.dispatch_task
+
+    def _schedule_fill_list(self, fill_list: List[Tuple[SimChore, float, int]]):
+        for chore, fill_px, fill_qty in fill_list:
+            self.fill_count += 1
+            self.filled_qty += fill_qty
+            chore.fill_count += 1
+            self._schedule(self.fill_latency_model.get_delay_secs(), chore, self._deliver_fill, chore, fill_px,
+                           fill_qty, f"F{chore.chore_id}-{chore.fill_count}")
+            if chore.leaves_qty == 0:
+                chore.state = SIM_FILLED
+                self._close_chore(chore)
+            # else not required: chore partially filled
+
+    async def _deliver_fill(self, chore: SimChore, fill_px: float, fill_qty: int, fill_id: str):
+        await self.fill_async_callable(chore, fill_px, fill_qty, fill_id)
+
+    def submit_new(self, chore: SimChore):
+        self.placed_chore_count += 1
+        self.chore_id_to_chore_dict[chore.chore_id] = chore
+        self._schedule(self.ack_latency_model.get_delay_secs(), chore, self._on_new_arrival, chore)
+
+    async def _on_new_arrival(self, chore: SimChore):
+        chore.state = SIM_ACKED
+        await self.chore_event_async_callable(chore, SIM_ACK, "")
+        order_book = self.get_order_book(chore.symbol)
+        self._schedule_fill_list(order_book.match(chore))
+        if chore.leaves_qty > 0:
+            order_book.add_resting(chore)
+        # else not required: fully filled on arrival - closed by fill scheduling
+
+    def submit_cxl(self, chore_id: str, context: Any = None) -> bool:
+        """False if chore_id is unknown - cxl is rejected with passed context standing in for chore"""
+        chore = self.get_chore(chore_id)
+        if chore is None:
+            unknown_chore = SimChore(chore_id, "", False, 0.0, 0, context)
+            unknown_chore.state = SIM_DOD
+            self._schedule(self.cxl_latency_model.get_delay_secs(), None, self.chore_event_async_callable,
+                           unknown_chore, SIM_CXL_REJ, "unknown chore")
+            return False
+        if chore.state == SIM_ACKED:
+            chore.state = SIM_CXL_UNACK
+        # else not required: unacked or closed chore - resolved on arrival
+        self._schedule(self.cxl_latency_model.get_delay_secs(), chore, self._on_cxl_arrival, chore)
+        return True
+
+    async def _on_cxl_arrival(self, chore: SimChore):
+        if chore.is_open:
+            # closed chore is dropped lazily from its level
+            chore.state = SIM_DOD
+            self._close_chore(chore)
+            await self.chore_event_async_callable(chore, SIM_CXL_ACK, "")
+        else:
+            await self.chore_event_async_callable(chore, SIM_CXL_REJ, f"chore is {chore.state}")
+
+    def submit_amend(self, chore_id: str, px: float | None = None, qty: int | None = None) -> bool:
+        chore = self.get_chore(chore_id)
+        if chore is None:
+            return False
+        self._schedule(self.ack_latency_model.get_delay_secs(), chore, self._on_amend_arrival, chore, px, qty)
+        return True
+
+    async def _on_amend_arrival(self, chore: SimChore, px: float | None, qty: int | None):
+        new_px = chore.px if px is None else px
+        new_qty = chore.qty if qty is None else qty
+        if not chore.is_open or new_qty <= chore.filled_qty:
+            await self.chore_event_async_callable(chore, SIM_AMD_REJ,
+                                                  f"chore is {chore.state}, filled_qty {chore.filled_qty}")
+            return
+        # else not required: amend applicable
+        order_book = self.get_order_book(chore.symbol)
+        if new_px == chore.px and new_qty <= chore.qty:
+            # qty down keeps time priority
+            chore.qty = new_qty
+            await self.chore_event_async_callable(chore, SIM_AMD_ACK, "")
+            return
+        # else not required: px change or qty up loses time priority
+        order_book.remove_resting(chore)
+        chore.px, chore.qty = new_px, new_qty
+        await self.chore_event_async_callable(chore, SIM_AMD_ACK, "")
+        self._schedule_fill_list(order_book.match(chore))
+        if chore.leaves_qty > 0:
+            order_book.add_resting(chore)
+        # else not required: fully filled on amend - closed by fill scheduling
+
+    def update_market_depth(self, symbol: str, is_bid: bool, px_qty_list: List[Tuple[float, int]]):
+        self._schedule_fill_list(self.get_order_book(symbol).update_market_depth(is_bid, px_qty_list))
+
+    def process_last_barter(self, symbol: str, px: float, qty: int):
+        self._schedule_fill_list(self.get_order_book(symbol).process_last_barter(px, qty))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"placed_chore_count": self.placed_chore_count, "fill_count": self.fill_count,
+                "filled_qty": self.filled_qty, "pending_action_count": len(self.action_heap),
+                "open_chore_count": sum(1 for chore in self.chore_id_to_chore_dict.values() if chore.is_open)}
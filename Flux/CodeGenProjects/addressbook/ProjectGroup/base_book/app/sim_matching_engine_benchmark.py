@@ -0,0 +1,115 @@
+# SimMatchingEngineBenchmark.py
+# chores/sec through SimMatchingEngine (engine behind MatchingBarterSimulator): --chore_count limit chores over
+# --symbol_count symbols placed around replayed depth (re-snapshotted every --depth_update_interval chores, with
+# a barter print), part of them cancelled or amended - counts chore events / fills delivered to stand-in chore
+# handlers and checks each chore's events arrive in order with delivered fill qty matching engine's filled qty
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List
+
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.sim_matching_engine import (
+    SimMatchingEngine, SimLatencyModel, SimChore, SIM_ACK)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class StandInChoreHandler:
+    """stands in for chore_create_async_callable / fill_create_async_callable - records delivery order"""
+
+    def __init__(self):
+        self.chore_id_to_event_list_dict: Dict[str, List[str]] = {}
+        self.chore_id_to_delivered_fill_qty_dict: Dict[str, int] = {}
+        self.chore_event_count: int = 0
+        self.fill_count: int = 0
+
+    async def handle_chore_event(self, chore: SimChore, sim_event: str, text: str):
+        self.chore_event_count += 1
+        self.chore_id_to_event_list_dict.setdefault(chore.chore_id, []).append(sim_event)
+
+    async def handle_fill(self, chore: SimChore, fill_px: float, fill_qty: int, fill_id: str):
+        self.fill_count += 1
+        event_list = self.chore_id_to_event_list_dict.get(chore.chore_id)
+        assert event_list and event_list[0] == SIM_ACK, f"fill before ack of {chore.chore_id}"
+        self.chore_id_to_delivered_fill_qty_dict[chore.chore_id] = \
+            self.chore_id_to_delivered_fill_qty_dict.get(chore.chore_id, 0) + fill_qty
+
+
+def get_depth_px_qty_list(mid_px: float, is_bid: bool, depth_level_count: int) -> List:
+    sign = -1 if is_bid else 1
+    return [(round(mid_px + sign * 0.01 * (level + 1), 2), random.randint(1, 10) * 100)
+            for level in range(depth_level_count)]
+
+
+async def run_benchmark(chore_count: int, symbol_count: int, depth_update_interval: int, cxl_percent: int,
+                        amend_percent: int, latency_ms: float, jitter_ms: float) -> None:
+    handler = StandInChoreHandler()
+    latency_model = SimLatencyModel(latency_ms, jitter_ms, seed=0)
+    engine = SimMatchingEngine(handler.handle_chore_event, handler.handle_fill, latency_model, latency_model,
+                               latency_model)
+    symbol_list = [f"SYM_{symbol_index}" for symbol_index in range(symbol_count)]
+    symbol_to_mid_px_dict = {symbol: 100.0 for symbol in symbol_list}
+    chore_list: List[SimChore] = []
+
+    start_time = time.perf_counter()
+    for chore_index in range(chore_count):
+        if chore_index % depth_update_interval == 0:
+            # replayed md: each symbol's mid drifts, both sides re-snapshotted, one barter at mid
+            for symbol in symbol_list:
+                mid_px = symbol_to_mid_px_dict[symbol] = round(
+                    symbol_to_mid_px_dict[symbol] + random.choice((-0.01, 0.0, 0.01)), 2)
+                engine.update_market_depth(symbol, True, get_depth_px_qty_list(mid_px, True, 10))
+                engine.update_market_depth(symbol, False, get_depth_px_qty_list(mid_px, False, 10))
+                engine.process_last_barter(symbol, mid_px, random.randint(1, 5) * 100)
+        # else not required: depth unchanged
+        symbol = random.choice(symbol_list)
+        is_buy = random.random() < 0.5
+        px = round(symbol_to_mid_px_dict[symbol] + (1 if is_buy else -1) * random.randint(-5, 2) * 0.01, 2)
+        chore = SimChore(f"C{chore_index}", symbol, is_buy, px, random.randint(1, 10) * 100)
+        engine.submit_new(chore)
+        chore_list.append(chore)
+        action_pick = random.randint(1, 100)
+        if action_pick <= cxl_percent:
+            engine.submit_cxl(random.choice(chore_list).chore_id)
+        elif action_pick <= cxl_percent + amend_percent:
+            # engine keeps only recently closed chores - amend of older closed one is just rejected
+            amended_chore = random.choice(chore_list)
+            engine.submit_amend(amended_chore.chore_id, qty=amended_chore.qty + 100)
+        # else not required: plain new chore
+        if chore_index % 100 == 0:
+            # lets dispatch catch up like chore handlers awaiting in between placements
+            await asyncio.sleep(0)
+        # else not required: keep placing
+    await engine.drain()
+    elapsed_secs = time.perf_counter() - start_time
+
+    for chore in chore_list:
+        assert handler.chore_id_to_delivered_fill_qty_dict.get(chore.chore_id, 0) == chore.filled_qty, \
+            f"delivered fill qty mismatch for {chore.chore_id}"
+    metrics = engine.get_metrics()
+    logging.info(f"latency {latency_ms} ms (+{jitter_ms} ms jitter): {chore_count:,} chores in "
+                 f"{elapsed_secs * 1000:,.1f} ms -> {chore_count / elapsed_secs:,.0f} chores/sec; delivered "
+                 f"{handler.chore_event_count:,} chore events, {handler.fill_count:,} fills "
+                 f"({metrics['filled_qty']:,} qty), {metrics['open_chore_count']:,} chores left open")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sim matching engine throughput benchmark")
+    parser.add_argument("--chore_count", type=int, default=100_000)
+    parser.add_argument("--symbol_count", type=int, default=20)
+    parser.add_argument("--depth_update_interval", type=int, default=50, help="chores between md replays")
+    parser.add_argument("--cxl_percent", type=int, default=20)
+    parser.add_argument("--amend_percent", type=int, default=5)
+    parser.add_argument("--latency_ms", type=float, default=0.0, help="ack/fill/cxl latency")
+    parser.add_argument("--jitter_ms", type=float, default=0.0)
+    args = parser.parse_args()
+    random.seed(0)
+    asyncio.run(run_benchmark(args.chore_count, args.symbol_count, args.depth_update_interval, args.cxl_percent,
+                              args.amend_percent, args.latency_ms, args.jitter_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,13 @@
 import logging
 import time
 import threading
-from typing import Dict, Any, List, ClassVar, Tuple, Final
+from typing import Dict, Any, List, ClassVar, Tuple, Final, Callable
 import os
 import ctypes
 import mmap
 
 # 3rd party imports
+import numpy as np
 import posix_ipc
 from pendulum import DateTime, parse
 
@@ -23,6 +24,8 @@ from Flux.CodeGenProjects.AddressBook.ProjectGroup.street_book.app.executor_conf
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.street_book.app.pretty_print_shm_data import pretty_print_shm_data
 from FluxPythonUtils.scripts.pthread_shm_mutex import PThreadShmMutex
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.mobile_book_structures import *
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.mobile_book_np_view import (
+    get_market_depth_np_view)
 
 
 class SymbolCache:
@@ -31,6 +34,9 @@ class SymbolCache:
         self.last_barter: LastBarter | None = None
         self.bid_market_depth: List[MarketDepth] | None = None
         self.ask_market_depth: List[MarketDepth] | None = None
+        # zero-copy numpy views over same depth memory as bid/ask_market_depth - for vectorized level scans
+        self.bid_market_depth_np_view: np.ndarray | None = None
+        self.ask_market_depth_np_view: np.ndarray | None = None
         self.so: SymbolOverview | SymbolOverviewBaseModel | None = None
         self.buy_pos_cache: PosCache | None = None
         self.sell_pos_cache: PosCache | None = None
@@ -91,6 +97,93 @@ class SymbolCache:
         return self.so
 
 
+# MDContainer byte layout used to copy only changed sections out of shm
+MD_CONTAINER_SIZE: Final[int] = ctypes.sizeof(MDContainer)
+MD_SECTION_COUNTERS_OFFSET: Final[int] = MDContainer.section_update_counters.offset
+MD_SECTION_COUNTERS_SIZE: Final[int] = ctypes.sizeof(MDSectionUpdateCounters)
+MD_CONTAINER_HEADER_SIZE: Final[int] = MDContainer.symbol_.offset
+MARKET_DEPTH_SIZE: Final[int] = ctypes.sizeof(MarketDepth)
+MD_SCALAR_SECTIONS: Final[Tuple[Tuple[str, int, int], ...]] = (
+    ("last_barter", MDContainer.last_barter.offset, ctypes.sizeof(LastBarter)),
+    ("top_of_book", MDContainer.top_of_book.offset, ctypes.sizeof(TopOfBook))
+)
+MD_DEPTH_SECTIONS: Final[Tuple[Tuple[str, int], ...]] = (
+    ("bid_market_depth_list", MDContainer.bid_market_depth_list.offset),
+    ("ask_market_depth_list", MDContainer.ask_market_depth_list.offset)
+)
+MD_LEG_OFFSETS: Final[Tuple[int, int]] = (
+    MDSharedMemoryContainer.md_cache_container.offset + BaseMDSharedMemoryContainer.leg_1_md_shared_memory.offset,
+    MDSharedMemoryContainer.md_cache_container.offset + BaseMDSharedMemoryContainer.leg_2_md_shared_memory.offset
+)
+
+
+class MDContainerMirror:
+    """
+    process local copy of one leg's shm MDContainer, kept across cycles: only sections whose update counter moved
+    are copied in and section objects handed to SymbolCache stay the same between cycles
+    """
+    def __init__(self):
+        self.md_container: MDContainer = MDContainer()
+        self.address: int = ctypes.addressof(self.md_container)
+        self.shm_section_counters_snapshot: MDSectionUpdateCounters = MDSectionUpdateCounters()
+        self.shm_section_counters_snapshot_address: int = ctypes.addressof(self.shm_section_counters_snapshot)
+        self.symbol: str | None = None
+        self.top_of_book: TopOfBook = self.md_container.top_of_book
+        self.last_barter: LastBarter = self.md_container.last_barter
+        self.bid_market_depth_list = self.md_container.bid_market_depth_list
+        self.ask_market_depth_list = self.md_container.ask_market_depth_list
+        self.bid_market_depth_np_view: np.ndarray = get_market_depth_np_view(self.md_container, TickType.BID)
+        self.ask_market_depth_np_view: np.ndarray = get_market_depth_np_view(self.md_container, TickType.ASK)
+
+    def is_writer_restarted(self, shm_md_container_address: int) -> bool:
+        # cpp starts counting from 0 again after restart
+        return c_int64.from_address(shm_md_container_address).value < self.md_container.update_counter
+
+    def copy_from_shm(self, shm_md_container_address: int, is_full_copy: bool = False) -> int:
+        """
+        caller must guard against concurrent writes (mutex held or seqlock validated) - returns bytes copied
+        """
+        if is_full_copy:
+            ctypes.memmove(self.address, shm_md_container_address, MD_CONTAINER_SIZE)
+            self.symbol = self.md_container.symbol
+            return MD_CONTAINER_SIZE
+        # else not required: copying only changed sections
+
+        shm_update_counter = c_int64.from_address(shm_md_container_address).value
+        if shm_update_counter == self.md_container.update_counter:
+            return 0
+        # else not required: some section changed
+
+        # section counters are snapshot before sections are copied: a section written after the snapshot keeps
+        # its counter ahead of mirror's and is copied again next cycle
+        ctypes.memmove(self.shm_section_counters_snapshot_address,
+                       shm_md_container_address + MD_SECTION_COUNTERS_OFFSET, MD_SECTION_COUNTERS_SIZE)
+        shm_counters = self.shm_section_counters_snapshot
+        mirror_counters = self.md_container.section_update_counters
+        copied_bytes = MD_CONTAINER_HEADER_SIZE
+        for section_name, section_offset, section_size in MD_SCALAR_SECTIONS:
+            if getattr(shm_counters, section_name) != getattr(mirror_counters, section_name):
+                ctypes.memmove(self.address + section_offset, shm_md_container_address + section_offset,
+                               section_size)
+                copied_bytes += section_size
+            # else not required: section unchanged
+        for section_name, section_offset in MD_DEPTH_SECTIONS:
+            shm_level_counters = getattr(shm_counters, section_name)
+            mirror_level_counters = getattr(mirror_counters, section_name)
+            for level in range(DEPTH_LVL):
+                if shm_level_counters[level] != mirror_level_counters[level]:
+                    level_offset = section_offset + level * MARKET_DEPTH_SIZE
+                    ctypes.memmove(self.address + level_offset, shm_md_container_address + level_offset,
+                                   MARKET_DEPTH_SIZE)
+                    copied_bytes += MARKET_DEPTH_SIZE
+                # else not required: depth level unchanged
+
+        self.md_container.update_counter = shm_update_counter
+        ctypes.memmove(self.address + MD_SECTION_COUNTERS_OFFSET, self.shm_section_counters_snapshot_address,
+                       MD_SECTION_COUNTERS_SIZE)
+        return copied_bytes
+
+
 class SymbolCacheContainer:
     # below None data-members must be initialized at init time of executor process
     shared_memory = None
@@ -100,6 +193,15 @@ class SymbolCacheContainer:
     symbol_to_symbol_cache_dict: Dict[str, SymbolCache] = {}
     semaphore = threading.Semaphore(0)
     print_shm_snapshot: bool | None = executor_config_yaml_dict.get('print_shm_snapshot')
+    # seqlock read mode: copy shm without taking the pthread mutex, retrying when a writer overlapped the copy
+    shm_seqlock_read: bool | None = executor_config_yaml_dict.get('shm_seqlock_read')
+    shm_seqlock_max_read_retries: int = executor_config_yaml_dict.get('shm_seqlock_max_read_retries', 1000)
+    shm_seqlock_retry_counts: int = 0
+    leg_md_container_mirrors: List[MDContainerMirror | None] = [None, None]
+    md_copied_bytes_count: int = 0
+    # called from reader thread with each leg's refreshed mirror md_container (reused across cycles - listeners
+    # must copy what they keep), e.g. MatchingBarterSimulator.update_from_md_container in test runs
+    md_update_listener_list: List[Callable[[MDContainer], Any]] = []
 
     @staticmethod
     def release_semaphore():
@@ -173,10 +275,43 @@ class SymbolCacheContainer:
         pthread_shm_mutex: PThreadShmMutex = PThreadShmMutex(md_shared_memory_container.mutex)
         return pthread_shm_mutex
 
+    @staticmethod
+    def _get_seq_versions(base_md_shared_memory_container_: BaseMDSharedMemoryContainer) -> Tuple[int, int]:
+        return (base_md_shared_memory_container_.leg_1_md_shared_memory.seq_version,
+                base_md_shared_memory_container_.leg_2_md_shared_memory.seq_version)
+
+    @staticmethod
+    def get_base_md_shared_memory_container_seqlock() -> BaseMDSharedMemoryContainer | None:
+        """
+        lock-free read: each leg's seq_version is odd while cpp writes it, a copy is valid only if both are even
+        and unchanged across the copy - returns None if no clean copy could be taken within max retries
+        """
+        shm_base_md_container: BaseMDSharedMemoryContainer = (
+            MDSharedMemoryContainer.from_buffer(SymbolCacheContainer.shared_memory).md_cache_container)
+        for _ in range(SymbolCacheContainer.shm_seqlock_max_read_retries):
+            start_seq_versions = SymbolCacheContainer._get_seq_versions(shm_base_md_container)
+            if not (start_seq_versions[0] & 1 or start_seq_versions[1] & 1):
+                md_shared_memory_container_: MDSharedMemoryContainer = (
+                    MDSharedMemoryContainer.from_buffer_copy(SymbolCacheContainer.shared_memory))
+                if SymbolCacheContainer._get_seq_versions(shm_base_md_container) == start_seq_versions:
+                    return md_shared_memory_container_.md_cache_container
+                # else not required: writer overlapped the copy - retrying
+            # else not required: writer in progress - retrying
+            SymbolCacheContainer.shm_seqlock_retry_counts += 1
+        logging.warning(f"seqlock read couldn't get consistent shm copy in "
+                        f"{SymbolCacheContainer.shm_seqlock_max_read_retries} attempts, falling back to mutex "
+                        f"read;;; {SymbolCacheContainer.shm_seqlock_retry_counts=}")
+        return None
+
     @staticmethod
     def get_base_md_shared_memory_container() -> BaseMDSharedMemoryContainer | None:
         pthread_shm_mutex: PThreadShmMutex = SymbolCacheContainer.get_shm_mutex()
         if pthread_shm_mutex is not None:
+            if SymbolCacheContainer.shm_seqlock_read:
+                base_md_shared_memory_container_ = SymbolCacheContainer.get_base_md_shared_memory_container_seqlock()
+                if base_md_shared_memory_container_ is not None:
+                    return base_md_shared_memory_container_
+                # else not required: falling back to mutex based read
             while True:
                 lock_try_time = DateTime.utcnow()
                 lock_res = pthread_shm_mutex.try_timedlock()
@@ -201,34 +336,101 @@ class SymbolCacheContainer:
             return None
 
     @staticmethod
-    def update_md_cache_from_shared_memory() -> bool:
-        base_md_shared_memory_container_ = SymbolCacheContainer.get_base_md_shared_memory_container()   # blocking call
+    def _refresh_leg_md_container_mirror(leg_index: int, shm_md_container_address: int,
+                                         is_full_copy: bool = False) -> None:
+        mirror: MDContainerMirror | None = SymbolCacheContainer.leg_md_container_mirrors[leg_index]
+        if mirror is None or is_full_copy or mirror.is_writer_restarted(shm_md_container_address):
+            mirror = MDContainerMirror()
+            SymbolCacheContainer.leg_md_container_mirrors[leg_index] = mirror
+            is_full_copy = True
+        # else not required: reusing existing mirror
+        SymbolCacheContainer.md_copied_bytes_count += mirror.copy_from_shm(shm_md_container_address, is_full_copy)
 
-        if base_md_shared_memory_container_ is not None:
-            if SymbolCacheContainer.print_shm_snapshot:
-                pretty_print_shm_data(base_md_shared_memory_container_)
+    @staticmethod
+    def _refresh_leg_md_container_mirror_seqlock(leg_index: int, shm_md_container_address: int) -> bool:
+        shm_seq_version = c_uint64.from_address(shm_md_container_address + MDContainer.seq_version.offset)
+        is_full_copy = False
+        for _ in range(SymbolCacheContainer.shm_seqlock_max_read_retries):
+            start_seq_version = shm_seq_version.value
+            if not start_seq_version & 1:
+                SymbolCacheContainer._refresh_leg_md_container_mirror(leg_index, shm_md_container_address,
+                                                                      is_full_copy)
+                if shm_seq_version.value == start_seq_version:
+                    return True
+                # writer overlapped the copy - mirror's section counters can't be trusted, next try copies all
+                is_full_copy = True
+            # else not required: writer in progress - retrying
+            SymbolCacheContainer.shm_seqlock_retry_counts += 1
+        logging.warning(f"seqlock read couldn't get consistent copy of leg {leg_index + 1} in "
+                        f"{SymbolCacheContainer.shm_seqlock_max_read_retries} attempts, falling back to mutex "
+                        f"read;;; {SymbolCacheContainer.shm_seqlock_retry_counts=}")
+        return False
 
-            # setting leg1 md data
-            leg_1_md_shared_memory: MDContainer = base_md_shared_memory_container_.leg_1_md_shared_memory
-            symbol1 = leg_1_md_shared_memory.symbol
-            symbol_cache = SymbolCacheContainer.symbol_to_symbol_cache_dict.get(symbol1)
-            symbol_cache.top_of_book = leg_1_md_shared_memory.top_of_book
-            symbol_cache.last_barter = leg_1_md_shared_memory.last_barter
-            symbol_cache.bid_market_depth = leg_1_md_shared_memory.bid_market_depth_list
-            symbol_cache.ask_market_depth = leg_1_md_shared_memory.ask_market_depth_list
-
-            # setting leg2 md data
-            leg_2_md_shared_memory = base_md_shared_memory_container_.leg_2_md_shared_memory
-            symbol2 = leg_2_md_shared_memory.symbol
-            symbol_cache = SymbolCacheContainer.symbol_to_symbol_cache_dict.get(symbol2)
-            symbol_cache.top_of_book = leg_2_md_shared_memory.top_of_book
-            symbol_cache.last_barter = leg_2_md_shared_memory.last_barter
-            symbol_cache.bid_market_depth = leg_2_md_shared_memory.bid_market_depth_list
-            symbol_cache.ask_market_depth = leg_2_md_shared_memory.ask_market_depth_list
-            return True
-        else:
+    @staticmethod
+    def _refresh_leg_md_container_mirrors_under_mutex(pthread_shm_mutex: PThreadShmMutex,
+                                                      shm_address: int) -> bool:
+        while True:
+            lock_try_time = DateTime.utcnow()
+            lock_res = pthread_shm_mutex.try_timedlock()
+            if lock_res == 0:
+                try:
+                    for leg_index, leg_offset in enumerate(MD_LEG_OFFSETS):
+                        SymbolCacheContainer._refresh_leg_md_container_mirror(leg_index, shm_address + leg_offset)
+                    return True
+                except Exception as e:
+                    logging.exception(f"_refresh_leg_md_container_mirrors_under_mutex failed: exception {e}")
+                    return False
+                finally:
+                    pthread_shm_mutex.unlock()
+            else:
+                lock_timed_out_time = DateTime.utcnow()
+                logging.error(f"pthread lock tried to take lock at {lock_try_time}, but timed-out at "
+                              f"{lock_timed_out_time}, taking total "
+                              f"{(lock_timed_out_time - lock_try_time).total_seconds()} sec(s), {lock_res=}")
+
+    @staticmethod
+    def update_md_cache_from_shared_memory() -> bool:
+        pthread_shm_mutex: PThreadShmMutex = SymbolCacheContainer.get_shm_mutex()     # also verifies signature
+        if pthread_shm_mutex is None:
             return False
+        # else not required: shm is ready
 
+        if SymbolCacheContainer.print_shm_snapshot:
+            base_md_shared_memory_container_ = SymbolCacheContainer.get_base_md_shared_memory_container()
+            if base_md_shared_memory_container_ is not None:
+                pretty_print_shm_data(base_md_shared_memory_container_)
+            # else not required: nothing to print
+
+        shm_address = ctypes.addressof(MDSharedMemoryContainer.from_buffer(SymbolCacheContainer.shared_memory))
+        is_refreshed = False
+        if SymbolCacheContainer.shm_seqlock_read:
+            is_refreshed = all([SymbolCacheContainer._refresh_leg_md_container_mirror_seqlock(
+                leg_index, shm_address + leg_offset) for leg_index, leg_offset in enumerate(MD_LEG_OFFSETS)])
+        # else not required: mutex based read
+        if not is_refreshed:
+            # blocking call
+            is_refreshed = SymbolCacheContainer._refresh_leg_md_container_mirrors_under_mutex(pthread_shm_mutex,
+                                                                                             shm_address)
+            if not is_refreshed:
+                return False
+            # else not required: all good
+
+        # setting leg1 and leg2 md data - mirror sections are stable objects, updated in place each cycle
+        for mirror in SymbolCacheContainer.leg_md_container_mirrors:
+            symbol_cache = SymbolCacheContainer.symbol_to_symbol_cache_dict.get(mirror.symbol)
+            symbol_cache.top_of_book = mirror.top_of_book
+            symbol_cache.last_barter = mirror.last_barter
+            symbol_cache.bid_market_depth = mirror.bid_market_depth_list
+            symbol_cache.ask_market_depth = mirror.ask_market_depth_list
+            symbol_cache.bid_market_depth_np_view = mirror.bid_market_depth_np_view
+            symbol_cache.ask_market_depth_np_view = mirror.ask_market_depth_np_view
+            for md_update_listener in SymbolCacheContainer.md_update_listener_list:
+                try:
+                    md_update_listener(mirror.md_container)
+                except Exception as e:
+                    logging.exception(f"md update listener {md_update_listener} failed;;; {mirror.symbol=}, "
+                                      f"exception: {e}")
+        return True
 
     @classmethod
     def get_symbol_cache(cls, symbol: str) -> SymbolCache | None:
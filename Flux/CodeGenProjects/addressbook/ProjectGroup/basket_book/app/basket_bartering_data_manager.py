@@ -59,6 +59,10 @@ class BasketBarteringDataManager(BaseBarteringDataManager, BasketBookServiceData
     def handle_unack_state(self, is_unack: bool, chore_snapshot: ChoreSnapshotBaseModel | ChoreSnapshot):
         self.plan_cache.set_unack(is_unack, chore_snapshot.chore_brief.security.sec_id,
                                    chore_snapshot.chore_brief.side)
+        if self.street_book is not None:
+            # chore state moved - managed chores of symbol need a look in next basket_book cycle
+            self.street_book.mark_managed_symbol_dirty(chore_snapshot.chore_brief.security.sec_id)
+        # else not required: executor not triggered yet - first cycle processes all managed symbols
 
     def handle_fx_symbol_overview_get_all_ws(self, fx_symbol_overview_: FxSymbolOverviewBaseModel, **kwargs):
         if fx_symbol_overview_.symbol in BasketCache.fx_symbol_overview_dict:
@@ -23,6 +23,7 @@ from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.bartering_link
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.basket_book.app.basket_bartering_data_manager import (
     BasketBarteringDataManager)
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.basket_book.app.basket_cache import BasketCache
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.basket_book.app.dirty_symbol_tracker import DirtySymbolTracker
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.phone_book.app.phone_book_service_helper import (
     get_symbol_side_key, get_usd_px, email_book_service_http_client)
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.street_book.app.pos_cache import PosCache, SecPosExtended
@@ -35,6 +36,7 @@ from Flux.CodeGenProjects.AddressBook.ProjectGroup.basket_book.app.basket_book_h
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.base_book import BaseBook
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_shared_memory_consumer import SymbolCacheContainer, SymbolCache
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.log_book.app.md_streaming_manager import MDStreamingManager
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.log_book.app.md_session_manager import MDSessionManager
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.phone_book.generated.ORMModel.email_book_service_model_imports import *
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.basket_book.generated.ORMModel.basket_book_service_model_imports import *
 from Flux.CodeGenProjects.AddressBook.ORMModel.street_book_n_post_book_n_basket_book_core_msgspec_model import *
@@ -79,15 +81,26 @@ class BasketBook(BaseBook):
         # processed new chore cache dict
         self.id_to_sec_pos_extended_dict: Dict[int, SecPosExtended] = {}
         self.managed_chores_by_symbol: Dict[str, List[NewChore]] = {}
+        # each cycle processes only changed (chore / md) or recheck-due symbols of managed_chores_by_symbol
+        self.dirty_symbol_tracker: DirtySymbolTracker = DirtySymbolTracker()
+        self.managed_symbol_recheck_sec: float = config_yaml_dict.get("managed_symbol_recheck_sec", 1.0)
         self.system_symbol_type: str = "ticker"
         self.algo_exchange: str = "TRADING_EXCHANGE"
         self.usd_fx = None
         self.basket_book_semaphore_path = "BO_sem"
         self.basket_book_semaphore = posix_ipc.Semaphore(self.basket_book_semaphore_path,
                                                              flags=posix_ipc.O_CREAT, initial_value=0)
-        self.md_streaming_mgr: MDStreamingManager = MDStreamingManager(CURRENT_PROJECT_DIR, be_host, be_port,
-                                                                       "basket_book",
-                                                                       self.basket_book_semaphore_path)
+        self.md_streaming_mgr: MDStreamingManager | MDSessionManager
+        if config_yaml_dict.get("use_md_session_manager"):
+            # symbols multiplexed on pool of long-lived md worker processes
+            self.md_streaming_mgr = MDSessionManager(
+                CURRENT_PROJECT_DIR, be_host, be_port, "basket_book", self.basket_book_semaphore_path,
+                worker_count=config_yaml_dict.get("md_session_worker_count", 4),
+                apply_batch_sec=config_yaml_dict.get("md_session_apply_batch_ms", 200) / 1000)
+        else:
+            # one md process per symbol
+            self.md_streaming_mgr = MDStreamingManager(CURRENT_PROJECT_DIR, be_host, be_port, "basket_book",
+                                                       self.basket_book_semaphore_path)
         self.md_streaming_mgr.static_data = self.plan_cache.static_data
         self.sys_symbol_to_md_trigger_time_dict: Dict[str, DateTime] = {}
         self.sys_symbol_to_md_retry_count: Dict[str, int] = {}
@@ -259,6 +272,14 @@ class BasketBook(BaseBook):
                 chore_list.append(in_chore_obj)
             else:
                 self.managed_chores_by_symbol[system_symbol] = [in_chore_obj]
+            self.dirty_symbol_tracker.mark_dirty(system_symbol)
+
+    def mark_managed_symbol_dirty(self, system_symbol: str):
+        """chore snapshot callbacks: get symbol processed in next cycle (if managed) and wake up run loop"""
+        if system_symbol in self.managed_chores_by_symbol:
+            self.dirty_symbol_tracker.mark_dirty(system_symbol)
+            self.basket_book_semaphore.release()
+        # else not required: symbol not managed
 
     def get_symbol_cache_cont(self, system_symbol: str, side: Side | None = None) -> SymbolCache | None:
         shared_memory_found = SymbolCacheContainer.check_if_shared_memory_exists(system_symbol)
@@ -1281,12 +1302,20 @@ class BasketBook(BaseBook):
         ord_delayed_compare_time = pendulum.DateTime.utcnow().subtract(seconds=60)
         chore_list: List[NewChore]
         with BasketBook.manage_chores_lock:
-            # Iterate over of copy of keys to allow safe modification during iteration
-            for sys_symbol in list(self.managed_chores_by_symbol.keys()):
+            self.dirty_symbol_tracker.mark_md_updated(self.managed_chores_by_symbol.keys(),
+                                                      SymbolCacheContainer.get_md_update_counter)
+            # only symbols with chore / md change or expired recheck deadline - rest are unchanged since their last
+            # cycle; ready set is a detached copy so safe modification of managed_chores_by_symbol is allowed
+            for sys_symbol in self.dirty_symbol_tracker.pop_ready_symbols():
                 chore_list = self.managed_chores_by_symbol.get(sys_symbol)
+                if chore_list is None:
+                    continue  # symbol already dropped from management
                 if not chore_list:
                     remove_sys_sym_n_type_list.append((sys_symbol, self.system_symbol_type))
                     continue  # nothing to do for this symbol
+                # periodic recheck even without chore / md change: bartering link state of posted chores (fills,
+                # closes) and md re-trigger are time driven - dropped symbols are discarded from tracker below
+                self.dirty_symbol_tracker.schedule(sys_symbol, self.managed_symbol_recheck_sec)
 
                 self.drop_dup_older_chores(chore_list)  # retain the latest change - drop all else
                 self.check_n_place_cancel_chore(chore_list)
@@ -1353,6 +1382,7 @@ class BasketBook(BaseBook):
                 self.md_streaming_mgr.force_stop_md_for_symbols(remove_sys_sym_n_type_list)
                 for sys_symbol, _ in remove_sys_sym_n_type_list:
                     self.managed_chores_by_symbol.pop(sys_symbol, None)
+                    self.dirty_symbol_tracker.discard(sys_symbol)
                     self.sys_symbol_to_md_trigger_time_dict.pop(sys_symbol, None)
                     self.sys_symbol_to_md_retry_count.pop(sys_symbol, None)
                     logging.debug(f"Cleaned up resources for symbol: {sys_symbol}")
@@ -1374,7 +1404,11 @@ class BasketBook(BaseBook):
 
     def run(self):
         while True:
-            self.basket_book_semaphore.acquire()
-            logging.debug("basket_book signaled")
+            try:
+                # wakes on chore / md release or at earliest symbol recheck deadline (blocks if none scheduled)
+                self.basket_book_semaphore.acquire(self.dirty_symbol_tracker.get_next_wait_sec())
+                logging.debug("basket_book signaled")
+            except posix_ipc.BusyError:
+                logging.debug("basket_book symbol recheck deadline reached")
 
             self.trigger_or_manage_algo_chores()
@@ -0,0 +1,78 @@
+# standard imports
+import heapq
+import time
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+
+class DirtySymbolTracker:
+    """
+    decides which managed symbols a BasketBook cycle must process: symbols marked dirty by chore / chore snapshot
+    callbacks, symbols whose md shm update_counter moved since last cycle and symbols whose recheck deadline
+    expired (deadline heap - periodic re-checks without full scans); thread safe, callbacks mark from other threads
+    """
+
+    def __init__(self):
+        self.lock: Lock = Lock()
+        self.dirty_symbol_set: Set[str] = set()
+        # (deadline monotonic secs, symbol) - lazy deletion: entry is live only if it matches symbol_to_deadline_dict
+        self.deadline_heap: List[Tuple[float, str]] = []
+        self.symbol_to_deadline_dict: Dict[str, float] = {}
+        self.symbol_to_md_update_counter_dict: Dict[str, int] = {}
+
+    def mark_dirty(self, symbol: str):
+        with self.lock:
+            self.dirty_symbol_set.add(symbol)
+
+    def mark_md_updated(self, symbol_iter: Iterable[str], get_md_update_counter: Callable[[str], int | None]):
+        """marks dirty every symbol whose update counter moved - or can't be read yet (shm not mapped)"""
+        with self.lock:
+            for symbol in symbol_iter:
+                md_update_counter = get_md_update_counter(symbol)
+                if md_update_counter is None or (
+                        self.symbol_to_md_update_counter_dict.get(symbol) != md_update_counter):
+                    self.dirty_symbol_set.add(symbol)
+                    if md_update_counter is not None:
+                        self.symbol_to_md_update_counter_dict[symbol] = md_update_counter
+                    # else not required: shm not mapped - nothing to remember
+                # else not required: no md change since last read
+
+    def schedule(self, symbol: str, delay_sec: float):
+        """sets recheck deadline of symbol, an earlier pending deadline is retained"""
+        deadline = time.monotonic() + delay_sec
+        with self.lock:
+            pending_deadline = self.symbol_to_deadline_dict.get(symbol)
+            if pending_deadline is None or deadline < pending_deadline:
+                self.symbol_to_deadline_dict[symbol] = deadline
+                heapq.heappush(self.deadline_heap, (deadline, symbol))
+            # else not required: earlier recheck already pending
+
+    def discard(self, symbol: str):
+        with self.lock:
+            self.dirty_symbol_set.discard(symbol)
+            self.symbol_to_deadline_dict.pop(symbol, None)
+            self.symbol_to_md_update_counter_dict.pop(symbol, None)
+
+    def pop_ready_symbols(self) -> Set[str]:
+        """returns and clears dirty symbols plus symbols with expired deadline"""
+        now = time.monotonic()
+        with self.lock:
+            ready_symbol_set = self.dirty_symbol_set
+            self.dirty_symbol_set = set()
+            while self.deadline_heap and self.deadline_heap[0][0] <= now:
+                deadline, symbol = heapq.heappop(self.deadline_heap)
+                if self.symbol_to_deadline_dict.get(symbol) == deadline:
+                    del self.symbol_to_deadline_dict[symbol]
+                    ready_symbol_set.add(symbol)
+                # else not required: stale entry - rescheduled earlier or discarded
+            return ready_symbol_set
+
+    def get_next_wait_sec(self) -> float | None:
+        """secs until earliest live deadline, None if nothing scheduled"""
+        with self.lock:
+            while self.deadline_heap:
+                deadline, symbol = self.deadline_heap[0]
+                if self.symbol_to_deadline_dict.get(symbol) == deadline:
+                    return max(deadline - time.monotonic(), 0.0)
+                heapq.heappop(self.deadline_heap)  # stale entry
+            return None
@@ -1,14 +1,50 @@
 # standard imports
 import asyncio
-from typing import Set
+import time
+from typing import Final, Any
+
+# 3rd party imports
+import polars as pl
 
 # project imports
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.dept_book.app.yahoo_finance_base import *
-from FluxPythonUtils.scripts.general_utility_functions import configure_logger
+from FluxPythonUtils.scripts.general_utility_functions import configure_logger, parse_to_int
+from Flux.PyCodeGenEngine.FluxCodeGenCore.df_bulk_post_client import DfBulkPostClient
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.dept_book.app.dept_book_service_helper import dashboard_service_http_client
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.dept_book.generated.ORMModel.dept_book_service_msgspec_model import *
 
 
+# yfinance history column -> BarData field
+HISTORY_TO_BAR_DATA_COLUMN_DICT: Final[Dict[str, str]] = {
+    "Open": "open", "High": "high", "Low": "low", "Close": "close", "Volume": "volume",
+    "Dividends": "dividends", "Stock Splits": "stock_splits"}
+
+
+def get_bar_data_df(history_df: Any, symbol: str, last_update_datetime: DateTime | None = None) -> pl.DataFrame:
+    """
+    column-wise BarData rows of history frame (pandas from yfinance, datetime index, or polars with timestamp
+    as first column), only rows newer than last_update_datetime - avoids repeating values in db when start
+    date is provided
+    """
+    if not isinstance(history_df, pl.DataFrame):
+        history_df = pl.from_pandas(history_df.reset_index())
+    # else not required: already polars
+    timestamp_column = history_df.columns[0]
+    if history_df.schema[timestamp_column].time_zone is None:
+        datetime_expr = pl.col(timestamp_column).dt.replace_time_zone("UTC")
+    else:
+        datetime_expr = pl.col(timestamp_column).dt.convert_time_zone("UTC")
+    bar_data_df = history_df.select(
+        pl.lit(symbol).alias("symbol"), datetime_expr.alias("datetime"),
+        *[pl.col(history_column).alias(bar_data_field)
+          for history_column, bar_data_field in HISTORY_TO_BAR_DATA_COLUMN_DICT.items()])
+    if last_update_datetime is not None:
+        bar_data_df = bar_data_df.filter(
+            pl.col("datetime").dt.epoch("ms") > int(last_update_datetime.timestamp() * 1000))
+    # else not required: all rows are new
+    return bar_data_df.with_columns(pl.col("datetime").dt.strftime("%Y-%m-%dT%H:%M:%S%.3f+00:00"))
+
+
 # This class is used to create objects that represent the concept of getting historical data.
 class BarDataLoader(YahooFinanceBase):
     """
@@ -26,82 +62,68 @@ class BarDataLoader(YahooFinanceBase):
                 for bar_data_symbol_n_datetime in self.bar_data_symbol_n_last_update_date_time_list[0].symbol_n_last_update_datetime
             }
 
-    async def _create_update_bar_data_from_source(self, ticker: yf.Ticker, symbol: str) -> None:
+    async def _create_update_bar_data_from_source(self, ticker: yf.Ticker, symbol: str,
+                                                  df_bulk_post_client: DfBulkPostClient) -> None:
         interval = config_yaml_dict["bar_data_fetch_interval"]
         period = config_yaml_dict["bar_data_fetch_period"]
+        last_update_datetime: DateTime | None = None
+        # yfinance calls are blocking - run in threads so symbols overlap
         if symbol in self.symbol_to_last_update_datetime_dict:
-            start_datetime = self.symbol_to_last_update_datetime_dict[symbol]
-            start_date = pendulum.parse(str(start_datetime)).add(days=1)
-            start_date_str = start_date.format("YYYY-MM-DD")
-            symbol_history_df: pl.Dataframe = ticker.history(period=period, interval=interval, start=start_date_str)
+            last_update_datetime = pendulum.parse(str(self.symbol_to_last_update_datetime_dict[symbol]))
+            start_date_str = last_update_datetime.add(days=1).format("YYYY-MM-DD")
+            symbol_history_df = await asyncio.to_thread(ticker.history, period=period, interval=interval,
+                                                        start=start_date_str)
         else:
-            symbol_history_df: pl.Dataframe = ticker.history(period=period, interval=interval)
+            symbol_history_df = await asyncio.to_thread(ticker.history, period=period, interval=interval)
         if not symbol_history_df.empty:
-            bar_data_list = []
-            for timestamp, row in symbol_history_df.iterrows():
-                if symbol in self.symbol_to_last_update_datetime_dict:
-                    df_datetime = pendulum.parse(str(timestamp))
-                    start_datetime = self.symbol_to_last_update_datetime_dict[symbol]
-                    if not (df_datetime > start_datetime):
-                        # to avoid any repeating value in db when start date is provided
-                        continue
-                bar_data = BarDataBaseModel(
-                    symbol=symbol,
-                    datetime=pendulum.parse(str(timestamp)),
-                    open=row['Open'],
-                    high=row['High'],
-                    low=row['Low'],
-                    close=row['Close'],
-                    volume=row['Volume'],
-                    dividends=row['Dividends'],
-                    stock_splits=row['Stock Splits'])
-                bar_data_list.append(bar_data)
-            dashboard_service_http_client.create_all_bar_data_client(bar_data_list)
+            bar_data_df = get_bar_data_df(symbol_history_df, symbol, last_update_datetime)
+            if len(bar_data_df):
+                await df_bulk_post_client.post_df(bar_data_df)
+            # else not required: no bars newer than last update
         else:
             add_symbol_to_invalid_cache(symbol)
 
-    # Fetches the historical data.
-    async def create_update_bar_data_from_source(self) -> None:
-        """
-        Fetch historical data for each symbol and store it in the market data service.
-        """
-        task_list: List[asyncio.Task] = []
-        for symbol in self.symbols:
-            complete_symbol = f"{symbol}.SI"
+    async def _create_update_symbol_bar_data_from_source(self, symbol: str, symbol_semaphore: asyncio.Semaphore,
+                                                         df_bulk_post_client: DfBulkPostClient) -> None:
+        complete_symbol = f"{symbol}.SI"
+        async with symbol_semaphore:
             # checking if symbol is valid
-            if is_valid_ticker(complete_symbol):
+            if await asyncio.to_thread(is_valid_ticker, complete_symbol):
                 ticker: yf.Ticker = yf.Ticker(complete_symbol)
-                task: asyncio.Task = \
-                    asyncio.create_task(self._create_update_bar_data_from_source(ticker, complete_symbol),
-                                        name=complete_symbol)
-                task_list.append(task)
+                await self._create_update_bar_data_from_source(ticker, complete_symbol, df_bulk_post_client)
             else:
                 # else putting in another csv cache file
                 add_symbol_to_invalid_cache(complete_symbol)
                 logging.debug(f"invalid symbol - {complete_symbol}, added symbol to invalid symbol's cache csv")
 
-        pending_tasks: Set[asyncio.Task] = set()
-        completed_tasks: Set[asyncio.Task] = set()
-        if task_list:
-            try:
-                # wait doesn't raise TimeoutError! Futures that aren't done when timeout occurs are returned in 2nd set
-                completed_tasks, pending_tasks = await asyncio.wait(task_list, return_when=asyncio.ALL_COMPLETED,
-                                                                    timeout=None)
-            except Exception as e:
-                logging.exception(f"await asyncio.wait raised exception: {e}")
-
-        while completed_tasks:
-            completed_task = None
-            try:
-                completed_task = completed_tasks.pop()
-            except Exception as e:
-                idx = int(completed_task.get_name())
-                logging.exception(f"create_update_bar_data_from_source failed for task {task_list[idx]} "
-                                  f"with exception: {e}")
-
-        if pending_tasks:
-            logging.error("Received timed out pending tasks in create_update_bar_data_from_source, dropping them. "
-                          f"PendingTasks: {[pending_task for pending_task in pending_tasks]}")
+    # Fetches the historical data.
+    async def create_update_bar_data_from_source(self) -> None:
+        """
+        Fetch historical data for each symbol and store it in the market data service.
+        At most bar_data_loader_max_concurrency symbols are fetched and posted at a time.
+        """
+        max_concurrency: int = parse_to_int(config_yaml_dict.get("bar_data_loader_max_concurrency") or 8)
+        chunk_row_count: int = parse_to_int(config_yaml_dict.get("bar_data_loader_chunk_row_count") or
+                                            DfBulkPostClient.default_chunk_row_count)
+        symbol_semaphore = asyncio.Semaphore(max_concurrency)
+        start_time = time.perf_counter()
+        async with DfBulkPostClient(dashboard_service_http_client.create_all_bar_data_client_url, max_concurrency,
+                                    chunk_row_count) as df_bulk_post_client:
+            task_list: List[asyncio.Task] = [
+                asyncio.create_task(self._create_update_symbol_bar_data_from_source(symbol, symbol_semaphore,
+                                                                                    df_bulk_post_client),
+                                    name=symbol)
+                for symbol in self.symbols]
+            result_list = await asyncio.gather(*task_list, return_exceptions=True)
+            for task, result in zip(task_list, result_list):
+                if isinstance(result, Exception):
+                    logging.exception(f"create_update_bar_data_from_source failed for symbol {task.get_name()} "
+                                      f"with exception: {result}", exc_info=result)
+                # else not required: symbol loaded
+            elapsed_secs = time.perf_counter() - start_time
+            logging.info(f"bar data loader posted {df_bulk_post_client.posted_row_count} rows of {len(task_list)} "
+                         f"symbols in {elapsed_secs:.3f} secs "
+                         f"({df_bulk_post_client.posted_row_count / max(elapsed_secs, 1e-9):,.0f} rows/sec)")
 
 
 if __name__ == "__main__":
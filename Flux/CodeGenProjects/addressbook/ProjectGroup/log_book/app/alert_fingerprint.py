@@ -0,0 +1,53 @@
+# standard imports
+import hashlib
+import re
+from functools import lru_cache
+from typing import Final
+
+# check-the-file suffix carries only the log location - never part of alert identity
+ALERT_FILE_REF_MARKER: Final[str] = "...check the file:"
+# volatile token passes, applied in this order (each pass sees output of prior one - fingerprints depend on it):
+# object hex memory paths, quoted model_object_id (str type id) followed by space, numeric digits with sign
+ALERT_HEX_PATH_REGEX: Final[re.Pattern] = re.compile(r"0x[a-f0-9]*")
+ALERT_QUOTED_OBJ_ID_REGEX: Final[re.Pattern] = re.compile(r"'[a-fA-F0-9]{24}' ")
+ALERT_SIGNED_NUM_REGEX: Final[re.Pattern] = re.compile(r"[-0-9]+")  # same removal as -?[0-9]* minus empty matches
+ALERT_FINGERPRINT_DIGEST_SIZE: Final[int] = 8
+
+
+def normalize_alert_brief(alert_brief: str) -> str:
+    cleaned_alert_brief = ALERT_HEX_PATH_REGEX.sub("", alert_brief)
+    cleaned_alert_brief = ALERT_QUOTED_OBJ_ID_REGEX.sub("", cleaned_alert_brief)
+    cleaned_alert_brief = ALERT_SIGNED_NUM_REGEX.sub("", cleaned_alert_brief)
+    # file ref split last: digits/hex removal may shape the marker
+    return cleaned_alert_brief.split(ALERT_FILE_REF_MARKER)[0]
+
+
+def get_fingerprint(key_str: str) -> int:
+    # stable across processes (unlike hash()): test/clients compute keys sent to verify queries
+    return int.from_bytes(hashlib.blake2b(key_str.encode(), digest_size=ALERT_FINGERPRINT_DIGEST_SIZE).digest(),
+                          "big")
+
+
+class AlertFingerprinter:
+    """
+    computes compact int dedup key of alert: normalized alert_brief fingerprint (bounded LRU keyed by raw
+    alert_brief - storms repeat same briefs) combined with severity, source file and line num
+    """
+
+    def __init__(self, brief_cache_size: int = 100_000):
+        self.get_brief_fingerprint = lru_cache(maxsize=brief_cache_size)(self._get_brief_fingerprint)
+
+    @staticmethod
+    def _get_brief_fingerprint(alert_brief: str) -> int:
+        return get_fingerprint(normalize_alert_brief(alert_brief))
+
+    def get_alert_fingerprint(self, severity: str, alert_brief: str, source_file_path: str | None = None,
+                              line_num: int | None = None) -> int:
+        key_str = f"{severity}@#@{self.get_brief_fingerprint(alert_brief)}"
+        if source_file_path:
+            key_str += f"@#@{source_file_path}"
+        # else not required: alert without source file
+        if line_num:
+            key_str += f"@#@{line_num}"
+        # else not required: alert without line num
+        return get_fingerprint(key_str)
@@ -0,0 +1,98 @@
+# AlertFingerprintBenchmark.py
+# alert dedup key throughput (alerts/sec) of former 3 pass re.sub clean + str key vs AlertFingerprinter, on a
+# recorded alert_brief corpus (--corpus_file: one alert_brief per line, e.g. dumped from ContactAlert collection)
+# or on a synthetic error storm corpus - few distinct alerts repeated with varying ids, addresses and numbers
+
+import argparse
+import logging
+import random
+import re
+import time
+from typing import List, Tuple
+
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.log_book.app.alert_fingerprint import (
+    AlertFingerprinter, normalize_alert_brief)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+ALERT_BRIEF_TEMPLATE_LIST: List[str] = [
+    "update_all_contact_limits failed with exception: <pymongo.errors.ServerSelectionTimeoutError object at {hex}> "
+    "...check the file: {file}:{line}",
+    "Unexpected: chore_snapshot not found for chore_id: 'O{num}-{num}' of symbol: Type1_Sec_{num}",
+    "Received fill_journal for unknown chore_id: '{obj_id}' qty: {num}, px: {px}",
+    "blocked generated chore, breach potential max_open_baskets: {num} > {num}, symbol: SYM_{num}",
+    "Tail executor timeout for {file}, no activity since {num} secs, restarting tail at offset {num}",
+    "mobile_book shm read failed: <MobileBookContainer at {hex}> last_update_seq_num: {num}",
+]
+
+
+def get_synthetic_alert_corpus(alert_count: int) -> List[Tuple[str, str, int]]:
+    corpus: List[Tuple[str, str, int]] = []
+    for _ in range(alert_count):
+        template_index = random.randrange(len(ALERT_BRIEF_TEMPLATE_LIST))
+        file = f"street_book_{template_index}.py"
+        alert_brief = ALERT_BRIEF_TEMPLATE_LIST[template_index].format(
+            hex=hex(random.getrandbits(48)), obj_id=f"{random.getrandbits(96):024x}", num=random.randint(-99, 99999),
+            px=round(random.uniform(1, 500), 2), file=file, line=random.randint(1, 2000))
+        corpus.append((alert_brief, file, 100 + template_index))
+    return corpus
+
+
+def get_recorded_alert_corpus(corpus_file: str) -> List[Tuple[str, str, int]]:
+    with open(corpus_file) as fl:
+        return [(alert_brief.rstrip("\n"), "", 0) for alert_brief in fl if alert_brief.strip()]
+
+
+def legacy_get_alert_cache_key(severity: str, alert_brief: str, source_file_path: str, line_num: int) -> str:
+    cleaned_alert_str: str = re.sub(r"0x[a-f0-9]*", "", alert_brief)
+    cleaned_alert_str = re.sub(r"\'[a-fA-F0-9]{24}\' ", "", cleaned_alert_str)
+    cleaned_alert_str = re.sub(r"-?[0-9]*", "", cleaned_alert_str)
+    cleaned_alert_str = cleaned_alert_str.split("...check the file:")[0]
+    alert_key = f"{severity}@#@{cleaned_alert_str}"
+    if source_file_path:
+        alert_key += f"@#@{source_file_path}"
+    if line_num:
+        alert_key += f"@#@{line_num}"
+    return alert_key
+
+
+def run(corpus: List[Tuple[str, str, int]], brief_cache_size: int) -> None:
+    severity = "Severity_ERROR"
+    # dedup dicts as contact_alerts_cache_dict
+    start_time = time.perf_counter()
+    legacy_cache_dict = {}
+    for alert_brief, source_file_path, line_num in corpus:
+        legacy_cache_dict.setdefault(legacy_get_alert_cache_key(severity, alert_brief, source_file_path, line_num),
+                                     alert_brief)
+    legacy_sec = time.perf_counter() - start_time
+
+    alert_fingerprinter = AlertFingerprinter(brief_cache_size)
+    start_time = time.perf_counter()
+    fingerprint_cache_dict = {}
+    for alert_brief, source_file_path, line_num in corpus:
+        fingerprint_cache_dict.setdefault(
+            alert_fingerprinter.get_alert_fingerprint(severity, alert_brief, source_file_path, line_num), alert_brief)
+    fingerprint_sec = time.perf_counter() - start_time
+
+    mismatch_count = sum(1 for alert_brief, _, _ in corpus
+                         if normalize_alert_brief(alert_brief) !=
+                         legacy_get_alert_cache_key("", alert_brief, "", 0).split("@#@", 1)[1])
+    cache_info = alert_fingerprinter.get_brief_fingerprint.cache_info()
+    logging.info(f"{len(corpus):,} alerts, distinct keys: legacy {len(legacy_cache_dict)}, "
+                 f"fingerprint {len(fingerprint_cache_dict)}, normalization mismatches: {mismatch_count}")
+    logging.info(f"legacy:      {len(corpus) / legacy_sec:,.0f} alerts/s")
+    logging.info(f"fingerprint: {len(corpus) / fingerprint_sec:,.0f} alerts/s, "
+                 f"speedup: {legacy_sec / fingerprint_sec:.2f}x, brief lru hits: {cache_info.hits}, "
+                 f"misses: {cache_info.misses}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark alert dedup key computation.")
+    parser.add_argument("--corpus_file", default=None, help="Recorded alert_brief per line; default synthetic.")
+    parser.add_argument("--alert_count", type=int, default=200_000, help="Synthetic corpus size.")
+    parser.add_argument("--brief_cache_size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    alert_corpus = (get_recorded_alert_corpus(args.corpus_file) if args.corpus_file else
+                    get_synthetic_alert_corpus(args.alert_count))
+    run(alert_corpus, args.brief_cache_size)
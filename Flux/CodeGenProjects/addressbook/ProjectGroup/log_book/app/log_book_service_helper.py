@@ -8,6 +8,8 @@ from FluxPythonUtils.scripts.general_utility_functions import (
     YAMLConfigurationManager, parse_to_int, is_first_param_list_type)
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.log_book.generated.FastApi.log_book_service_http_client import (
     LogBookServiceHttpClient)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.log_book.app.alert_fingerprint import (
+    AlertFingerprinter, normalize_alert_brief)
 
 # standard imports
 import datetime
@@ -38,6 +40,8 @@ if config_yaml_dict.get("use_view_clients"):
 else:
     log_book_service_http_client = log_book_service_http_main_client
 
+alert_fingerprinter = AlertFingerprinter(parse_to_int(config_yaml_dict.get("alert_fingerprint_cache_size", 100_000)))
+
 datetime_str = datetime.datetime.now().strftime("%Y%m%d")
 contact_alert_fail_log = f"contact_alert_fail_logs_{datetime_str}.log"
 simulator_contact_alert_fail_log = f"simulator_contact_alert_fail_logs_{datetime_str}.log"
@@ -119,7 +123,7 @@ def is_view_log_book_service_up(ignore_error: bool = False) -> bool:
         return False
 
 
-def init_service(contact_alerts_cache: Dict[str, ContactAlertBaseModel]) -> bool:
+def init_service(contact_alerts_cache: Dict[int, ContactAlertBaseModel]) -> bool:
     if is_log_book_service_up(ignore_error=True):
         try:
             # block for task to finish
@@ -593,34 +597,20 @@ async def update_alert_caches(alerts_cache_cont: AlertsCacheCont, alert_obj: Pla
 
 
 def clean_alert_str(alert_str: str) -> str:
-    # remove object hex memory path
-    cleaned_alert_str: str = re.sub(r"0x[a-f0-9]*", "", alert_str)
-    # remove any model_object_id (str type id)
-    cleaned_alert_str = re.sub(r"\'[a-fA-F0-9]{24}\' ", "", cleaned_alert_str)
-    # remove all numeric digits
-    cleaned_alert_str = re.sub(r"-?[0-9]*", "", cleaned_alert_str)
-    cleaned_alert_str = cleaned_alert_str.split("...check the file:")[0]
-    return cleaned_alert_str
+    # removes object hex memory paths, model_object_id (str type id), numeric digits and check-the-file suffix
+    return normalize_alert_brief(alert_str)
 
 
 def get_alert_cache_key(severity: Severity, alert_brief: str, component_path: str | None = None,
-                        source_file_path: str | None = None, line_num: int | None = None) -> str:
-    # updated_alert_brief: str = alert_brief.split(":", 3)[-1].strip()
-    updated_alert_brief = clean_alert_str(alert_str=alert_brief)
-    alert_key = f"{severity}@#@{updated_alert_brief}"
-    # if component_path:
-    #     alert_key += f"@#@{component_path}"
-    if source_file_path:
-        alert_key += f"@#@{source_file_path}"
-    if line_num:
-        alert_key += f"@#@{line_num}"
-    return alert_key
+                        source_file_path: str | None = None, line_num: int | None = None) -> int:
+    # component_path is not part of key
+    return alert_fingerprinter.get_alert_fingerprint(severity, alert_brief, source_file_path, line_num)
 
 
 def create_or_update_alert(create_alert_list: List[PlanAlert | ContactAlert],
                            upload_alert_list: List[PlanAlert | ContactAlert],
-                           alerts_cache_dict: Dict[str, PlanAlertBaseModel | PlanAlert] |
-                                               Dict[str, PlanAlertBaseModel | PlanAlert] | None,
+                           alerts_cache_dict: Dict[int, PlanAlertBaseModel | PlanAlert] |
+                                               Dict[int, PlanAlertBaseModel | PlanAlert] | None,
                            plan_alert_type: Type[PlanAlert] | Type[PlanAlertBaseModel],
                            contact_alert_type: Type[ContactAlert] | Type[ContactAlertBaseModel],
                            severity: Severity, alert_brief: str, plan_id: int | None = None,
@@ -693,7 +683,7 @@ def create_or_update_alert(create_alert_list: List[PlanAlert | ContactAlert],
 
 
 def update_plan_alert_cache(
-        plan_id: int, plan_alert_cache_by_plan_id_dict: Dict[int, Dict[str, PlanAlertBaseModel | PlanAlert]],
+        plan_id: int, plan_alert_cache_by_plan_id_dict: Dict[int, Dict[int, PlanAlertBaseModel | PlanAlert]],
         filter_query_callable: Callable[..., Any]) -> None:
     if plan_id not in plan_alert_cache_by_plan_id_dict:
         try:
@@ -140,10 +140,10 @@ class LogBookServiceRoutesCallbackBaseNativeOverride(LogBookServiceRoutesCallbac
         self.loaded_unload_plan_list_async_rlock: AsyncRLock = AsyncRLock()
         self.loaded_plan_id_list: List[int] = []
         self.loaded_plan_id_by_symbol_side_dict: Dict[str, int] = {}
-        self.plan_alert_cache_dict_by_plan_id_dict: Dict[int, Dict[str, PlanAlert]] = {}
+        self.plan_alert_cache_dict_by_plan_id_dict: Dict[int, Dict[int, PlanAlert]] = {}
         self.contact_alerts_cache_dict_async_rlock: AsyncRLock = AsyncRLock()
         self.contact_alerts_id_to_obj_cache_dict: Dict[int, ContactAlert] = {}
-        self.contact_alerts_cache_dict: Dict[str, ContactAlert] = {}
+        self.contact_alerts_cache_dict: Dict[int, ContactAlert] = {}
         self.contact_alert_queue: Queue = Queue()
         self.plan_alert_queue: Queue = Queue()
         # timeout event
@@ -1202,7 +1202,8 @@ class LogBookServiceRoutesCallbackBaseNativeOverride(LogBookServiceRoutesCallbac
         is_key_present = False
         async with self.loaded_unload_plan_list_async_rlock:
             plan_id = parse_to_int(payload.get("plan_id"))
-            plan_cache_key = payload.get("plan_cache_key")
+            # alert cache keys are int fingerprints - query param arrives as str
+            plan_cache_key = parse_to_int(payload.get("plan_cache_key"))
             plan_alert_cache_dict = self.plan_alert_cache_dict_by_plan_id_dict.get(plan_id)
             if plan_alert_cache_dict is not None:
                 is_key_present = plan_cache_key in plan_alert_cache_dict
@@ -1212,7 +1213,8 @@ class LogBookServiceRoutesCallbackBaseNativeOverride(LogBookServiceRoutesCallbac
             self, contact_alert_cache_dict_class_type: Type[ContactAlertCacheDict], payload: Dict[str, Any]):
         # This query uses local cache so to avoid call from view server this query is kept as PATCH type
         async with self.contact_alerts_cache_dict_async_rlock:
-            plan_cache_key = payload.get("plan_cache_key")
+            # alert cache keys are int fingerprints - query param arrives as str
+            plan_cache_key = parse_to_int(payload.get("plan_cache_key"))
             is_key_present = plan_cache_key in self.contact_alerts_cache_dict
             return [ContactAlertCacheDict(is_key_present=is_key_present)]
 
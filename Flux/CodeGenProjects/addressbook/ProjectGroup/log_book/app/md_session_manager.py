@@ -0,0 +1,411 @@
+import logging
+import multiprocessing
+import os
+import stat
+import subprocess
+import time
+from enum import auto
+from multiprocessing.connection import Connection, wait
+from pathlib import PurePath
+from threading import Thread, Lock
+from typing import Dict, List, Tuple, Final, Any, Set, Type
+
+from fastapi_restful.enums import StrEnum
+
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.static_data import SecurityRecordManager
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.phone_book.app.phone_book_service_helper import (
+    MDShellEnvData, create_md_shell_script, create_stop_md_script)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.generated.ORMModel.mobile_book_service_model_imports import SymbolInterestsBaseModel
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_service_helper import mobile_book_service_http_client
+
+spawn: multiprocessing.context.SpawnContext = multiprocessing.get_context("spawn")
+
+
+class MDSessionCmdType(StrEnum):
+    SUBSCRIBE = auto()
+    UNSUBSCRIBE = auto()
+    FORCE_UNSUBSCRIBE = auto()  # relaunches worker md process even if symbol set is unchanged (md restart)
+    EXIT = auto()
+
+
+class MDSessionWorker:
+    """
+    long-lived md worker process: owns one md process streaming all its symbols (SUBSCRIPTION_DATA of md shell
+    script), applies subscribe / unsubscribe commands received over control pipe - commands arriving within
+    apply_batch_sec are coalesced into one md process relaunch, each command is acked once applied
+    """
+
+    def __init__(self, worker_index: int, conn: Connection, scripts_dir: PurePath, host: str, port: int,
+                 db_name: str, project_name: str, apply_batch_sec: float):
+        self.worker_index: Final[int] = worker_index
+        self.conn: Connection = conn
+        self.run_md_file_path: PurePath = scripts_dir / f"md_worker_{worker_index}_so.sh"
+        self.stop_md_file_path: PurePath = scripts_dir / f"stop_md_worker_{worker_index}_so.sh"
+        self.host: str = host
+        self.port: int = port
+        self.db_name: str = db_name
+        self.project_name: str = project_name
+        self.apply_batch_sec: float = apply_batch_sec
+        self.symbol_to_sec_id_source_dict: Dict[str, str] = {}
+        self.exch_code: str | None = None
+        self.md_process: subprocess.Popen | None = None
+
+    @classmethod
+    def run(cls, *args):
+        cls(*args).run_loop()
+
+    def run_loop(self):
+        if os.path.exists(self.stop_md_file_path):
+            # md process of this worker slot may have outlived a prior crashed session
+            subprocess.run([f"{self.stop_md_file_path}"])
+        # else not required: first session on this host
+        while True:
+            cmd_list: List[Tuple[int, MDSessionCmdType, str | None, str | None, str | None]] = [self.conn.recv()]
+            while self.conn.poll(self.apply_batch_sec):
+                cmd_list.append(self.conn.recv())
+            is_exit = any(cmd[1] == MDSessionCmdType.EXIT for cmd in cmd_list)
+            err_str_: str | None = None
+            try:
+                if is_exit:
+                    self.stop_md_process()
+                else:
+                    self.apply_cmd_list(cmd_list)
+            except Exception as e:
+                err_str_ = f"md worker {self.worker_index} failed to apply {len(cmd_list)} cmds, exception: {e}"
+                logging.exception(err_str_)
+            for cmd_id, *_ in cmd_list:
+                self.conn.send((cmd_id, err_str_))
+            if is_exit:
+                return
+            # else not required: keep serving commands
+
+    def apply_cmd_list(self, cmd_list: List[Tuple[int, MDSessionCmdType, str | None, str | None, str | None]]):
+        prior_symbol_set = set(self.symbol_to_sec_id_source_dict)
+        is_force_relaunch = False
+        for _, cmd_type, symbol, sec_id_source, exch_code in cmd_list:
+            if cmd_type == MDSessionCmdType.SUBSCRIBE:
+                self.symbol_to_sec_id_source_dict[symbol] = sec_id_source
+                self.exch_code = exch_code
+            elif cmd_type in (MDSessionCmdType.UNSUBSCRIBE, MDSessionCmdType.FORCE_UNSUBSCRIBE):
+                self.symbol_to_sec_id_source_dict.pop(symbol, None)
+                is_force_relaunch = is_force_relaunch or cmd_type == MDSessionCmdType.FORCE_UNSUBSCRIBE
+            # else not required: exit handled by caller
+        if set(self.symbol_to_sec_id_source_dict) == prior_symbol_set and not is_force_relaunch:
+            return  # net no-op batch, e.g. subscribe + unsubscribe of same symbol
+        self.stop_md_process()
+        if self.symbol_to_sec_id_source_dict:
+            self.start_md_process()
+        # else not required: no symbol left on this worker
+
+    def start_md_process(self):
+        subscription_data = [(symbol, str(sec_id_source))
+                             for symbol, sec_id_source in self.symbol_to_sec_id_source_dict.items()]
+        md_shell_env_data: MDShellEnvData = (
+            MDShellEnvData(subscription_data=subscription_data, host=self.host, port=self.port,
+                           db_name=self.db_name, exch_code=self.exch_code, project_name=self.project_name))
+        create_md_shell_script(md_shell_env_data, str(self.run_md_file_path), "SO_CONTINUE",
+                               instance_id=f"md_worker_{self.worker_index}")
+        os.chmod(self.run_md_file_path, stat.S_IRWXU)
+        create_stop_md_script(running_process_name=str(self.run_md_file_path),
+                              generation_stop_file_path=str(self.stop_md_file_path))
+        os.chmod(self.stop_md_file_path, stat.S_IRWXU)
+        self.md_process = subprocess.Popen([f"{self.run_md_file_path}"])
+        logging.info(f"md worker {self.worker_index} started md process for {len(subscription_data)} symbols;;;"
+                     f"{subscription_data=}")
+
+    def stop_md_process(self):
+        if self.md_process is None:
+            return
+        # stop script kills md process tree of run script (pgrep on script path) - blocking here only stalls this
+        # worker, never the caller
+        subprocess.run([f"{self.stop_md_file_path}"])
+        if self.md_process.poll() is None:
+            self.md_process.wait()
+        # else - process already terminated
+        self.md_process = None
+
+
+class MDSessionWorkerHandle:
+    def __init__(self, worker_index: int, process: multiprocessing.Process, conn: Connection):
+        self.worker_index: Final[int] = worker_index
+        self.process: multiprocessing.Process = process
+        self.conn: Connection = conn
+        self.symbol_set: Set[str] = set()
+        self.exch_code: str | None = None
+
+
+class MDSessionManager:
+    """
+    drop-in for MDStreamingManager: md subscriptions are multiplexed on pool of worker_count long-lived
+    MDSessionWorker processes instead of one md process (and 2 shell scripts) per symbol; a new symbol goes to
+    least loaded worker of its exchange (md process streams one exchange code), calls return once command is sent
+    and acks are consumed by reader thread which keeps subscribe latency metrics
+    """
+    md_session_worker_type: Type[MDSessionWorker] = MDSessionWorker
+
+    def __init__(self, CURRENT_PROJECT_DIR: PurePath, host: str, port: int,
+                 db_name: str, consumer_semaphore_path: str, worker_count: int = 4, apply_batch_sec: float = 0.2,
+                 project_name: str = "basket_book"):
+        self.static_data: SecurityRecordManager | None = None
+        self.CURRENT_PROJECT_DIR: PurePath = CURRENT_PROJECT_DIR
+        self.host = host
+        self.port = port
+        self.db_name: Final[str] = db_name
+        self.consumer_semaphore_path = consumer_semaphore_path
+        self.worker_count: int = worker_count
+        self.apply_batch_sec: float = apply_batch_sec
+        self.project_name: str = project_name
+        self.lock: Lock = Lock()
+        self.worker_handle_list: List[MDSessionWorkerHandle] = []
+        self.symbol_to_worker_handle_dict: Dict[str, MDSessionWorkerHandle] = {}
+        self.symbol_to_sec_id_source_dict: Dict[str, Any] = {}
+        # increment on MD trigger request (0->1 real subscribe) and decrement on MD stop request (1->0 real stop)
+        self.symbol_to_md_request_counter_dict: Dict[str, int] = {}
+        self.next_cmd_id: int = 0
+        self.cmd_id_to_sent_cmd_dict: Dict[int, Tuple[float, MDSessionCmdType, str, MDSessionWorkerHandle]] = {}
+        # symbols whose unsubscribe is not acked yet: (worker handle, cmd id) - resubscribe goes to same worker so
+        # two md processes never write symbol's shm at once (worker applies its cmds in order)
+        self.symbol_to_unsubscribing_worker_n_cmd_id_dict: Dict[str, Tuple[MDSessionWorkerHandle, int]] = {}
+        # metrics
+        self.subscribe_count: int = 0
+        self.subscribe_latency_total_sec: float = 0.0
+        self.subscribe_latency_max_sec: float = 0.0
+        self.ack_reader_thread: Thread | None = None
+
+    def _start_worker(self, worker_index: int) -> MDSessionWorkerHandle:
+        parent_conn, child_conn = spawn.Pipe()
+        process = spawn.Process(target=self.md_session_worker_type.run, name=f"md_session_worker_{worker_index}", daemon=True,
+                                args=(worker_index, child_conn, self.CURRENT_PROJECT_DIR / "scripts", self.host,
+                                      self.port, self.db_name, self.project_name, self.apply_batch_sec))
+        process.start()
+        # worker owns child end now - parent copy kept open would hide worker exit (no EOFError on parent_conn)
+        child_conn.close()
+        return MDSessionWorkerHandle(worker_index, process, parent_conn)
+
+    def _start_workers_if_not_started(self):
+        if self.worker_handle_list:
+            return
+        # else not required: first use - start pool
+        self.worker_handle_list = [self._start_worker(worker_index) for worker_index in range(self.worker_count)]
+        self.ack_reader_thread = Thread(target=self._read_acks, name="md_session_ack_reader", daemon=True)
+        self.ack_reader_thread.start()
+
+    def _send_cmd(self, worker_handle: MDSessionWorkerHandle, cmd_type: MDSessionCmdType, symbol: str | None,
+                  sec_id_source: str | None = None, exch_code: str | None = None):
+        self.next_cmd_id += 1
+        self.cmd_id_to_sent_cmd_dict[self.next_cmd_id] = (time.perf_counter(), cmd_type, symbol, worker_handle)
+        try:
+            worker_handle.conn.send((self.next_cmd_id, cmd_type, symbol, sec_id_source, exch_code))
+        except OSError as e:
+            # worker died - ack reader restarts it, replaying its symbol set and pending unsubscribes
+            logging.error(f"md worker {worker_handle.worker_index} unreachable, {cmd_type} of {symbol=} deferred to "
+                          f"its restart;;;exception: {e}")
+
+    def _read_acks(self):
+        while True:
+            with self.lock:
+                conn_to_worker_handle_dict = {worker_handle.conn: worker_handle
+                                              for worker_handle in self.worker_handle_list}
+            ready_conn_list = wait(list(conn_to_worker_handle_dict), timeout=1)
+            for conn, worker_handle in conn_to_worker_handle_dict.items():
+                if conn not in ready_conn_list and worker_handle.process.exitcode is not None and not conn.poll():
+                    # worker died without its pipe reporting EOF yet
+                    self._restart_worker(worker_handle)
+                # else not required: worker alive or its pending acks / EOF are read below
+            for conn in ready_conn_list:
+                worker_handle = conn_to_worker_handle_dict[conn]
+                try:
+                    cmd_id, err_str_ = conn.recv()
+                except (EOFError, OSError):
+                    self._restart_worker(worker_handle)
+                    continue
+                is_deregister_required = False
+                with self.lock:
+                    sent_time, cmd_type, symbol, _ = self.cmd_id_to_sent_cmd_dict.pop(cmd_id, (None, None, None, None))
+                    if sent_time is None:
+                        continue  # ack of cmd sent to a restarted worker
+                    latency_sec = time.perf_counter() - sent_time
+                    if cmd_type in (MDSessionCmdType.UNSUBSCRIBE, MDSessionCmdType.FORCE_UNSUBSCRIBE):
+                        unsubscribing_worker_n_cmd_id = self.symbol_to_unsubscribing_worker_n_cmd_id_dict.get(symbol)
+                        if unsubscribing_worker_n_cmd_id is not None and unsubscribing_worker_n_cmd_id[1] == cmd_id:
+                            # md process of worker no longer streams symbol - free to move, drop its interest
+                            del self.symbol_to_unsubscribing_worker_n_cmd_id_dict[symbol]
+                            is_deregister_required = True
+                        # else not required: symbol resubscribed (interest kept) or unsubscribed again since
+                    # else not required: not an unsubscribe ack
+                    if err_str_ is not None:
+                        logging.error(f"md worker {worker_handle.worker_index} failed {cmd_type} of {symbol=}, "
+                                      f"after {latency_sec:.3f} sec;;;{err_str_}")
+                    elif cmd_type == MDSessionCmdType.SUBSCRIBE:
+                        self.subscribe_count += 1
+                        self.subscribe_latency_total_sec += latency_sec
+                        self.subscribe_latency_max_sec = max(self.subscribe_latency_max_sec, latency_sec)
+                        logging.info(f"md worker {worker_handle.worker_index} subscribed {symbol=} in "
+                                     f"{latency_sec:.3f} sec;;;{self.get_subscribe_latency_stats()}")
+                    # else not required: unsubscribe ack
+                if is_deregister_required:
+                    try:
+                        self.deregister_symbol_from_md(symbol)
+                    except Exception as e:
+                        logging.exception(f"deregister_symbol_from_md failed for {symbol=} after unsubscribe ack "
+                                          f"of md worker {worker_handle.worker_index};;;exception: {e}")
+                # else not required: symbol interest still in use
+
+    def _restart_worker(self, worker_handle: MDSessionWorkerHandle):
+        with self.lock:
+            if worker_handle not in self.worker_handle_list:
+                return  # already restarted
+            logging.error(f"md worker {worker_handle.worker_index} exited unexpectedly with "
+                          f"{worker_handle.process.exitcode=}, restarting with its {len(worker_handle.symbol_set)} "
+                          f"symbols;;;{worker_handle.symbol_set=}")
+            worker_handle.conn.close()
+            new_worker_handle = self._start_worker(worker_handle.worker_index)
+            new_worker_handle.symbol_set = worker_handle.symbol_set
+            new_worker_handle.exch_code = worker_handle.exch_code
+            self.worker_handle_list[self.worker_handle_list.index(worker_handle)] = new_worker_handle
+            # dead worker never acks its pending cmds
+            for cmd_id, (*_, sent_worker_handle) in list(self.cmd_id_to_sent_cmd_dict.items()):
+                if sent_worker_handle is worker_handle:
+                    del self.cmd_id_to_sent_cmd_dict[cmd_id]
+                # else not required: cmd pending on other worker
+            # new worker stops md process left by old one before applying cmds - pending moves stay pinned to it and
+            # are resent so their ack still drops symbol interest
+            for symbol, (unsubscribing_worker_handle, _) in \
+                    list(self.symbol_to_unsubscribing_worker_n_cmd_id_dict.items()):
+                if unsubscribing_worker_handle is worker_handle:
+                    self._send_cmd(new_worker_handle, MDSessionCmdType.UNSUBSCRIBE, symbol)
+                    self.symbol_to_unsubscribing_worker_n_cmd_id_dict[symbol] = (new_worker_handle, self.next_cmd_id)
+                # else not required: symbol unsubscribing on other worker
+            for symbol in new_worker_handle.symbol_set:
+                self.symbol_to_worker_handle_dict[symbol] = new_worker_handle
+                self._send_cmd(new_worker_handle, MDSessionCmdType.SUBSCRIBE, symbol,
+                               *self._get_sec_id_source_n_exch_code(symbol,
+                                                                    self.symbol_to_sec_id_source_dict[symbol]))
+
+    def get_subscribe_latency_stats(self) -> Dict[str, Any]:
+        avg_latency_sec = self.subscribe_latency_total_sec / self.subscribe_count if self.subscribe_count else 0
+        return {"subscribe_count": self.subscribe_count, "avg_latency_sec": round(avg_latency_sec, 3),
+                "max_latency_sec": round(self.subscribe_latency_max_sec, 3),
+                "worker_symbol_counts": [len(worker_handle.symbol_set)
+                                         for worker_handle in self.worker_handle_list]}
+
+    def _get_sec_id_source_n_exch_code(self, sec_id: str, sec_id_source: Any) -> Tuple[str, str]:
+        if self.static_data is None:
+            raise Exception(f"Unexpected: trigger_md_for_symbols is invoked while self.static_data is None, this call"
+                            f" assumes static data is ready")
+        exch_id, ticker = self.static_data.get_exchange_n_ticker_from_sec_id_n_source(sec_id, sec_id_source)
+        return str(sec_id_source), "SS" if exch_id == "SSE" else "SZ"
+
+    def _get_least_loaded_worker_handle(self, exch_code: str) -> MDSessionWorkerHandle:
+        eligible_worker_handle_list = [worker_handle for worker_handle in self.worker_handle_list
+                                       if worker_handle.exch_code in (None, exch_code)]
+        if not eligible_worker_handle_list:
+            # every worker streams another exchange - grow pool
+            worker_handle = self._start_worker(len(self.worker_handle_list))
+            self.worker_handle_list.append(worker_handle)
+            logging.warning(f"no md worker free for {exch_code=}, pool grown to {len(self.worker_handle_list)}")
+            return worker_handle
+        return min(eligible_worker_handle_list, key=lambda worker_handle_: len(worker_handle_.symbol_set))
+
+    def _subscribe(self, system_symbol: str, sec_id_source: Any):
+        sec_id_source_str, exch_code = self._get_sec_id_source_n_exch_code(system_symbol, sec_id_source)
+        unsubscribing_worker_n_cmd_id = self.symbol_to_unsubscribing_worker_n_cmd_id_dict.pop(system_symbol, None)
+        if unsubscribing_worker_n_cmd_id is None:
+            # register for this symbol
+            symbol_interest = SymbolInterestsBaseModel.from_kwargs(symbol_name=system_symbol,
+                                                                   semaphore_full_path=self.consumer_semaphore_path)
+            mobile_book_service_http_client.create_symbol_interests_client(symbol_interest)
+        # else not required: interest of symbol is dropped only on unsubscribe ack - not sent yet, still registered
+        if (unsubscribing_worker_n_cmd_id is not None and
+                unsubscribing_worker_n_cmd_id[0].exch_code in (None, exch_code)):
+            # unsubscribe (e.g. of restart_md_for_symbols) not applied yet - other worker's md process could start
+            # writing symbol's shm while this one still does
+            worker_handle = unsubscribing_worker_n_cmd_id[0]
+        else:
+            if unsubscribing_worker_n_cmd_id is not None:
+                logging.warning(f"{system_symbol=} resubscribed before its unsubscribe ack while md worker "
+                                f"{unsubscribing_worker_n_cmd_id[0].worker_index} moved to other exchange, "
+                                f"subscribing on least loaded worker")
+            # else not required: symbol not streamed by any worker
+            worker_handle = self._get_least_loaded_worker_handle(exch_code)
+        worker_handle.symbol_set.add(system_symbol)
+        worker_handle.exch_code = exch_code
+        self.symbol_to_worker_handle_dict[system_symbol] = worker_handle
+        self.symbol_to_sec_id_source_dict[system_symbol] = sec_id_source
+        self._send_cmd(worker_handle, MDSessionCmdType.SUBSCRIBE, system_symbol, sec_id_source_str, exch_code)
+
+    def _unsubscribe(self, system_symbol: str, force: bool):
+        self.symbol_to_sec_id_source_dict.pop(system_symbol, None)
+        if worker_handle := self.symbol_to_worker_handle_dict.pop(system_symbol, None):
+            worker_handle.symbol_set.discard(system_symbol)
+            if not worker_handle.symbol_set:
+                worker_handle.exch_code = None  # free for any exchange
+            # else not required: worker still streams other symbols
+            self._send_cmd(worker_handle,
+                           MDSessionCmdType.FORCE_UNSUBSCRIBE if force else MDSessionCmdType.UNSUBSCRIBE,
+                           system_symbol)
+            # symbol interest is dropped once worker acks, see _read_acks
+            self.symbol_to_unsubscribing_worker_n_cmd_id_dict[system_symbol] = (worker_handle, self.next_cmd_id)
+        elif system_symbol not in self.symbol_to_unsubscribing_worker_n_cmd_id_dict:
+            # symbol not subscribed on any worker
+            self.deregister_symbol_from_md(system_symbol)
+        # else not required: unsubscribe already pending, its ack drops interest
+
+    def restart_md_for_symbols(self, system_symbol_n_sec_id_source_list: List[Tuple[str, Any]]) -> None:
+        self.force_stop_md_for_symbols(system_symbol_n_sec_id_source_list)
+        self.trigger_md_for_symbols(system_symbol_n_sec_id_source_list)
+
+    def trigger_md_for_symbols(self, system_symbol_n_sec_id_source_list: List[Tuple[str, Any]]) -> None:
+        with self.lock:
+            self._start_workers_if_not_started()
+            for system_symbol, sec_id_source in system_symbol_n_sec_id_source_list:
+                md_request_counter = self.symbol_to_md_request_counter_dict.get(system_symbol, 0)
+                if md_request_counter == 0:
+                    self._subscribe(system_symbol, sec_id_source)
+                # else streaming for symbol triggered by prior request, common increment is sufficient
+                self.symbol_to_md_request_counter_dict[system_symbol] = md_request_counter + 1
+        logging.info(f"trigger_md_for_symbols sent for {len(system_symbol_n_sec_id_source_list)} symbols;;;"
+                     f"{system_symbol_n_sec_id_source_list=}")
+
+    def force_stop_md_for_symbols(self, system_symbol_n_sec_id_source_list: List[Tuple[str, Any]]) -> None:
+        """
+        currently used to stop MD on recovery start for all chores found
+        """
+        if 1 > len(system_symbol_n_sec_id_source_list):
+            raise Exception(f"Unsupported: {len(system_symbol_n_sec_id_source_list)=} expected >0;;;"
+                            f"{system_symbol_n_sec_id_source_list=}")
+        with self.lock:
+            self._start_workers_if_not_started()
+            for system_symbol, _ in system_symbol_n_sec_id_source_list:
+                self.symbol_to_md_request_counter_dict.pop(system_symbol, None)
+                self._unsubscribe(system_symbol, force=True)
+        logging.info(f"force_stop_md_for_symbols sent for {len(system_symbol_n_sec_id_source_list)=} symbols;;;"
+                     f"{system_symbol_n_sec_id_source_list=}")
+
+    def deregister_symbol_from_md(self, symbol: str):
+        mobile_book_service_http_client.remove_symbol_interest_by_symbol_query_client(symbol)
+
+    def stop_md_for_symbols(self, symbols: List[str]):
+        # called for all fully closed chores where no other chore exist on same symbol
+        with self.lock:
+            for system_symbol in symbols:
+                md_request_counter = self.symbol_to_md_request_counter_dict.get(system_symbol)
+                if md_request_counter is None:
+                    logging.error(f"{system_symbol=} not found in symbol_to_md_request_counter_dict in "
+                                  f"stop_md_for_symbols call;;;{symbols=}")
+                    self.deregister_symbol_from_md(system_symbol)
+                elif md_request_counter > 1:
+                    self.symbol_to_md_request_counter_dict[system_symbol] = md_request_counter - 1
+                else:
+                    del self.symbol_to_md_request_counter_dict[system_symbol]
+                    self._unsubscribe(system_symbol, force=False)
+        logging.info(f"run stop_md_by_symbol sent for {len(symbols)=} {symbols};;;{symbols=}")
+
+    def close(self):
+        with self.lock:
+            # cleared first - exiting workers must not be restarted by ack reader
+            worker_handle_list, self.worker_handle_list = self.worker_handle_list, []
+            for worker_handle in worker_handle_list:
+                self._send_cmd(worker_handle, MDSessionCmdType.EXIT, None)
+            for worker_handle in worker_handle_list:
+                worker_handle.process.join(timeout=10)
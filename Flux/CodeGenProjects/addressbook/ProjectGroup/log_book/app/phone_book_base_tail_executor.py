@@ -76,9 +76,9 @@ class PhoneBookBaseTailExecutor(AppTailExecutor):
         self.market: Market = Market([MarketID.IN])
         self.simulation_mode = simulation_mode
         self.contact_alerts_model_exist: bool = False
-        self.contact_alerts_cache_dict: Dict[str, ContactAlertBaseModel] = {}
+        self.contact_alerts_cache_dict: Dict[int, ContactAlertBaseModel] = {}
         self.plan_id_by_symbol_side_dict: Dict[str, int] = {}
-        self.plan_alert_cache_dict_by_plan_id_dict: Dict[int, Dict[str, PlanAlertBaseModel]] = {}
+        self.plan_alert_cache_dict_by_plan_id_dict: Dict[int, Dict[int, PlanAlertBaseModel]] = {}
         self.service_up: bool = False
         self.contact_alert_queue: Queue = Queue()
         self.plan_alert_queue: Queue = Queue()
@@ -22,6 +22,9 @@ from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_s
 from FluxPythonUtils.scripts.general_utility_functions import except_n_log_alert, parse_to_int
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.generated.ORMModel.mobile_book_service_msgspec_model import *
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_shared_memory_producer import MobileBookSharedMemoryProducer
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_shared_memory_arena import (
+    MobileBookSharedMemoryArena)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_shm_journal import ShmJournalRecorder
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_service_helper import md_view_port
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.aggregate import (
     get_symbol_interest_from_symbol, get_symbol_overview_from_symbol)
@@ -80,6 +83,17 @@ class MobileBookServiceRoutesCallbackBaseNativeOverride(MobileBookServiceRoutesC
         self.ticker_update_queue: Queue[Any] = Queue()
         self.symbol_to_sem_n_producer_container_dict: Dict[str, SemaphoreNSHMProducerContainer] = {}
         self.symbol_to_sem_n_producer_container_dict_async_lock: AsyncRLock = AsyncRLock()
+        # arena mode: all symbols' shm slots live in one segment instead of one segment per symbol
+        self.md_shm_arena: MobileBookSharedMemoryArena | None = None
+        if md_shm_arena_name := config_yaml_dict.get("md_shm_arena_name"):
+            self.md_shm_arena = MobileBookSharedMemoryArena(
+                md_shm_arena_name, config_yaml_dict.get("md_shm_arena_capacity", 1024))
+        # else not required: per symbol shm segments
+        # shm replay benchmarking: journals every shm write of this process's producers for mobile_book_shm_replay
+        self.md_shm_journal_recorder: ShmJournalRecorder | None = None
+        if md_shm_journal_path := config_yaml_dict.get("md_shm_journal_path"):
+            self.md_shm_journal_recorder = ShmJournalRecorder(md_shm_journal_path)
+        # else not required: shm writes not journaled
         self.static_data: SecurityRecordManager | None = None
         self.ib = IB()
         self.ib_tickers: Dict[str, Tuple[Ticker, Ticker]] = {}
@@ -168,6 +182,13 @@ class MobileBookServiceRoutesCallbackBaseNativeOverride(MobileBookServiceRoutesC
                 except Exception as e:
                     logging.error(f"Error closing SEM for {symbol}: {e}", exc_info=True)
             sem_n_shm_producer_container_obj.shm_producer_obj.close()
+        if self.md_shm_arena is not None:
+            self.md_shm_arena.close()
+            self.md_shm_arena.unlink()
+        # else not required: no arena in use
+        if self.md_shm_journal_recorder is not None:
+            self.md_shm_journal_recorder.close()
+        # else not required: shm writes not journaled
 
         if self.ib.isConnected():
             self.ib.disconnect()
@@ -442,6 +463,12 @@ class MobileBookServiceRoutesCallbackBaseNativeOverride(MobileBookServiceRoutesC
         shm_producer = sem_n_shm_producer_container_obj.shm_producer_obj
         shm_producer.update_last_barter_shm_from_msgspec_obj(last_barter_obj)
 
+        await self._update_tob_db_from_last_barter(last_barter_obj)
+
+        for semaphore in sem_n_shm_producer_container_obj.semaphore_list:
+            semaphore.release()
+
+    async def _update_tob_db_from_last_barter(self, last_barter_obj: LastBarter):
         async with self.symbol_to_mobile_book_db_id_dict_async_lock:
             # Update Top of Book
             tob_update_data = {
@@ -457,15 +484,32 @@ class MobileBookServiceRoutesCallbackBaseNativeOverride(MobileBookServiceRoutesC
         await MobileBookServiceRoutesCallbackBaseNativeOverride.underlying_partial_update_top_of_book_http(
             tob_update_data)
 
-        for semaphore in sem_n_shm_producer_container_obj.semaphore_list:
-            semaphore.release()
+    async def _apply_batch_to_shm(self, symbol_to_md_obj_list_dict: Dict[str, List]):
+        # one lock/seqlock epoch, update_counter bump and semaphore release per symbol instead of per obj
+        for symbol, md_obj_list in symbol_to_md_obj_list_dict.items():
+            sem_n_shm_producer_container_obj: SemaphoreNSHMProducerContainer = \
+                await self.get_sem_n_shm_producer_cont_obj(symbol)
+            shm_producer: MobileBookSharedMemoryProducer = sem_n_shm_producer_container_obj.shm_producer_obj
+            shm_producer.apply_batch(md_obj_list)
+
+            for semaphore in sem_n_shm_producer_container_obj.semaphore_list:
+                semaphore.release()
 
     async def create_last_barter_pre(self, last_barter_obj: LastBarter):
         await self._update_last_barter_cache_n_shm(last_barter_obj)
 
     async def create_all_last_barter_pre(self, last_barter_obj_list: List[LastBarter]):
+        symbol_to_last_barter_obj_list_dict: Dict[str, List[LastBarter]] = {}
+        for last_barter_obj in last_barter_obj_list:
+            # updating cache for last barter
+            self.id_to_last_barter_cache_dict[last_barter_obj.id] = last_barter_obj
+            symbol_to_last_barter_obj_list_dict.setdefault(
+                last_barter_obj.symbol_n_exch_id.symbol, []).append(last_barter_obj)
+
+        await self._apply_batch_to_shm(symbol_to_last_barter_obj_list_dict)
+
         for last_barter_obj in last_barter_obj_list:
-            await self._update_last_barter_cache_n_shm(last_barter_obj)
+            await self._update_tob_db_from_last_barter(last_barter_obj)
 
     async def _update_market_depth_shm(self, market_depth_obj: MarketDepth):
         sem_n_shm_producer_container_obj: SemaphoreNSHMProducerContainer = \
@@ -473,6 +517,12 @@ class MobileBookServiceRoutesCallbackBaseNativeOverride(MobileBookServiceRoutesC
         shm_producer: MobileBookSharedMemoryProducer = sem_n_shm_producer_container_obj.shm_producer_obj
         shm_producer.update_market_depth_shm_from_msgspec_obj(market_depth_obj)
 
+        await self._update_tob_db_from_market_depth(market_depth_obj)
+
+        for semaphore in sem_n_shm_producer_container_obj.semaphore_list:
+            semaphore.release()
+
+    async def _update_tob_db_from_market_depth(self, market_depth_obj: MarketDepth):
         if market_depth_obj.position == 0:
             async with self.symbol_to_mobile_book_db_id_dict_async_lock:
                 tob_update_data: Dict[str, Any] = {
@@ -489,9 +539,17 @@ class MobileBookServiceRoutesCallbackBaseNativeOverride(MobileBookServiceRoutesC
 
             await MobileBookServiceRoutesCallbackBaseNativeOverride.underlying_partial_update_top_of_book_http(
                 tob_update_data)
+        # else not required: only top level depth feeds top of book
 
-        for semaphore in sem_n_shm_producer_container_obj.semaphore_list:
-            semaphore.release()
+    async def _update_market_depth_list_shm(self, market_depth_obj_list: List[MarketDepth]):
+        symbol_to_market_depth_obj_list_dict: Dict[str, List[MarketDepth]] = {}
+        for market_depth_obj in market_depth_obj_list:
+            symbol_to_market_depth_obj_list_dict.setdefault(market_depth_obj.symbol, []).append(market_depth_obj)
+
+        await self._apply_batch_to_shm(symbol_to_market_depth_obj_list_dict)
+
+        for market_depth_obj in market_depth_obj_list:
+            await self._update_tob_db_from_market_depth(market_depth_obj)
 
     async def _update_market_depth_cache_n_shm(self, market_depth_obj: MarketDepth):
         # updating cache
@@ -502,21 +560,26 @@ class MobileBookServiceRoutesCallbackBaseNativeOverride(MobileBookServiceRoutesC
 
     async def _partial_update_market_depth_cache_n_shm(self, market_depth_patch_dict: Dict):
         # updating cache
-        market_depth_obj = self.id_to_md_cache_dict.get(market_depth_patch_dict.get("_id"))
-        patched_dict = compare_n_patch_dict(market_depth_obj.to_dict(), market_depth_patch_dict)
-        market_depth_obj = MarketDepth.from_dict(patched_dict)
-        self.id_to_md_cache_dict[market_depth_obj.id] = market_depth_obj
+        market_depth_obj, patched_dict = self._partial_update_market_depth_cache(market_depth_patch_dict)
 
         # updating shm
         await self._update_market_depth_shm(market_depth_obj)
         return patched_dict
 
+    def _partial_update_market_depth_cache(self, market_depth_patch_dict: Dict) -> Tuple[MarketDepth, Dict]:
+        market_depth_obj = self.id_to_md_cache_dict.get(market_depth_patch_dict.get("_id"))
+        patched_dict = compare_n_patch_dict(market_depth_obj.to_dict(), market_depth_patch_dict)
+        market_depth_obj = MarketDepth.from_dict(patched_dict)
+        self.id_to_md_cache_dict[market_depth_obj.id] = market_depth_obj
+        return market_depth_obj, patched_dict
+
     async def create_market_depth_pre(self, market_depth_obj: MarketDepth):
         await self._update_market_depth_cache_n_shm(market_depth_obj)
 
     async def create_all_market_depth_pre(self, market_depth_obj_list: List[MarketDepth]):
         for market_depth_obj in market_depth_obj_list:
-            await self._update_market_depth_cache_n_shm(market_depth_obj)
+            self.id_to_md_cache_dict[market_depth_obj.id] = market_depth_obj
+        await self._update_market_depth_list_shm(market_depth_obj_list)
 
     async def update_market_depth_pre(self, updated_market_depth_obj: MarketDepth):
         await self._update_market_depth_cache_n_shm(updated_market_depth_obj)
@@ -524,7 +587,8 @@ class MobileBookServiceRoutesCallbackBaseNativeOverride(MobileBookServiceRoutesC
 
     async def update_all_market_depth_pre(self, updated_market_depth_obj_list: List[MarketDepth]):
         for market_depth_obj in updated_market_depth_obj_list:
-            await self._update_market_depth_cache_n_shm(market_depth_obj)
+            self.id_to_md_cache_dict[market_depth_obj.id] = market_depth_obj
+        await self._update_market_depth_list_shm(updated_market_depth_obj_list)
         return updated_market_depth_obj_list
 
     async def partial_update_market_depth_pre(self, stored_market_depth_obj_json: Dict[str, Any],
@@ -534,9 +598,12 @@ class MobileBookServiceRoutesCallbackBaseNativeOverride(MobileBookServiceRoutesC
     async def partial_update_all_market_depth_pre(self, stored_market_depth_dict_list: List[Dict[str, Any]],
                                                   updated_market_depth_dict_list: List[Dict[str, Any]]):
         market_depth_patched_dict_list: List[Dict] = []
+        patched_market_depth_obj_list: List[MarketDepth] = []
         for market_depth_obj_dict in updated_market_depth_dict_list:
-            market_depth_patched_dict = await self._partial_update_market_depth_cache_n_shm(market_depth_obj_dict)
+            market_depth_obj, market_depth_patched_dict = self._partial_update_market_depth_cache(market_depth_obj_dict)
+            patched_market_depth_obj_list.append(market_depth_obj)
             market_depth_patched_dict_list.append(market_depth_patched_dict)
+        await self._update_market_depth_list_shm(patched_market_depth_obj_list)
         return market_depth_patched_dict_list
 
     async def _update_top_of_book_shm(self, top_of_book_obj: TopOfBook):
@@ -569,17 +636,25 @@ class MobileBookServiceRoutesCallbackBaseNativeOverride(MobileBookServiceRoutesC
     async def create_top_of_book_pre(self, top_of_book_obj: TopOfBook):
         await self._update_tob_cache_n_shm(top_of_book_obj)
 
-    async def create_all_top_of_book_pre(self, top_of_book_obj_list: List[TopOfBook]):
+    async def _update_top_of_book_list_cache_n_shm(self, top_of_book_obj_list: List[TopOfBook]):
+        symbol_to_top_of_book_obj_list_dict: Dict[str, List[TopOfBook]] = {}
         for top_of_book_obj in top_of_book_obj_list:
-            await self._update_tob_cache_n_shm(top_of_book_obj)
+            # updating cache
+            self.id_to_tob_cache_dict[top_of_book_obj.id] = top_of_book_obj
+            symbol_to_top_of_book_obj_list_dict.setdefault(top_of_book_obj.symbol, []).append(top_of_book_obj)
+
+        # updating shm
+        await self._apply_batch_to_shm(symbol_to_top_of_book_obj_list_dict)
+
+    async def create_all_top_of_book_pre(self, top_of_book_obj_list: List[TopOfBook]):
+        await self._update_top_of_book_list_cache_n_shm(top_of_book_obj_list)
 
     async def update_top_of_book_pre(self, updated_top_of_book_obj: TopOfBook):
         await self._update_tob_cache_n_shm(updated_top_of_book_obj)
         return updated_top_of_book_obj
 
     async def update_all_top_of_book_pre(self, updated_top_of_book_obj_list: List[TopOfBook]):
-        for tob in updated_top_of_book_obj_list:
-            await self._update_tob_cache_n_shm(tob)
+        await self._update_top_of_book_list_cache_n_shm(updated_top_of_book_obj_list)
         return updated_top_of_book_obj_list
 
     async def partial_update_top_of_book_pre(
@@ -967,7 +1042,10 @@ class MobileBookServiceRoutesCallbackBaseNativeOverride(MobileBookServiceRoutesC
             if sem_n_producer_container_obj:
                 sem_n_producer_container_obj.semaphore_list.append(semaphore)
             else:
-                producer = MobileBookSharedMemoryProducer(symbol_interests_obj.symbol_name)
+                producer = MobileBookSharedMemoryProducer(symbol_interests_obj.symbol_name, self.md_shm_arena)
+                if self.md_shm_journal_recorder is not None:
+                    self.md_shm_journal_recorder.attach(producer)
+                # else not required: shm writes not journaled
                 self.symbol_to_sem_n_producer_container_dict[symbol_interests_obj.symbol_name] = (
                     SemaphoreNSHMProducerContainer(semaphore_list=[semaphore], shm_producer_obj=producer))
 
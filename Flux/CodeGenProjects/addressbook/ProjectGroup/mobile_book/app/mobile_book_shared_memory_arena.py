@@ -0,0 +1,164 @@
+# standard imports
+import ctypes
+import logging
+import mmap
+import time
+from typing import Dict, Final
+
+# 3rd party imports
+import posix_ipc  # type: ignore
+
+# project imports
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_structure import (
+    MDSharedMemoryContainer, MDSharedMemoryArenaHeader, MAX_STRING_LENGTH, get_md_shared_memory_arena_type)
+from FluxPythonUtils.scripts.pthread_shm_mutex import PThreadShmMutex
+
+EXPECTED_ARENA_SIGNATURE: Final[int] = 0xFAFAFAFAFAFAFAFB
+ARENA_HEADER_WAIT_ATTEMPTS: Final[int] = 100     # attempts of 10 ms each for creator to publish arena header
+SLOT_SIZE: Final[int] = ctypes.sizeof(MDSharedMemoryContainer)
+
+
+class MobileBookSharedMemoryArena:
+    """
+    Single shm segment holding fixed capacity table of per-symbol MDSharedMemoryContainer slots - replaces one
+    segment (and fd + mmap) per symbol. Producers pass capacity and create the segment if missing, consumers
+    attach with capacity None and read it from the header.
+    """
+
+    def __init__(self, arena_name: str, capacity: int | None = None):
+        self.shm_name = arena_name if arena_name.startswith("/") else f"/{arena_name}"
+        self.shm: posix_ipc.SharedMemory | None = None
+        self.mmap_obj: mmap.mmap | None = None
+        self.arena = None
+        self.header: MDSharedMemoryArenaHeader | None = None
+        self.table_mutex: PThreadShmMutex | None = None
+        self.symbol_to_slot_index_dict: Dict[str, int] = {}
+        self.indexed_slot_count: int = 0
+
+        is_creator = False
+        try:
+            self.shm = posix_ipc.SharedMemory(self.shm_name)
+        except posix_ipc.ExistentialError:
+            if capacity is None:
+                raise
+            # else not required: producer side creates arena
+            try:
+                self.shm = posix_ipc.SharedMemory(
+                    self.shm_name, flags=posix_ipc.O_CREX,
+                    size=ctypes.sizeof(get_md_shared_memory_arena_type(capacity)))
+                is_creator = True
+            except posix_ipc.ExistentialError:
+                # other producer created it in between
+                self.shm = posix_ipc.SharedMemory(self.shm_name)
+
+        try:
+            self.mmap_obj = mmap.mmap(self.shm.fd, self.shm.size, flags=mmap.MAP_SHARED,
+                                      prot=mmap.PROT_READ | mmap.PROT_WRITE)
+            self.header = MDSharedMemoryArenaHeader.from_buffer(self.mmap_obj)
+            if is_creator:
+                self.header.capacity = capacity
+                self.header.slot_count = 0
+                self.header.arena_signature = EXPECTED_ARENA_SIGNATURE
+            else:
+                self._wait_for_arena_header()
+                if capacity is not None and capacity != self.header.capacity:
+                    logging.warning(f"arena {self.shm_name} already exists with capacity {self.header.capacity}, "
+                                    f"ignoring requested capacity {capacity}")
+                # else not required: capacity matches or consumer side
+            arena_type = get_md_shared_memory_arena_type(self.header.capacity)
+            self.arena = arena_type.from_buffer(self.mmap_obj)
+            self.table_mutex = PThreadShmMutex(self.header.table_mutex)
+            logging.info(f"md shm arena {self.shm_name} attached, capacity={self.capacity}, "
+                         f"slots used={self.header.slot_count}, {is_creator=}")
+        except Exception as e:
+            logging.error(f"Error attaching md shm arena {self.shm_name}: {e}", exc_info=True)
+            self.close()
+            raise
+
+    def _wait_for_arena_header(self):
+        for _ in range(ARENA_HEADER_WAIT_ATTEMPTS):
+            if self.header.arena_signature == EXPECTED_ARENA_SIGNATURE:
+                return
+            time.sleep(0.01)
+        raise Exception(f"md shm arena {self.shm_name} header not published by creator, "
+                        f"found signature {hex(self.header.arena_signature)}")
+
+    @property
+    def capacity(self) -> int:
+        return self.header.capacity
+
+    def _refresh_symbol_to_slot_index(self):
+        for slot_index in range(self.indexed_slot_count, self.header.slot_count):
+            symbol = self.arena.slots[slot_index].mobile_book_container.symbol_.decode()
+            if not symbol:
+                # slot's producer is re-initializing it - picked up on next refresh
+                return
+            self.symbol_to_slot_index_dict[symbol] = slot_index
+            self.indexed_slot_count = slot_index + 1
+
+    def get_slot_index(self, symbol: str) -> int | None:
+        slot_index = self.symbol_to_slot_index_dict.get(symbol)
+        if slot_index is None:
+            self._refresh_symbol_to_slot_index()
+            slot_index = self.symbol_to_slot_index_dict.get(symbol)
+        # else not required: cached slot - slots are never reassigned
+        return slot_index
+
+    def get_slot_offset(self, symbol: str) -> int | None:
+        slot_index = self.get_slot_index(symbol)
+        if slot_index is None:
+            return None
+        return type(self.arena).slots.offset + slot_index * SLOT_SIZE
+
+    def get_or_create_slot(self, symbol: str) -> MDSharedMemoryContainer:
+        if len(symbol.encode()) >= MAX_STRING_LENGTH:
+            raise Exception(f"symbol {symbol} too long for md shm arena slot, max {MAX_STRING_LENGTH - 1} bytes")
+        # else not required: symbol fits in slot
+
+        self.table_mutex.lock()
+        try:
+            slot_index = self.get_slot_index(symbol)
+            if slot_index is None:
+                slot_index = self.header.slot_count
+                if slot_index >= self.capacity:
+                    raise Exception(f"md shm arena {self.shm_name} full, capacity={self.capacity}, "
+                                    f"can't allocate slot for {symbol}")
+                # else not required: free slot available
+                self.arena.slots[slot_index].mobile_book_container.symbol_ = symbol.encode()
+                self.header.slot_count = slot_index + 1
+                self.symbol_to_slot_index_dict[symbol] = slot_index
+                logging.info(f"allocated md shm arena slot {slot_index} for {symbol}")
+            # else not required: symbol already has slot - producer restarted
+        finally:
+            self.table_mutex.unlock()
+        return self.arena.slots[slot_index]
+
+    def close(self):
+        self.table_mutex = None
+        self.header = None
+        self.arena = None
+
+        import gc
+        gc.collect()
+
+        if self.mmap_obj:
+            try:
+                self.mmap_obj.close()
+            except Exception as e:
+                logging.error(f"Error closing mmap for md shm arena {self.shm_name}: {e}", exc_info=True)
+            finally:
+                self.mmap_obj = None
+
+        if self.shm is not None:
+            try:
+                self.shm.close_fd()
+            except Exception as e:
+                logging.error(f"Error closing md shm arena fd {self.shm_name}: {e}", exc_info=True)
+            finally:
+                self.shm = None
+
+    def unlink(self):
+        try:
+            posix_ipc.unlink_shared_memory(self.shm_name)
+        except posix_ipc.ExistentialError:
+            pass
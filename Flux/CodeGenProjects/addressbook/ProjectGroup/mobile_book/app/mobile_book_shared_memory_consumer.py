@@ -16,6 +16,9 @@ from Flux.CodeGenProjects.AddressBook.ProjectGroup.street_book.app.pos_cache imp
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.pretty_print_md_shm_data import pretty_print_shm_data
 from FluxPythonUtils.scripts.pthread_shm_mutex import PThreadShmMutex
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_structure import *
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_shared_memory_arena import (
+    MobileBookSharedMemoryArena)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_shm_journal import ShmReactionRecorder
 
 
 class SymbolCache:
@@ -84,12 +87,26 @@ class SymbolCache:
 class SymbolCacheContainer:
     # below None data-members must be initialized at init time of executor process
     shared_memory: Dict[str, mmap.mmap] = {}
+    # offset of symbol's MDSharedMemoryContainer in shared_memory - non-zero only for arena slots
+    shared_memory_offset: Dict[str, int] = {}
+    # arena mode: all symbols mapped through one mmap of the producer's multi-symbol segment
+    md_shm_arena_name: str | None = executor_config_yaml_dict.get('md_shm_arena_name')
+    md_shm_arena: MobileBookSharedMemoryArena | None = None
     # shared_memory_semaphore = None
     EXPECTED_SHM_SIGNATURE: Final[hex] = 0xFAFAFAFAFAFAFAFA    # hard-coded: cpp puts same value
     shm_signature_mismatch_counts:  int = 0
     symbol_to_symbol_cache_dict: Dict[str, SymbolCache] = {}
     # semaphore = threading.Semaphore(0)
     print_shm_snapshot: bool | None = executor_config_yaml_dict.get('print_shm_snapshot')
+    # seqlock read mode: copy shm without taking the pthread mutex, retrying when a writer overlapped the copy
+    shm_seqlock_read: bool | None = executor_config_yaml_dict.get('shm_seqlock_read')
+    shm_seqlock_max_read_retries: int = executor_config_yaml_dict.get('shm_seqlock_max_read_retries', 1000)
+    shm_seqlock_retry_counts: int = 0
+    # shm replay benchmarking: journals (symbol, update_counter) of every md update cache took, for
+    # mobile_book_shm_replay report - left unset in production
+    md_reaction_journal_path: str | None = executor_config_yaml_dict.get('md_reaction_journal_path')
+    md_reaction_recorder: ShmReactionRecorder | None = (
+        ShmReactionRecorder(md_reaction_journal_path) if md_reaction_journal_path else None)
 
     # @staticmethod
     # def release_semaphore():
@@ -105,8 +122,38 @@ class SymbolCacheContainer:
     #     else:
     #         SymbolCacheContainer.semaphore.acquire()
 
+    @staticmethod
+    def check_if_arena_slot_exists(md_shared_memory_name: str) -> bool:
+        if md_shared_memory_name in SymbolCacheContainer.shared_memory:
+            return True
+        # else not required: symbol not mapped yet
+
+        if SymbolCacheContainer.md_shm_arena is None:
+            try:
+                SymbolCacheContainer.md_shm_arena = MobileBookSharedMemoryArena(SymbolCacheContainer.md_shm_arena_name)
+            except posix_ipc.ExistentialError as exp:
+                # arena doesn't exist yet, will retry in next loop
+                logging.warning(f"Something went wrong with setting up md shared memory arena: {exp}")
+                return False
+        # else not required: arena already mapped
+
+        slot_offset = SymbolCacheContainer.md_shm_arena.get_slot_offset(md_shared_memory_name)
+        if slot_offset is None:
+            # producer hasn't allocated slot for symbol yet, will retry in next loop
+            logging.warning(f"No slot found for {md_shared_memory_name} in md shared memory arena "
+                            f"{SymbolCacheContainer.md_shm_arena_name}")
+            return False
+        SymbolCacheContainer.shared_memory[md_shared_memory_name] = SymbolCacheContainer.md_shm_arena.mmap_obj
+        SymbolCacheContainer.shared_memory_offset[md_shared_memory_name] = slot_offset
+        SymbolCacheContainer.add_symbol_cache_for_symbol(md_shared_memory_name)
+        return True
+
     @staticmethod
     def check_if_shared_memory_exists(md_shared_memory_name: str) -> bool:
+        if SymbolCacheContainer.md_shm_arena_name:
+            return SymbolCacheContainer.check_if_arena_slot_exists(md_shared_memory_name)
+        # else not required: per symbol shm segment
+
         shared_memory_found = False
         try:
             shm_fd = os.open(f"/dev/shm/{md_shared_memory_name}", os.O_RDWR)
@@ -126,7 +173,8 @@ class SymbolCacheContainer:
     @staticmethod
     def get_shm_mutex(md_shared_memory_name: str) -> PThreadShmMutex | None:
         shm = SymbolCacheContainer.shared_memory.get(md_shared_memory_name)
-        md_shared_memory_container: MDSharedMemoryContainer = MDSharedMemoryContainer.from_buffer(shm)
+        md_shared_memory_container: MDSharedMemoryContainer = MDSharedMemoryContainer.from_buffer(
+            shm, SymbolCacheContainer.shared_memory_offset.get(md_shared_memory_name, 0))
         sleep_sec = 1
         if md_shared_memory_container.shm_update_signature != SymbolCacheContainer.EXPECTED_SHM_SIGNATURE:
             # @@@ below error log is used in specific test case for string matching - if changed here
@@ -155,10 +203,53 @@ class SymbolCacheContainer:
         pthread_shm_mutex: PThreadShmMutex = PThreadShmMutex(md_shared_memory_container.mutex)
         return pthread_shm_mutex
 
+    @staticmethod
+    def get_md_container_seqlock(md_shared_memory_name: str) -> MDContainer | None:
+        """
+        lock-free read: seq_version is odd while producer writes, a copy is valid only if seq_version is even and
+        unchanged across the copy - returns None if no clean copy could be taken within max retries
+        """
+        shm = SymbolCacheContainer.shared_memory.get(md_shared_memory_name)
+        shm_offset = SymbolCacheContainer.shared_memory_offset.get(md_shared_memory_name, 0)
+        shm_md_container: MDContainer = MDSharedMemoryContainer.from_buffer(shm, shm_offset).mobile_book_container
+        for _ in range(SymbolCacheContainer.shm_seqlock_max_read_retries):
+            start_seq_version = shm_md_container.seq_version
+            if not start_seq_version & 1:
+                md_shared_memory_container_: MDSharedMemoryContainer = (
+                    MDSharedMemoryContainer.from_buffer_copy(shm, shm_offset))
+                if shm_md_container.seq_version == start_seq_version:
+                    return md_shared_memory_container_.mobile_book_container
+                # else not required: writer overlapped the copy - retrying
+            # else not required: writer in progress - retrying
+            SymbolCacheContainer.shm_seqlock_retry_counts += 1
+        logging.warning(f"seqlock read couldn't get consistent copy of {md_shared_memory_name} in "
+                        f"{SymbolCacheContainer.shm_seqlock_max_read_retries} attempts, falling back to mutex "
+                        f"read;;; {SymbolCacheContainer.shm_seqlock_retry_counts=}")
+        return None
+
+    @staticmethod
+    def get_md_update_counter(md_shared_memory_name: str) -> int | None:
+        """
+        producer's update_counter read in place (no copy, no lock) - lets consumers skip symbols whose md didn't
+        change since last read; None if shm of symbol is not mapped yet
+        """
+        shm = SymbolCacheContainer.shared_memory.get(md_shared_memory_name)
+        if shm is None:
+            return None
+        # else not required: shm mapped
+        return MDSharedMemoryContainer.from_buffer(
+            shm, SymbolCacheContainer.shared_memory_offset.get(md_shared_memory_name, 0)
+        ).mobile_book_container.update_counter
+
     @staticmethod
     def get_md_container(md_shared_memory_name: str) -> MDContainer | None:
         pthread_shm_mutex: PThreadShmMutex = SymbolCacheContainer.get_shm_mutex(md_shared_memory_name)
         if pthread_shm_mutex is not None:
+            if SymbolCacheContainer.shm_seqlock_read:
+                mobile_book_container_ = SymbolCacheContainer.get_md_container_seqlock(md_shared_memory_name)
+                if mobile_book_container_ is not None:
+                    return mobile_book_container_
+                # else not required: falling back to mutex based read
             while True:
                 lock_try_time = DateTime.utcnow()
                 lock_res = pthread_shm_mutex.try_timedlock()
@@ -166,7 +257,8 @@ class SymbolCacheContainer:
                     try:
                         shm = SymbolCacheContainer.shared_memory.get(md_shared_memory_name)
                         md_shared_memory_container_: MDSharedMemoryContainer = (
-                            MDSharedMemoryContainer.from_buffer_copy(shm))
+                            MDSharedMemoryContainer.from_buffer_copy(
+                                shm, SymbolCacheContainer.shared_memory_offset.get(md_shared_memory_name, 0)))
                         mobile_book_container_ = md_shared_memory_container_.mobile_book_container
                         break
                     except Exception as e:
@@ -207,6 +299,9 @@ class SymbolCacheContainer:
                     symbol_cache.so = None  # Explicitly set to None if not set in SHM
             else:
                 logging.warning(f"No SymbolCache found for leg 1 symbol: {symbol1} during SHM update.")
+            if SymbolCacheContainer.md_reaction_recorder is not None:
+                SymbolCacheContainer.md_reaction_recorder.record(symbol1, mobile_book_container_.update_counter)
+            # else not required: reaction journaling disabled
             return True
         else:
             return False
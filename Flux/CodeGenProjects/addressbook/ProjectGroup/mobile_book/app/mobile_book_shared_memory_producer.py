@@ -5,7 +5,7 @@ import mmap
 import os
 import time
 import logging
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Callable, Tuple
 
 import posix_ipc  # type: ignore
 import pendulum
@@ -27,6 +27,8 @@ from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_s
     Structure  # Base Structure
 )
 from FluxPythonUtils.scripts.pthread_shm_mutex import PThreadShmMutex, pthread_mutex_t
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_shared_memory_arena import (
+    MobileBookSharedMemoryArena)
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.generated.ORMModel.mobile_book_service_ts_utils import (
     get_epoch_from_pendulum_dt, get_pendulum_dt_from_epoch)
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.generated.ORMModel.mobile_book_service_msgspec_model import (
@@ -41,8 +43,10 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 
 
 class MobileBookSharedMemoryProducer:
-    def __init__(self, symbol: str):
-        self.shm_name = f"/{symbol}"  # posix_ipc names usually start with /
+    def __init__(self, symbol: str, arena: MobileBookSharedMemoryArena | None = None):
+        # arena passed: symbol gets a slot in shared multi-symbol segment instead of a segment of its own
+        self.arena = arena
+        self.shm_name = f"/{symbol}" if arena is None else arena.shm_name  # posix_ipc names usually start with /
         # self.sem_name = f"/{sem_name}"
         self.instrument_symbol = symbol  # The single symbol this producer manages
 
@@ -53,18 +57,27 @@ class MobileBookSharedMemoryProducer:
 
         self.mutex_wrapper: Optional[PThreadShmMutex] = None
         # self.semaphore: Optional[posix_ipc.Semaphore] = None
+        # called with (symbol, copy of md container) after every seqlock write, copy is taken under mutex - e.g. shm
+        # journal recorder capturing exactly what was written
+        self.shm_write_listener: Optional[Callable[[str, MDContainer], None]] = None
         self._now_ns = lambda: get_epoch_from_pendulum_dt(pendulum.DateTime.utcnow())
+        # cached once - apply_batch writes it straight into ctypes char arrays
+        self._encoded_symbol: bytes = self.instrument_symbol.encode('utf-8')[:MAX_STRING_LENGTH - 1]
 
         try:
-            self.shm = posix_ipc.SharedMemory(self.shm_name, flags=posix_ipc.O_CREAT | posix_ipc.O_RDWR,
-                                              size=ctypes.sizeof(MDSharedMemoryContainer))  # Size of the new top struct
-            logging.debug(f"Shared memory {self.shm_name} created or opened for symbol {self.instrument_symbol}.")
+            if self.arena is None:
+                self.shm = posix_ipc.SharedMemory(self.shm_name, flags=posix_ipc.O_CREAT | posix_ipc.O_RDWR,
+                                                  size=ctypes.sizeof(MDSharedMemoryContainer))  # Size of the new top struct
+                logging.debug(f"Shared memory {self.shm_name} created or opened for symbol {self.instrument_symbol}.")
 
-            self.mmap_obj = mmap.mmap(self.shm.fd, self.shm.size,
-                                      flags=mmap.MAP_SHARED,
-                                      prot=mmap.PROT_READ | mmap.PROT_WRITE)
+                self.mmap_obj = mmap.mmap(self.shm.fd, self.shm.size,
+                                          flags=mmap.MAP_SHARED,
+                                          prot=mmap.PROT_READ | mmap.PROT_WRITE)
 
-            self.shm_root_ptr = MDSharedMemoryContainer.from_buffer(self.mmap_obj)
+                self.shm_root_ptr = MDSharedMemoryContainer.from_buffer(self.mmap_obj)
+            else:
+                # slot has same layout as per-symbol segment - arena owns the segment and mmap, close leaves them
+                self.shm_root_ptr = self.arena.get_or_create_slot(self.instrument_symbol)
 
             # Cache direct reference to the nested MDContainer
             if self.shm_root_ptr:
@@ -116,6 +129,7 @@ class MobileBookSharedMemoryProducer:
         #     return logging.error(f"Producer for '{self.instrument_symbol}' not ready for market depth update.")
 
         self.mutex_wrapper.lock()
+        self._begin_seq_write()
         try:
             md_container = self._mobile_book_struct  # Direct reference
             depth_data = {
@@ -127,22 +141,26 @@ class MobileBookSharedMemoryProducer:
             }
 
             target_depth_list = None
+            target_level_update_counters = None
             if side == TickType.BID:
                 target_depth_list = md_container.bid_market_depth_list
+                target_level_update_counters = md_container.section_update_counters.bid_market_depth_list
             elif side == TickType.ASK:
                 target_depth_list = md_container.ask_market_depth_list
+                target_level_update_counters = md_container.section_update_counters.ask_market_depth_list
             else:
                 logging.error(f"Invalid side for market depth: {side}"); return
 
             if 0 <= position < DEPTH_LVL:
                 self._populate_market_depth_entry(target_depth_list[position], depth_data)
+                target_level_update_counters[position] += 1
             else:
                 logging.error(f"Invalid position for market depth: {position}"); return
 
             md_container.update_counter += 1
             self.shm_root_ptr.shm_update_signature = EXPECTED_SHM_SIGNATURE
         finally:
-            self.mutex_wrapper.unlock()
+            self._end_seq_write_n_unlock()
         # self.semaphore.release()
 
     def update_market_depth_shm_from_msgspec_obj(self, market_depth_obj: MarketDepthMsgspec):
@@ -162,6 +180,7 @@ class MobileBookSharedMemoryProducer:
         #     return logging.error(f"Producer for '{self.instrument_symbol}' not ready for last barter update.")
 
         self.mutex_wrapper.lock()
+        self._begin_seq_write()
         try:
             md_container = self._mobile_book_struct
             last_barter_data = {
@@ -170,11 +189,12 @@ class MobileBookSharedMemoryProducer:
                 "premium": premium, "market_barter_volume": market_barter_volume_data
             }
             self._populate_last_barter(md_container.last_barter, last_barter_data)
+            md_container.section_update_counters.last_barter += 1
 
             md_container.update_counter += 1
             self.shm_root_ptr.shm_update_signature = EXPECTED_SHM_SIGNATURE
         finally:
-            self.mutex_wrapper.unlock()
+            self._end_seq_write_n_unlock()
         # self.semaphore.release()
 
     def update_last_barter_shm_from_msgspec_obj(self, last_barter_obj: LastBarterMsgspec):
@@ -212,6 +232,7 @@ class MobileBookSharedMemoryProducer:
                 f"Unexpected keyword arguments in update_symbol_overview for '{self.instrument_symbol}': {kwargs}")
 
         self.mutex_wrapper.lock()
+        self._begin_seq_write()
         try:
             md_container = self._mobile_book_struct
 
@@ -242,6 +263,7 @@ class MobileBookSharedMemoryProducer:
 
             self._populate_symbol_overview(md_container.symbol_overview, overview_data)
             md_container.is_symbol_overview_set = True  # Mark the SO as set in MDContainer
+            md_container.section_update_counters.symbol_overview += 1
 
             md_container.update_counter += 1
             self.shm_root_ptr.shm_update_signature = EXPECTED_SHM_SIGNATURE
@@ -249,7 +271,7 @@ class MobileBookSharedMemoryProducer:
         except Exception as e:
             logging.error(f"Error updating symbol overview for {self.instrument_symbol}: {e}", exc_info=True)
         finally:
-            self.mutex_wrapper.unlock()
+            self._end_seq_write_n_unlock()
 
         # self.semaphore.release()  # Release semaphore after update
 
@@ -276,6 +298,7 @@ class MobileBookSharedMemoryProducer:
             last_update_date_time_ns: Optional[int] = None
     ):
         self.mutex_wrapper.lock()
+        self._begin_seq_write()
         try:
             md_container = self._mobile_book_struct
             tob_container = md_container.top_of_book
@@ -290,12 +313,13 @@ class MobileBookSharedMemoryProducer:
                 "last_update_date_time": last_update_date_time_ns
             }
             self._populate_top_of_book(tob_container, data)
+            md_container.section_update_counters.top_of_book += 1
 
             md_container.update_counter += 1
             self.shm_root_ptr.shm_update_signature = EXPECTED_SHM_SIGNATURE
 
         finally:
-            self.mutex_wrapper.unlock()
+            self._end_seq_write_n_unlock()
 
     def update_top_of_book_shm_from_msgspec_obj(self, top_of_book_obj: TopOfBookMsgspec):
         bid_quote_data = None
@@ -339,6 +363,209 @@ class MobileBookSharedMemoryProducer:
             last_update_date_time_ns=last_update_date_time_ns
         )
 
+    def apply_batch(self, md_obj_list: List[MarketDepthMsgspec | TopOfBookMsgspec | LastBarterMsgspec]) -> int:
+        """
+        Writes all passed MarketDepth/TopOfBook/LastBarter msgspec objs under single lock and seqlock epoch with
+        direct ctypes field writes, update_counter is bumped once for whole batch - consumers see one update.
+        Returns count of objs applied, unsupported objs are logged and skipped
+        """
+        applied_count = 0
+        self.mutex_wrapper.lock()
+        self._begin_seq_write()
+        try:
+            md_container = self._mobile_book_struct
+            for md_obj in md_obj_list:
+                if isinstance(md_obj, (MarketDepthMsgspec, MarketDepthMsgspecBaseModel)):
+                    is_applied = self._write_market_depth(md_container, md_obj)
+                elif isinstance(md_obj, (TopOfBookMsgspec, TopOfBookMsgspecBaseModel)):
+                    is_applied = self._write_top_of_book(md_container, md_obj)
+                elif isinstance(md_obj, (LastBarterMsgspec, LastBarterMsgspecBaseModel)):
+                    is_applied = self._write_last_barter(md_container, md_obj)
+                else:
+                    logging.error(f"Unsupported obj type {type(md_obj).__name__} in apply_batch for "
+                                  f"{self.instrument_symbol}, skipping: {md_obj}")
+                    is_applied = False
+                if is_applied:
+                    applied_count += 1
+                # else not required: error already logged
+
+            if applied_count:
+                md_container.update_counter += 1
+                self.shm_root_ptr.shm_update_signature = EXPECTED_SHM_SIGNATURE
+            # else not required: nothing written - consumers must not see a new update
+        finally:
+            self._end_seq_write_n_unlock()
+        return applied_count
+
+    def write_md_container_ranges(self, range_list: List[Tuple[int, bytes]]) -> int:
+        """
+        copies (offset, bytes) ranges into MDContainer under lock and seqlock epoch as one update - raw write path
+        of shm journal replay, ranges carry update counters too so update_counter is not bumped here. seq_version
+        bytes of ranges are ignored. Returns update_counter after write
+        """
+        self.mutex_wrapper.lock()
+        self._begin_seq_write()
+        try:
+            md_container = self._mobile_book_struct
+            seq_version = md_container.seq_version
+            md_container_address = ctypes.addressof(md_container)
+            for offset, range_bytes in range_list:
+                ctypes.memmove(md_container_address + offset, range_bytes, len(range_bytes))
+            md_container.seq_version = seq_version
+            self.shm_root_ptr.shm_update_signature = EXPECTED_SHM_SIGNATURE
+            return md_container.update_counter
+        finally:
+            self._end_seq_write_n_unlock()
+
+    @staticmethod
+    def _get_epoch_or_zero(dt_val: pendulum.DateTime | None) -> int:
+        return get_epoch_from_pendulum_dt(dt_val) if dt_val is not None else 0
+
+    def _write_market_depth(self, md_container: MDContainer, market_depth_obj: MarketDepthMsgspec) -> bool:
+        # must be called with mutex held and seq write begun
+        side = market_depth_obj.side
+        if side == TickType.BID:
+            target_depth_list = md_container.bid_market_depth_list
+            target_level_update_counters = md_container.section_update_counters.bid_market_depth_list
+            side_char = b'B'
+        elif side == TickType.ASK:
+            target_depth_list = md_container.ask_market_depth_list
+            target_level_update_counters = md_container.section_update_counters.ask_market_depth_list
+            side_char = b'A'
+        else:
+            logging.error(f"Invalid side for market depth: {side}, skipping: {market_depth_obj}")
+            return False
+
+        position = market_depth_obj.position
+        if position is None or not 0 <= position < DEPTH_LVL:
+            logging.error(f"Invalid position for market depth: {position}, skipping: {market_depth_obj}")
+            return False
+        # else not required: valid position
+
+        md_struct = target_depth_list[position]
+        md_struct.id = market_depth_obj.id or 0
+        md_struct.symbol_ = self._encoded_symbol
+        md_struct.exch_time_ = self._get_epoch_or_zero(market_depth_obj.exch_time)
+        md_struct.arrival_time_ = self._get_epoch_or_zero(market_depth_obj.arrival_time)
+        md_struct.side_ = side_char
+        md_struct.position = position
+
+        px = market_depth_obj.px
+        md_struct.is_px_set_ = px is not None
+        if px is not None:
+            md_struct.px_ = px
+        qty = market_depth_obj.qty
+        md_struct.is_qty_set_ = qty is not None
+        if qty is not None:
+            md_struct.qty_ = qty
+        market_maker = market_depth_obj.market_maker
+        md_struct.is_market_maker_set_ = market_maker is not None
+        self._populate_string(md_struct, "market_maker_", market_maker)
+        is_smart_depth = market_depth_obj.is_smart_depth
+        md_struct.is_is_smart_depth_set_ = is_smart_depth is not None
+        if is_smart_depth is not None:
+            md_struct.is_smart_depth_ = is_smart_depth
+        cumulative_notional = market_depth_obj.cumulative_notional
+        md_struct.is_cumulative_notional_set_ = cumulative_notional is not None
+        if cumulative_notional is not None:
+            md_struct.cumulative_notional_ = cumulative_notional
+        cumulative_qty = market_depth_obj.cumulative_qty
+        md_struct.is_cumulative_qty_set_ = cumulative_qty is not None
+        if cumulative_qty is not None:
+            md_struct.cumulative_qty_ = cumulative_qty
+        cumulative_avg_px = market_depth_obj.cumulative_avg_px
+        md_struct.is_cumulative_avg_px_set_ = cumulative_avg_px is not None
+        if cumulative_avg_px is not None:
+            md_struct.cumulative_avg_px_ = cumulative_avg_px
+
+        target_level_update_counters[position] += 1
+        return True
+
+    def _write_quote(self, quote_struct: Quote, quote_obj: QuoteMsgspec):
+        px = quote_obj.px
+        quote_struct.is_px_set_ = px is not None
+        if px is not None:
+            quote_struct.px_ = px
+        qty = quote_obj.qty
+        quote_struct.is_qty_set_ = qty is not None
+        if qty is not None:
+            quote_struct.qty_ = qty
+        premium = quote_obj.premium
+        quote_struct.is_premium_set_ = premium is not None
+        if premium is not None:
+            quote_struct.premium_ = premium
+        last_update_date_time = quote_obj.last_update_date_time
+        quote_struct.is_last_update_date_time_set_ = last_update_date_time is not None
+        if last_update_date_time is not None:
+            quote_struct.last_update_date_time_ = get_epoch_from_pendulum_dt(last_update_date_time)
+
+    def _write_market_barter_volume(self, mtv_struct: MarketBarterVolume, mtv_obj: MarketBarterVolumeMsgspec):
+        self._populate_string(mtv_struct, "id_", mtv_obj.id)
+        qty_sum = mtv_obj.participation_period_last_barter_qty_sum
+        mtv_struct.is_participation_period_last_barter_qty_sum_set_ = qty_sum is not None
+        if qty_sum is not None:
+            mtv_struct.participation_period_last_barter_qty_sum_ = qty_sum
+        applicable_period_seconds = mtv_obj.applicable_period_seconds
+        mtv_struct.is_applicable_period_seconds_set_ = applicable_period_seconds is not None
+        if applicable_period_seconds is not None:
+            mtv_struct.applicable_period_seconds_ = applicable_period_seconds
+
+    def _write_top_of_book(self, md_container: MDContainer, top_of_book_obj: TopOfBookMsgspec) -> bool:
+        # must be called with mutex held and seq write begun
+        tob_struct = md_container.top_of_book
+        if top_of_book_obj.id is not None:
+            tob_struct.id = top_of_book_obj.id
+        # else keeping existing id
+
+        for quote_field_name in ("bid_quote", "ask_quote", "last_barter"):
+            quote_obj = getattr(top_of_book_obj, quote_field_name)
+            setattr(tob_struct, f"is_{quote_field_name}_set_", quote_obj is not None)
+            if quote_obj is not None:
+                self._write_quote(getattr(tob_struct, f"{quote_field_name}_"), quote_obj)
+            # else not required: flag cleared above
+
+        total_bartering_security_size = top_of_book_obj.total_bartering_security_size
+        tob_struct.is_total_bartering_security_size_set_ = total_bartering_security_size is not None
+        if total_bartering_security_size is not None:
+            tob_struct.total_bartering_security_size_ = total_bartering_security_size
+
+        market_barter_volume_list = top_of_book_obj.market_barter_volume
+        if market_barter_volume_list and market_barter_volume_list[0]:
+            self._write_market_barter_volume(tob_struct.market_barter_volume_, market_barter_volume_list[0])
+            tob_struct.is_market_barter_volume_set_ = True
+        else:
+            tob_struct.is_market_barter_volume_set_ = False
+
+        last_update_date_time = top_of_book_obj.last_update_date_time
+        tob_struct.is_last_update_date_time_set_ = last_update_date_time is not None
+        if last_update_date_time is not None:
+            tob_struct.last_update_date_time_ = get_epoch_from_pendulum_dt(last_update_date_time)
+
+        md_container.section_update_counters.top_of_book += 1
+        return True
+
+    def _write_last_barter(self, md_container: MDContainer, last_barter_obj: LastBarterMsgspec) -> bool:
+        # must be called with mutex held and seq write begun
+        lt_struct = md_container.last_barter
+        lt_struct.id = last_barter_obj.id or 0
+        lt_struct.symbol_n_exch_id.symbol_ = self._encoded_symbol
+        self._populate_string(lt_struct.symbol_n_exch_id, "exch_id_", last_barter_obj.symbol_n_exch_id.exch_id)
+        lt_struct.exch_time_ = self._get_epoch_or_zero(last_barter_obj.exch_time)
+        lt_struct.arrival_time_ = self._get_epoch_or_zero(last_barter_obj.arrival_time)
+        lt_struct.px = last_barter_obj.px or 0.0
+        lt_struct.qty = last_barter_obj.qty or 0
+        premium = last_barter_obj.premium
+        lt_struct.is_premium_set_ = premium is not None
+        if premium is not None:
+            lt_struct.premium_ = premium
+        market_barter_volume = last_barter_obj.market_barter_volume
+        lt_struct.is_market_barter_volume_set_ = market_barter_volume is not None
+        if market_barter_volume is not None:
+            self._write_market_barter_volume(lt_struct.market_barter_volume_, market_barter_volume)
+
+        md_container.section_update_counters.last_barter += 1
+        return True
+
     def _convert_c_mtv_to_msgspec_mtv(self, c_mtv: MarketBarterVolume) -> Optional[MarketBarterVolumeMsgspec]:
         if not c_mtv:
             return None
@@ -352,6 +579,33 @@ class MobileBookSharedMemoryProducer:
         )
 
     # --- Private _populate_* methods (identical to previous versions) ---
+    def _begin_seq_write(self):
+        # must be called with mutex held - odd seq_version tells seqlock readers a write is in progress
+        md_container = self._mobile_book_struct
+        if md_container.seq_version & 1:
+            # left odd by a writer that died mid-update - realign so the post-update value is even
+            md_container.seq_version += 1
+        md_container.seq_version += 1
+
+    def _end_seq_write_n_unlock(self):
+        # must be called with mutex held - even seq_version marks the container consistent again. Listener gets a
+        # copy taken under mutex and runs after unlock: its (file) io never holds consumers and its failures can't
+        # leave shared mutex locked
+        md_container_copy: MDContainer | None = None
+        try:
+            self._mobile_book_struct.seq_version += 1
+            if self.shm_write_listener is not None:
+                md_container_copy = MDContainer.from_buffer_copy(self._mobile_book_struct)
+            # else not required: no listener attached
+        finally:
+            self.mutex_wrapper.unlock()
+        if md_container_copy is not None:
+            try:
+                self.shm_write_listener(self.instrument_symbol, md_container_copy)
+            except Exception as e:
+                logging.exception(f"shm write listener failed for {self.instrument_symbol};;; exception: {e}")
+        # else not required: no listener attached
+
     def _populate_string(self, parent_struct: Structure, field_name_str: str, python_string: str):
         # ... (Implementation from previous correct version)
         try:
@@ -0,0 +1,229 @@
+# standard imports
+import atexit
+import ctypes
+import logging
+import struct
+import threading
+import time
+from typing import Dict, List, Tuple, Iterator, BinaryIO, Final
+
+# project imports
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_structure import MDContainer
+
+# journal layout: header (magic, version, MDContainer size) then records - each a record header (type, symbol
+# index, time.time_ns() timestamp, payload size) followed by payload. All little endian
+JOURNAL_MAGIC: Final[bytes] = b"MBSHMJNL"
+JOURNAL_VERSION: Final[int] = 1
+JOURNAL_HEADER_STRUCT: Final[struct.Struct] = struct.Struct("<8sII")
+RECORD_HEADER_STRUCT: Final[struct.Struct] = struct.Struct("<BHqI")
+RANGE_HEADER_STRUCT: Final[struct.Struct] = struct.Struct("<II")
+UPDATE_COUNTER_STRUCT: Final[struct.Struct] = struct.Struct("<q")
+
+# record types
+SYMBOL_RECORD: Final[int] = 1      # payload: utf-8 symbol - assigns next symbol index, precedes symbol's records
+SNAPSHOT_RECORD: Final[int] = 2    # payload: whole MDContainer image
+DELTA_RECORD: Final[int] = 3       # payload: (offset, size, bytes) ranges of MDContainer changed by one write
+MARK_RECORD: Final[int] = 4        # payload: update_counter replayer made visible at timestamp
+REACTION_RECORD: Final[int] = 5    # payload: update_counter consumer reacted to at timestamp
+
+MD_CONTAINER_SIZE: Final[int] = ctypes.sizeof(MDContainer)
+# seq_version is owned by whoever writes the segment - kept zero in journal images, replayer runs its own seqlock
+SEQ_VERSION_OFFSET: Final[int] = MDContainer.seq_version.offset
+SEQ_VERSION_SIZE: Final[int] = MDContainer.seq_version.size
+# granularity of write diffing - depth level / quote updates touch few blocks
+DIFF_BLOCK_SIZE: Final[int] = 64
+
+
+def get_md_container_image(md_container: MDContainer) -> bytearray:
+    """byte image of md_container with seq_version zeroed - caller must hold mutex or check seqlock"""
+    image = bytearray(ctypes.string_at(ctypes.addressof(md_container), MD_CONTAINER_SIZE))
+    image[SEQ_VERSION_OFFSET:SEQ_VERSION_OFFSET + SEQ_VERSION_SIZE] = bytes(SEQ_VERSION_SIZE)
+    return image
+
+
+def get_changed_range_list(prior_image: bytearray, image: bytearray,
+                           block_size: int = DIFF_BLOCK_SIZE) -> List[Tuple[int, bytes]]:
+    """(offset, bytes) of image blocks differing from prior_image, adjacent changed blocks merged"""
+    range_list: List[Tuple[int, bytes]] = []
+    range_start: int | None = None
+    image_size = len(image)
+    for block_start in range(0, image_size, block_size):
+        block_end = block_start + block_size
+        if prior_image[block_start:block_end] != image[block_start:block_end]:
+            if range_start is None:
+                range_start = block_start
+            # else not required: extending open range
+        elif range_start is not None:
+            range_list.append((range_start, bytes(image[range_start:block_start])))
+            range_start = None
+        # else not required: unchanged block outside any range
+    if range_start is not None:
+        range_list.append((range_start, bytes(image[range_start:image_size])))
+    # else not required: no open range at end
+    return range_list
+
+
+def encode_range_list(range_list: List[Tuple[int, bytes]]) -> bytes:
+    return b"".join(RANGE_HEADER_STRUCT.pack(offset, len(range_bytes)) + range_bytes
+                    for offset, range_bytes in range_list)
+
+
+def decode_range_list(payload: bytes) -> List[Tuple[int, bytes]]:
+    range_list: List[Tuple[int, bytes]] = []
+    position = 0
+    while position < len(payload):
+        offset, size = RANGE_HEADER_STRUCT.unpack_from(payload, position)
+        position += RANGE_HEADER_STRUCT.size
+        range_list.append((offset, payload[position:position + size]))
+        position += size
+    return range_list
+
+
+def get_range_list_from_record(record_type: int, payload: bytes) -> List[Tuple[int, bytes]]:
+    if record_type == SNAPSHOT_RECORD:
+        return [(0, payload)]
+    return decode_range_list(payload)
+
+
+class ShmJournalWriter:
+    def __init__(self, journal_path: str):
+        self.journal_path: str = journal_path
+        self.journal_file: BinaryIO = open(journal_path, "wb", buffering=1 << 20)
+        self.journal_file.write(JOURNAL_HEADER_STRUCT.pack(JOURNAL_MAGIC, JOURNAL_VERSION, MD_CONTAINER_SIZE))
+        self.symbol_to_index_dict: Dict[str, int] = {}
+        self.record_count: int = 0
+        # buffered records of processes exiting without close still reach the journal
+        atexit.register(self.close)
+
+    def _get_symbol_index(self, symbol: str, timestamp_ns: int) -> int:
+        symbol_index = self.symbol_to_index_dict.get(symbol)
+        if symbol_index is None:
+            symbol_index = self.symbol_to_index_dict[symbol] = len(self.symbol_to_index_dict)
+            self._write(SYMBOL_RECORD, symbol_index, timestamp_ns, symbol.encode())
+        # else not required: symbol already announced
+        return symbol_index
+
+    def _write(self, record_type: int, symbol_index: int, timestamp_ns: int, payload: bytes):
+        self.journal_file.write(RECORD_HEADER_STRUCT.pack(record_type, symbol_index, timestamp_ns, len(payload)))
+        self.journal_file.write(payload)
+        self.record_count += 1
+
+    def write_record(self, record_type: int, symbol: str, timestamp_ns: int, payload: bytes):
+        self._write(record_type, self._get_symbol_index(symbol, timestamp_ns), timestamp_ns, payload)
+
+    def write_update_counter_record(self, record_type: int, symbol: str, timestamp_ns: int, update_counter: int):
+        self.write_record(record_type, symbol, timestamp_ns, UPDATE_COUNTER_STRUCT.pack(update_counter))
+
+    def flush(self):
+        self.journal_file.flush()
+
+    def close(self):
+        if not self.journal_file.closed:
+            self.journal_file.close()
+        # else not required: already closed
+
+
+def read_journal(journal_path: str) -> Iterator[Tuple[int, str, int, bytes]]:
+    """yields (record_type, symbol, timestamp_ns, payload) of passed journal, symbol records are consumed"""
+    symbol_list: List[str] = []
+    with open(journal_path, "rb", buffering=1 << 20) as journal_file:
+        magic, version, md_container_size = JOURNAL_HEADER_STRUCT.unpack(
+            journal_file.read(JOURNAL_HEADER_STRUCT.size))
+        if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+            raise Exception(f"{journal_path} is not a v{JOURNAL_VERSION} mobile book shm journal;;; {magic=}, "
+                            f"{version=}")
+        if md_container_size != MD_CONTAINER_SIZE:
+            raise Exception(f"{journal_path} was recorded with MDContainer of {md_container_size} bytes, current "
+                            f"layout has {MD_CONTAINER_SIZE} - journal can't be replayed bit-for-bit")
+        # else not required: same layout
+        while record_header := journal_file.read(RECORD_HEADER_STRUCT.size):
+            if len(record_header) < RECORD_HEADER_STRUCT.size:
+                logging.warning(f"{journal_path} ends with truncated record header - recorder didn't close it")
+                return
+            record_type, symbol_index, timestamp_ns, payload_size = RECORD_HEADER_STRUCT.unpack(record_header)
+            payload = journal_file.read(payload_size)
+            if len(payload) < payload_size:
+                logging.warning(f"{journal_path} ends with truncated record payload - recorder didn't close it")
+                return
+            if record_type == SYMBOL_RECORD:
+                symbol_list.append(payload.decode())
+            else:
+                yield record_type, symbol_list[symbol_index], timestamp_ns, payload
+
+
+class ShmJournalRecorder:
+    """
+    records every committed md container write of attached MobileBookSharedMemoryProducer-s (listener gets copy
+    taken under producer's mutex at end of each seqlock write) - first write of a symbol as full snapshot, later ones as
+    changed byte ranges. poll_md_container records producers of other processes (cpp md app) by watching
+    update_counter - writes landing between two polls are coalesced into one record there
+    """
+
+    def __init__(self, journal_path: str):
+        self.journal_writer: ShmJournalWriter = ShmJournalWriter(journal_path)
+        self.symbol_to_image_dict: Dict[str, bytearray] = {}
+        # producers of different symbols may be written from different threads
+        self.record_lock: threading.Lock = threading.Lock()
+        # metrics
+        self.write_count: int = 0
+        self.recorded_byte_count: int = 0
+
+    def attach(self, producer):
+        producer.shm_write_listener = self.on_shm_write
+
+    def on_shm_write(self, symbol: str, md_container: MDContainer):
+        timestamp_ns = time.time_ns()
+        image = get_md_container_image(md_container)
+        with self.record_lock:
+            prior_image = self.symbol_to_image_dict.get(symbol)
+            if prior_image is None:
+                payload = bytes(image)
+                self.journal_writer.write_record(SNAPSHOT_RECORD, symbol, timestamp_ns, payload)
+            else:
+                payload = encode_range_list(get_changed_range_list(prior_image, image))
+                self.journal_writer.write_record(DELTA_RECORD, symbol, timestamp_ns, payload)
+            self.symbol_to_image_dict[symbol] = image
+            self.write_count += 1
+            self.recorded_byte_count += len(payload)
+
+    def poll_md_container(self, symbol: str, md_container: MDContainer, duration_secs: float):
+        """busy polls md_container (mapped view of other process's segment) for duration_secs"""
+        last_update_counter: int | None = None
+        end_time = time.perf_counter() + duration_secs
+        while time.perf_counter() < end_time:
+            update_counter = md_container.update_counter
+            if update_counter == last_update_counter:
+                continue
+            # else not required: producer committed new write(s)
+            start_seq_version = md_container.seq_version
+            if start_seq_version & 1:
+                continue
+            # else not required: no write in progress
+            image = get_md_container_image(md_container)
+            if md_container.seq_version != start_seq_version:
+                continue
+            # else not required: consistent copy - recorded from same image as in-process writes
+            self.on_shm_write(symbol, MDContainer.from_buffer(image))
+            last_update_counter = update_counter
+
+    def close(self):
+        with self.record_lock:
+            self.journal_writer.close()
+        logging.info(f"shm journal {self.journal_writer.journal_path} closed;;; {self.write_count=}, "
+                     f"{self.recorded_byte_count=}, symbols: {list(self.journal_writer.symbol_to_index_dict)}")
+
+
+class ShmReactionRecorder:
+    """
+    consumer side probe - journals (symbol, update_counter) of every md update consumer reacted to, replay report
+    joins these with replayer's write marks to get write-to-reaction latency per update
+    """
+
+    def __init__(self, journal_path: str):
+        self.journal_writer: ShmJournalWriter = ShmJournalWriter(journal_path)
+
+    def record(self, symbol: str, update_counter: int):
+        self.journal_writer.write_update_counter_record(REACTION_RECORD, symbol, time.time_ns(), update_counter)
+
+    def close(self):
+        self.journal_writer.close()
@@ -0,0 +1,261 @@
+# MobileBookShmReplay.py
+# record / replay / report harness over mobile book shm journals (see mobile_book_shm_journal):
+#   record - polls symbols' shm segments (or arena slots) written by another process into a journal - exact
+#            in-process recording of mobile_book's producers is enabled by its md_shm_journal_path config instead
+#   replay - drives journal writes bit-for-bit into fresh segments of same layout at original (--speed 1),
+#            accelerated (--speed N) or max (--speed 0) pace, journaling a write mark per replayed update
+#   report - joins write marks with consumer reaction journals (ShmReactionRecorder) per run and compares
+#            write-to-reaction latency across runs, first run is baseline
+
+import argparse
+import ctypes
+import logging
+import mmap
+import os
+import statistics
+import time
+from typing import Dict, List, Tuple, Any
+
+import posix_ipc  # type: ignore
+
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_structure import (
+    MDSharedMemoryContainer)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_shared_memory_arena import (
+    MobileBookSharedMemoryArena)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_shared_memory_producer import (
+    MobileBookSharedMemoryProducer)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_shm_journal import (
+    ShmJournalRecorder, ShmJournalWriter, read_journal, get_range_list_from_record, get_md_container_image,
+    SNAPSHOT_RECORD, DELTA_RECORD, MARK_RECORD, REACTION_RECORD, UPDATE_COUNTER_STRUCT)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# remaining wait below which replay pacing spins instead of sleeping - sleep overshoots by ~50-100 us
+SPIN_WAIT_NS: int = 200_000
+
+
+class ShmJournalReplayer:
+    """
+    replays journal's SNAPSHOT/DELTA records through MobileBookSharedMemoryProducer.write_md_container_ranges
+    - same lock + seqlock protocol as live producer, resulting MDContainer bytes equal recorded ones (except
+    seq_version). speed None/0 replays back to back, else record gaps are divided by speed
+    """
+
+    def __init__(self, journal_path: str, speed: float | None = 1.0, arena_name: str | None = None,
+                 arena_capacity: int = 64, mark_journal_path: str | None = None, sem_name: str | None = None):
+        self.journal_path: str = journal_path
+        self.speed: float | None = speed or None
+        self.arena: MobileBookSharedMemoryArena | None = \
+            MobileBookSharedMemoryArena(arena_name, arena_capacity) if arena_name else None
+        self.mark_journal_writer: ShmJournalWriter | None = \
+            ShmJournalWriter(mark_journal_path) if mark_journal_path else None
+        # posted once per replayed write for consumers waiting on md semaphore instead of polling
+        self.semaphore: posix_ipc.Semaphore | None = \
+            posix_ipc.Semaphore(sem_name, flags=posix_ipc.O_CREAT) if sem_name else None
+        self.symbol_to_producer_dict: Dict[str, MobileBookSharedMemoryProducer] = {}
+        # metrics
+        self.replayed_write_count: int = 0
+        self.max_lag_ns: int = 0
+        self.total_lag_ns: int = 0
+
+    def _get_producer(self, symbol: str) -> MobileBookSharedMemoryProducer:
+        producer = self.symbol_to_producer_dict.get(symbol)
+        if producer is None:
+            producer = self.symbol_to_producer_dict[symbol] = MobileBookSharedMemoryProducer(symbol, self.arena)
+        # else not required: segment already set up
+        return producer
+
+    def run(self) -> Dict[str, Any]:
+        first_record_time_ns: int | None = None
+        replay_start_ns = time.perf_counter_ns()
+        for record_type, symbol, timestamp_ns, payload in read_journal(self.journal_path):
+            if record_type not in (SNAPSHOT_RECORD, DELTA_RECORD):
+                continue
+            # else not required: md write record
+            producer = self._get_producer(symbol)
+            if self.speed is not None:
+                if first_record_time_ns is None:
+                    first_record_time_ns = timestamp_ns
+                    replay_start_ns = time.perf_counter_ns()
+                # else not required: pacing against first record
+                due_ns = replay_start_ns + int((timestamp_ns - first_record_time_ns) / self.speed)
+                while (wait_ns := due_ns - time.perf_counter_ns()) > 0:
+                    if wait_ns > SPIN_WAIT_NS:
+                        time.sleep((wait_ns - SPIN_WAIT_NS) / 1_000_000_000)
+                    # else not required: spinning out last stretch
+                lag_ns = time.perf_counter_ns() - due_ns
+                self.total_lag_ns += lag_ns
+                self.max_lag_ns = max(self.max_lag_ns, lag_ns)
+            # else not required: max speed
+            update_counter = producer.write_md_container_ranges(get_range_list_from_record(record_type, payload))
+            if self.mark_journal_writer is not None:
+                self.mark_journal_writer.write_update_counter_record(MARK_RECORD, symbol, time.time_ns(),
+                                                                     update_counter)
+            # else not required: no reaction report requested
+            if self.semaphore is not None:
+                self.semaphore.release()
+            # else not required: consumers poll
+            self.replayed_write_count += 1
+        replay_secs = (time.perf_counter_ns() - replay_start_ns) / 1_000_000_000
+        metrics = {"replayed_write_count": self.replayed_write_count, "replay_secs": replay_secs,
+                   "writes_per_sec": self.replayed_write_count / replay_secs if replay_secs else 0.0,
+                   "mean_lag_us": (self.total_lag_ns / self.replayed_write_count / 1000
+                                   if self.speed is not None and self.replayed_write_count else 0.0),
+                   "max_lag_us": self.max_lag_ns / 1000}
+        logging.info(f"replayed {self.journal_path} at {f'{self.speed}x' if self.speed else 'max'} speed;;; {metrics}")
+        return metrics
+
+    def verify(self) -> bool:
+        """True if every replayed segment holds bytes of journal's last write of its symbol"""
+        symbol_to_image_dict: Dict[str, bytearray] = {}
+        for record_type, symbol, _, payload in read_journal(self.journal_path):
+            if record_type in (SNAPSHOT_RECORD, DELTA_RECORD):
+                image = symbol_to_image_dict.setdefault(symbol, bytearray(len(payload)))
+                for offset, range_bytes in get_range_list_from_record(record_type, payload):
+                    image[offset:offset + len(range_bytes)] = range_bytes
+            # else not required: not a write record
+        is_identical = True
+        for symbol, image in symbol_to_image_dict.items():
+            producer = self.symbol_to_producer_dict.get(symbol)
+            if producer is None or get_md_container_image(producer._mobile_book_struct) != image:
+                logging.error(f"replayed shm of {symbol} differs from journal {self.journal_path}")
+                is_identical = False
+            # else not required: bit-for-bit identical
+        return is_identical
+
+    def close(self, unlink: bool = False):
+        if self.mark_journal_writer is not None:
+            self.mark_journal_writer.close()
+        # else not required: no mark journal
+        for producer in self.symbol_to_producer_dict.values():
+            if unlink or self.arena is not None:
+                producer.close()
+            # else not required: segments stay up for consumers - producer close unlinks them
+        if self.arena is not None:
+            if unlink:
+                self.arena.unlink()
+            # else not required: arena stays up for consumers
+            self.arena.close()
+        # else not required: per symbol segments
+        if self.semaphore is not None:
+            self.semaphore.close()
+        # else not required: no semaphore
+
+
+def map_md_shared_memory_container(symbol: str, arena: MobileBookSharedMemoryArena | None
+                                   ) -> Tuple[mmap.mmap, MDSharedMemoryContainer]:
+    # same mapping consumers (SymbolCacheContainer) use
+    if arena is not None:
+        slot_offset = arena.get_slot_offset(symbol)
+        if slot_offset is None:
+            raise Exception(f"no slot for {symbol} in md shm arena {arena.shm_name}")
+        return arena.mmap_obj, MDSharedMemoryContainer.from_buffer(arena.mmap_obj, slot_offset)
+    shm_fd = os.open(f"/dev/shm/{symbol}", os.O_RDWR)
+    try:
+        shm = mmap.mmap(shm_fd, ctypes.sizeof(MDSharedMemoryContainer), mmap.MAP_SHARED,
+                        mmap.PROT_READ | mmap.PROT_WRITE)
+    finally:
+        os.close(shm_fd)
+    return shm, MDSharedMemoryContainer.from_buffer(shm)
+
+
+def get_symbol_n_update_counter_to_time_ns_dict(journal_path: str, record_type: int) -> Dict[Tuple[str, int], int]:
+    # first record of each (symbol, update_counter) - consumers may react to same update more than once
+    key_to_time_ns_dict: Dict[Tuple[str, int], int] = {}
+    for record_type_, symbol, timestamp_ns, payload in read_journal(journal_path):
+        if record_type_ == record_type:
+            key_to_time_ns_dict.setdefault((symbol, UPDATE_COUNTER_STRUCT.unpack(payload)[0]), timestamp_ns)
+        # else not required: other record type
+    return key_to_time_ns_dict
+
+
+def get_reaction_summary(mark_journal_path: str, reaction_journal_path: str) -> Dict[str, Any]:
+    """
+    write-to-reaction latency of every replayed update consumer reacted to - updates without reaction were
+    coalesced (consumer read a later update first) or dropped
+    """
+    mark_dict = get_symbol_n_update_counter_to_time_ns_dict(mark_journal_path, MARK_RECORD)
+    reaction_dict = get_symbol_n_update_counter_to_time_ns_dict(reaction_journal_path, REACTION_RECORD)
+    latency_us_list = sorted((reaction_dict[key] - mark_time_ns) / 1000
+                             for key, mark_time_ns in mark_dict.items() if key in reaction_dict)
+    summary: Dict[str, Any] = {"write_count": len(mark_dict), "reacted_count": len(latency_us_list),
+                               "missed_count": len(mark_dict) - len(latency_us_list)}
+    if latency_us_list:
+        summary.update({
+            "mean_us": statistics.fmean(latency_us_list),
+            "p50_us": latency_us_list[int(0.50 * (len(latency_us_list) - 1))],
+            "p90_us": latency_us_list[int(0.90 * (len(latency_us_list) - 1))],
+            "p99_us": latency_us_list[int(0.99 * (len(latency_us_list) - 1))],
+            "max_us": latency_us_list[-1]})
+    # else not required: nothing to summarize
+    return summary
+
+
+def log_reaction_report(run_list: List[Tuple[str, str, str]]) -> Dict[str, Dict[str, Any]]:
+    """run_list: (run_name, mark_journal_path, reaction_journal_path) - first run is baseline of deltas"""
+    run_name_to_summary_dict: Dict[str, Dict[str, Any]] = {}
+    baseline_summary: Dict[str, Any] | None = None
+    for run_name, mark_journal_path, reaction_journal_path in run_list:
+        summary = get_reaction_summary(mark_journal_path, reaction_journal_path)
+        run_name_to_summary_dict[run_name] = summary
+        latency_str = ", ".join(
+            f"{key.removesuffix('_us')}={summary[key]:,.1f}us"
+            f"{f' ({summary[key] - baseline_summary[key]:+,.1f})' if baseline_summary and key in baseline_summary else ''}"
+            for key in ("mean_us", "p50_us", "p90_us", "p99_us", "max_us") if key in summary)
+        logging.info(f"{run_name}: reacted to {summary['reacted_count']:,}/{summary['write_count']:,} writes "
+                     f"({summary['missed_count']:,} coalesced/missed); {latency_str}")
+        if baseline_summary is None:
+            baseline_summary = summary
+        # else not required: baseline already set
+    return run_name_to_summary_dict
+
+
+def main():
+    parser = argparse.ArgumentParser(description="mobile book shm journal record / replay / reaction report")
+    sub_parsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = sub_parsers.add_parser("record", help="poll shm of symbol written by another process")
+    record_parser.add_argument("--symbol", type=str, required=True)
+    record_parser.add_argument("--journal", type=str, required=True)
+    record_parser.add_argument("--duration", type=float, default=60.0, help="seconds to record")
+    record_parser.add_argument("--arena_name", type=str, default=None)
+
+    replay_parser = sub_parsers.add_parser("replay", help="replay journal into fresh shm")
+    replay_parser.add_argument("--journal", type=str, required=True)
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="1 original, N accelerated, 0 max")
+    replay_parser.add_argument("--mark_journal", type=str, default=None, help="write marks for reaction report")
+    replay_parser.add_argument("--arena_name", type=str, default=None)
+    replay_parser.add_argument("--arena_capacity", type=int, default=64)
+    replay_parser.add_argument("--sem_name", type=str, default=None, help="semaphore posted per replayed write")
+    replay_parser.add_argument("--verify", action="store_true", help="check replayed shm bytes against journal")
+    replay_parser.add_argument("--unlink", action="store_true", help="remove replayed shm once done")
+
+    report_parser = sub_parsers.add_parser("report", help="compare consumer reaction times between runs")
+    report_parser.add_argument("--run", nargs=3, action="append", required=True,
+                               metavar=("RUN_NAME", "MARK_JOURNAL", "REACTION_JOURNAL"))
+    args = parser.parse_args()
+
+    if args.command == "record":
+        arena = MobileBookSharedMemoryArena(args.arena_name) if args.arena_name else None
+        shm, md_shared_memory_container = map_md_shared_memory_container(args.symbol, arena)
+        recorder = ShmJournalRecorder(args.journal)
+        try:
+            recorder.poll_md_container(args.symbol, md_shared_memory_container.mobile_book_container, args.duration)
+        finally:
+            recorder.close()
+    elif args.command == "replay":
+        replayer = ShmJournalReplayer(args.journal, args.speed, args.arena_name, args.arena_capacity,
+                                      args.mark_journal, args.sem_name)
+        try:
+            replayer.run()
+            if args.verify:
+                logging.info(f"bit-for-bit verification {'passed' if replayer.verify() else 'FAILED'}")
+            # else not required: verification not requested
+        finally:
+            replayer.close(args.unlink)
+    else:
+        log_reaction_report([tuple(run) for run in args.run])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 # standard imports
 from typing import Dict, Any, List, ClassVar, Tuple, Final
 from ctypes import *
+from functools import lru_cache
 import os
 
 # 3rd party imports
@@ -526,9 +527,26 @@ class SymbolOverview(Structure): # Renamed to avoid potential import conflicts
         return self.force_publish_ if self.is_force_publish_set_ else None
 
 
+class MDSectionUpdateCounters(Structure):
+    """
+    per-section update counters of MDContainer - writer bumps a section's counter after every change to that
+    section, readers compare against counters of their last copy and copy only the sections that moved
+    """
+    _fields_ = [
+        ("last_barter", c_uint64),
+        ("top_of_book", c_uint64),
+        ("bid_market_depth_list", c_uint64 * DEPTH_LVL),
+        ("ask_market_depth_list", c_uint64 * DEPTH_LVL),
+        ("symbol_overview", c_uint64)
+    ]
+
+
 class MDContainer(Structure):
     _fields_ = [
         ("update_counter", c_int64),
+        # seqlock version: odd while a writer is updating this container, even once the update is complete
+        ("seq_version", c_uint64),
+        ("section_update_counters", MDSectionUpdateCounters),
         ("symbol_", c_char * MAX_STRING_LENGTH),
         ("last_barter", LastBarter),
         ("top_of_book", TopOfBook),
@@ -563,3 +581,28 @@ class MDSharedMemoryContainer(Structure):
     def __str__(self):
         return (f"MDSharedMemoryContainer(signature={hex(self.shm_update_signature)}, "
                 f"mobile_book_container={str(self.mobile_book_container)})")
+
+
+class MDSharedMemoryArenaHeader(Structure):
+    """
+    Header of multi-symbol shared memory arena. Slots follow the header, each slot is a
+    MDSharedMemoryContainer with its own signature, mutex and seq_version. table_mutex
+    guards slot allocation across producers.
+    """
+    _fields_ = [
+        ("arena_signature", c_uint64),
+        ("capacity", c_uint32),
+        ("slot_count", c_uint32),
+        ("table_mutex", pthread_mutex_t)
+    ]
+
+
+@lru_cache(maxsize=None)
+def get_md_shared_memory_arena_type(capacity: int):
+    class MDSharedMemoryArena(Structure):
+        _fields_ = [
+            ("header", MDSharedMemoryArenaHeader),
+            ("slots", MDSharedMemoryContainer * capacity)
+        ]
+
+    return MDSharedMemoryArena
@@ -0,0 +1,94 @@
+# ShmSeqlockContentionBenchmark.py
+# compares mutex vs seqlock shm reads while a producer hammers the same symbol's shm with depth updates
+
+import argparse
+import logging
+import multiprocessing
+import time
+
+import posix_ipc  # type: ignore
+
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_shared_memory_producer import (
+    MobileBookSharedMemoryProducer)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_shared_memory_consumer import (
+    SymbolCacheContainer)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.mobile_book.app.mobile_book_structure import DEPTH_LVL, TickType
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def run_writer(symbol: str, duration_sec: float, start_event, result_queue):
+    producer = MobileBookSharedMemoryProducer(symbol)
+    now_ns = producer._now_ns()
+    write_count = 0
+    start_event.wait()
+    end_time = time.perf_counter() + duration_sec
+    while time.perf_counter() < end_time:
+        position = write_count % DEPTH_LVL
+        side = TickType.BID if (write_count // DEPTH_LVL) % 2 == 0 else TickType.ASK
+        producer.update_market_depth_shm(md_id=write_count, side=side, position=position, px=100.0 + position,
+                                         qty=write_count, exch_time_ns=now_ns, arrival_time_ns=now_ns)
+        write_count += 1
+    result_queue.put(("writer", write_count, 0))
+    producer.close()
+
+
+def run_reader(symbol: str, seqlock_read: bool, duration_sec: float, start_event, result_queue):
+    SymbolCacheContainer.shm_seqlock_read = seqlock_read
+    while not SymbolCacheContainer.check_if_shared_memory_exists(symbol):
+        time.sleep(0.01)
+    read_count = 0
+    start_event.wait()
+    end_time = time.perf_counter() + duration_sec
+    while time.perf_counter() < end_time:
+        if SymbolCacheContainer.get_md_container(symbol) is not None:
+            read_count += 1
+        # else not required: signature not yet set by writer
+    result_queue.put(("reader", read_count, SymbolCacheContainer.shm_seqlock_retry_counts))
+
+
+def run_mode(symbol: str, seqlock_read: bool, reader_count: int, duration_sec: float) -> None:
+    start_event = multiprocessing.Event()
+    result_queue = multiprocessing.Queue()
+    writer = multiprocessing.Process(target=run_writer, args=(symbol, duration_sec, start_event, result_queue))
+    writer.start()
+    time.sleep(0.5)     # lets producer create shm before readers map it
+    readers = [multiprocessing.Process(target=run_reader,
+                                       args=(symbol, seqlock_read, duration_sec, start_event, result_queue))
+               for _ in range(reader_count)]
+    for reader in readers:
+        reader.start()
+    time.sleep(0.5)
+    start_event.set()
+
+    write_count = read_count = retry_count = 0
+    for _ in range(reader_count + 1):
+        role, count, retries = result_queue.get()
+        if role == "writer":
+            write_count = count
+        else:
+            read_count += count
+            retry_count += retries
+    writer.join()
+    for reader in readers:
+        reader.join()
+    try:
+        posix_ipc.unlink_shared_memory(f"/{symbol}")
+    except posix_ipc.ExistentialError:
+        pass
+
+    mode = "seqlock" if seqlock_read else "mutex"
+    logging.info(f"{mode:>7}: writes/sec={write_count / duration_sec:,.0f}, "
+                 f"reads/sec={read_count / duration_sec:,.0f} across {reader_count} reader(s), "
+                 f"seqlock retries={retry_count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark mutex vs seqlock reads of mobile book shared memory.")
+    parser.add_argument("--symbol", type=str, default="SEQLOCK_BENCH")
+    parser.add_argument("--readers", type=int, default=2, help="Number of concurrent reader processes.")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per mode.")
+    args = parser.parse_args()
+
+    for is_seqlock_read in (False, True):
+        run_mode(args.symbol, is_seqlock_read, args.readers, args.duration)
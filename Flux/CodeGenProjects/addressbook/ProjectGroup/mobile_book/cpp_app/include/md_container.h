@@ -2,6 +2,9 @@
 
 #include <iostream>
 #include <array>
+#include <atomic>
+#include <cstddef>
+#include <cstring>
 
 #include "../../../mobile_book/generated/CppUtilGen/mobile_book_service_shared_data_structure.h"
 #include "../../../mobile_book/generated/CppUtilGen/mobile_book_constants.h"
@@ -9,9 +12,22 @@
 
 constexpr auto MARKET_DEPTH_LEVEL = 10;
 
+// per-section update counters of MDContainer - writer bumps a section's counter on every change to that section,
+// readers compare against counters of their last copy and copy only the sections that moved
+template<size_t N>
+struct MDSectionUpdateCounters {
+    uint64_t last_barter_;
+    uint64_t top_of_book_;
+    std::array<uint64_t, N> bid_market_depths_;
+    std::array<uint64_t, N> ask_market_depths_;
+};
+
 template<size_t N>
 struct MDContainer {
     int64_t update_counter;
+    // seqlock version: odd while a writer is updating this container in shm, even once the update is complete
+    uint64_t seq_version;
+    MDSectionUpdateCounters<N> section_update_counters_;
     char symbol_[mobile_book_handler::MAX_STRING_LENGTH];
     LastBarterQueueElement last_barter_;
     TopOfBookQueueElement top_of_book_;
@@ -19,3 +35,24 @@ struct MDContainer {
     std::array<MarketDepthQueueElement, N> ask_market_depths_;
 };
 
+// copies kr_src into shm resident r_dest, wrapping the copy in seq_version odd/even bumps so lock-free readers
+// can detect torn reads - r_dest keeps its own seq_version, the one in kr_src (process local cache) is ignored
+template<size_t N>
+void seqlock_copy_md_container(MDContainer<N>& r_dest, const MDContainer<N>& kr_src) {
+    std::atomic_ref<uint64_t> seq_version(r_dest.seq_version);
+    uint64_t start_version = seq_version.load(std::memory_order_relaxed);
+    if (start_version & 1) {
+        // left odd by a writer that died mid-update - realign so the post-update value is even
+        ++start_version;
+    }
+    seq_version.store(start_version + 1, std::memory_order_relaxed);
+    std::atomic_thread_fence(std::memory_order_release);
+
+    r_dest.update_counter = kr_src.update_counter;
+    constexpr size_t k_body_offset = offsetof(MDContainer<N>, section_update_counters_);
+    std::memcpy(reinterpret_cast<char*>(&r_dest) + k_body_offset,
+        reinterpret_cast<const char*>(&kr_src) + k_body_offset, sizeof(MDContainer<N>) - k_body_offset);
+
+    seq_version.store(start_version + 2, std::memory_order_release);
+}
+
@@ -10,5 +10,11 @@ struct ShmSymbolCache {
     [[nodiscard]] bool is_data_set() const {
         return m_leg_2_data_shm_cache_.update_counter != 0 || m_leg_1_data_shm_cache_.update_counter!= 0;
     }
+
+    // used by SharedMemoryManager instead of plain memcpy so each leg's seq_version guards its own copy
+    static void seqlock_copy(ShmSymbolCache& r_dest, const ShmSymbolCache& kr_src) {
+        seqlock_copy_md_container(r_dest.m_leg_1_data_shm_cache_, kr_src.m_leg_1_data_shm_cache_);
+        seqlock_copy_md_container(r_dest.m_leg_2_data_shm_cache_, kr_src.m_leg_2_data_shm_cache_);
+    }
 };
 
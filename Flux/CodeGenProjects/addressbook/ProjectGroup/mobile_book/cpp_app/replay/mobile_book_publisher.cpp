@@ -663,15 +663,24 @@ template<size_t N>
 void MobileBookPublisher::update_market_depth_cache(const MarketDepthQueueElement& kr_market_depth_queue_element,
 	MDContainer<N>& r_mobile_book_cache_out) const {
 
+    // cumulative fields get recomputed from this position till last level - all of them are marked changed
+    auto& r_section_update_counters = r_mobile_book_cache_out.section_update_counters_;
     if (kr_market_depth_queue_element.side_ == 'B') {
         r_mobile_book_cache_out.bid_market_depths_[kr_market_depth_queue_element.position_] = kr_market_depth_queue_element;
+        for (size_t i = kr_market_depth_queue_element.position_; i < N; ++i) {
+            ++r_section_update_counters.bid_market_depths_[i];
+        }
     }
 
     if (kr_market_depth_queue_element.side_ == 'A') {
         r_mobile_book_cache_out.ask_market_depths_[kr_market_depth_queue_element.position_] = kr_market_depth_queue_element;
+        for (size_t i = kr_market_depth_queue_element.position_; i < N; ++i) {
+            ++r_section_update_counters.ask_market_depths_[i];
+        }
     }
 
     if (kr_market_depth_queue_element.position_ == 0) {
+        ++r_section_update_counters.top_of_book_;
         r_mobile_book_cache_out.top_of_book_.id_ = kr_market_depth_queue_element.id_;
         FluxCppCore::StringUtil::setString(r_mobile_book_cache_out.top_of_book_.symbol_,  kr_market_depth_queue_element.symbol_);
         r_mobile_book_cache_out.top_of_book_.last_update_date_time_ = kr_market_depth_queue_element.exch_time_;
@@ -709,6 +718,9 @@ void MobileBookPublisher::update_market_depth_cache(const MarketDepthQueueElemen
 template<size_t N>
 void MobileBookPublisher::update_last_barter_cache(const LastBarterQueueElement& kr_last_barter_queue_element,
 	MDContainer<N>& r_mobile_book_cache_out) const {
+	++r_mobile_book_cache_out.section_update_counters_.last_barter_;
+	++r_mobile_book_cache_out.section_update_counters_.top_of_book_;
+
 	// LastBarter
 	r_mobile_book_cache_out.last_barter_ = kr_last_barter_queue_element;
 
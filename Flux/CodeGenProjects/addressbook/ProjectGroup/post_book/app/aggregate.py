@@ -21,6 +21,22 @@ def get_open_chore_counts():
         }]}
 
 
+def get_chore_ledgers_of_last_n_sec(last_n_sec: int):
+    # Model - chore ledger
+    return {"agg": [
+        {
+            "$match": {
+                "$expr": {
+                    "$gte": [
+                        "$chore_event_date_time",
+                        {"$dateSubtract": {"startDate": "$$NOW", "unit": "second", "amount": last_n_sec}}
+                    ]
+                }
+            }
+        }
+    ]}
+
+
 def get_last_n_sec_chores_by_events(last_n_sec: int, chore_event_list: List[str]):
     agg_query: Dict[str, Any] = {"agg": [
         {
@@ -0,0 +1,65 @@
+# standard imports
+import logging
+
+# project imports
+from FluxPythonUtils.scripts.ws_reader import WSReader
+from Flux.PyCodeGenEngine.FluxCodeGenCore.generic_web_client import async_generic_http_get_client
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.phone_book.app.phone_book_service_helper import (
+    email_book_service_http_client)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.phone_book.generated.ORMModel.email_book_service_model_imports import (
+    ContactLimitsBaseModel, ContactLimitsBaseModelList, ContactStatusBaseModel)
+
+
+class ContactLimitsCache:
+    """
+    contact limit check inputs without blocking the event loop: ContactLimits is cached and refreshed by phone_book
+    get-contact_limits-ws push (http fetched only till first push or while ws is disconnected), ContactStatus moves
+    with every chore so it is fetched per check - over pooled keep-alive async web client
+    """
+
+    def __init__(self, contact_limits_id: int = 1, contact_status_id: int = 1):
+        self.contact_limits_id: int = contact_limits_id
+        self.contact_status_id: int = contact_status_id
+        self.contact_limits: ContactLimitsBaseModel | None = None
+        port = (email_book_service_http_client.view_port if email_book_service_http_client.view_port
+                else email_book_service_http_client.port)
+        self.contact_limits_ws_uri: str = (f"ws://{email_book_service_http_client.host}:{port}/phone_book/"
+                                           f"get-contact_limits-ws/{contact_limits_id}?need_initial_snapshot=true")
+        self.contact_limits_ws_cont: WSReader | None = None
+
+    def handle_contact_limits_get_by_id_ws(self, contact_limits_: ContactLimitsBaseModel, **kwargs):
+        self.contact_limits = contact_limits_
+        logging.debug(f"Updated contact_limits cache from ws;;; {contact_limits_=}")
+
+    def register_contact_limits_ws(self):
+        """registers contact_limits ws reader - caller runs WSReader.start thread"""
+        self.contact_limits_ws_cont = WSReader(self.contact_limits_ws_uri, ContactLimitsBaseModel,
+                                               ContactLimitsBaseModelList, self.handle_contact_limits_get_by_id_ws,
+                                               notify=False)
+        self.contact_limits_ws_cont.register_to_run()
+
+    def reconnect_contact_limits_ws_if_disconnected(self):
+        if self.contact_limits_ws_cont is not None and self.contact_limits_ws_cont.force_disconnected:
+            # pushes missed while disconnected are covered by initial snapshot of new connection
+            ws_cont = self.contact_limits_ws_cont
+            self.contact_limits_ws_cont = WSReader(ws_cont.uri, ws_cont.ModelClassType, ws_cont.ModelClassTypeList,
+                                                   ws_cont.callback, notify=False)
+            self.contact_limits_ws_cont.new_register_to_run()
+            ws_cont.expired = True
+        # else not required: ws not registered or still connected
+
+    def is_contact_limits_ws_live(self) -> bool:
+        return self.contact_limits_ws_cont is not None and not self.contact_limits_ws_cont.force_disconnected
+
+    async def get_contact_limits(self) -> ContactLimitsBaseModel:
+        if self.contact_limits is None or not self.is_contact_limits_ws_live():
+            self.contact_limits = await async_generic_http_get_client(
+                email_book_service_http_client.get_contact_limits_client_url, self.contact_limits_id,
+                ContactLimitsBaseModel)
+        # else not required: ws pushed contact_limits is current
+        return self.contact_limits
+
+    async def get_contact_status(self) -> ContactStatusBaseModel:
+        return await async_generic_http_get_client(
+            email_book_service_http_client.get_contact_status_client_url, self.contact_status_id,
+            ContactStatusBaseModel)
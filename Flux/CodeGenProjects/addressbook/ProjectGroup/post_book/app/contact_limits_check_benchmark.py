@@ -0,0 +1,108 @@
+# ContactLimitsCheckBenchmark.py
+# burst of chore events through post_book's contact limit check path - former pattern (per plan sequential
+# ledger -> snapshot -> brief writes, each a blocking loop round trip, then blocking http get of contact_limits and
+# contact_status inside the check coroutine) vs current pattern (all plan writes gathered in one round trip, ws cached
+# contact_limits, contact_status over async client); db and phone_book latencies are simulated (--db_write_ms,
+# --http_ms) - reports burst drain time and p50/max latency of a probe coroutine standing in for http routes served
+# by the same event loop
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from threading import Thread
+from typing import List
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class SimulatedPostBook:
+    def __init__(self, loop: asyncio.AbstractEventLoop, db_write_sec: float, http_sec: float):
+        self.loop = loop
+        self.db_write_sec = db_write_sec
+        self.http_sec = http_sec
+        self.cached_contact_limits = {"max_open_baskets": 100}
+
+    async def db_write(self):
+        await asyncio.sleep(self.db_write_sec)
+
+    def blocking_http_get(self):
+        time.sleep(self.http_sec)  # sync client call inside coroutine stalls the loop
+
+    async def async_http_get(self):
+        await asyncio.sleep(self.http_sec)
+
+    def run_blocking(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    # former pattern
+    def legacy_handle_burst(self, plan_count: int):
+        for _ in range(plan_count):
+            self.run_blocking(self.db_write())  # chore_ledgers
+            self.run_blocking(self.db_write())  # chore_snapshots
+            self.run_blocking(self.db_write())  # plan_brief
+        self.run_blocking(self.legacy_check_all_contact_limits())
+
+    async def legacy_check_all_contact_limits(self):
+        self.blocking_http_get()  # contact_limits
+        self.blocking_http_get()  # contact_status
+
+    # current pattern
+    async def update_db_of_plans(self, plan_count: int):
+        await asyncio.gather(*[asyncio.gather(self.db_write(), self.db_write(), self.db_write())
+                               for _ in range(plan_count)])
+
+    def handle_burst(self, plan_count: int):
+        self.run_blocking(self.update_db_of_plans(plan_count))
+        self.run_blocking(self.check_all_contact_limits())
+
+    async def check_all_contact_limits(self):
+        await self.async_http_get()  # contact_status - contact_limits read from ws pushed cache
+        return self.cached_contact_limits
+
+
+async def probe_loop_latency(probe_interval_sec: float, probe_latency_list: List[float], stop_event: asyncio.Event):
+    while not stop_event.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(probe_interval_sec)
+        probe_latency_list.append(time.perf_counter() - start - probe_interval_sec)
+
+
+def run_case(name: str, post_book: SimulatedPostBook, handle_burst, burst_count: int, plan_count: int) -> None:
+    probe_latency_list: List[float] = []
+    stop_event = asyncio.Event()
+    probe_future = asyncio.run_coroutine_threadsafe(probe_loop_latency(0.001, probe_latency_list, stop_event),
+                                                    post_book.loop)
+    burst_latency_list: List[float] = []
+    for _ in range(burst_count):
+        start = time.perf_counter()
+        handle_burst(plan_count)
+        burst_latency_list.append(time.perf_counter() - start)
+    post_book.loop.call_soon_threadsafe(stop_event.set)
+    probe_future.result()
+    probe_latency_list.sort()
+    logging.info(f"{name}: burst of {plan_count} plans drained in avg "
+                 f"{statistics.mean(burst_latency_list) * 1000:.1f} ms, max {max(burst_latency_list) * 1000:.1f} ms;"
+                 f" loop probe delay p50 {statistics.median(probe_latency_list) * 1000:.2f} ms, "
+                 f"max {probe_latency_list[-1] * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="post_book contact limit check path burst latency benchmark")
+    parser.add_argument("--burst_count", type=int, default=20)
+    parser.add_argument("--plan_count", type=int, default=10, help="plans with chore events in one queue pickup")
+    parser.add_argument("--db_write_ms", type=float, default=2)
+    parser.add_argument("--http_ms", type=float, default=3)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    Thread(target=loop.run_forever, daemon=True).start()
+    post_book = SimulatedPostBook(loop, args.db_write_ms / 1000, args.http_ms / 1000)
+    run_case("legacy", post_book, post_book.legacy_handle_burst, args.burst_count, args.plan_count)
+    run_case("current", post_book, post_book.handle_burst, args.burst_count, args.plan_count)
+    loop.call_soon_threadsafe(loop.stop)
+
+
+if __name__ == "__main__":
+    main()
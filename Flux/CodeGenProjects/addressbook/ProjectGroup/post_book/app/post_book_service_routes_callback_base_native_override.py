@@ -4,6 +4,7 @@ import time
 from threading import Thread
 from typing import Type, Callable
 
+import httpx
 import msgspec
 from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
@@ -19,7 +20,10 @@ from Flux.CodeGenProjects.AddressBook.ProjectGroup.phone_book.app.phone_book_ser
     email_book_service_http_client)
 from FluxPythonUtils.scripts.general_utility_functions import except_n_log_alert, handle_refresh_configurable_data_members
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.post_book.app.aggregate import (
-    get_open_chore_counts, get_last_n_sec_chores_by_events)
+    get_open_chore_counts, get_last_n_sec_chores_by_events, get_chore_ledgers_of_last_n_sec)
+from Flux.PyCodeGenEngine.FluxCodeGenCore.rolling_window_counter import RollingWindowCounter
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.post_book.app.contact_limits_cache import ContactLimitsCache
+from FluxPythonUtils.scripts.ws_reader import WSReader
 
 
 MsgspecType = TypeVar('MsgspecType', bound=msgspec.Struct)
@@ -81,6 +85,13 @@ class PostBookServiceRoutesCallbackBaseNativeOverride(PostBookServiceRoutesCallb
         self.chore_id_to_chore_snapshot_cache_dict: Dict[str, ChoreSnapshot] = {}
         self.chore_id_to_open_chore_snapshot_cache_dict: Dict[str, ChoreSnapshot] = {}
         self.plan_id_to_plan_brief_cache_dict: Dict[int, PlanBrief] = {}
+        self.use_rolling_window_counters: bool = bool(config_yaml_dict.get("use_rolling_window_counters"))
+        self.rolling_window_counter_retention_secs: int = parse_to_int(
+            config_yaml_dict.get("rolling_window_counter_retention_secs") or 3600)
+        # chore_event wise chore_ledger counts by chore_event_date_time - set by load_chore_event_rolling_window
+        self.chore_event_rolling_window_counter: RollingWindowCounter | None = None
+        # contact_limits pushed by phone_book ws, contact_status fetched per check - both non-blocking
+        self.contact_limits_cache: ContactLimitsCache = ContactLimitsCache()
 
     @except_n_log_alert()
     def _app_launch_pre_thread_func(self):
@@ -101,10 +112,19 @@ class PostBookServiceRoutesCallbackBaseNativeOverride(PostBookServiceRoutesCallb
                 # validate essential services are up, if so, set service ready state to true
                 if self.service_up:
                     if not self.service_ready:
+                        # loading rolling window before service is ready - chore_ledger creates are rejected till
+                        # then so no ledger is missed or counted twice
+                        if self.use_rolling_window_counters:
+                            self.load_chore_event_rolling_window()
+                        # else not required: rolling chore counts served by db aggregation
+
                         # Updating chore_snapshot cache and plan_brief cache
                         self.load_existing_chore_snapshot()
                         self.load_existing_plan_brief()
 
+                        self.contact_limits_cache.register_contact_limits_ws()
+                        Thread(target=WSReader.start, daemon=True).start()
+
                         # Running contact_limit_check_queue_handler
                         Thread(target=self.contact_limit_check_queue_handler, daemon=True).start()
                         Thread(target=self._update_contact_status_n_check_contact_limits, daemon=True).start()
@@ -126,6 +146,9 @@ class PostBookServiceRoutesCallbackBaseNativeOverride(PostBookServiceRoutesCallb
                     should_sleep = True
                     # any periodic refresh code goes here
 
+                    # Reconnecting lost contact_limits ws connection - checks fall back to http till then
+                    self.contact_limits_cache.reconnect_contact_limits_ws_if_disconnected()
+
                     last_modified_timestamp = os.path.getmtime(config_yaml_path)
                     if self.config_yaml_last_modified_timestamp != last_modified_timestamp:
                         self.config_yaml_last_modified_timestamp = last_modified_timestamp
@@ -251,6 +274,12 @@ class PostBookServiceRoutesCallbackBaseNativeOverride(PostBookServiceRoutesCallb
             logging.error(err_str_)
             raise HTTPException(detail=err_str_, status_code=503)
 
+    async def create_chore_ledger_post(self, chore_ledger_obj: ChoreLedger):
+        self.count_chore_ledger_events([chore_ledger_obj])
+
+    async def create_all_chore_ledger_post(self, chore_ledger_obj_list: List[ChoreLedger]):
+        self.count_chore_ledger_events(chore_ledger_obj_list)
+
     async def create_chore_snapshot_pre(self, chore_snapshot_obj: ChoreSnapshot):
         if not self.service_ready:
             # raise service unavailable 503 exception, let the caller retry
@@ -319,6 +348,38 @@ class PostBookServiceRoutesCallbackBaseNativeOverride(PostBookServiceRoutesCallb
 
         self._load_existing_chore_snapshot(chore_snapshot_list)
 
+    def load_chore_event_rolling_window(self):
+        run_coro = self._load_chore_event_rolling_window()
+        future = asyncio.run_coroutine_threadsafe(run_coro, self.asyncio_loop)
+
+        # block for task to finish
+        try:
+            future.result()
+        except Exception as e:
+            logging.exception(f"_load_chore_event_rolling_window failed - rolling chore counts will be served by db "
+                              f"aggregation, exception: {e}")
+
+    async def _load_chore_event_rolling_window(self):
+        chore_event_rolling_window_counter = RollingWindowCounter(self.rolling_window_counter_retention_secs)
+        chore_ledger_list: List[ChoreLedger] = (
+            await PostBookServiceRoutesCallbackBaseNativeOverride.underlying_read_chore_ledger_http(
+                get_chore_ledgers_of_last_n_sec(self.rolling_window_counter_retention_secs)))
+        for chore_ledger in chore_ledger_list:
+            chore_event_rolling_window_counter.add(
+                chore_ledger.chore_event,
+                chore_event_rolling_window_counter.get_epoch_ms(chore_ledger.chore_event_date_time))
+        self.chore_event_rolling_window_counter = chore_event_rolling_window_counter
+        logging.debug(f"loaded {len(chore_ledger_list)} chore_ledgers of last "
+                      f"{self.rolling_window_counter_retention_secs} secs in chore event rolling window")
+
+    def count_chore_ledger_events(self, chore_ledger_list: List[ChoreLedger]):
+        if self.chore_event_rolling_window_counter is not None:
+            for chore_ledger in chore_ledger_list:
+                self.chore_event_rolling_window_counter.add(
+                    chore_ledger.chore_event,
+                    self.chore_event_rolling_window_counter.get_epoch_ms(chore_ledger.chore_event_date_time))
+        # else not required: rolling window not in use or not loaded
+
     def _update_open_chore_snapshot_cache(self, chore_snapshot: ChoreSnapshot):
         chore_id = chore_snapshot.chore_brief.chore_id
         cached_open_chore_snapshot = self.chore_id_to_open_chore_snapshot_cache_dict.get(chore_id)
@@ -481,14 +542,10 @@ class PostBookServiceRoutesCallbackBaseNativeOverride(PostBookServiceRoutesCallb
             plan_id_to_container_obj_dict[plan_id] = container_obj
         return None
 
-    def add_chore_ledgers(self, chore_ledger_list: List[ChoreLedger]):
-        run_coro = PostBookServiceRoutesCallbackBaseNativeOverride.underlying_create_all_chore_ledger_http(
-            chore_ledger_list)
-        future = asyncio.run_coroutine_threadsafe(run_coro, self.asyncio_loop)
-
-        # block for task to finish
+    async def add_chore_ledgers(self, chore_ledger_list: List[ChoreLedger]):
         try:
-            future.result()
+            await PostBookServiceRoutesCallbackBaseNativeOverride.underlying_create_all_chore_ledger_http(
+                chore_ledger_list)
         except Exception as e:
             logging.exception(f"underlying_create_all_chore_ledger_http failed "
                               f"with exception: {e}")
@@ -503,39 +560,43 @@ class PostBookServiceRoutesCallbackBaseNativeOverride(PostBookServiceRoutesCallb
                     plan_brief)
             self.plan_id_to_plan_brief_cache_dict[plan_brief.id] = plan_brief
 
-    def update_db(self, chore_ledger_list: List[ChoreLedger],
-                  chore_snapshot_list: List[ChoreSnapshot],
-                  plan_brief: PlanBrief):
-        # creating chore_ledgers
-        if chore_ledger_list:
-            self.add_chore_ledgers(chore_ledger_list)
+    async def _create_or_update_chore_snapshot_n_log(self, chore_snapshot_list: List[ChoreSnapshot]):
+        try:
+            await self.create_or_update_chore_snapshot(chore_snapshot_list)
+        except HTTPException as http_e:
+            logging.exception(f"create_or_update_chore_snapshot failed "
+                              f"with http_exception: {http_e.detail}")
+        except Exception as e:
+            logging.exception(f"create_or_update_chore_snapshot failed "
+                              f"with exception: {e}")
 
-        # creating or updating chore_snapshot
+    async def _create_or_update_plan_brief_n_log(self, plan_brief: PlanBrief):
+        try:
+            await self.create_or_update_plan_brief(plan_brief)
+        except Exception as e:
+            logging.exception(f"create_or_update_plan_brief failed "
+                              f"with exception: {e}")
+
+    async def update_db(self, chore_ledger_list: List[ChoreLedger],
+                        chore_snapshot_list: List[ChoreSnapshot],
+                        plan_brief: PlanBrief):
+        """
+        chore_ledger creates, chore_snapshot creates/updates and plan_brief create/update are independent
+        collections - run concurrently, each failure is logged by its own coroutine
+        """
+        update_coro_list = []
+        if chore_ledger_list:
+            update_coro_list.append(self.add_chore_ledgers(chore_ledger_list))
         if chore_snapshot_list:
-            run_coro = self.create_or_update_chore_snapshot(chore_snapshot_list)
-            future = asyncio.run_coroutine_threadsafe(run_coro, self.asyncio_loop)
-
-            # block for task to finish
-            try:
-                future.result()
-            except HTTPException as http_e:
-                logging.exception(f"create_or_update_chore_snapshot failed "
-                                  f"with http_exception: {http_e.detail}")
-            except Exception as e:
-                logging.exception(f"create_or_update_chore_snapshot failed "
-                                  f"with exception: {e}")
-
-        # creating or updating plan_brief
+            update_coro_list.append(self._create_or_update_chore_snapshot_n_log(chore_snapshot_list))
         if plan_brief is not None:
-            run_coro = self.create_or_update_plan_brief(plan_brief)
-            future = asyncio.run_coroutine_threadsafe(run_coro, self.asyncio_loop)
+            update_coro_list.append(self._create_or_update_plan_brief_n_log(plan_brief))
+        await asyncio.gather(*update_coro_list)
 
-            # block for task to finish
-            try:
-                future.result()
-            except Exception as e:
-                logging.exception(f"create_or_update_plan_brief failed "
-                                  f"with exception: {e}")
+    async def update_db_of_plans(self, container_object_list: List[ContainerObject]):
+        await asyncio.gather(*[self.update_db(container_object.chore_ledgers, container_object.chore_snapshots,
+                                              container_object.plan_brief)
+                               for container_object in container_object_list])
 
     def check_max_open_baskets(self, max_open_baskets: int, open_chore_count: int) -> bool:
         pause_all_plans = False
@@ -555,26 +616,31 @@ class PostBookServiceRoutesCallbackBaseNativeOverride(PostBookServiceRoutesCallb
     async def check_rolling_max_chore_count(self, rolling_chore_count_period_seconds: int, max_rolling_tx_count: int):
         pause_all_plans = False
 
-        chore_count_updated_chore_ledgers: List[ChoreLedger] = (
-            await PostBookServiceRoutesCallbackBaseNativeOverride.
-            underlying_get_last_n_sec_chores_by_events_query_http(rolling_chore_count_period_seconds,
-                                                                  [ChoreEventType.OE_NEW]))
-
-        if len(chore_count_updated_chore_ledgers) == 1:
-            rolling_new_chore_count = chore_count_updated_chore_ledgers[-1].current_period_chore_count
-        elif len(chore_count_updated_chore_ledgers) > 1:
-            err_str_ = ("Must receive only one object in list by get_last_n_sec_chores_by_events_query, "
-                        f"received {len(chore_count_updated_chore_ledgers)}, skipping rolling_max_chore_count check, "
-                        f"received list: {chore_count_updated_chore_ledgers}")
-            logging.error(err_str_)
-            return False
+        if (self.chore_event_rolling_window_counter is not None and
+                self.chore_event_rolling_window_counter.covers(rolling_chore_count_period_seconds)):
+            rolling_new_chore_count = int(self.chore_event_rolling_window_counter.get_multi_key_window_sum(
+                [ChoreEventType.OE_NEW], rolling_chore_count_period_seconds))
         else:
-            rolling_new_chore_count = 0
+            chore_count_updated_chore_ledgers: List[ChoreLedger] = (
+                await PostBookServiceRoutesCallbackBaseNativeOverride.
+                underlying_get_last_n_sec_chores_by_events_query_http(rolling_chore_count_period_seconds,
+                                                                      [ChoreEventType.OE_NEW]))
+
+            if len(chore_count_updated_chore_ledgers) == 1:
+                rolling_new_chore_count = chore_count_updated_chore_ledgers[-1].current_period_chore_count
+            elif len(chore_count_updated_chore_ledgers) > 1:
+                err_str_ = ("Must receive only one object in list by get_last_n_sec_chores_by_events_query, "
+                            f"received {len(chore_count_updated_chore_ledgers)}, skipping rolling_max_chore_count "
+                            f"check, received list: {chore_count_updated_chore_ledgers}")
+                logging.error(err_str_)
+                return False
+            else:
+                rolling_new_chore_count = 0
         if rolling_new_chore_count > max_rolling_tx_count:
             # @@@ below error log is used in specific test case for string matching - if changed here
             # needs to be changed in test also
             logging.critical(f"rolling_max_chore_count breached: "
-                             f"{chore_count_updated_chore_ledgers[0].current_period_chore_count} "
+                             f"{rolling_new_chore_count} "
                              f"chores in past {rolling_chore_count_period_seconds} secs, allowed chores within this "
                              f"period is {max_rolling_tx_count}, initiating all plan pause")
             pause_all_plans = True
@@ -583,26 +649,32 @@ class PostBookServiceRoutesCallbackBaseNativeOverride(PostBookServiceRoutesCallb
     async def check_rolling_max_rej_count(self, rolling_rej_count_period_seconds: int, max_rolling_tx_count: int):
         pause_all_plans = False
 
-        chore_count_updated_chore_ledgers: List[ChoreLedger] = (
-            await PostBookServiceRoutesCallbackBaseNativeOverride.
-            underlying_get_last_n_sec_chores_by_events_query_http(
-                rolling_rej_count_period_seconds, [ChoreEventType.OE_BRK_REJ, ChoreEventType.OE_EXH_REJ]))
-        if len(chore_count_updated_chore_ledgers) == 1:
-            rolling_rej_chore_count = chore_count_updated_chore_ledgers[0].current_period_chore_count
-        elif len(chore_count_updated_chore_ledgers) > 0:
-            err_str_ = ("Must receive only one object in list from get_last_n_sec_chores_by_events_query, "
-                        f"received: {len(chore_count_updated_chore_ledgers)}, avoiding this check, "
-                        f"received list: {chore_count_updated_chore_ledgers}")
-            logging.error(err_str_)
-            return False
+        rej_chore_event_list = [ChoreEventType.OE_BRK_REJ, ChoreEventType.OE_EXH_REJ]
+        if (self.chore_event_rolling_window_counter is not None and
+                self.chore_event_rolling_window_counter.covers(rolling_rej_count_period_seconds)):
+            rolling_rej_chore_count = int(self.chore_event_rolling_window_counter.get_multi_key_window_sum(
+                rej_chore_event_list, rolling_rej_count_period_seconds))
         else:
-            rolling_rej_chore_count = 0
+            chore_count_updated_chore_ledgers: List[ChoreLedger] = (
+                await PostBookServiceRoutesCallbackBaseNativeOverride.
+                underlying_get_last_n_sec_chores_by_events_query_http(
+                    rolling_rej_count_period_seconds, rej_chore_event_list))
+            if len(chore_count_updated_chore_ledgers) == 1:
+                rolling_rej_chore_count = chore_count_updated_chore_ledgers[0].current_period_chore_count
+            elif len(chore_count_updated_chore_ledgers) > 0:
+                err_str_ = ("Must receive only one object in list from get_last_n_sec_chores_by_events_query, "
+                            f"received: {len(chore_count_updated_chore_ledgers)}, avoiding this check, "
+                            f"received list: {chore_count_updated_chore_ledgers}")
+                logging.error(err_str_)
+                return False
+            else:
+                rolling_rej_chore_count = 0
 
         if rolling_rej_chore_count > max_rolling_tx_count:
             # @@@ below error log is used in specific test case for string matching - if changed here
             # needs to be changed in test also
             logging.critical(f"max_allowed_rejection_within_period breached: "
-                             f"{chore_count_updated_chore_ledgers[0].current_period_chore_count} "
+                             f"{rolling_rej_chore_count} "
                              f"rejections in past {rolling_rej_count_period_seconds} secs, "
                              f"allowed rejections within this period is {max_rolling_tx_count}"
                              f"- initiating all plan pause")
@@ -610,8 +682,8 @@ class PostBookServiceRoutesCallbackBaseNativeOverride(PostBookServiceRoutesCallb
         return pause_all_plans
 
     async def check_all_contact_limits(self) -> bool:
-        contact_limits = email_book_service_http_client.get_contact_limits_client(contact_limits_id=1)
-        contact_status = email_book_service_http_client.get_contact_status_client(contact_status_id=1)
+        contact_limits, contact_status = await asyncio.gather(self.contact_limits_cache.get_contact_limits(),
+                                                              self.contact_limits_cache.get_contact_status())
 
         pause_all_plans = False
 
@@ -682,19 +754,22 @@ class PostBookServiceRoutesCallbackBaseNativeOverride(PostBookServiceRoutesCallb
     def _contact_limit_check_queue_handler(self, plan_id_list: List[int],
                                              plan_id_to_container_obj_dict: Dict[int, ContainerObject]):
         """post pickup form queue - data [list] is now in dict/list"""
-        for plan_id in plan_id_list:
-            container_object = plan_id_to_container_obj_dict.get(plan_id)
-            chore_ledger_list = container_object.chore_ledgers
-            chore_snapshot_list = container_object.chore_snapshots
-            plan_brief = container_object.plan_brief
-            contact_status_updates_list = container_object.contact_status_updates
+        container_object_list: List[ContainerObject] = [plan_id_to_container_obj_dict.get(plan_id)
+                                                        for plan_id in plan_id_list]
+        # Updating db - all picked plans in one loop round trip
+        run_coro = self.update_db_of_plans(container_object_list)
+        future = asyncio.run_coroutine_threadsafe(run_coro, self.asyncio_loop)
 
-            # Updating db
-            self.update_db(chore_ledger_list, chore_snapshot_list, plan_brief)
+        # block for task to finish
+        try:
+            future.result()
+        except Exception as e:
+            logging.exception(f"update_db_of_plans failed with exception: {e}")
 
+        for container_object in container_object_list:
             # updating update_contact_status_queue - handler gets data and constantly tries
             #                                          to update until gets success
-            for contact_status_updates in contact_status_updates_list:
+            for contact_status_updates in container_object.contact_status_updates:
                 self.update_contact_status_queue.put(contact_status_updates)
 
     @staticmethod
@@ -710,6 +785,9 @@ class PostBookServiceRoutesCallbackBaseNativeOverride(PostBookServiceRoutesCallb
         elif ("The Web Server may be down, too busy, or experiencing other problems preventing "
               "it from responding to requests" in str(exception) and "status_code: 503" in str(exception)):
             logging.exception("phone_book service connection error")
+        elif isinstance(exception, httpx.TransportError):
+            # async web client (contact_limits_cache)
+            logging.exception("phone_book service connection error")
         else:
             return False
         return True
@@ -3,6 +3,22 @@ from pendulum import DateTime
 from Flux.PyCodeGenEngine.FluxCodeGenCore.base_aggregate import *
 
 
+def get_chore_snapshots_created_in_last_n_sec(n: int):
+    # Model - ChoreSnapshot
+    return {"agg": [
+        {
+            "$match": {
+                "$expr": {
+                    "$gte": [
+                        "$create_date_time",
+                        {"$dateSubtract": {"startDate": "$$NOW", "unit": "second", "amount": n}}
+                    ]
+                }
+            }
+        }
+    ]}
+
+
 def get_symbol_side_snapshot_from_symbol_side(security_id: str, side: str):
     return {"agg": [
         {
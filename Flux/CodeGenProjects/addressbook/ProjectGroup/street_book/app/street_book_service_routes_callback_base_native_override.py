@@ -51,6 +51,9 @@ from Flux.CodeGenProjects.AddressBook.ProjectGroup.phone_book.app.phone_book_ser
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.barter_simulator import (
     BarterSimulator, BarteringLinkBase)
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.log_barter_simulator import LogBarterSimulator
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.matching_barter_simulator import (
+    MatchingBarterSimulator)
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.bartering_link import get_bartering_link
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.street_book.app.plan_cache import PlanCache
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.phone_book.generated.StreetBook.email_book_service_key_handler import (
     EmailBookServiceKeyHandler)
@@ -59,7 +62,8 @@ from Flux.CodeGenProjects.AddressBook.ProjectGroup.street_book.generated.FastApi
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.street_book.app.aggregate import (
     get_chore_total_sum_of_last_n_sec, get_symbol_side_snapshot_from_symbol_side, get_plan_brief_from_symbol,
     get_open_chore_snapshots_for_symbol, get_last_n_sec_total_barter_qty,
-    get_market_depths, get_last_n_sec_first_n_last_barter)
+    get_market_depths, get_last_n_sec_first_n_last_barter, get_chore_snapshots_created_in_last_n_sec)
+from Flux.PyCodeGenEngine.FluxCodeGenCore.rolling_window_counter import RollingWindowSumTracker
 from Flux.CodeGenProjects.AddressBook.ProjectGroup.post_book.generated.ORMModel.post_book_service_model_imports import (
     ContactStatusUpdatesContainer)
 from FluxPythonUtils.scripts.ws_reader import WSReader
@@ -247,6 +251,11 @@ class StreetBookServiceRoutesCallbackBaseNativeOverride(BaseBookServiceRoutesCal
         self.config_yaml_last_modified_timestamp = os.path.getmtime(self.project_config_yaml_path)
         self.total_barter_qty_by_aggregated_window_first_n_lst_barters: bool = (
             executor_config_yaml_dict.get("total_barter_qty_by_aggregated_window_first_n_lst_barters"))
+        self.use_rolling_window_counters: bool = bool(executor_config_yaml_dict.get("use_rolling_window_counters"))
+        self.rolling_window_counter_retention_secs: int = parse_to_int(
+            executor_config_yaml_dict.get("rolling_window_counter_retention_secs") or 3600)
+        # symbol wise chore_snapshot qty by create time - set in load_plan_cache if use_rolling_window_counters
+        self.chore_qty_rolling_window_tracker: RollingWindowSumTracker | None = None
         self.min_refresh_interval: int = parse_to_int(executor_config_yaml_dict.get("min_refresh_interval"))
         if self.min_refresh_interval is None:
             self.min_refresh_interval = 30
@@ -750,6 +759,10 @@ class StreetBookServiceRoutesCallbackBaseNativeOverride(BaseBookServiceRoutesCal
                 StreetBookServiceRoutesCallbackBaseNativeOverride.underlying_create_chore_ledger_http)
             BarterSimulator.fill_create_async_callable = (
                 StreetBookServiceRoutesCallbackBaseNativeOverride.underlying_create_deals_ledger_http)
+            MatchingBarterSimulator.chore_create_async_callable = (
+                StreetBookServiceRoutesCallbackBaseNativeOverride.underlying_create_chore_ledger_http)
+            MatchingBarterSimulator.fill_create_async_callable = (
+                StreetBookServiceRoutesCallbackBaseNativeOverride.underlying_create_deals_ledger_http)
 
         self.port = find_free_port()
         self.web_client = StreetBookServiceHttpClient.set_or_get_if_instance_exists(host, self.port)
@@ -1339,6 +1352,13 @@ class StreetBookServiceRoutesCallbackBaseNativeOverride(BaseBookServiceRoutesCal
         # Setting asyncio_loop for StreetBook
         StreetBook.asyncio_loop = self.asyncio_loop
         BarteringDataManager.asyncio_loop = self.asyncio_loop
+        if self.market.is_test_run and isinstance(get_bartering_link(), MatchingBarterSimulator):
+            # matching simulator is fed from shm reader thread, its engine runs on server loop
+            MatchingBarterSimulator.asyncio_loop = self.asyncio_loop
+            if MatchingBarterSimulator.update_from_md_container not in SymbolCacheContainer.md_update_listener_list:
+                SymbolCacheContainer.md_update_listener_list.append(MatchingBarterSimulator.update_from_md_container)
+            # else not required: already registered in earlier plan create
+        # else not required: live run or other simulator configured in bartering_link - no md feed needed
         self.bartering_data_manager = BarteringDataManager(StreetBook.executor_trigger,
                                                        self.plan_cache)
         logging.debug(f"Created bartering_data_manager")
@@ -1379,6 +1399,10 @@ class StreetBookServiceRoutesCallbackBaseNativeOverride(BaseBookServiceRoutesCal
         return False
 
     async def load_plan_cache(self):
+        if self.use_rolling_window_counters:
+            await self.load_chore_qty_rolling_window()
+        # else not required: last n sec chore qty served by db aggregation
+
         # updating plan_brief
         plan_brief_list: List[PlanBrief] = \
             await StreetBookServiceRoutesCallbackBaseNativeOverride.underlying_read_plan_brief_http()
@@ -1411,6 +1435,35 @@ class StreetBookServiceRoutesCallbackBaseNativeOverride(BaseBookServiceRoutesCal
             for cancel_chore in cancel_chores:
                 self.bartering_data_manager.handle_recovery_cancel_chore(cancel_chore)
 
+    async def load_chore_qty_rolling_window(self):
+        # tracker is set before db read so snapshots created/updated meanwhile are fed live and skipped by rebuild
+        chore_qty_rolling_window_tracker = RollingWindowSumTracker(self.rolling_window_counter_retention_secs)
+        self.chore_qty_rolling_window_tracker = chore_qty_rolling_window_tracker
+        try:
+            chore_snapshots: List[ChoreSnapshot] = \
+                await StreetBookServiceRoutesCallbackBaseNativeOverride.underlying_read_chore_snapshot_http(
+                    get_chore_snapshots_created_in_last_n_sec(self.rolling_window_counter_retention_secs))
+        except Exception as e:
+            logging.exception(f"load_chore_qty_rolling_window failed, last n sec chore qty will be served by db "
+                              f"aggregation;;; exception: {e}")
+            self.chore_qty_rolling_window_tracker = None
+            return
+        for chore_snapshot in chore_snapshots:
+            chore_qty_rolling_window_tracker.track_if_unseen(
+                chore_snapshot.id, chore_snapshot.chore_brief.security.sec_id,
+                chore_qty_rolling_window_tracker.counter.get_epoch_ms(chore_snapshot.create_date_time),
+                chore_snapshot.chore_brief.qty)
+        logging.debug(f"loaded {len(chore_snapshots)} chore_snapshots of last "
+                      f"{self.rolling_window_counter_retention_secs} secs in chore qty rolling window")
+
+    def track_chore_snapshot_qty(self, chore_snapshot: ChoreSnapshot):
+        if self.chore_qty_rolling_window_tracker is not None:
+            self.chore_qty_rolling_window_tracker.track(
+                chore_snapshot.id, chore_snapshot.chore_brief.security.sec_id,
+                self.chore_qty_rolling_window_tracker.counter.get_epoch_ms(chore_snapshot.create_date_time),
+                chore_snapshot.chore_brief.qty)
+        # else not required: rolling window not in use or not loaded yet
+
     def get_hedge_ratio(self) -> float | None:
         """
         assumes await self.load_plan_cache() is invoked prior to this call (only once at startup)
@@ -1607,6 +1660,10 @@ class StreetBookServiceRoutesCallbackBaseNativeOverride(BaseBookServiceRoutesCal
                 err_str_ = f"Received symbol_side_snapshots_tuple as None from plan_cache, symbol_side_key: " \
                            f"{get_symbol_side_key([(symbol, side)])}"
                 logging.exception(err_str_)
+        elif (self.chore_qty_rolling_window_tracker is not None and
+              self.chore_qty_rolling_window_tracker.counter.covers(last_n_sec)):
+            # same as aggregation below: qty sum of symbol's chore_snapshots created in last n sec (any side)
+            last_n_sec_chore_qty = self.chore_qty_rolling_window_tracker.counter.get_window_sum(symbol, last_n_sec)
         else:
             agg_objs = \
                 await StreetBookServiceRoutesCallbackBaseNativeOverride.underlying_read_chore_snapshot_http(
@@ -4114,12 +4171,17 @@ class StreetBookServiceRoutesCallbackBaseNativeOverride(BaseBookServiceRoutesCal
 
     async def create_chore_snapshot_post(self, chore_snapshot_obj: ChoreSnapshot):
         await self.handle_create_chore_snapshot_post(chore_snapshot_obj)
+        self.track_chore_snapshot_qty(chore_snapshot_obj)
 
     async def update_chore_snapshot_post(self, updated_chore_snapshot_obj: ChoreSnapshot):
         await self.handle_update_chore_snapshot_post(updated_chore_snapshot_obj)
+        self.track_chore_snapshot_qty(updated_chore_snapshot_obj)
 
     async def partial_update_chore_snapshot_post(self, updated_chore_snapshot_obj_json: Dict[str, Any]):
         await self.handle_partial_update_chore_snapshot_post(updated_chore_snapshot_obj_json)
+        if self.chore_qty_rolling_window_tracker is not None:
+            self.track_chore_snapshot_qty(ChoreSnapshot.from_dict(updated_chore_snapshot_obj_json))
+        # else not required: rolling window not in use or not loaded yet
 
     async def create_symbol_side_snapshot_post(self, symbol_side_snapshot_obj: SymbolSideSnapshot):
         # updating bartering_data_manager's plan_cache
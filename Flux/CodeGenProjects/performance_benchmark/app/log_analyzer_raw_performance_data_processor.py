@@ -26,8 +26,12 @@ if __name__ == "__main__":
         collection="RawPerformanceData"
     )
 
+    state_file_path = config_yaml_dict.get("raw_performance_data_processor_state_file")
+    if state_file_path is None:
+        state_file_path = str(PAIR_STRAT_DATA_DIR / "raw_performance_data_processor_state.json")
+
     raw_performance_data_processor = (
         RawPerformanceDataProcessor(performance_benchmark_service_http_client,
                                     ProcessedPerformanceAnalysisBaseModel, mongo_connection_reqs,
-                                    config_yaml_dict))
+                                    config_yaml_dict, state_file_path))
     raw_performance_data_processor.run()
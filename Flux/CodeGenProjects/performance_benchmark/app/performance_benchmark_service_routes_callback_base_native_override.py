@@ -15,6 +15,7 @@ from FluxPythonUtils.scripts.general_utility_functions import (
 from Flux.PyCodeGenEngine.FluxCodeGenCore.base_aggregate import get_raw_performance_data_from_callable_name_agg_pipeline
 from Flux.PyCodeGenEngine.FluxCodeGenCore.perf_benchmark_decorators import (get_timeit_pattern,
                                                                             get_timeit_field_separator)
+from Flux.PyCodeGenEngine.FluxCodeGenCore.perf_benchmark_ring_buffer import PerfBenchmarkRingCollector
 from Flux.CodeGenProjects.TradeEngine.ProjectGroup.log_analyzer.app.log_analyzer_service_helper import (
     alert_queue_handler_for_create_only)
 from Flux.PyCodeGenEngine.FluxCodeGenCore.log_analyzer_utils import *
@@ -47,6 +48,11 @@ class PerformanceBenchmarkServiceRoutesCallbackBaseNativeOverride(PerformanceBen
         self.timeit_field_separator: str = get_timeit_field_separator()
         self.raw_performance_data_queue: queue.Queue = queue.Queue()
         self.perf_benchmark_queue_handler_running_state: bool = True
+        # drains binary timing rings of processes running with PERF_BENCHMARK_BACKEND=ring
+        self.perf_benchmark_ring_collector_enabled: bool = (
+            config_yaml_dict.get("perf_benchmark_ring_collector_enabled", False))
+        self.perf_benchmark_ring_drain_interval_secs: float = parse_to_float(
+            config_yaml_dict.get("perf_benchmark_ring_drain_interval_secs", 1))
 
     @except_n_log_alert()
     def _app_launch_pre_thread_func(self):
@@ -74,6 +80,12 @@ class PerformanceBenchmarkServiceRoutesCallbackBaseNativeOverride(PerformanceBen
                         raw_performance_handler_thread.start()
                         logging.info(f"Thread Started: _handle_raw_performance_data_queue")
 
+                        if self.perf_benchmark_ring_collector_enabled:
+                            Thread(target=self._drain_perf_benchmark_rings, daemon=True,
+                                   name="perf_benchmark_ring_collector").start()
+                            logging.info(f"Thread Started: _drain_perf_benchmark_rings")
+                        # else not required: timings only come in as logs
+
                         # todo start RawPerformanceDataProcessor script once performance_benchmark service is up
                         self.service_ready = True
                         # print is just to manually check if this server is ready - useful when we run
@@ -185,6 +197,27 @@ class PerformanceBenchmarkServiceRoutesCallbackBaseNativeOverride(PerformanceBen
             self.handle_raw_performance_data_queue_err_handler,
             client_connection_fail_retry_secs=client_connection_fail_retry_secs)
 
+    def _drain_perf_benchmark_rings(self):
+        perf_benchmark_ring_collector = PerfBenchmarkRingCollector(config_yaml_dict.get("perf_benchmark_ring_dir"))
+        while self.perf_benchmark_queue_handler_running_state:
+            try:
+                for perf_benchmark_timing in perf_benchmark_ring_collector.drain():
+                    if perf_benchmark_timing.callable_name in ("underlying_create_raw_performance_data_http",
+                                                               "underlying_create_all_raw_performance_data_http"):
+                        # avoiding timings of raw_performance_data creation itself to avoid infinite loop
+                        continue
+                    raw_performance_data_obj = RawPerformanceDataBaseModel()
+                    raw_performance_data_obj.callable_name = perf_benchmark_timing.callable_name
+                    raw_performance_data_obj.start_time = pendulum.from_timestamp(
+                        perf_benchmark_timing.start_ns / 1_000_000_000, tz="UTC")
+                    raw_performance_data_obj.delta = perf_benchmark_timing.duration_ns / 1_000_000_000
+                    raw_performance_data_obj.project_name = perf_benchmark_timing.project_name
+                    self.raw_performance_data_queue.put(raw_performance_data_obj)
+            except Exception as e:
+                logging.exception(f"_drain_perf_benchmark_rings failed, retrying next interval;;; exception: {e}")
+            time.sleep(self.perf_benchmark_ring_drain_interval_secs)
+        perf_benchmark_ring_collector.close()
+
     def handle_raw_performance_data_queue_err_handler(self, *args):
         err_str_ = f"perf benchmark's create_all_raw_performance_data_client failed, {args=}"
         logging.error(err_str_)
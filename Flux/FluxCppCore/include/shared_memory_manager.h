@@ -96,7 +96,12 @@ public:
     // Write data to shared memory
     bool write_to_shared_memory(const T& new_data) {
         if (try_lock()) {  // Attempt to acquire the lock without blocking
-            std::memcpy(&m_shm_data_->data, &new_data, sizeof(T)); // Copy data to shared memory
+            if constexpr (requires(T& r_dest, const T& kr_src) { T::seqlock_copy(r_dest, kr_src); }) {
+                // T carries seqlock versions - copy bumps them so lock-free readers can detect torn reads
+                T::seqlock_copy(m_shm_data_->data, new_data);
+            } else {
+                std::memcpy(&m_shm_data_->data, &new_data, sizeof(T)); // Copy data to shared memory
+            }
             if(!m_shm_signature_set){
                 auto signature = new_data.is_data_set() ? k_shm_signature : 0;
                 m_shm_data_->shm_update_signature = signature;
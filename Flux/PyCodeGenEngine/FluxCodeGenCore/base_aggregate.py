@@ -117,6 +117,25 @@ def get_raw_performance_data_from_callable_name_agg_pipeline(callable_name: str)
     ]}
 
 
+def get_raw_performance_data_after_id_agg_pipeline(last_processed_id: int, limit: int):
+    return {"agg": [
+        {
+            "$match": {
+                "_id": {"$gt": last_processed_id}
+            }
+        },
+        {
+            "$sort": {"_id": 1}
+        },
+        {
+            "$limit": limit
+        },
+        {
+            "$project": {"callable_name": 1, "delta": 1}
+        }
+    ]}
+
+
 def get_array_path_for_key(model_class, key: str) -> list[str]:
     path_parts = key.split('.')
     array_path = []
@@ -822,6 +841,95 @@ def is_relevant_update(before_item: Dict[str, Any], after_item: Dict[str, Any],
     return False
 
 
+def dedupe_page_changes(changes: List[Dict]) -> List[Dict]:
+    """
+    Remove duplicate changes by _id, but keep different types of changes (deletion and full item) separately
+    """
+    unique_changes = {}
+    for change in changes:
+        change_id = change["_id"]
+        change_type = "deletion" if len(change) == 1 else "full_item"
+
+        # Create a unique key based on _id and change type
+        unique_key = f"{change_id}_{change_type}"
+
+        # Store the change with its unique key
+        unique_changes[unique_key] = change
+
+    return list(unique_changes.values())
+
+
+def sort_n_cleanup_page_changes(final_changes: List[Dict], sort_order: List[Dict], pagination: Dict | None,
+                                item_data_map: Dict[Any, Dict]) -> List[Dict]:
+    """
+    Orders detected page changes as per sort_order (full items first, then filtered out items) and removes
+    boundary flags when page has no pagination
+
+    Args:
+        final_changes: deduplicated change list of page
+        sort_order: List of sort definitions of page
+        pagination: pagination definition of page
+        item_data_map: _id to full item data - used to get sort values of filtered out (only _id) changes
+
+    Returns:
+        Ordered & cleaned change list
+    """
+    # Sort changes according to sort_order if provided
+    if sort_order and final_changes:
+        def get_sort_value(change, sort_def):
+            field = sort_def['sort_by']
+            direction = sort_def['sort_direction']
+            item_id = change["_id"]
+
+            # Get the full item data for sorting
+            sort_item = item_data_map.get(item_id, change)
+            value = sort_item.get(field, 0)
+
+            # Handle absolute sorting
+            if sort_def.get('is_absolute_sort', False) and isinstance(value, (int, float)):
+                value = abs(value)
+
+            # Handle None values
+            if value is None:
+                value = 0
+
+            return value if direction > 0 else -value
+
+        try:
+            # Separate items into "full items" and "filtered out items"
+            # Full items: have more than just _id field (remain in filters)
+            # Filtered out items: only have _id field (filtered out)
+            full_items = [change for change in final_changes if len(change) > 1]
+            filtered_items = [change for change in final_changes if len(change) == 1]
+
+            # Sort each group separately
+            if full_items:
+                full_items.sort(key=lambda change: tuple(
+                    get_sort_value(change, sort_def) for sort_def in sort_order
+                ))
+
+            if filtered_items:
+                filtered_items.sort(key=lambda change: tuple(
+                    get_sort_value(change, sort_def) for sort_def in sort_order
+                ))
+
+            # Combine: full items first, then filtered items
+            final_changes = full_items + filtered_items
+
+        except Exception:
+            # If sorting fails, keep original order
+            pass
+
+    # Remove boundary flags when no pagination
+    if not pagination:
+        for change in final_changes:
+            if "_new_top" in change:
+                del change["_new_top"]
+            if "_new_bottom" in change:
+                del change["_new_bottom"]
+    return final_changes
+
+
 async def detect_multiple_page_changes(
         collection,  # MongoDB collection instance
         page_definitions: list[dict],  # List of page definitions with filters, sort, pagination
@@ -1424,24 +1532,11 @@ async def detect_multiple_page_changes(
                         pass
 
             # --- Final Deduplication and Cleanup ---
-            # Remove duplicate changes by _id, but keep different types of changes separately
-            unique_changes = {}
-            for change in changes:
-                change_id = change["_id"]
-                change_type = "deletion" if len(change) == 1 else "full_item"
-
-                # Create a unique key based on _id and change type
-                unique_key = f"{change_id}_{change_type}"
+            final_changes = dedupe_page_changes(changes)
 
-                # Store the change with its unique key
-                unique_changes[unique_key] = change
-
-            final_changes = list(unique_changes.values())
-
-            # Sort changes according to sort_order if provided
+            item_data_map = {}
             if sort_order and final_changes:
                 # Create a mapping of item_id to full item data for sorting
-                item_data_map = {}
 
                 # First, populate with updated_items data
                 for updated_item in updated_items:
@@ -1457,59 +1552,7 @@ async def detect_multiple_page_changes(
                         item_data_map.update(db_items_dict)
                     except Exception:
                         pass  # If we can't fetch from DB, continue with available data
-
-                def get_sort_value(change, sort_def):
-                    field = sort_def['sort_by']
-                    direction = sort_def['sort_direction']
-                    item_id = change["_id"]
-
-                    # Get the full item data for sorting
-                    sort_item = item_data_map.get(item_id, change)
-                    value = sort_item.get(field, 0)
-
-                    # Handle absolute sorting
-                    if sort_def.get('is_absolute_sort', False) and isinstance(value, (int, float)):
-                        value = abs(value)
-
-                    # Handle None values
-                    if value is None:
-                        value = 0
-
-                    return value if direction > 0 else -value
-
-                try:
-                    # Separate items into "full items" and "filtered out items"
-                    # Full items: have more than just _id field (remain in filters)
-                    # Filtered out items: only have _id field (filtered out)
-                    full_items = [change for change in final_changes if len(change) > 1]
-                    filtered_items = [change for change in final_changes if len(change) == 1]
-
-                    # Sort each group separately
-                    if full_items:
-                        full_items.sort(key=lambda change: tuple(
-                            get_sort_value(change, sort_def) for sort_def in sort_order
-                        ))
-
-                    if filtered_items:
-                        filtered_items.sort(key=lambda change: tuple(
-                            get_sort_value(change, sort_def) for sort_def in sort_order
-                        ))
-
-                    # Combine: full items first, then filtered items
-                    final_changes = full_items + filtered_items
-
-                except Exception:
-                    # If sorting fails, keep original order
-                    pass
-
-            # Remove boundary flags when no pagination
-            if not pagination:
-                for change in final_changes:
-                    if "_new_top" in change:
-                        del change["_new_top"]
-                    if "_new_bottom" in change:
-                        del change["_new_bottom"]
-
+            final_changes = sort_n_cleanup_page_changes(final_changes, sort_order, pagination, item_data_map)
             final_reports.append({"page_id": page_id, "changes": final_changes})
 
         return final_reports
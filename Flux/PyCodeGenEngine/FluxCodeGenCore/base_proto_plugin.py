@@ -256,6 +256,7 @@ class BaseProtoPlugin(ABC):
     executor_option_is_repeated_field: ClassVar[str] = "IsRepeated"
     executor_option_cache_as_dict_with_key_field: ClassVar[str] = "CacheAsDictWithKeyField"
     flux_msg_small_sized_collection: ClassVar[str] = "FluxMsgSmallSizedCollection"
+    flux_msg_group_commit: ClassVar[str] = "FluxMsgGroupCommit"
     flux_fld_PK: ClassVar[str] = "FluxFldPk"
     flux_msg_is_cpp_web_server_model: ClassVar[str] = 'FluxMsgIsCppWebServerModel'
     flux_msg_string_length: ClassVar[str] = "FluxMsgStringLength"
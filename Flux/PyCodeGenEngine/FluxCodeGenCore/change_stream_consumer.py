@@ -0,0 +1,267 @@
+# standard imports
+import asyncio
+import datetime
+import logging
+import os
+import time
+from typing import List, Dict, Any, Callable, Awaitable, Final
+
+# 3rd party imports
+import motor.motor_asyncio
+import pymongo
+import pymongo.errors
+
+# project imports
+from FluxPythonUtils.scripts.general_utility_functions import parse_to_int
+
+# micro-batch is published once it holds this many changes ...
+change_stream_batch_max_size: int = parse_to_int(os.getenv("CHANGE_STREAM_BATCH_MAX_SIZE") or 500)
+# ... or its oldest change is this old (also max await of each stream getMore)
+change_stream_batch_max_ms: int = parse_to_int(os.getenv("CHANGE_STREAM_BATCH_MAX_MS") or 20)
+# time-series tail: poll interval and how far behind latest seen time field value each poll looks again
+time_series_tail_poll_ms: int = parse_to_int(os.getenv("TIME_SERIES_TAIL_POLL_MS") or 1000)
+time_series_tail_lag_ms: int = parse_to_int(os.getenv("TIME_SERIES_TAIL_LAG_MS") or 5000)
+# wait before re-opening stream after error
+change_stream_retry_secs: float = float(os.getenv("CHANGE_STREAM_RETRY_SECS") or 1.0)
+
+RESUME_TOKEN_COLLECTION_NAME: Final[str] = "ChangeStreamResumeToken"
+# InvalidResumeToken, ChangeStreamFatalError, ChangeStreamHistoryLost - saved token can't be resumed from
+UNRESUMABLE_ERROR_CODES: Final[frozenset] = frozenset({260, 280, 286})
+
+
+class ChangeStreamResumeTokenStore:
+    """
+    last published position of a collection's change consumer - stream resume token (or latest tailed time field
+    value for time-series), kept in ChangeStreamResumeToken collection of same db keyed by collection name
+    """
+
+    def __init__(self, collection_obj: motor.motor_asyncio.AsyncIOMotorCollection):
+        self.token_collection: motor.motor_asyncio.AsyncIOMotorCollection = \
+            collection_obj.database[RESUME_TOKEN_COLLECTION_NAME]
+        self.collection_name: str = collection_obj.name
+
+    async def load(self) -> Any | None:
+        token_doc = await self.token_collection.find_one({"_id": self.collection_name})
+        if token_doc is not None:
+            return token_doc.get("resume_token")
+        return None
+
+    async def save(self, resume_token: Any):
+        await self.token_collection.update_one(
+            {"_id": self.collection_name},
+            {"$set": {"resume_token": resume_token,
+                      "update_date_time": datetime.datetime.now(datetime.timezone.utc)}}, upsert=True)
+
+    async def clear(self):
+        await self.token_collection.delete_one({"_id": self.collection_name})
+
+
+class CoalescedChangeBatch:
+    """
+    changes of one micro-batch coalesced by _id in first-seen order - last change of an id wins, except: insert
+    followed by update/replace stays insert (subscribers haven't seen the obj yet), insert followed by delete is
+    dropped and delete followed by insert becomes update (time-series update is a delete and re-insert of same _id)
+    """
+
+    def __init__(self):
+        self.id_to_change_dict: Dict[Any, Dict[str, Any]] = {}
+        self.change_count: int = 0
+        self.start_time: float | None = None
+
+    def __len__(self):
+        return len(self.id_to_change_dict)
+
+    def add(self, change: Dict[str, Any]):
+        if self.start_time is None:
+            self.start_time = time.perf_counter()
+        # else not required: batch already started
+        self.change_count += 1
+        document_id = change["documentKey"]["_id"]
+        operation_type = change["operationType"]
+        prior_change = self.id_to_change_dict.get(document_id)
+        if prior_change is not None:
+            prior_operation_type = prior_change["operationType"]
+            if prior_operation_type == "insert" and operation_type in ("update", "replace"):
+                change = {**change, "operationType": "insert"}
+            elif prior_operation_type == "insert" and operation_type == "delete":
+                del self.id_to_change_dict[document_id]
+                return
+            elif prior_operation_type == "delete" and operation_type == "insert":
+                change = {**change, "operationType": "update"}
+            # else not required: latest change replaces prior one as is
+            # deleting before re-adding - coalesced change is published in position of its latest change
+            del self.id_to_change_dict[document_id]
+        # else not required: first change of this id in batch
+        self.id_to_change_dict[document_id] = change
+
+    def is_due(self, batch_max_size: int, batch_max_ms: int) -> bool:
+        return self.start_time is not None and (
+                self.change_count >= batch_max_size or
+                (time.perf_counter() - self.start_time) * 1000 >= batch_max_ms)
+
+    def pop_change_list(self) -> List[Dict[str, Any]]:
+        change_list = list(self.id_to_change_dict.values())
+        self.id_to_change_dict = {}
+        self.change_count = 0
+        self.start_time = None
+        return change_list
+
+
+class ChangeStreamConsumer:
+    """
+    drains collection changes in size/time bounded micro-batches coalesced by _id and hands each batch to
+    publish_batch_callable; position after every published batch is persisted so a restart or stream error
+    resumes right after last published change - changes of the unpublished window are replayed. Time-series
+    collections can't be watched by mongo and have no _id index, they are tailed on their time field instead
+    (appends only: in-place time-series updates and deletes leave no trace to tail) - see _tail_time_series
+    """
+
+    def __init__(self, collection_obj: motor.motor_asyncio.AsyncIOMotorCollection,
+                 publish_batch_callable: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+                 is_time_series: bool = False,
+                 batch_max_size: int = change_stream_batch_max_size,
+                 batch_max_ms: int = change_stream_batch_max_ms,
+                 time_field: str | None = None):
+        self.collection_obj: motor.motor_asyncio.AsyncIOMotorCollection = collection_obj
+        self.publish_batch_callable: Callable[[List[Dict[str, Any]]], Awaitable[None]] = publish_batch_callable
+        self.is_time_series: bool = is_time_series
+        self.time_field: str | None = time_field
+        if is_time_series and time_field is None:
+            raise ValueError(f"time_field is required to tail time-series collection {collection_obj.name}")
+        # else not required: time field known or not time-series
+        self.batch_max_size: int = batch_max_size
+        self.batch_max_ms: int = batch_max_ms
+        self.resume_token_store: ChangeStreamResumeTokenStore = ChangeStreamResumeTokenStore(collection_obj)
+        # metrics
+        self.received_change_count: int = 0
+        self.published_change_count: int = 0
+        self.published_batch_count: int = 0
+
+    async def run(self):
+        while True:
+            try:
+                if self.is_time_series:
+                    await self._tail_time_series()
+                else:
+                    await self._consume_stream()
+            except asyncio.CancelledError:
+                raise
+            except pymongo.errors.OperationFailure as e:
+                if e.code in UNRESUMABLE_ERROR_CODES:
+                    logging.error(f"[STREAM - {self.collection_obj.name}] saved resume token is not resumable, "
+                                  f"restarting from current position - changes since last publish are lost;;; "
+                                  f"exception: {e}")
+                    await self.resume_token_store.clear()
+                else:
+                    logging.exception(f"[STREAM - {self.collection_obj.name}] stream failed, resuming from last "
+                                      f"published change;;; exception: {e}")
+            except pymongo.errors.PyMongoError as e:
+                logging.exception(f"[STREAM - {self.collection_obj.name}] stream failed, resuming from last "
+                                  f"published change;;; exception: {e}")
+            await asyncio.sleep(change_stream_retry_secs)
+
+    async def _publish(self, change_list: List[Dict[str, Any]]):
+        try:
+            await self.publish_batch_callable(change_list)
+        except Exception as e:
+            # position is still advanced - replaying a batch that failed to publish would fail it again
+            logging.exception(f"[STREAM - {self.collection_obj.name}] publish of {len(change_list)} coalesced "
+                              f"changes failed, skipping batch;;; exception: {e}")
+        self.published_change_count += len(change_list)
+        self.published_batch_count += 1
+
+    async def _consume_stream(self):
+        resume_token = await self.resume_token_store.load()
+        change_batch = CoalescedChangeBatch()
+        async with self.collection_obj.watch(full_document='updateLookup', resume_after=resume_token,
+                                             max_await_time_ms=self.batch_max_ms,
+                                             batch_size=self.batch_max_size) as stream:
+            logging.info(f"[STREAM - {self.collection_obj.name}] watching changes "
+                         f"{'after saved resume token' if resume_token is not None else 'from now'}")
+            if resume_token is None and stream.resume_token is not None:
+                # pinning start position - error before first publish must replay from here, not from reopen time
+                await self.resume_token_store.save(stream.resume_token)
+            # else not required: resuming from saved token
+            while stream.alive:
+                change = await stream.try_next()
+                if change is not None:
+                    self.received_change_count += 1
+                    if change["operationType"] in ("insert", "update", "replace", "delete"):
+                        change_batch.add(change)
+                    elif change["operationType"] == "invalidate":
+                        # collection dropped / renamed - token after invalidate can't be resumed with resume_after
+                        logging.warning(f"[STREAM - {self.collection_obj.name}] stream invalidated;;; {change}")
+                    else:
+                        logging.error(f"Mongo Stream Unhandled change detected: {change}")
+                # else not required: no change within max await - pending batch is flushed below
+
+                if change_batch.is_due(self.batch_max_size, self.batch_max_ms) or (
+                        change is None and change_batch.start_time is not None):
+                    await self._publish(change_batch.pop_change_list())
+                    await self.resume_token_store.save(stream.resume_token)
+                # else not required: batch still filling
+        if change_batch.start_time is not None:
+            await self._publish(change_batch.pop_change_list())
+            await self.resume_token_store.clear()
+        # else not required: nothing pending when stream closed
+
+    async def _tail_time_series(self):
+        """
+        polls rows with time field >= latest seen time field value - TIME_SERIES_TAIL_LAG_MS every
+        TIME_SERIES_TAIL_POLL_MS (time field is what time-series buckets are pruned on), ids already published
+        within the lag window are skipped. Assumes rows become visible no later than lag after a row with a later
+        time field value did: a row committed later than that (e.g. back-dated insert) is never published.
+        Restart resumes from saved time field value - rows of its lag window are published again
+        """
+        lag = datetime.timedelta(milliseconds=time_series_tail_lag_ms)
+        # ids published within lag window to their time field value - pruned as window moves
+        published_id_to_time_dict: Dict[Any, datetime.datetime] = {}
+        latest_time = await self.resume_token_store.load()
+        if not isinstance(latest_time, datetime.datetime):
+            # nothing saved (or _id position saved by older tailing) - starting from now: rows already in lag
+            # window are taken as published
+            latest_obj = await self.collection_obj.find_one(sort=[(self.time_field, pymongo.DESCENDING)])
+            latest_time = latest_obj.get(self.time_field) if latest_obj is not None else None
+            if latest_time is not None:
+                async for obj in self.collection_obj.find({self.time_field: {"$gte": latest_time - lag}},
+                                                          {self.time_field: 1}):
+                    published_id_to_time_dict[obj["_id"]] = obj.get(self.time_field)
+            # else not required: empty collection
+        # else not required: tailing after last saved time field value
+        logging.info(f"[STREAM - {self.collection_obj.name}] tailing time-series appends on {self.time_field} "
+                     f"from: {latest_time}")
+        while True:
+            time_filter = {self.time_field: {"$gte": latest_time - lag}} if latest_time is not None else {}
+            change_batch = CoalescedChangeBatch()
+            async for obj in self.collection_obj.find(time_filter).sort(self.time_field, pymongo.ASCENDING):
+                obj_id = obj["_id"]
+                if obj_id in published_id_to_time_dict:
+                    continue
+                # else not required: unpublished row
+                obj_time = obj.get(self.time_field)
+                published_id_to_time_dict[obj_id] = obj_time
+                if obj_time is not None and (latest_time is None or obj_time > latest_time):
+                    latest_time = obj_time
+                # else not required: late row within lag window
+                self.received_change_count += 1
+                change_batch.add({"operationType": "insert", "documentKey": {"_id": obj_id}, "fullDocument": obj})
+                if len(change_batch) >= self.batch_max_size:
+                    await self._publish(change_batch.pop_change_list())
+                    await self.resume_token_store.save(latest_time)
+                # else not required: batch still filling
+            if change_batch.start_time is not None:
+                await self._publish(change_batch.pop_change_list())
+                await self.resume_token_store.save(latest_time)
+            # else not required: no appends since last poll
+            if latest_time is not None:
+                window_start_time = latest_time - lag
+                published_id_to_time_dict = {obj_id: obj_time
+                                             for obj_id, obj_time in published_id_to_time_dict.items()
+                                             if obj_time is not None and obj_time >= window_start_time}
+            # else not required: nothing tailed yet
+            await asyncio.sleep(time_series_tail_poll_ms / 1000)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"collection_name": self.collection_obj.name, "received_change_count": self.received_change_count,
+                "published_change_count": self.published_change_count,
+                "published_batch_count": self.published_batch_count}
@@ -0,0 +1,115 @@
+# DfBulkPostBenchmark.py
+# ingestion throughput (rows/sec) of synthetic BarData-like frames: per row dict encode (iterrows/model list path)
+# vs column-wise encode_df_as_json_array, then end to end DfBulkPostClient posts against a local create-all sink
+# that answers every request after a simulated server latency
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+import polars as pl
+
+from Flux.PyCodeGenEngine.FluxCodeGenCore.df_bulk_post_client import DfBulkPostClient, encode_df_as_json_array
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# per request httpx info logs would swamp results
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def get_synthetic_bar_data_df(symbol_count: int, rows_per_symbol: int) -> pl.DataFrame:
+    start_time = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    row_count = symbol_count * rows_per_symbol
+    return pl.DataFrame({
+        "symbol": [f"SYM_{row_index // rows_per_symbol}" for row_index in range(row_count)],
+        "datetime": pl.datetime_range(start_time, start_time + timedelta(minutes=rows_per_symbol - 1), "1m",
+                                      time_zone="UTC", eager=True).to_list() * symbol_count,
+        "open": [100.0 + row_index % 97 for row_index in range(row_count)],
+        "high": [101.0 + row_index % 89 for row_index in range(row_count)],
+        "low": [99.0 + row_index % 83 for row_index in range(row_count)],
+        "close": [100.5 + row_index % 79 for row_index in range(row_count)],
+        "volume": [row_index % 10_000 for row_index in range(row_count)],
+    }).with_columns(pl.col("datetime").dt.strftime("%Y-%m-%dT%H:%M:%S%.3f+00:00"))
+
+
+def run_encode(df: pl.DataFrame, chunk_row_count: int) -> None:
+    start_time = time.perf_counter()
+    for offset in range(0, len(df), chunk_row_count):
+        # per row python objects, as iterrows + model list + generic_encoder
+        json.dumps([dict(row) for row in df.slice(offset, chunk_row_count).iter_rows(named=True)]).encode()
+    per_row_sec = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for offset in range(0, len(df), chunk_row_count):
+        encode_df_as_json_array(df.slice(offset, chunk_row_count))
+    columnar_sec = time.perf_counter() - start_time
+
+    logging.info(f"encode per row:  {len(df) / per_row_sec:,.0f} rows/s")
+    logging.info(f"encode columnar: {len(df) / columnar_sec:,.0f} rows/s, speedup: {per_row_sec / columnar_sec:.2f}x")
+
+
+async def run_sink_server(latency_ms: float) -> asyncio.AbstractServer:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                header_bytes = await reader.readuntil(b"\r\n\r\n")
+                content_length = 0
+                for header_line in header_bytes.split(b"\r\n"):
+                    if header_line.lower().startswith(b"content-length:"):
+                        content_length = int(header_line.split(b":", 1)[1])
+                await reader.readexactly(content_length)
+                await asyncio.sleep(latency_ms / 1e3)
+                writer.write(b"HTTP/1.1 201 Created\r\nContent-Length: 4\r\n\r\ntrue")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def run_post(df: pl.DataFrame, symbol_count: int, chunk_row_count: int, max_concurrency: int,
+                   latency_ms: float, url: str | None) -> float:
+    sink_server = None
+    if url is None:
+        sink_server = await run_sink_server(latency_ms)
+        url = f"http://127.0.0.1:{sink_server.sockets[0].getsockname()[1]}/create-all-bar_data"
+    # else not required: posting to real server
+    symbol_df_list = df.partition_by("symbol", maintain_order=True)
+    start_time = time.perf_counter()
+    async with DfBulkPostClient(url, max_concurrency, chunk_row_count) as df_bulk_post_client:
+        # one task per symbol, as BarDataLoader
+        await asyncio.gather(*[df_bulk_post_client.post_df(symbol_df) for symbol_df in symbol_df_list])
+    elapsed_sec = time.perf_counter() - start_time
+    if sink_server is not None:
+        sink_server.close()
+    # else not required: no local sink
+    return elapsed_sec
+
+
+def run(symbol_count: int, rows_per_symbol: int, chunk_row_count: int, max_concurrency: int, latency_ms: float,
+        url: str | None) -> None:
+    df = get_synthetic_bar_data_df(symbol_count, rows_per_symbol)
+    logging.info(f"{len(df):,} rows, {symbol_count} symbols, chunk {chunk_row_count} rows")
+    run_encode(df, chunk_row_count)
+
+    serial_sec = asyncio.run(run_post(df, symbol_count, chunk_row_count, 1, latency_ms, url))
+    concurrent_sec = asyncio.run(run_post(df, symbol_count, chunk_row_count, max_concurrency, latency_ms, url))
+    logging.info(f"post serial:     {len(df) / serial_sec:,.0f} rows/s")
+    logging.info(f"post concurrent: {len(df) / concurrent_sec:,.0f} rows/s with {max_concurrency} in flight, "
+                 f"speedup: {serial_sec / concurrent_sec:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per row vs columnar bar data ingestion throughput.")
+    parser.add_argument("--symbol_count", type=int, default=200)
+    parser.add_argument("--rows_per_symbol", type=int, default=2000)
+    parser.add_argument("--chunk_row_count", type=int, default=DfBulkPostClient.default_chunk_row_count)
+    parser.add_argument("--max_concurrency", type=int, default=8)
+    parser.add_argument("--latency_ms", type=float, default=20.0, help="Simulated create-all server latency.")
+    parser.add_argument("--url", default=None, help="Real create-all url instead of local sink.")
+    args = parser.parse_args()
+
+    run(args.symbol_count, args.rows_per_symbol, args.chunk_row_count, args.max_concurrency, args.latency_ms,
+        args.url)
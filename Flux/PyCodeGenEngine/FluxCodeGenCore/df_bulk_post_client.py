@@ -0,0 +1,81 @@
+# standard imports
+import asyncio
+import logging
+import time
+from typing import List, Final
+
+# 3rd party imports
+import httpx
+import polars as pl
+
+# project imports
+from FluxPythonUtils.scripts.general_utility_functions import ClientError
+
+
+def encode_df_as_json_array(df: pl.DataFrame) -> bytes:
+    # native polars row serializer (no per row python dicts) - ndjson lines joined into json array body that
+    # msgspec create-all routes decode straight into model list
+    ndjson_bytes = df.write_ndjson().encode("utf-8")
+    if not ndjson_bytes:
+        return b"[]"
+    return b"[" + ndjson_bytes.rstrip(b"\n").replace(b"\n", b",") + b"]"
+
+
+class DfBulkPostClient:
+    """
+    async bulk create-all poster: DataFrame rows already in model field layout are encoded column-wise and posted
+    to a create-all url in chunks of chunk_row_count over one keep-alive httpx.AsyncClient, at most
+    max_concurrency requests in flight across all callers (e.g. one caller per symbol), created objs are not
+    echoed back (return_obj_copy=False)
+    """
+    default_chunk_row_count: Final[int] = 5000
+
+    def __init__(self, create_all_url: str, max_concurrency: int = 8, chunk_row_count: int = default_chunk_row_count,
+                 timeout_secs: float = 120):
+        self.create_all_url: str = create_all_url
+        self.chunk_row_count: int = chunk_row_count
+        self.request_semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+        self.async_client: httpx.AsyncClient = httpx.AsyncClient(
+            timeout=timeout_secs, headers={"Content-Type": "application/json"},
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency))
+        # metrics
+        self.posted_row_count: int = 0
+        self.posted_byte_count: int = 0
+        self.post_secs: float = 0.0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        await self.async_client.aclose()
+
+    async def post_df(self, df: pl.DataFrame) -> int:
+        """
+        posts all rows of df, chunks concurrently (bounded by shared semaphore); returns posted row count,
+        raises ClientError on first failed chunk
+        """
+        chunk_df_list: List[pl.DataFrame] = [df.slice(offset, self.chunk_row_count)
+                                             for offset in range(0, len(df), self.chunk_row_count)]
+        posted_row_count_list = await asyncio.gather(*[self._post_chunk(chunk_df) for chunk_df in chunk_df_list])
+        return sum(posted_row_count_list)
+
+    async def _post_chunk(self, chunk_df: pl.DataFrame) -> int:
+        # encoding outside semaphore - next chunk is ready by the time a request slot frees up
+        body_bytes = encode_df_as_json_array(chunk_df)
+        async with self.request_semaphore:
+            start_time = time.perf_counter()
+            response = await self.async_client.post(self.create_all_url, content=body_bytes,
+                                                    params={"return_obj_copy": False})
+            self.post_secs += time.perf_counter() - start_time
+        if response.status_code != 201:
+            err_str_ = (f"bulk post of {len(chunk_df)} rows to {self.create_all_url} failed with status: "
+                        f"{response.status_code};;; response: {response.text[:1000]}")
+            logging.error(err_str_)
+            raise ClientError(err_str_)
+        # else not required: chunk created
+        self.posted_row_count += len(chunk_df)
+        self.posted_byte_count += len(body_bytes)
+        return len(chunk_df)
@@ -1,5 +1,6 @@
 # system imports
 import copy
+import functools
 import json
 import asyncio
 from typing import List, Any, Dict, Final, Callable, Type, Tuple, TypeVar
@@ -15,6 +16,7 @@ import msgspec
 import motor.motor_asyncio
 from pymongo import UpdateOne
 import pymongo.results
+import pymongo.errors
 from fastapi import HTTPException, WebSocket, WebSocketDisconnect
 import orjson
 from pendulum import DateTime
@@ -31,6 +33,14 @@ from Flux.PyCodeGenEngine.FluxCodeGenCore.generic_route_utils import get_aggrega
 from FluxPythonUtils.scripts.model_base_utils import MsgspecBaseModel, remove_none_values
 from Flux.PyCodeGenEngine.FluxCodeGenCore.base_aggregate import *
 from FluxPythonUtils.scripts.async_rlock import AsyncRLock
+from Flux.PyCodeGenEngine.FluxCodeGenCore.page_change_detector import (
+    PageChangeDetector, detect_page_changes, commit_page_windows, discard_page_windows)
+from Flux.PyCodeGenEngine.FluxCodeGenCore.ws_broadcast_queue import (
+    WsBroadcastQueue, WsBroadcastEvent, async_ws_publish)
+from Flux.PyCodeGenEngine.FluxCodeGenCore.change_stream_consumer import ChangeStreamConsumer
+from Flux.PyCodeGenEngine.FluxCodeGenCore.time_series_update_engine import get_time_series_update_engine
+from Flux.PyCodeGenEngine.FluxCodeGenCore.large_db_object_cache import (
+    get_large_db_object_cache, invalidate_large_db_objects, large_db_object_download_concurrency)
 
 """
 1. FilterAggregate [only filters the returned value]
@@ -46,7 +56,6 @@ MsgspecModel = TypeVar('MsgspecModel', bound=MsgspecBaseModel)
 id_not_found: Final[DefaultMsgspecWebResponse] = DefaultMsgspecWebResponse(msg="Id not Found")
 del_success: Final[DefaultMsgspecWebResponse] = DefaultMsgspecWebResponse(msg="Deletion Successful")
 code_gen_projects_path = PurePath(__file__).parent.parent.parent / "CodeGenProjects"
-timeseries_update_log_counter = 0
 
 
 def validate_ws_connection_managers_in_model_obj(model_class_type: Type[MsgspecModel]):
@@ -59,13 +68,48 @@ def validate_ws_connection_managers_in_model_obj(model_class_type: Type[MsgspecM
         raise Exception(err)
 
 
-async def broadcast_all_from_active_ws_data_set(active_ws_data_set: List[WSData],
+def _get_page_change_json_str(ws_data: WSData, **kwargs) -> str | None:
+    page_changes = kwargs.get("page_changes")
+    if page_changes is not None:
+        for page_change in page_changes:
+            if page_change.get("page_id") == ws_data.id:
+                change_list = page_change.get("changes")
+                if not change_list:
+                    # create or delete didn't impact in any change on this page
+                    return None
+                if len(change_list) == 1:
+                    # to send obj to ws notification if only single obj is to be sent - this is how
+                    # UI expects ws updates
+                    change_list = change_list[0]
+                return orjson.dumps(change_list, default=non_jsonable_types_handler).decode("utf-8")
+        else:
+            logging.error("Unexpected: ws found with ws_data having flag has_pagination_with_or_without_filters True "
+                          f"but page_id not found in detected changes ;;; {ws_data=}, {page_changes=}")
+            return None
+    else:
+        # Either create/delete happened after ws pages so no impact on any page or put/patch happened
+        # before or after page on attributes which doesn't affect pages
+        return None
+
+
+async def broadcast_all_from_active_ws_data_set(signature_to_active_ws_data_list_dict: Dict[Tuple, List[WSData]],
                                                 msgspec_class_type: Type[MsgspecModel],
                                                 db_obj_id_list: List[Any], db_obj_dict_list: List[Dict[str, Any]],
                                                 broadcast_callable: Callable,
                                                 tasks_list: List[asyncio.Task],
-                                                has_links: bool | None = None, **kwargs):
-    for ws_data in active_ws_data_set:
+                                                has_links: bool | None = None, **kwargs) -> Tuple[int, int]:
+    """
+    Fan-out of db_obj_dict_list to subscribers grouped by their broadcast_signature (projection/pagination/plain) -
+    groups come from ws connection manager's signature index, payload for each group is fetched & encoded once
+    and shared by all subscribers of the group
+    :return: Tuple of (encode_count, send_count) for this broadcast
+    """
+    encode_count: int = 0
+    send_count: int = 0
+    for ws_data_list in signature_to_active_ws_data_list_dict.values():
+        # all subscribers of group share filter kwargs & projection - first one drives fetch and encode
+        ws_data = ws_data_list[0]
+        json_str: str | None = None
         projection_agg_params = ws_data.filter_callable_kwargs
         projection_agg_pipeline_callable = ws_data.projection_agg_pipeline_callable
 
@@ -79,60 +123,59 @@ async def broadcast_all_from_active_ws_data_set(active_ws_data_set: List[WSData]
             projected_db_obj_dict_list = await get_obj_list(msgspec_class_type, db_obj_id_list,
                                                   filter_agg_pipeline=filter_agg_pipeline,
                                                   has_links=has_links, is_projection_type=True)
-            if not projected_db_obj_dict_list:
-                # if this projection filter has some filter param that filters out all available db objs, in that case
-                # db_obj_dict_list will be empty so no ws update is required
-                continue
-            # else not required: all good if fetched projection applied object list - will publish this now
-
-            for obj_json in projected_db_obj_dict_list:
-                # handling all datetime fields - converting to epoch int values before passing to ws network
-                msgspec_class_type.convert_ts_fields_from_datetime_to_epoch_int(obj_json)
-
-            if ws_data.allow_full_db_read_on_updates:
-                # full db read is done for projecting to single obj for example counting
-                # filtered docs - sending it as obj instead of list
-                json_str = orjson.dumps(projected_db_obj_dict_list[0], default=non_jsonable_types_handler).decode('utf-8')
-            else:
-                json_str = orjson.dumps(projected_db_obj_dict_list, default=non_jsonable_types_handler).decode('utf-8')
+            # if this projection filter has some filter param that filters out all available db objs, in that case
+            # db_obj_dict_list will be empty so no ws update is required
+            if projected_db_obj_dict_list:
+                for obj_json in projected_db_obj_dict_list:
+                    # handling all datetime fields - converting to epoch int values before passing to ws network
+                    msgspec_class_type.convert_ts_fields_from_datetime_to_epoch_int(obj_json)
+
+                if ws_data.allow_full_db_read_on_updates:
+                    # full db read is done for projecting to single obj for example counting
+                    # filtered docs - sending it as obj instead of list
+                    json_str = orjson.dumps(projected_db_obj_dict_list[0],
+                                            default=non_jsonable_types_handler).decode('utf-8')
+                else:
+                    json_str = orjson.dumps(projected_db_obj_dict_list,
+                                            default=non_jsonable_types_handler).decode('utf-8')
+                encode_count += 1
+            # else not required: no ws update required for this projection group
 
         elif ws_data.has_pagination_with_or_without_filters:    # has pagination might also have filters and sort along with pagination
-            page_changes = kwargs.get("page_changes")
-            if page_changes is not None:
-                for page_change in page_changes:
-                    if page_change.get("page_id") == ws_data.id:
-                        change_list = page_change.get("changes")
-                        if not change_list:
-                            # create or delete didn't impact in any change on this page
-                            continue
-                        if len(change_list) == 1:
-                            # to send obj to ws notification if only single obj is to be sent - this is how
-                            # UI expects ws updates
-                            change_list = change_list[0]
-                        json_str = orjson.dumps(change_list, default=non_jsonable_types_handler).decode("utf-8")
-                        break
-                else:
-                    logging.error("Unexpected: ws found with ws_data having flag has_pagination_with_or_without_filters True but page_id not "
-                                  f"found in detected changes ;;; {ws_data=}, {page_changes=}")
-                    continue
-            else:
-                # Either create/delete happened after ws pages so no impact on any page or put/patch happened
-                # before or after page on attributes which doesn't affect pages
-                continue
+            json_str = _get_page_change_json_str(ws_data, **kwargs)
+            if json_str is not None:
+                encode_count += 1
         else:
             # when ws is without any filter, sort or pagination
             json_str = orjson.dumps(db_obj_dict_list, default=non_jsonable_types_handler).decode("utf-8")
+            encode_count += 1
 
-        await broadcast_callable(json_str, db_obj_id_list, ws_data, tasks_list)
+        if json_str is not None:
+            for group_ws_data in ws_data_list:
+                await broadcast_callable(json_str, db_obj_id_list, group_ws_data, tasks_list)
+            send_count += len(ws_data_list)
+        # else not required: no update required for this subscriber group
+    return encode_count, send_count
 
 
-async def broadcast_from_active_ws_data_set(active_ws_data_set: List[WSData], msgspec_class_type: Type[MsgspecModel],
+async def broadcast_from_active_ws_data_set(signature_to_active_ws_data_list_dict: Dict[Tuple, List[WSData]],
+                                            msgspec_class_type: Type[MsgspecModel],
                                             db_obj_id: Any, db_obj_dict: Dict[str, Any],
                                             broadcast_callable: Callable,
                                             tasks_list: List[asyncio.Task],
                                             broadcast_with_id: bool | None = None,
-                                            has_links: bool | None = None, **kwargs):
-    for ws_data in active_ws_data_set:
+                                            has_links: bool | None = None, **kwargs) -> Tuple[int, int]:
+    """
+    Single obj variant of broadcast_all_from_active_ws_data_set - payload is fetched & encoded once per
+    subscriber group (broadcast_signature) and shared by all subscribers of the group
+    :return: Tuple of (encode_count, send_count) for this broadcast
+    """
+    encode_count: int = 0
+    send_count: int = 0
+    for ws_data_list in signature_to_active_ws_data_list_dict.values():
+        # all subscribers of group share filter kwargs & projection - first one drives fetch and encode
+        ws_data = ws_data_list[0]
+        json_str: str | None = None
         projection_agg_params = ws_data.filter_callable_kwargs
         projection_agg_pipeline_callable = ws_data.projection_agg_pipeline_callable
 
@@ -146,50 +189,103 @@ async def broadcast_from_active_ws_data_set(active_ws_data_set: List[WSData], ms
             projected_db_obj_dict = await get_obj(msgspec_class_type, db_obj_id,
                                         filter_agg_pipeline=filter_agg_pipeline,
                                         has_links=has_links, is_projection_type=True)
-            if projected_db_obj_dict is None:
-                # if this projection filter has some filter param that mismatches to this update, in that case
-                # db_obj_dict will be None so no ws update is required
-                continue
-            # else not required: all good if fetched projection applied object - will publish this now
-
-            # handling all datetime fields - converting to epoch int values before passing to ws network
-            msgspec_class_type.convert_ts_fields_from_datetime_to_epoch_int(projected_db_obj_dict)
-            json_str = orjson.dumps(projected_db_obj_dict, default=non_jsonable_types_handler).decode("utf-8")
+            # if this projection filter has some filter param that mismatches to this update, in that case
+            # db_obj_dict will be None so no ws update is required
+            if projected_db_obj_dict is not None:
+                # handling all datetime fields - converting to epoch int values before passing to ws network
+                msgspec_class_type.convert_ts_fields_from_datetime_to_epoch_int(projected_db_obj_dict)
+                json_str = orjson.dumps(projected_db_obj_dict, default=non_jsonable_types_handler).decode("utf-8")
+                encode_count += 1
+            # else not required: no ws update required for this projection group
 
         # else not required: passing provided db_obj_dict if ws_data is not of projection type to avoid
         # multiple look-ups as fetched object will also be exact same unless some projection is required on it
 
         elif ws_data.has_pagination_with_or_without_filters:    # might also have filters and sort along with pagination - handled already
-            page_changes = kwargs.get("page_changes")
-            if page_changes is not None:
-                for page_change in page_changes:
-                    if page_change.get("page_id") == ws_data.id:
-                        change_list = page_change.get("changes")
-                        if not change_list:
-                            # create or delete didn't impact in any change on this page
-                            continue
-                        if len(change_list) == 1:
-                            # to send obj to ws notification if only single obj is to be sent - this is how
-                            # UI expects ws updates
-                            change_list = change_list[0]
-                        json_str = orjson.dumps(change_list, default=non_jsonable_types_handler).decode("utf-8")
-                        break
-                else:
-                    logging.error("Unexpected: ws found with ws_data having flag has_pagination_with_or_without_filters True but page_id not "
-                                  f"found in detected changes ;;; {ws_data=}, {page_changes=}")
-                    continue
-            else:
-                # create/delete happened after ws pages to be detected so no impact on current pages
-                continue
+            json_str = _get_page_change_json_str(ws_data, **kwargs)
+            if json_str is not None:
+                encode_count += 1
         else:
             # when ws is without any filter, sort or pagination
             json_str = orjson.dumps(db_obj_dict, default=non_jsonable_types_handler).decode("utf-8")
-        await broadcast_callable(json_str, db_obj_id, ws_data, tasks_list)
+            encode_count += 1
+
+        if json_str is not None:
+            for group_ws_data in ws_data_list:
+                await broadcast_callable(json_str, db_obj_id, group_ws_data, tasks_list)
+            send_count += len(ws_data_list)
+        # else not required: no update required for this subscriber group
+    return encode_count, send_count
+
+
+def _log_broadcast_counts(msgspec_class_type: Type[MsgspecModel], publish_callable_name: str,
+                          encode_count: int, send_count: int):
+    if send_count:
+        logging.debug(f"{publish_callable_name}: {msgspec_class_type.__name__} broadcast done with "
+                      f"{encode_count=}, {send_count=}")
+    # else not required: nothing was broadcast
+
+
+model_name_to_ws_broadcast_queue_dict: Dict[str, WsBroadcastQueue] = {}
+
+
+def get_ws_broadcast_queue(msgspec_class_type: Type[MsgspecModel]) -> WsBroadcastQueue:
+    ws_broadcast_queue = model_name_to_ws_broadcast_queue_dict.get(msgspec_class_type.__name__)
+    if ws_broadcast_queue is None:
+        ws_broadcast_queue = WsBroadcastQueue(msgspec_class_type.__name__,
+                                              functools.partial(publish_ws_inline, msgspec_class_type),
+                                              functools.partial(publish_ws_all_inline, msgspec_class_type))
+        model_name_to_ws_broadcast_queue_dict[msgspec_class_type.__name__] = ws_broadcast_queue
+    # else not required: using existing queue of model
+    return ws_broadcast_queue
+
+
+def get_ws_broadcast_queue_metrics_list() -> List[Dict[str, Any]]:
+    return [ws_broadcast_queue.get_queue_metrics()
+            for ws_broadcast_queue in model_name_to_ws_broadcast_queue_dict.values()]
+
+
+def _get_ws_obj_dict_snapshot(db_obj_dict: Dict[str, Any]) -> Dict[str, Any]:
+    # callers may set fields of passed dict once publish returns (returned obj is only decoded / read past that) -
+    # shallow copy keeps queued broadcast on dict as of write at a fraction of an encode / decode round trip, with
+    # keys and values keeping their types
+    return dict(db_obj_dict)
 
 
 async def publish_ws(msgspec_class_type: Type[MsgspecModel], db_obj_id: Any, db_obj_dict: Dict[str, Any],
                      has_links: bool | None = None, update_ws_with_id: bool | None = None, **kwargs):
     """
+    publishes inline or, with AsyncWsPublish env set, enqueues to model's WsBroadcastQueue and returns without
+    waiting for subscribers - params same as publish_ws_inline
+    """
+    if async_ws_publish:
+        await get_ws_broadcast_queue(msgspec_class_type).enqueue(
+            WsBroadcastEvent([db_obj_id], [_get_ws_obj_dict_snapshot(db_obj_dict)], has_links, update_ws_with_id,
+                             True, kwargs))
+    else:
+        await publish_ws_inline(msgspec_class_type, db_obj_id, db_obj_dict, has_links, update_ws_with_id, **kwargs)
+
+
+async def publish_ws_all(msgspec_class_type: Type[MsgspecModel], db_obj_id_list: List[Any],
+                         db_obj_dict_list: List[Dict[str, Any]],
+                         has_links: bool | None = None, update_ws_with_id: bool | None = None, **kwargs):
+    """
+    publishes inline or, with AsyncWsPublish env set, enqueues to model's WsBroadcastQueue and returns without
+    waiting for subscribers - params same as publish_ws_all_inline
+    """
+    if async_ws_publish:
+        await get_ws_broadcast_queue(msgspec_class_type).enqueue(
+            WsBroadcastEvent(list(db_obj_id_list),
+                             [_get_ws_obj_dict_snapshot(db_obj_dict) for db_obj_dict in db_obj_dict_list],
+                             has_links, update_ws_with_id, False, kwargs))
+    else:
+        await publish_ws_all_inline(msgspec_class_type, db_obj_id_list, db_obj_dict_list, has_links,
+                                    update_ws_with_id, **kwargs)
+
+
+async def publish_ws_inline(msgspec_class_type: Type[MsgspecModel], db_obj_id: Any, db_obj_dict: Dict[str, Any],
+                            has_links: bool | None = None, update_ws_with_id: bool | None = None, **kwargs):
+    """
     :param msgspec_class_type: Dataclass SubClass Type
     :param db_obj_id: db_obj_id for create/update/delete
     :param db_obj_dict: db_obj_dict for create/update/delete
@@ -198,30 +294,37 @@ async def publish_ws(msgspec_class_type: Type[MsgspecModel], db_obj_id: Any, db_
     """
     validate_ws_connection_managers_in_model_obj(msgspec_class_type)
     tasks_list: List[asyncio.Task] = []
-    active_ws_data_list: List[WSData] = msgspec_class_type.read_ws_path_ws_connection_manager.get_activ_ws_data_list()
-    if active_ws_data_list:
+    encode_count: int = 0
+    send_count: int = 0
+    signature_to_active_ws_data_list_dict: Dict[Tuple, List[WSData]] = \
+        msgspec_class_type.read_ws_path_ws_connection_manager.get_broadcast_signature_to_active_ws_data_list_dict()
+    if signature_to_active_ws_data_list_dict:
         async with msgspec_class_type.read_ws_path_ws_connection_manager.rlock:
-            await broadcast_from_active_ws_data_set(active_ws_data_list, msgspec_class_type, db_obj_id, db_obj_dict,
-                                                    msgspec_class_type.read_ws_path_ws_connection_manager.broadcast,
-                                                    tasks_list, has_links=has_links, **kwargs)
+            encode_count, send_count = await broadcast_from_active_ws_data_set(
+                signature_to_active_ws_data_list_dict, msgspec_class_type, db_obj_id, db_obj_dict,
+                msgspec_class_type.read_ws_path_ws_connection_manager.broadcast,
+                tasks_list, has_links=has_links, **kwargs)
     if update_ws_with_id:
-        active_ws_data_list_for_id: List[WSData] = \
-            msgspec_class_type.read_ws_path_with_id_ws_connection_manager.get_activ_ws_tuple_list_with_id(
-                db_obj_id)
+        signature_to_active_ws_data_list_dict_for_id: Dict[Tuple, List[WSData]] | None = \
+            msgspec_class_type.read_ws_path_with_id_ws_connection_manager.\
+            get_broadcast_signature_to_active_ws_data_list_dict_with_id(db_obj_id)
 
-        if active_ws_data_list_for_id:
+        if signature_to_active_ws_data_list_dict_for_id:
             async with msgspec_class_type.read_ws_path_with_id_ws_connection_manager.rlock:
-                await broadcast_from_active_ws_data_set(
-                    active_ws_data_list_for_id, msgspec_class_type, db_obj_id, db_obj_dict,
+                id_encode_count, id_send_count = await broadcast_from_active_ws_data_set(
+                    signature_to_active_ws_data_list_dict_for_id, msgspec_class_type, db_obj_id, db_obj_dict,
                     msgspec_class_type.read_ws_path_with_id_ws_connection_manager.broadcast,
                     tasks_list, broadcast_with_id=True, has_links=has_links, **kwargs)
+                encode_count += id_encode_count
+                send_count += id_send_count
+    _log_broadcast_counts(msgspec_class_type, "publish_ws", encode_count, send_count)
     if tasks_list:
         await execute_tasks_list_with_all_completed(tasks_list, msgspec_class_type)
 
 
-async def publish_ws_all(msgspec_class_type: Type[MsgspecModel], db_obj_id_list: List[Any],
-                         db_obj_dict_list: List[Dict[str, Any]],
-                         has_links: bool | None = None, update_ws_with_id: bool | None = None, **kwargs):
+async def publish_ws_all_inline(msgspec_class_type: Type[MsgspecModel], db_obj_id_list: List[Any],
+                                db_obj_dict_list: List[Dict[str, Any]],
+                                has_links: bool | None = None, update_ws_with_id: bool | None = None, **kwargs):
     """
     :param msgspec_class_type: MsgspecModel SubClass Type
     :param db_obj_id_list: List of db_obj_ids for create/update/delete
@@ -231,50 +334,45 @@ async def publish_ws_all(msgspec_class_type: Type[MsgspecModel], db_obj_id_list:
     """
     validate_ws_connection_managers_in_model_obj(msgspec_class_type)
     tasks_list: List[asyncio.Task] = []
+    encode_count: int = 0
+    send_count: int = 0
 
-    active_ws_data_list: List[WSData] = msgspec_class_type.read_ws_path_ws_connection_manager.get_activ_ws_data_list()
-    if active_ws_data_list:
+    signature_to_active_ws_data_list_dict: Dict[Tuple, List[WSData]] = \
+        msgspec_class_type.read_ws_path_ws_connection_manager.get_broadcast_signature_to_active_ws_data_list_dict()
+    if signature_to_active_ws_data_list_dict:
         async with msgspec_class_type.read_ws_path_ws_connection_manager.rlock:
-            await broadcast_all_from_active_ws_data_set(active_ws_data_list, msgspec_class_type,
-                                                        db_obj_id_list, db_obj_dict_list,
-                                                        msgspec_class_type.read_ws_path_ws_connection_manager.broadcast,
-                                                        tasks_list, has_links, **kwargs)
+            encode_count, send_count = await broadcast_all_from_active_ws_data_set(
+                signature_to_active_ws_data_list_dict, msgspec_class_type, db_obj_id_list, db_obj_dict_list,
+                msgspec_class_type.read_ws_path_ws_connection_manager.broadcast,
+                tasks_list, has_links, **kwargs)
     # TODO: this can be optimized by sending array of messages to ws instead of sending one message at a time per ws
     #       in most use-case the consumer of one id is interested in all ids.
     if update_ws_with_id:
         for db_obj_dict in db_obj_dict_list:
             db_obj_id = db_obj_dict.get("_id")
-            active_ws_data_list_for_id: List[WSData] = \
-                msgspec_class_type.read_ws_path_with_id_ws_connection_manager.get_activ_ws_tuple_list_with_id(
-                    db_obj_id)
+            signature_to_active_ws_data_list_dict_for_id: Dict[Tuple, List[WSData]] | None = \
+                msgspec_class_type.read_ws_path_with_id_ws_connection_manager.\
+                get_broadcast_signature_to_active_ws_data_list_dict_with_id(db_obj_id)
 
-            if active_ws_data_list_for_id:
+            if signature_to_active_ws_data_list_dict_for_id:
                 async with msgspec_class_type.read_ws_path_with_id_ws_connection_manager.rlock:
-                    await broadcast_from_active_ws_data_set(
-                        active_ws_data_list_for_id, msgspec_class_type, db_obj_id, db_obj_dict,
+                    id_encode_count, id_send_count = await broadcast_from_active_ws_data_set(
+                        signature_to_active_ws_data_list_dict_for_id, msgspec_class_type, db_obj_id, db_obj_dict,
                         msgspec_class_type.read_ws_path_with_id_ws_connection_manager.broadcast,
                         tasks_list, broadcast_with_id=True, has_links=has_links, **kwargs)
+                    encode_count += id_encode_count
+                    send_count += id_send_count
+    _log_broadcast_counts(msgspec_class_type, "publish_ws_all", encode_count, send_count)
     if tasks_list:
         await execute_tasks_list_with_all_completed(tasks_list, msgspec_class_type)
 
 
-async def _update_time_series(
-        collection_obj: motor.motor_asyncio.AsyncIOMotorCollection, id_list: List[str | int | Any],
-        new_json_obj_list: List[Dict[str, Any]]):
+async def _update_time_series(msgspec_class_type: Type[MsgspecModel], id_list: List[str | int | Any],
+                              new_json_obj_list: List[Dict[str, Any]]):
     # TimeSeries has limitations when it comes to update:
     # https://www.mongodb.com/docs/manual/core/timeseries/timeseries-limitations/#updates
-    # We have implemented alternative way to avoid limitations
-    global timeseries_update_log_counter
-    if timeseries_update_log_counter < 100:
-        logging.info("MongoDB time-series collections have limitations on document updates. "
-                     "A delete-and-reinsert workaround is being used, which is more resource-intensive than a direct update.")
-        timeseries_update_log_counter += 1
-
-    # first deleting all update objects
-    delete_result = await collection_obj.delete_many({"_id": {'$in': id_list}})
-
-    # creating new objects with updated values
-    await collection_obj.insert_many(new_json_obj_list)
+    # update engine picks in-place bucket update or latest row buffering instead of delete-and-reinsert per update
+    await get_time_series_update_engine(msgspec_class_type).update(id_list, new_json_obj_list)
 
 
 async def execute_update_agg_pipeline(msgspec_class_type: Type[MsgspecModel],
@@ -292,14 +390,15 @@ async def execute_update_agg_pipeline(msgspec_class_type: Type[MsgspecModel],
 
             if not msgspec_class_type.is_time_series:
                 update_req_list.append(UpdateOne({"_id": db_id}, {"$set": aggregated_dict}))
-            # else not required: if model is time series then delete and new insert is done due to unsupported
-            # updates in time-series (check below)
+            # else not required: if model is time series then time-series update engine handles update (check below)
 
         collection_obj: motor.motor_asyncio.AsyncIOMotorCollection = msgspec_class_type.collection_obj
 
         if aggregated_dict_list:
+            # update aggregation modifies docs outside page change detection - page windows must be reloaded
+            PageChangeDetector.invalidate_model_windows(msgspec_class_type)
             if msgspec_class_type.is_time_series:
-                await _update_time_series(collection_obj, id_list, aggregated_dict_list)
+                await _update_time_series(msgspec_class_type, id_list, aggregated_dict_list)
             else:
                 await collection_obj.bulk_write(update_req_list)
         # else not required: avoiding db calls if collection is empty
@@ -311,7 +410,13 @@ async def execute_update_agg_pipeline(msgspec_class_type: Type[MsgspecModel],
 
 
 async def get_detected_changes_in_pagination(msgspec_class_type: Type[MsgspecModel], created_obj_list: List[Any],
-                                             deleted_obj_list: List[Any], update_obj_list: List[Any]) -> Dict | None:
+                                             deleted_obj_list: List[Any], update_obj_list: List[Any],
+                                             pending_window_list: List | None = None,
+                                             exclude_id_list: List[Any] | None = None) -> Dict | None:
+    """
+    exclude_id_list: ids already written to db whose write is being detected after the fact - hidden from each
+    page's db view so pages are compared against state before the write (pages fall back to db detection)
+    """
     active_ws_data_list: List[
         WSData] = msgspec_class_type.read_ws_path_ws_connection_manager.get_activ_ws_data_list()
     page_definitions = []
@@ -323,6 +428,10 @@ async def get_detected_changes_in_pagination(msgspec_class_type: Type[MsgspecMod
             custom_aggregation_before_filter_sort_pagination: List[Dict[str, Any]] = []
             if passed_filter_agg_pipeline is not None:
                 custom_aggregation_before_filter_sort_pagination: List[Dict[str, Any]] = copy.deepcopy(passed_filter_agg_pipeline.get("agg"))
+            if exclude_id_list:
+                custom_aggregation_before_filter_sort_pagination = (
+                    [{"$match": {"_id": {"$nin": exclude_id_list}}}] + (custom_aggregation_before_filter_sort_pagination or []))
+            # else not required: detecting before db write
 
             filters = active_ws_data.filter_callable_kwargs.get("filters")
             sort_order = active_ws_data.filter_callable_kwargs.get("sort_order")
@@ -345,10 +454,9 @@ async def get_detected_changes_in_pagination(msgspec_class_type: Type[MsgspecMod
          # else not required: No special handling required for ws without pagination
 
     if page_definitions:
-        detected_changes: List[Dict] = await detect_multiple_page_changes(msgspec_class_type.collection_obj,
-                                                                          page_definitions, created_obj_list,
-                                                                          deleted_obj_list, msgspec_class_type,
-                                                                          update_obj_list)
+        detected_changes: List[Dict] = await detect_page_changes(msgspec_class_type, page_definitions,
+                                                                 created_obj_list, deleted_obj_list,
+                                                                 update_obj_list, pending_window_list)
 
         for page_change in detected_changes:
             change_detected_obj_json_list = page_change.get("changes")
@@ -382,12 +490,18 @@ async def generic_post_http(msgspec_class_type: Type[MsgspecModel],
             source=create_obj.to_json_str(),
         )
     else:
-        # handling pagination before db create
+        # handling pagination before db create - page windows are moved only once db write succeeds
+        pending_window_list: List = []
         detected_changes = await get_detected_changes_in_pagination(msgspec_class_type,
-                                                                    [obj_json], [], [])
+                                                                    [obj_json], [], [], pending_window_list)
 
         collection_obj: motor.motor_asyncio.AsyncIOMotorCollection = msgspec_class_type.collection_obj
-        insert_one_result: pymongo.results.InsertOneResult = await collection_obj.insert_one(obj_json)
+        try:
+            insert_one_result: pymongo.results.InsertOneResult = await collection_obj.insert_one(obj_json)
+        except Exception:
+            discard_page_windows(pending_window_list)
+            raise
+        commit_page_windows(pending_window_list)
 
         await execute_update_agg_pipeline(msgspec_class_type, proto_package_name, update_agg_pipeline)
 
@@ -495,6 +609,74 @@ async def generic_post_all_http(msgspec_class_type: Type[MsgspecModel], proto_pa
     return obj_json_list
 
 
+async def generic_group_commit_post_http(msgspec_class_type: Type[MsgspecModel], proto_package_name: str,
+                                         create_obj_list: List[MsgspecModel],
+                                         has_links: bool = False) -> List[Dict[str, Any] | Exception]:
+    """
+    writes independent creates coalesced by GroupCommitQueue - unlike generic_post_all_http each obj succeeds or
+    fails on its own (unordered insert_many), returns obj_json or exception per passed obj in same order, all
+    committed objs are published with one publish_ws_all
+    """
+    if msgspec_class_type.enable_large_db_object:
+        # gridfs has no batch upload - per obj writes
+        result_list: List[Dict[str, Any] | Exception] = []
+        for create_obj in create_obj_list:
+            try:
+                result_list.append(await generic_post_http(msgspec_class_type, proto_package_name, create_obj,
+                                                           has_links=has_links))
+            except Exception as e:
+                result_list.append(e)
+        return result_list
+    # else not required: regular collection - single db round trip for batch
+
+    for create_obj in create_obj_list:
+        if create_obj.id is not None:
+            msgspec_class_type.init_max_id(create_obj.id, None)  # updates max_id to this id if is > than existing max_id
+    obj_json_list = msgspec.to_builtins(create_obj_list, builtin_types=[DateTime])
+    result_list: List[Dict[str, Any] | Exception] = list(obj_json_list)
+
+    # handling pagination before db create
+    detected_changes: Dict = await get_detected_changes_in_pagination(msgspec_class_type, obj_json_list, [], [])
+
+    collection_obj: motor.motor_asyncio.AsyncIOMotorCollection = msgspec_class_type.collection_obj
+    try:
+        await collection_obj.insert_many(obj_json_list, ordered=False)
+    except pymongo.errors.BulkWriteError as e:
+        for write_error in e.details.get("writeErrors", []):
+            result_list[write_error["index"]] = pymongo.errors.WriteError(
+                write_error.get("errmsg"), write_error.get("code"), write_error)
+        logging.error(f"group commit insert of {msgspec_class_type.__name__} failed for "
+                      f"{len(e.details.get('writeErrors', []))} of {len(obj_json_list)} objs;;; "
+                      f"write_errors: {e.details.get('writeErrors')}")
+        # page changes were detected with failed objs included - windows may hold them too, redetecting for
+        # committed objs only against db state without them
+        PageChangeDetector.invalidate_model_windows(msgspec_class_type)
+        committed_obj_json_list = [obj_json for obj_json in result_list if not isinstance(obj_json, Exception)]
+        if committed_obj_json_list:
+            committed_obj_id_list = [obj_json.get("_id") for obj_json in committed_obj_json_list]
+            detected_changes = await get_detected_changes_in_pagination(
+                msgspec_class_type, committed_obj_json_list, [], [], exclude_id_list=committed_obj_id_list)
+        else:
+            detected_changes = {"page_changes": []}
+
+    committed_obj_id_list = []
+    committed_obj_json_list = []
+    for obj_json in result_list:
+        if not isinstance(obj_json, Exception):
+            # handling all datetime fields - converting to epoch int values - caller of this function will handle
+            # these fields back if required
+            msgspec_class_type.convert_ts_fields_from_datetime_to_epoch_int(obj_json)
+            committed_obj_id_list.append(obj_json.get("_id"))
+            committed_obj_json_list.append(obj_json)
+        # else not required: failed obj is neither converted nor published
+
+    if committed_obj_json_list:
+        await publish_ws_all(msgspec_class_type, committed_obj_id_list, committed_obj_json_list, has_links,
+                             **detected_changes)
+    # else not required: nothing committed to publish
+    return result_list
+
+
 # def _get_beanie_formatted_update_request_json(updated_model_obj_dict: Dict):
 #     # creating new obj without id and _id key
 #     request_obj = {'$set': updated_model_obj_dict.items()}
@@ -512,29 +694,39 @@ async def _underlying_patch_n_put(msgspec_class_type: Type[MsgspecModel], proto_
 
     if msgspec_class_type.enable_large_db_object:
         gridfs_bucket_obj: motor.motor_asyncio.AsyncIOMotorGridFSBucket = msgspec_class_type.gridfs_bucket_obj
-        # first deleting the existing object
-        await gridfs_bucket_obj.delete(_id)
+        try:
+            # first deleting the existing object
+            await gridfs_bucket_obj.delete(_id)
 
-        # now creating updated object
-        await gridfs_bucket_obj.upload_from_stream_with_id(
-            file_id=_id,
-            filename=str(_id),
-            source=orjson.dumps(updated_json_obj_dict, default=non_jsonable_types_handler),
-        )
+            # now creating updated object
+            await gridfs_bucket_obj.upload_from_stream_with_id(
+                file_id=_id,
+                filename=str(_id),
+                source=orjson.dumps(updated_json_obj_dict, default=non_jsonable_types_handler),
+            )
+        finally:
+            invalidate_large_db_objects(msgspec_class_type, [_id])
 
     else:
         collection_obj: motor.motor_asyncio.AsyncIOMotorCollection = msgspec_class_type.collection_obj
 
-        # handling pagination before db update
+        # handling pagination before db update - page windows are moved only once db write succeeds
+        pending_window_list: List = []
         detected_changes = await get_detected_changes_in_pagination(msgspec_class_type, [], [],
-                                                                    update_obj_list=[updated_json_obj_dict])
+                                                                    update_obj_list=[updated_json_obj_dict],
+                                                                    pending_window_list=pending_window_list)
 
-        if msgspec_class_type.is_time_series:
-            await _update_time_series(collection_obj, [_id], [updated_json_obj_dict])
+        try:
+            if msgspec_class_type.is_time_series:
+                await _update_time_series(msgspec_class_type, [_id], [updated_json_obj_dict])
 
-        else:
-            update_one_result: pymongo.results.UpdateResult = \
-                await collection_obj.update_one({"_id": _id}, {"$set": updated_json_obj_dict})
+            else:
+                update_one_result: pymongo.results.UpdateResult = \
+                    await collection_obj.update_one({"_id": _id}, {"$set": updated_json_obj_dict})
+        except Exception:
+            discard_page_windows(pending_window_list)
+            raise
+        commit_page_windows(pending_window_list)
         await execute_update_agg_pipeline(msgspec_class_type, proto_package_name, update_agg_pipeline)
 
         if update_agg_pipeline or filter_agg_pipeline:
@@ -574,12 +766,15 @@ async def _underlying_patch_n_put_all(msgspec_class_type: Type[MsgspecModel], pr
                 missing_ids.append(_id)
                 continue
 
-            # now creating updated object
-            await gridfs_bucket_obj.upload_from_stream_with_id(
-                file_id=_id,
-                filename=str(_id),
-                source=orjson.dumps(updated_json_obj_dict, default=non_jsonable_types_handler),
-            )
+            try:
+                # now creating updated object
+                await gridfs_bucket_obj.upload_from_stream_with_id(
+                    file_id=_id,
+                    filename=str(_id),
+                    source=orjson.dumps(updated_json_obj_dict, default=non_jsonable_types_handler),
+                )
+            finally:
+                invalidate_large_db_objects(msgspec_class_type, [_id])
     else:
         collection_obj: motor.motor_asyncio.AsyncIOMotorCollection = msgspec_class_type.collection_obj
 
@@ -588,7 +783,7 @@ async def _underlying_patch_n_put_all(msgspec_class_type: Type[MsgspecModel], pr
                                                                     update_obj_list=updated_json_obj_dict_list)
 
         if msgspec_class_type.is_time_series:
-            await _update_time_series(collection_obj, updated_obj_id_list, updated_json_obj_dict_list)
+            await _update_time_series(msgspec_class_type, updated_obj_id_list, updated_json_obj_dict_list)
         else:
             update_req_list: List[UpdateOne] = []
             for updated_json_obj_dict in updated_json_obj_dict_list:
@@ -918,14 +1113,27 @@ async def generic_delete_http(msgspec_class_type: Type[MsgspecModel], proto_pack
             err_str = f"Unexpected: Obj with {db_obj_id=} doesn't exist - Can't be deleted"
             logging.error(err_str)
             raise HTTPException(status_code=404, detail=err_str)
+        finally:
+            invalidate_large_db_objects(msgspec_class_type, [db_obj_id])
     else:
-        # handling pagination before db create
+        # handling pagination before db delete - page windows are moved only once db write succeeds
+        pending_window_list: List = []
         detected_changes: Dict | None = await get_detected_changes_in_pagination(msgspec_class_type,
-                                                                                [], [db_obj_id], [])
+                                                                                [], [db_obj_id], [],
+                                                                                pending_window_list)
 
         collection_obj: motor.motor_asyncio.AsyncIOMotorCollection = msgspec_class_type.collection_obj
-        delete_res = await collection_obj.delete_one({"_id": db_obj_id})
+        try:
+            if msgspec_class_type.is_time_series:
+                # also drops buffered latest row
+                delete_res = await get_time_series_update_engine(msgspec_class_type).delete_rows([db_obj_id])
+            else:
+                delete_res = await collection_obj.delete_one({"_id": db_obj_id})
+        except Exception:
+            discard_page_windows(pending_window_list)
+            raise
         if delete_res.deleted_count == 1:
+            commit_page_windows(pending_window_list)
             await execute_update_agg_pipeline(msgspec_class_type, proto_package_name, update_agg_pipeline)
 
             # replacing change detected json objs with objs after update agg execution
@@ -946,6 +1154,7 @@ async def generic_delete_http(msgspec_class_type: Type[MsgspecModel], proto_pack
             # delete_res.deleted_count for delete_one will always be either 1 or 0 - The delete_one method is
             # implemented to stop after deleting a single matching document, so it will never delete more than
             # one document, even if multiple documents match the query filter.
+            discard_page_windows(pending_window_list)
             err_str = f"Unexpected: Obj with {db_obj_id=} doesn't exist - Can't be deleted"
             logging.error(err_str)
             raise HTTPException(status_code=404, detail=err_str)
@@ -981,6 +1190,8 @@ async def generic_delete_all_http(msgspec_class_type: Type[MsgspecModel], proto_
                 err_str = f"Unexpected: Obj with {_id=} doesn't exist - Can't be deleted"
                 logging.error(err_str)
                 raise HTTPException(status_code=404, detail=err_str)
+            finally:
+                invalidate_large_db_objects(msgspec_class_type, [_id])
     else:
         collection_obj: motor.motor_asyncio.AsyncIOMotorCollection = msgspec_class_type.collection_obj
 
@@ -1000,7 +1211,12 @@ async def generic_delete_all_http(msgspec_class_type: Type[MsgspecModel], proto_
                                                                     [], del_success.id, [])
 
         # deleting all
-        delete_result: pymongo.results.DeleteResult = await collection_obj.delete_many({})
+        if msgspec_class_type.is_time_series:
+            # also drops buffered latest rows
+            delete_result: pymongo.results.DeleteResult = await get_time_series_update_engine(
+                msgspec_class_type).delete_rows()
+        else:
+            delete_result: pymongo.results.DeleteResult = await collection_obj.delete_many({})
 
     # Setting back incremental id to 0 if collection gets empty
     if id_is_int_type:
@@ -1035,6 +1251,8 @@ async def generic_delete_by_id_list_http(
             else:
                 del_success.id.append(_id)
                 empty_obj_dict_list.append({'_id': _id})
+            finally:
+                invalidate_large_db_objects(msgspec_class_type, [_id])
 
         if non_existing_ids:
             # setting only existing id list to db_obj_id_list variable to handle only those further
@@ -1051,7 +1269,11 @@ async def generic_delete_by_id_list_http(
         # fetching document objs based using requested id list to verify if all ids exist
         motor_cursor: motor.motor_asyncio.AsyncIOMotorCursor = collection_obj.find({'_id': {'$in': db_obj_id_list}})
         documents_to_delete = await motor_cursor.to_list(None)
-        delete_res = await collection_obj.delete_many({'_id': {'$in': db_obj_id_list}})
+        if msgspec_class_type.is_time_series:
+            # also drops buffered latest rows
+            delete_res = await get_time_series_update_engine(msgspec_class_type).delete_rows(db_obj_id_list)
+        else:
+            delete_res = await collection_obj.delete_many({'_id': {'$in': db_obj_id_list}})
 
         if delete_res.deleted_count:
             if delete_res.deleted_count != len(db_obj_id_list):
@@ -1396,20 +1618,45 @@ async def generic_read_by_id_ws(ws: WebSocket, project_name: str, msgspec_class_
             logging.debug(f"Disconnected to websocket: {ws.client}")
 
 
+async def read_large_db_object(msgspec_class_type: Type[MsgspecModel],
+                               grid_out: motor.motor_asyncio.AsyncIOMotorGridOut) -> Dict[str, Any]:
+    """
+    decoded obj of passed grid_out - chunks are downloaded only when cache (if enabled) has no entry for
+    file's (_id, upload_date), returned dict is always freshly decoded so callers may mutate it
+    """
+    large_db_object_cache = get_large_db_object_cache(msgspec_class_type)
+    if large_db_object_cache is None:
+        return orjson.loads(await grid_out.read())
+    # else not required: cache enabled
+
+    data_bytes = large_db_object_cache.get(grid_out._id, grid_out.upload_date)
+    if data_bytes is None:
+        invalidation_count = large_db_object_cache.invalidation_count
+        data_bytes = await grid_out.read()
+        if invalidation_count == large_db_object_cache.invalidation_count:
+            large_db_object_cache.put(grid_out._id, grid_out.upload_date, data_bytes)
+        # else not required: update/delete landed while downloading - bytes may predate it
+    # else not required: cache hit - no chunk download
+    return orjson.loads(data_bytes)
+
+
 async def get_obj(msgspec_class_type: Type[MsgspecModel], db_obj_id: Any,
                   filter_agg_pipeline: Any = None, has_links: bool = False,
                   is_projection_type: bool | None = False):
     if msgspec_class_type.enable_large_db_object:
         gridfs_bucket_obj: motor.motor_asyncio.AsyncIOMotorGridFSBucket = msgspec_class_type.gridfs_bucket_obj
-        # Open a download stream using the custom _id
+        # Open a download stream using the custom _id - opening fetches files doc, chunks are read only on miss
         download_stream = await gridfs_bucket_obj.open_download_stream(db_obj_id)
-        file_data = await download_stream.read()
-        fetched_json_obj = orjson.loads(file_data)
+        fetched_json_obj = await read_large_db_object(msgspec_class_type, download_stream)
 
     else:
         if filter_agg_pipeline is None:
             collection_cursor: motor.motor_asyncio.AsyncIOMotorCollection = msgspec_class_type.collection_obj
             fetched_json_obj = await collection_cursor.find_one({"_id": db_obj_id})
+            if fetched_json_obj is not None and msgspec_class_type.is_time_series:
+                fetched_json_obj = (await get_time_series_update_engine(msgspec_class_type).overlay_latest_rows(
+                    [fetched_json_obj]))[0]
+            # else not required: not found or regular collection
         else:
             fetched_json_obj = await get_filtered_obj(filter_agg_pipeline, msgspec_class_type,
                                                       db_obj_id, has_links, is_projection_type=is_projection_type)
@@ -1421,19 +1668,20 @@ async def get_obj_list(msgspec_class_type: Type[MsgspecModel], find_ids: List[An
                        is_projection_type: bool | None = False) -> List[Dict[str, Any]]:
     if msgspec_class_type.enable_large_db_object:
         gridfs_bucket_obj: motor.motor_asyncio.AsyncIOMotorGridFSBucket = msgspec_class_type.gridfs_bucket_obj
-        data_cursor = gridfs_bucket_obj.find()
-        json_data_list = []
-        async for grid_out in data_cursor:
-            # Read the file's content
-            data_bytes = grid_out.read()
-            data_json = orjson.loads(data_bytes)
-            if find_ids:
-                if data_json.get("_id") in find_ids:
-                    json_data_list.append(data_json)
-                #else not required: avoiding passing any value that doesn't exist in find_ids if find_ids is passed
-            else:
-                json_data_list.append(data_json)
-        return json_data_list
+        if find_ids is None:
+            data_cursor = gridfs_bucket_obj.find()
+        else:
+            # file _id is obj _id (upload_from_stream_with_id) - keyed fs.files lookup, only matching files' chunks are read
+            data_cursor = gridfs_bucket_obj.find({"_id": {'$in': find_ids}})
+        grid_out_list = await data_cursor.to_list(None)
+        download_semaphore = asyncio.Semaphore(large_db_object_download_concurrency)
+
+        async def read_with_limit(grid_out: motor.motor_asyncio.AsyncIOMotorGridOut) -> Dict[str, Any]:
+            async with download_semaphore:
+                return await read_large_db_object(msgspec_class_type, grid_out)
+
+        json_data_list = await asyncio.gather(*[read_with_limit(grid_out) for grid_out in grid_out_list])
+        return list(json_data_list)
     else:
         if filter_agg_pipeline is None:
             collection_obj: motor.motor_asyncio.AsyncIOMotorCollection = msgspec_class_type.collection_obj
@@ -1442,6 +1690,10 @@ async def get_obj_list(msgspec_class_type: Type[MsgspecModel], find_ids: List[An
             else:
                 fetched_objs_cursor: motor.motor_asyncio.AsyncIOMotorCursor = collection_obj.find({"_id": {'$in': find_ids}})
             fetched_json_list = await fetched_objs_cursor.to_list(None)
+            if msgspec_class_type.is_time_series:
+                fetched_json_list = await get_time_series_update_engine(msgspec_class_type).overlay_latest_rows(
+                    fetched_json_list)
+            # else not required: regular collection
             return fetched_json_list
         else:
             # find_ids if none: will be handled inside get_filtered_obj_list implicitly
@@ -1465,6 +1717,7 @@ async def projection_read_http(msgspec_class_type: Type[MsgspecModel], proto_pac
         projection_model = msgspec_class_type
     else:
         agg_pipeline = filter_agg_pipeline["agg"]
+    agg_pipeline = await _get_time_series_merged_agg_pipeline(msgspec_class_type, agg_pipeline)
     try:
         collection_obj: motor.motor_asyncio.AsyncIOMotorCollection = msgspec_class_type.collection_obj
         fetched_objs_cursor: motor.motor_asyncio.AsyncIOMotorCommandCursor = collection_obj.aggregate(agg_pipeline)
@@ -1481,6 +1734,16 @@ async def projection_read_http(msgspec_class_type: Type[MsgspecModel], proto_pac
         return projection_model_obj
 
 
+async def _get_time_series_merged_agg_pipeline(msgspec_class_type: Type[MsgspecModel],
+                                               agg_pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # time-series rows may have buffered latest version (see TimeSeriesUpdateEngine) - unioned after leading $match
+    if msgspec_class_type.is_time_series:
+        return await get_time_series_update_engine(msgspec_class_type).get_latest_row_merged_agg_pipeline(
+            agg_pipeline)
+    # else not required: regular collection
+    return agg_pipeline
+
+
 async def get_filtered_obj_list(filter_agg_pipeline: Dict, msgspec_class_type: Type[MsgspecModel],
                                 db_obj_id_list: List | None = None,
                                 has_links: bool = False, is_projection_type: bool | None = False):
@@ -1496,6 +1759,7 @@ async def get_filtered_obj_list(filter_agg_pipeline: Dict, msgspec_class_type: T
         agg_pipeline = get_aggregate_pipeline(filter_agg_pipeline_copy)
     else:
         agg_pipeline = filter_agg_pipeline["agg"]
+    agg_pipeline = await _get_time_series_merged_agg_pipeline(msgspec_class_type, agg_pipeline)
 
     collection_obj: motor.motor_asyncio.AsyncIOMotorCollection = msgspec_class_type.collection_obj
 
@@ -1539,17 +1803,94 @@ def generic_encoder(obj_to_encode: Any, enc_hook: Callable, exclude_none: bool =
     return updated_dict
 
 
+async def publish_coalesced_stream_changes(msgspec_class_type: Type[MsgspecModel],
+                                           change_list: List[Dict[str, Any]],
+                                           filter_ws_updates_callable: Callable | None = None,
+                                           filter_agg_pipeline_callable_for_create_obj: Callable | None = None,
+                                           filter_agg_pipeline_callable_for_update_obj: Callable | None = None):
+    """
+    publishes one coalesced change batch (one change per _id) of ChangeStreamConsumer - created/updated objs and
+    deleted ids go out as one publish_ws_all each instead of one publish_ws per change
+    """
+    upsert_id_list: List[Any] = []
+    upsert_obj_list: List[Dict[str, Any]] = []
+    filter_agg_fetch_coro_list = []
+    delete_id_list: List[Any] = []
+    for change in change_list:
+        document_id = change['documentKey']['_id']
+        operation_type = change['operationType']
+        if operation_type == 'delete':
+            logging.debug(f"STREAM - Document with _id '{document_id}' was deleted.")
+            delete_id_list.append(document_id)
+            continue
+        # else not required: insert / update / replace handled below
+
+        updated_or_created_obj = change.get('fullDocument')
+        if not updated_or_created_obj:
+            # obj deleted before update lookup - its delete change follows
+            continue
+        # else not required: post image available
+        logging.debug(f"STREAM - Full document: {updated_or_created_obj}")
+        if filter_ws_updates_callable is not None:
+            if not filter_ws_updates_callable(updated_or_created_obj):
+                # if filter check fails for obj then avoiding ws update
+                continue
+            # else not required: if passes check allowing it for ws update
+        # else not required: if no filter_ws_updates_callable passed - no need for any handling
+        if operation_type == 'insert' and filter_agg_pipeline_callable_for_create_obj is not None:
+            filter_agg_pipeline = filter_agg_pipeline_callable_for_create_obj(updated_or_created_obj)
+            upsert_id_list.append(document_id)
+            filter_agg_fetch_coro_list.append(get_obj(msgspec_class_type, document_id, filter_agg_pipeline))
+        elif operation_type != 'insert' and filter_agg_pipeline_callable_for_update_obj is not None:
+            filter_agg_pipeline = filter_agg_pipeline_callable_for_update_obj(updated_or_created_obj)
+            upsert_id_list.append(document_id)
+            filter_agg_fetch_coro_list.append(get_obj(msgspec_class_type, document_id, filter_agg_pipeline))
+        else:
+            upsert_id_list.append(document_id)
+            filter_agg_fetch_coro_list.append(None)
+            upsert_obj_list.append(updated_or_created_obj)
+
+    if filter_agg_fetch_coro_list:
+        # filter agg pipelines are built per obj - fetched concurrently, objs without pipeline are used as streamed
+        fetched_obj_list = await asyncio.gather(*[coro for coro in filter_agg_fetch_coro_list if coro is not None])
+        fetched_obj_iter = iter(fetched_obj_list)
+        streamed_obj_iter = iter(upsert_obj_list)
+        published_id_list: List[Any] = []
+        published_obj_list: List[Dict[str, Any]] = []
+        for document_id, coro in zip(upsert_id_list, filter_agg_fetch_coro_list):
+            obj = next(fetched_obj_iter) if coro is not None else next(streamed_obj_iter)
+            if obj is None:
+                # filtered out by filter agg pipeline
+                continue
+            # handling all datetime fields - converting to epoch int values - caller of this function will handle
+            # these fields back if required
+            msgspec_class_type.convert_ts_fields_from_datetime_to_epoch_int(obj)
+            published_id_list.append(document_id)
+            published_obj_list.append(obj)
+        if published_obj_list:
+            await publish_ws_all(msgspec_class_type, published_id_list, published_obj_list, update_ws_with_id=True)
+        # else not required: all objs filtered out
+    # else not required: no created / updated objs in batch
+
+    if delete_id_list:
+        await publish_ws_all(msgspec_class_type, delete_id_list,
+                             [{'_id': document_id} for document_id in delete_id_list], update_ws_with_id=True)
+    # else not required: no deletes in batch
+
+
 async def watch_specific_collection_with_stream(msgspec_class_type: Type[MsgspecModel],
                                                 filter_ws_updates_callable: Callable | None = None,
                                                 filter_agg_pipeline_callable_for_create_obj: Callable | None = None,
                                                 filter_agg_pipeline_callable_for_update_obj: Callable | None = None):
     """
-    Watches a specific collection for changes.
+    Watches a specific collection for changes - changes are drained in micro-batches coalesced by _id and published
+    once per batch via publish_ws_all, position is persisted per batch so restarts / stream errors resume after last
+    published change (see ChangeStreamConsumer).
     Note: Currently only supports general get and query ws(s)
           - big db type not supported as it is implemented in gridfs and not in mongodb's motor
-          - timeseries not supprted as updates in timeseries are not supported and in our implementation
-          we since we do delete and create to simulate update in timeseries there is no handling to handle 2 ws
-          notifications for single update call
+          - timeseries can't be watched by mongo - appends are tailed on time field instead (only for models whose
+          streamer is opted in at codegen, see ChangeStreamConsumer._tail_time_series for ordering assumption),
+          in-place updates and deletes of timeseries objs are not streamed
           - no support for any ws with generic filter, sort and pagination support in get-all ws as page detection
           logic works on simulating operation on page before actual db operation but stream is only invoked when
           there is actual db operation
@@ -1562,51 +1903,20 @@ async def watch_specific_collection_with_stream(msgspec_class_type: Type[Msgspec
 
     collection_cursor: motor.motor_asyncio.AsyncIOMotorCollection = msgspec_class_type.collection_obj
 
+    async def publish_batch(change_list: List[Dict[str, Any]]):
+        await publish_coalesced_stream_changes(msgspec_class_type, change_list, filter_ws_updates_callable,
+                                               filter_agg_pipeline_callable_for_create_obj,
+                                               filter_agg_pipeline_callable_for_update_obj)
+
+    change_stream_consumer = ChangeStreamConsumer(
+        collection_cursor, publish_batch, is_time_series=bool(msgspec_class_type.is_time_series),
+        time_field=getattr(msgspec_class_type, "time_series_time_field", None))
     logging.info(f"[STREAM - {msgspec_class_type.__name__}] Starting to watch for changes...")
     try:
-        async with collection_cursor.watch(full_document='updateLookup') as stream:
-            async for change in stream:
-                document_id = change['documentKey']['_id']
-                if 'fullDocument' in change and change['fullDocument']:
-                    updated_or_created_obj = change['fullDocument']
-                    logging.debug(f"STREAM - Full document: {updated_or_created_obj}")
-                    if filter_ws_updates_callable is not None:
-                        if not filter_ws_updates_callable(updated_or_created_obj):
-                            # if filter check fails for obj then avoiding ws update
-                            continue
-                        # else not required: if passes check allowing it for ws update
-                    # else not required: if no filter_ws_updates_callable passed - no need for any handling
-                    if change['operationType'] == 'insert' and filter_agg_pipeline_callable_for_create_obj is not None:
-                        filter_agg_pipeline = filter_agg_pipeline_callable_for_create_obj(updated_or_created_obj)
-                        fetched_obj: Dict | None = await get_obj(msgspec_class_type, document_id, filter_agg_pipeline)
-
-                        # handling all datetime fields - converting to epoch int values - caller of this function will handle
-                        # these fields back if required
-                        msgspec_class_type.convert_ts_fields_from_datetime_to_epoch_int(fetched_obj)
-                        await publish_ws(msgspec_class_type, document_id, fetched_obj,
-                                         update_ws_with_id=True)
-                    elif change['operationType'] == 'update' and filter_agg_pipeline_callable_for_update_obj is not None:
-                        filter_agg_pipeline = filter_agg_pipeline_callable_for_update_obj(updated_or_created_obj)
-                        fetched_obj: Dict | None = await get_obj(msgspec_class_type, document_id, filter_agg_pipeline)
-
-                        # handling all datetime fields - converting to epoch int values - caller of this function will handle
-                        # these fields back if required
-                        msgspec_class_type.convert_ts_fields_from_datetime_to_epoch_int(fetched_obj)
-                        await publish_ws(msgspec_class_type, document_id, fetched_obj,
-                                         update_ws_with_id=True)
-                    else:
-                        # handling all datetime fields - converting to epoch int values - caller of this function will handle
-                        # these fields back if required
-                        msgspec_class_type.convert_ts_fields_from_datetime_to_epoch_int(updated_or_created_obj)
-                        await publish_ws(msgspec_class_type, document_id, updated_or_created_obj, update_ws_with_id=True)
-                elif change['operationType'] == 'delete':
-                    logging.debug(f"STREAM - Document with _id '{document_id}' was deleted.")
-                    empty_obj_dict = {'_id': document_id}
-                    await publish_ws(msgspec_class_type, document_id, empty_obj_dict, update_ws_with_id=True)
-                else:
-                    logging.error(f"Mongo Stream Unhandled change detected: {change}")
+        await change_stream_consumer.run()
     except Exception as e:
         logging.exception(f"[STREAM - {msgspec_class_type.__name__}] Error: {e}")
     finally:
-        logging.info(f"[STREAM - {msgspec_class_type.__name__}] Stopped watching changes.")
+        logging.info(f"[STREAM - {msgspec_class_type.__name__}] Stopped watching changes;;; "
+                     f"{change_stream_consumer.get_metrics()}")
 
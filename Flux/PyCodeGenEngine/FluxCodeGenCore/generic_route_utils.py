@@ -5,17 +5,34 @@ import functools
 import pendulum
 import os
 import logging
+import time
 
 # project imports
 from FluxPythonUtils.scripts.general_utility_functions import parse_to_int, parse_to_float
-from Flux.PyCodeGenEngine.FluxCodeGenCore.perf_benchmark_decorators import get_time_it_log_pattern
+from Flux.PyCodeGenEngine.FluxCodeGenCore.perf_benchmark_decorators import (
+    get_time_it_log_pattern, is_ring_backend_enabled)
 
 log_generic_timings = parse_to_int(log_generic_timings_env_var) \
     if ((log_generic_timings_env_var := os.getenv("LogGenericTiming")) is not None and
         len(log_generic_timings_env_var)) else None
 
 
-if log_generic_timings is not None and log_generic_timings == 1:
+if log_generic_timings is not None and log_generic_timings == 1 and is_ring_backend_enabled:
+    from Flux.PyCodeGenEngine.FluxCodeGenCore.perf_benchmark_ring_buffer import record_perf_benchmark_timing
+
+    # Decorator Function
+    def generic_perf_benchmark(func_callable):
+        callable_name = func_callable.__name__
+
+        @functools.wraps(func_callable)
+        async def benchmarker(*args, **kwargs):
+            start_ns = time.time_ns()
+            start_perf_counter_ns = time.perf_counter_ns()
+            return_val = await func_callable(*args, **kwargs)
+            record_perf_benchmark_timing(callable_name, start_ns, time.perf_counter_ns() - start_perf_counter_ns)
+            return return_val
+        return benchmarker
+elif log_generic_timings is not None and log_generic_timings == 1:
     # Decorator Function
     def generic_perf_benchmark(func_callable):
         @functools.wraps(func_callable)
@@ -15,12 +15,15 @@ import json
 import urllib.parse
 
 # 3rd party imports
+import httpx
 import polars as pl
 
 # project imports
 from FluxPythonUtils.scripts.general_utility_functions import (
-    log_n_except, http_response_as_class_type, HTTPRequestType, ClientError, http_response_as_df, http_response_as_json)
+    log_n_except, HTTPRequestType, ClientError, http_response_as_df, http_response_as_json)
 from FluxPythonUtils.scripts.model_base_utils import MsgspecBaseModel
+from Flux.PyCodeGenEngine.FluxCodeGenCore.pooled_web_client import (
+    pooled_requests, get_async_client, http_response_as_model_type)
 
 
 MsgspecModel = TypeVar('MsgspecModel', bound=MsgspecBaseModel)
@@ -52,8 +55,8 @@ def generic_http_get_all_client(url: str, model_type: Type[MsgspecModel], limit_
         params["limit_obj_count"] = limit_obj_count
 
     params = _dump_kwargs(params)
-    response: requests.Response = requests.get(url, timeout=120, params=params)     # TIMEOUT for get-all set to 60 sec
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.GET)
+    response: requests.Response = pooled_requests.get(url, timeout=120, params=params)     # TIMEOUT for get-all set to 60 sec
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.GET)
 
 
 @log_n_except
@@ -66,7 +69,7 @@ def generic_http_get_all_df_client(url: str, limit_obj_count: int | None = None,
         params["limit_obj_count"] = limit_obj_count
 
     params = _dump_kwargs(params)
-    response: requests.Response = requests.get(url, timeout=120, params=params)     # TIMEOUT for get-all set to 60 sec
+    response: requests.Response = pooled_requests.get(url, timeout=120, params=params)     # TIMEOUT for get-all set to 60 sec
     return http_response_as_df(url, response, 200, HTTPRequestType.GET)
 
 
@@ -98,8 +101,8 @@ def generic_http_post_client(url: str, model_obj: MsgspecModel, model_type: Type
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.post(url, json=json_data, params=params)
-    return http_response_as_class_type(url, response, 201, model_type, HTTPRequestType.POST)
+    response: requests.Response = pooled_requests.post(url, json=json_data, params=params)
+    return http_response_as_model_type(url, response, 201, model_type, HTTPRequestType.POST)
 
 
 @log_n_except
@@ -109,8 +112,8 @@ def generic_http_file_query_client(url: str, file_path: str | PurePath, query_pa
     if os.path.exists(file_path):
         with open(file_path, "rb") as file:
             files = {"upload_file": (str(file_path), file, "multipart/form-data")}
-            response: requests.Response = requests.post(url, files=files, params=query_params_dict)
-            return http_response_as_class_type(url, response, 201, model_type, HTTPRequestType.POST)
+            response: requests.Response = pooled_requests.post(url, files=files, params=query_params_dict)
+            return http_response_as_model_type(url, response, 201, model_type, HTTPRequestType.POST)
     else:
         raise ClientError(f"Can't find file path: {file_path}")
 
@@ -128,8 +131,8 @@ def generic_http_post_all_client(url: str, model_obj_list: List[MsgspecModel], m
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.post(url, json=json_data, params=params)
-    return http_response_as_class_type(url, response, 201, model_type, HTTPRequestType.POST)
+    response: requests.Response = pooled_requests.post(url, json=json_data, params=params)
+    return http_response_as_model_type(url, response, 201, model_type, HTTPRequestType.POST)
 
 
 @log_n_except
@@ -146,8 +149,8 @@ def generic_http_post_all_df_in_model_list_out_client(url: str, df: pl.DataFrame
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.post(url, json=json_data, params=params)
-    return http_response_as_class_type(url, response, 201, model_type, HTTPRequestType.POST)
+    response: requests.Response = pooled_requests.post(url, json=json_data, params=params)
+    return http_response_as_model_type(url, response, 201, model_type, HTTPRequestType.POST)
 
 
 @log_n_except
@@ -164,7 +167,7 @@ def generic_http_post_all_model_list_in_df_out_client(url: str, model_obj_list:
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.post(url, json=json_data, params=params)
+    response: requests.Response = pooled_requests.post(url, json=json_data, params=params)
     return http_response_as_df(url, response, 201, HTTPRequestType.POST)
 
 
@@ -183,7 +186,7 @@ def generic_http_post_all_df_in_df_out_client(url: str, df: pl.DataFrame,
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.post(url, json=json_data, params=params)
+    response: requests.Response = pooled_requests.post(url, json=json_data, params=params)
     return http_response_as_df(url, response, 201, HTTPRequestType.POST)
 
 
@@ -197,8 +200,8 @@ def generic_http_get_client(url: str, query_param: Any, model_type: Type[Msgspec
             url = f"{url}/{query_param}"
     # else not required: When used for queries, like get last date query, there is no query_param in case of query
     kwargs = _dump_kwargs(kwargs)
-    response: requests.Response = requests.get(url, params=kwargs)
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.GET)
+    response: requests.Response = pooled_requests.get(url, params=kwargs)
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.GET)
 
 
 @log_n_except
@@ -213,8 +216,8 @@ def generic_http_put_client(url: str, model_obj: MsgspecModel, model_type: Type[
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.put(url, json=json_data, params=params)
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.PUT)
+    response: requests.Response = pooled_requests.put(url, json=json_data, params=params)
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.PUT)
 
 
 @log_n_except
@@ -229,8 +232,8 @@ def generic_http_put_all_client(url: str, model_obj_list: List[MsgspecModel], mo
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.put(url, json=json_data, params=params)
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.PUT)
+    response: requests.Response = pooled_requests.put(url, json=json_data, params=params)
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.PUT)
 
 
 @log_n_except
@@ -247,8 +250,8 @@ def generic_http_put_all_df_in_model_list_out_client(url: str, df: pl.DataFrame,
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.put(url, json=json_data, params=params)
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.PUT)
+    response: requests.Response = pooled_requests.put(url, json=json_data, params=params)
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.PUT)
 
 
 @log_n_except
@@ -264,7 +267,7 @@ def generic_http_put_all_model_list_in_df_out_client(url: str, model_obj_list: L
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.put(url, json=json_data, params=params)
+    response: requests.Response = pooled_requests.put(url, json=json_data, params=params)
     return http_response_as_df(url, response, 200, HTTPRequestType.PUT)
 
 
@@ -283,7 +286,7 @@ def generic_http_put_all_df_in_df_out_client(url: str, df: pl.DataFrame,
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.put(url, json=json_data, params=params)
+    response: requests.Response = pooled_requests.put(url, json=json_data, params=params)
     return http_response_as_df(url, response, 200, HTTPRequestType.PUT)
 
 
@@ -294,9 +297,9 @@ def generic_http_patch_client(url: str, model_obj_json: Dict, model_type: Type[M
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.patch(url, json=model_obj_json,
-                                                 params=params)
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.PATCH)
+    response: requests.Response = pooled_requests.patch(url, json=model_obj_json,
+                                                        params=params)
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.PATCH)
 
 
 @log_n_except
@@ -306,8 +309,8 @@ def generic_http_patch_all_client(url: str, model_obj_json_list: List[Dict], mod
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.patch(url, json=model_obj_json_list, params=params)
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.PATCH)
+    response: requests.Response = pooled_requests.patch(url, json=model_obj_json_list, params=params)
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.PATCH)
 
 
 @log_n_except
@@ -315,7 +318,7 @@ def generic_http_patch_all_json_list_in_df_out_client(url: str, json_list: List[
                                                       return_copy_obj: bool | None = True, **kwargs):
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.patch(url, json=json_list, params=params)
+    response: requests.Response = pooled_requests.patch(url, json=json_list, params=params)
     return http_response_as_df(url, response, 200, HTTPRequestType.PATCH)
 
 
@@ -327,7 +330,7 @@ def generic_http_patch_all_df_in_df_out_client(url: str, df: pl.DataFrame, model
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.patch(url, json=json_data, params=params)
+    response: requests.Response = pooled_requests.patch(url, json=json_data, params=params)
     return http_response_as_df(url, response, 200, HTTPRequestType.PATCH)
 
 
@@ -343,7 +346,7 @@ def generic_http_delete_client(url: str, query_param: Any, return_copy_obj: bool
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.delete(url, params=params)
+    response: requests.Response = pooled_requests.delete(url, params=params)
     expected_status_code = 200
     return http_response_as_json(url, response, expected_status_code, HTTPRequestType.DELETE)
 
@@ -355,7 +358,7 @@ def generic_http_delete_by_id_list_client(url: str, delete_id_list: List[Any], m
 
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.delete(url, json=delete_id_list_json, params=params)
+    response: requests.Response = pooled_requests.delete(url, json=delete_id_list_json, params=params)
     expected_status_code = 200
     return http_response_as_json(url, response, expected_status_code, HTTPRequestType.DELETE)
 
@@ -364,7 +367,7 @@ def generic_http_delete_by_id_list_client(url: str, delete_id_list: List[Any], m
 def generic_http_delete_all_client(url: str, return_copy_obj: bool | None = True, **kwargs):
     params = _get_params_from_kwargs(return_copy_obj, **kwargs)
 
-    response: requests.Response = requests.delete(url, params=params)
+    response: requests.Response = pooled_requests.delete(url, params=params)
     expected_status_code = 200
     return http_response_as_json(url, response, expected_status_code, HTTPRequestType.DELETE)
 
@@ -460,41 +463,165 @@ def generic_http_index_client(url: str, query_params: List[Any], model_type: Typ
         url = f"{url}/{query_params}"
 
     kwargs = _dump_kwargs(kwargs)
-    response: requests.Response = requests.get(url, params=kwargs)
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.GET)
+    response: requests.Response = pooled_requests.get(url, params=kwargs)
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.GET)
 
 
 @log_n_except
 def generic_http_get_query_client(url: str, query_params_dict: Dict[str, Any], model_type: Type[MsgspecModel]):
-    response: requests.Response = requests.get(url, params=query_params_dict)
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.GET)
+    response: requests.Response = pooled_requests.get(url, params=query_params_dict)
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.GET)
 
 
 @log_n_except
 def generic_http_get_query_df_client(url: str, query_params_dict: Dict[str, Any]):
-    response: requests.Response = requests.get(url, params=query_params_dict)
+    response: requests.Response = pooled_requests.get(url, params=query_params_dict)
     return http_response_as_df(url, response, 200, HTTPRequestType.GET)
 
 
 @log_n_except
 def generic_http_patch_query_client(url: str, query_payload_dict: Dict[str, Any], model_type: Type[MsgspecModel]):
-    response: requests.Response = requests.patch(url, json=query_payload_dict)
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.PATCH)
+    response: requests.Response = pooled_requests.patch(url, json=query_payload_dict)
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.PATCH)
 
 
 @log_n_except
 def generic_http_patch_query_df_client(url: str, query_payload_dict: Dict[str, Any]):
-    response: requests.Response = requests.patch(url, json=query_payload_dict)
+    response: requests.Response = pooled_requests.patch(url, json=query_payload_dict)
     return http_response_as_df(url, response, 200, HTTPRequestType.PATCH)
 
 
 @log_n_except
 def generic_http_post_query_client(url: str, query_payload_dict: Dict[str, Any], model_type: Type[MsgspecModel]):
-    response: requests.Response = requests.post(url, json=query_payload_dict)
-    return http_response_as_class_type(url, response, 201, model_type, HTTPRequestType.POST)
+    response: requests.Response = pooled_requests.post(url, json=query_payload_dict)
+    return http_response_as_model_type(url, response, 201, model_type, HTTPRequestType.POST)
 
 
 @log_n_except
 def generic_http_post_query_df_client(url: str, query_payload_dict: Dict[str, Any]):
-    response: requests.Response = requests.post(url, json=query_payload_dict)
+    response: requests.Response = pooled_requests.post(url, json=query_payload_dict)
     return http_response_as_df(url, response, 201, HTTPRequestType.POST)
+
+
+# async variants for coroutine callers - same urls (generated client *_client_url attributes), params and payloads
+# as sync helpers above, over keep-alive httpx.AsyncClient of running event loop
+
+def _as_str_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    # httpx would send orjson dumped bytes params as "b'...'"
+    return {key: value.decode() if isinstance(value, bytes) else value for key, value in params.items()}
+
+
+async def _async_http_request(method: str, url: str, expected_status_code: int, model_type: Type[MsgspecModel] | None,
+                              http_request_type: HTTPRequestType, params: Dict[str, Any] | None = None, **kwargs):
+    try:
+        response: httpx.Response = await get_async_client().request(
+            method, url, params=_as_str_params(params) if params else None, **kwargs)
+        if model_type is None:
+            return http_response_as_json(url, response, expected_status_code, http_request_type)
+        return http_response_as_model_type(url, response, expected_status_code, model_type, http_request_type)
+    except Exception as e:
+        logging.exception(f"async {method} {url} failed;;; exception: {e}")
+        raise
+
+
+async def async_generic_http_get_all_client(url: str, model_type: Type[MsgspecModel],
+                                            limit_obj_count: int | None = None, **kwargs):
+    params = kwargs
+    if limit_obj_count:
+        params["limit_obj_count"] = limit_obj_count
+    return await _async_http_request("GET", url, 200, model_type, HTTPRequestType.GET,
+                                     params=_dump_kwargs(params), timeout=120)
+
+
+async def async_generic_http_get_client(url: str, query_param: Any, model_type: Type[MsgspecModel], **kwargs):
+    if query_param is not None:
+        if url.endswith("/"):
+            url = f"{url}{query_param}"
+        else:
+            url = f"{url}/{query_param}"
+    # else not required: When used for queries, like get last date query, there is no query_param in case of query
+    return await _async_http_request("GET", url, 200, model_type, HTTPRequestType.GET, params=_dump_kwargs(kwargs))
+
+
+async def async_generic_http_post_client(url: str, model_obj: MsgspecModel | None, model_type: Type[MsgspecModel],
+                                         return_copy_obj: bool | None = True, **kwargs):
+    json_data = None
+    if model_obj is not None:
+        json_data = generic_encoder(model_obj, model_type.enc_hook, by_alias=True, exclude_none=True)
+    # else not required: query without model obj
+    return await _async_http_request("POST", url, 201, model_type, HTTPRequestType.POST, json=json_data,
+                                     params=_get_params_from_kwargs(return_copy_obj, **kwargs))
+
+
+async def async_generic_http_post_all_client(url: str, model_obj_list: List[MsgspecModel] | None,
+                                             model_type: Type[MsgspecModel], return_copy_obj: bool | None = True,
+                                             **kwargs):
+    json_data = None
+    if model_obj_list is not None:
+        json_data = generic_encoder(model_obj_list, model_type.enc_hook, by_alias=True, exclude_none=True)
+    # else not required: query without model obj
+    return await _async_http_request("POST", url, 201, model_type, HTTPRequestType.POST, json=json_data,
+                                     params=_get_params_from_kwargs(return_copy_obj, **kwargs))
+
+
+async def async_generic_http_put_client(url: str, model_obj: MsgspecModel | None, model_type: Type[MsgspecModel],
+                                        return_copy_obj: bool | None = True, **kwargs):
+    json_data = None
+    if model_obj is not None:
+        json_data = generic_encoder(model_obj, model_type.enc_hook, by_alias=True)
+    # else not required: query without model obj
+    return await _async_http_request("PUT", url, 200, model_type, HTTPRequestType.PUT, json=json_data,
+                                     params=_get_params_from_kwargs(return_copy_obj, **kwargs))
+
+
+async def async_generic_http_put_all_client(url: str, model_obj_list: List[MsgspecModel] | None,
+                                            model_type: Type[MsgspecModel], return_copy_obj: bool | None = True,
+                                            **kwargs):
+    json_data = None
+    if model_obj_list is not None:
+        json_data = generic_encoder(model_obj_list, model_type.enc_hook, by_alias=True)
+    # else not required: query without model obj
+    return await _async_http_request("PUT", url, 200, model_type, HTTPRequestType.PUT, json=json_data,
+                                     params=_get_params_from_kwargs(return_copy_obj, **kwargs))
+
+
+async def async_generic_http_patch_client(url: str, model_obj_json: Dict, model_type: Type[MsgspecModel],
+                                          return_copy_obj: bool | None = True, **kwargs):
+    model_obj_json = generic_encoder(model_obj_json, model_type.enc_hook, by_alias=True)
+    return await _async_http_request("PATCH", url, 200, model_type, HTTPRequestType.PATCH, json=model_obj_json,
+                                     params=_get_params_from_kwargs(return_copy_obj, **kwargs))
+
+
+async def async_generic_http_patch_all_client(url: str, model_obj_json_list: List[Dict],
+                                              model_type: Type[MsgspecModel], return_copy_obj: bool | None = True,
+                                              **kwargs):
+    model_obj_json_list = generic_encoder(model_obj_json_list, model_type.enc_hook, by_alias=True)
+    return await _async_http_request("PATCH", url, 200, model_type, HTTPRequestType.PATCH, json=model_obj_json_list,
+                                     params=_get_params_from_kwargs(return_copy_obj, **kwargs))
+
+
+async def async_generic_http_delete_client(url: str, query_param: Any, return_copy_obj: bool | None = True,
+                                           **kwargs):
+    if query_param is not None:
+        if url.endswith("/"):
+            url = f"{url}{query_param}"
+        else:
+            url = f"{url}/{query_param}"
+    # else not required: When used for queries like get last date query, as there is no query_param in case of query
+    return await _async_http_request("DELETE", url, 200, None, HTTPRequestType.DELETE,
+                                     params=_get_params_from_kwargs(return_copy_obj, **kwargs))
+
+
+async def async_generic_http_get_query_client(url: str, query_params_dict: Dict[str, Any],
+                                              model_type: Type[MsgspecModel]):
+    return await _async_http_request("GET", url, 200, model_type, HTTPRequestType.GET, params=query_params_dict)
+
+
+async def async_generic_http_patch_query_client(url: str, query_payload_dict: Dict[str, Any],
+                                                model_type: Type[MsgspecModel]):
+    return await _async_http_request("PATCH", url, 200, model_type, HTTPRequestType.PATCH, json=query_payload_dict)
+
+
+async def async_generic_http_post_query_client(url: str, query_payload_dict: Dict[str, Any],
+                                               model_type: Type[MsgspecModel]):
+    return await _async_http_request("POST", url, 201, model_type, HTTPRequestType.POST, json=query_payload_dict)
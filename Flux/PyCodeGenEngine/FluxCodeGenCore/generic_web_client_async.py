@@ -2,6 +2,7 @@
 import os
 
 import msgspec
+import requests
 from typing import Any, Callable, List, Dict
 from pathlib import PurePath
 import logging
@@ -13,9 +14,9 @@ import json
 import urllib.parse
 
 # project imports
-from Flux.PyCodeGenEngine.FluxCodeGenCore.httpx_client import default_httpx_client as requests
+from Flux.PyCodeGenEngine.FluxCodeGenCore.pooled_web_client import pooled_requests, http_response_as_model_type
 from FluxPythonUtils.scripts.general_utility_functions import (
-    log_n_except, http_response_as_class_type, HTTPRequestType, ClientError, http_response_as_json)
+    log_n_except, HTTPRequestType, ClientError, http_response_as_json)
 
 if (model_type := os.getenv("ModelType")) is None or len(model_type) == 0:
     err_str = f"env var ModelType must not be {model_type}"
@@ -39,8 +40,8 @@ def generic_http_get_all_client(url: str, model_type, limit_obj_count: int | Non
     params = None
     if limit_obj_count:
         params = {"limit_obj_count": limit_obj_count}
-    response: requests.Response = requests.get(url, timeout=120, params=params)  # TIMEOUT for get-all set to 60 sec
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.GET)
+    response: requests.Response = pooled_requests.get(url, timeout=120, params=params)  # TIMEOUT for get-all set to 60 sec
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.GET)
 
 
 @log_n_except
@@ -55,8 +56,8 @@ def generic_http_post_client(url: str, model_obj, model_type,
     # When used for queries like get last date query, as there is no model obj in case of query
     else:
         json_data = None
-    response: requests.Response = requests.post(url, json=json_data, params={"return_obj_copy": return_copy_obj})
-    return http_response_as_class_type(url, response, 201, model_type, HTTPRequestType.POST)
+    response: requests.Response = pooled_requests.post(url, json=json_data, params={"return_obj_copy": return_copy_obj})
+    return http_response_as_model_type(url, response, 201, model_type, HTTPRequestType.POST)
 
 
 @log_n_except
@@ -66,8 +67,8 @@ def generic_http_file_query_client(url: str, file_path: str | PurePath, query_pa
     if os.path.exists(file_path):
         with open(file_path, "rb") as file:
             files = {"upload_file": (str(file_path), file, "multipart/form-data")}
-            response: requests.Response = requests.post(url, files=files, params=query_params_dict)
-            return http_response_as_class_type(url, response, 201, model_type, HTTPRequestType.POST)
+            response: requests.Response = pooled_requests.post(url, files=files, params=query_params_dict)
+            return http_response_as_model_type(url, response, 201, model_type, HTTPRequestType.POST)
     else:
         raise ClientError(f"Can't find file path: {file_path}")
 
@@ -82,8 +83,8 @@ def generic_http_post_all_client(url: str, model_obj_list, model_type,
     # When used for queries like get last date query, as there is no model obj in case of query
     else:
         json_data = None
-    response: requests.Response = requests.post(url, json=json_data, params={"return_obj_copy": return_copy_obj})
-    return http_response_as_class_type(url, response, 201, model_type, HTTPRequestType.POST)
+    response: requests.Response = pooled_requests.post(url, json=json_data, params={"return_obj_copy": return_copy_obj})
+    return http_response_as_model_type(url, response, 201, model_type, HTTPRequestType.POST)
 
 
 @log_n_except
@@ -96,8 +97,8 @@ def generic_http_get_client(url: str, query_param: Any, model_type):
             url = f"{url}/{query_param}"
 
     # else not required: When used for queries, like get last date query, there is no query_param in case of query
-    response: requests.Response = requests.get(url)
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.GET)
+    response: requests.Response = pooled_requests.get(url)
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.GET)
 
 
 @log_n_except
@@ -109,8 +110,8 @@ def generic_http_put_client(url: str, model_obj, model_type,
     else:
         # When used for queries like get last date query, as there is no model obj in case of query
         json_data = None
-    response: requests.Response = requests.put(url, json=json_data, params={"return_obj_copy": return_copy_obj})
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.PUT)
+    response: requests.Response = pooled_requests.put(url, json=json_data, params={"return_obj_copy": return_copy_obj})
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.PUT)
 
 
 @log_n_except
@@ -122,26 +123,26 @@ def generic_http_put_all_client(url: str, model_obj_list, model_type,
     else:
         # When used for queries like get last date query, as there is no model obj in case of query
         json_data = None
-    response: requests.Response = requests.put(url, json=json_data, params={"return_obj_copy": return_copy_obj})
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.PUT)
+    response: requests.Response = pooled_requests.put(url, json=json_data, params={"return_obj_copy": return_copy_obj})
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.PUT)
 
 
 @log_n_except
 def generic_http_patch_client(url: str, model_obj_json: Dict, model_type,
                               return_copy_obj: bool | None = True):
     model_obj_json = generic_encoder(model_obj_json, model_type.enc_hook, by_alias=True)
-    response: requests.Response = requests.patch(url, json=model_obj_json,
-                                                 params={"return_obj_copy": return_copy_obj})
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.PATCH)
+    response: requests.Response = pooled_requests.patch(url, json=model_obj_json,
+                                                        params={"return_obj_copy": return_copy_obj})
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.PATCH)
 
 
 @log_n_except
 def generic_http_patch_all_client(url: str, model_obj_json_list: List[Dict], model_type,
                                   return_copy_obj: bool | None = True):
     model_obj_json_list = generic_encoder(model_obj_json_list, model_type.enc_hook, by_alias=True)
-    response: requests.Response = requests.patch(url, json=model_obj_json_list,
-                                                 params={"return_obj_copy": return_copy_obj})
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.PATCH)
+    response: requests.Response = pooled_requests.patch(url, json=model_obj_json_list,
+                                                        params={"return_obj_copy": return_copy_obj})
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.PATCH)
 
 
 @log_n_except
@@ -153,7 +154,7 @@ def generic_http_delete_client(url: str, query_param: Any, return_copy_obj: bool
         else:
             url = f"{url}/{query_param}"
     # else not required: When used for queries like get last date query, as there is no query_param in case of query
-    response: requests.Response = requests.delete(url, params={"return_obj_copy": return_copy_obj})
+    response: requests.Response = pooled_requests.delete(url, params={"return_obj_copy": return_copy_obj})
     expected_status_code = 200
     return http_response_as_json(url, response, expected_status_code, HTTPRequestType.DELETE)
 
@@ -162,15 +163,15 @@ def generic_http_delete_client(url: str, query_param: Any, return_copy_obj: bool
 def generic_http_delete_by_id_list_client(url: str, delete_id_list: List[Any], model_type,
                                           return_copy_obj: bool | None = True):
     delete_id_list_json = generic_encoder(delete_id_list, model_type.enc_hook, by_alias=True)
-    response: requests.Response = requests.delete(url, json=delete_id_list_json,
-                                                  params={"return_obj_copy": return_copy_obj})
+    response: requests.Response = pooled_requests.delete(url, json=delete_id_list_json,
+                                                         params={"return_obj_copy": return_copy_obj})
     expected_status_code = 200
     return http_response_as_json(url, response, expected_status_code, HTTPRequestType.DELETE)
 
 
 @log_n_except
 def generic_http_delete_all_client(url: str, return_copy_obj: bool | None = True):
-    response: requests.Response = requests.delete(url, params={"return_obj_copy": return_copy_obj})
+    response: requests.Response = pooled_requests.delete(url, params={"return_obj_copy": return_copy_obj})
     expected_status_code = 200
     return http_response_as_json(url, response, expected_status_code, HTTPRequestType.DELETE)
 
@@ -265,23 +266,23 @@ def generic_http_index_client(url: str, query_params: List[Any], model_type):
         url = f"{url}{query_params}"
     else:
         url = f"{url}/{query_params}"
-    response: requests.Response = requests.get(url)
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.GET)
+    response: requests.Response = pooled_requests.get(url)
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.GET)
 
 
 @log_n_except
 def generic_http_get_query_client(url: str, query_params_dict: Dict[str, Any], model_type):
-    response: requests.Response = requests.get(url, params=query_params_dict)
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.GET)
+    response: requests.Response = pooled_requests.get(url, params=query_params_dict)
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.GET)
 
 
 @log_n_except
 def generic_http_patch_query_client(url: str, query_payload_dict: Dict[str, Any], model_type):
-    response: requests.Response = requests.patch(url, json=query_payload_dict)
-    return http_response_as_class_type(url, response, 200, model_type, HTTPRequestType.PATCH)
+    response: requests.Response = pooled_requests.patch(url, json=query_payload_dict)
+    return http_response_as_model_type(url, response, 200, model_type, HTTPRequestType.PATCH)
 
 
 @log_n_except
 def generic_http_post_query_client(url: str, query_payload_dict: Dict[str, Any], model_type):
-    response: requests.Response = requests.post(url, json=query_payload_dict)
-    return http_response_as_class_type(url, response, 201, model_type, HTTPRequestType.POST)
+    response: requests.Response = pooled_requests.post(url, json=query_payload_dict)
+    return http_response_as_model_type(url, response, 201, model_type, HTTPRequestType.POST)
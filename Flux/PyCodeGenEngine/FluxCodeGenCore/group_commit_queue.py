@@ -0,0 +1,73 @@
+# standard imports
+import asyncio
+import logging
+from typing import List, Any, Tuple, Callable, Awaitable
+
+
+class GroupCommitQueue:
+    """
+    coalesces concurrent single obj writes of a model into batch writes: each caller enqueues its obj and awaits own
+    future, a single flush task drains everything queued (up to max_batch_size per flush) until queue is empty -
+    while one flush is awaiting db, new arrivals pile up and go out together in next one, so idle system adds no
+    latency and busy system pays one round trip chain per batch instead of per obj.
+    flush_callable gets obj list and must return result list of same order - Exception entries fail only that obj's
+    caller, an exception raised by flush_callable fails whole batch.
+    Flush runs in its own task so callers must not hold any lock flush_callable takes (it would deadlock on
+    them) - submit only from tasks not holding those (e.g. http route)
+    """
+
+    def __init__(self, flush_callable: Callable[[List[Any]], Awaitable[List[Any]]], max_batch_size: int = 1000):
+        self.flush_callable: Callable[[List[Any]], Awaitable[List[Any]]] = flush_callable
+        self.max_batch_size: int = max_batch_size
+        self.pending_obj_n_future_list: List[Tuple[Any, asyncio.Future]] = []
+        self.flush_task: asyncio.Task | None = None
+        self.flush_count: int = 0
+        self.flushed_obj_count: int = 0
+
+    async def submit(self, obj: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self.pending_obj_n_future_list.append((obj, future))
+        if self.flush_task is None:
+            # flush runs in its own task so a cancelled caller can't abort a batch write others wait on, task
+            # starts on next loop iteration so concurrently scheduled callers join first batch
+            self.flush_task = loop.create_task(self._flush_until_empty())
+        # else not required: running flush loop picks obj up
+        return await future
+
+    async def _flush_until_empty(self):
+        try:
+            while self.pending_obj_n_future_list:
+                await self._flush_pending_batch()
+        finally:
+            self.flush_task = None
+
+    async def _flush_pending_batch(self):
+        obj_n_future_list = self.pending_obj_n_future_list[:self.max_batch_size]
+        del self.pending_obj_n_future_list[:self.max_batch_size]
+        obj_list = [obj for obj, _ in obj_n_future_list]
+        try:
+            result_list = await self.flush_callable(obj_list)
+            if len(result_list) != len(obj_list):
+                raise Exception(f"group commit flush returned {len(result_list)} results for {len(obj_list)} objs")
+            # else not required: one result per obj
+        except asyncio.CancelledError:
+            # batch outcome unknown - failing its callers instead of leaving them waiting forever
+            for _, future in obj_n_future_list:
+                if not future.done():
+                    future.set_exception(Exception("group commit flush cancelled - obj write outcome unknown"))
+            raise
+        except Exception as e:
+            logging.exception(f"group commit flush of {len(obj_list)} objs failed;;; exception: {e}")
+            result_list = [e] * len(obj_list)
+        self.flush_count += 1
+        self.flushed_obj_count += len(obj_list)
+
+        for (_, future), result in zip(obj_n_future_list, result_list):
+            if future.done():
+                # caller cancelled while waiting - obj is still written
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
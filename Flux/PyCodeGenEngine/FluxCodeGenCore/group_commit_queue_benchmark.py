@@ -0,0 +1,93 @@
+# GroupCommitQueueBenchmark.py
+# compares per request locked create (current generated route) vs GroupCommitQueue coalesced create throughput
+# against simulated db: each write costs one round trip + per doc cost, each ws publish one round trip
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import List, Any
+
+from Flux.PyCodeGenEngine.FluxCodeGenCore.group_commit_queue import GroupCommitQueue
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class SimulatedDb:
+    def __init__(self, round_trip_sec: float, per_doc_sec: float):
+        self.round_trip_sec: float = round_trip_sec
+        self.per_doc_sec: float = per_doc_sec
+        self.write_count: int = 0
+
+    async def insert(self, doc_list: List[Any]):
+        self.write_count += 1
+        await asyncio.sleep(self.round_trip_sec + self.per_doc_sec * len(doc_list))
+
+    async def publish(self, doc_list: List[Any]):
+        await asyncio.sleep(self.round_trip_sec)
+
+
+async def run_single(db: SimulatedDb, client_count: int, request_per_client: int) -> float:
+    reentrant_lock = asyncio.Lock()
+
+    async def create(doc):
+        # mirrors generated _underlying_create_*_http: lock held across write and publish
+        async with reentrant_lock:
+            await db.insert([doc])
+            await db.publish([doc])
+        return doc
+
+    async def client(client_id: int):
+        for request_id in range(request_per_client):
+            await create((client_id, request_id))
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*[client(client_id) for client_id in range(client_count)])
+    return time.perf_counter() - start_time
+
+
+async def run_coalesced(db: SimulatedDb, client_count: int, request_per_client: int,
+                        max_batch_size: int) -> float:
+    reentrant_lock = asyncio.Lock()
+
+    async def flush(doc_list: List[Any]) -> List[Any]:
+        async with reentrant_lock:
+            await db.insert(doc_list)
+            await db.publish(doc_list)
+        return doc_list
+
+    group_commit_queue = GroupCommitQueue(flush, max_batch_size)
+
+    async def client(client_id: int):
+        for request_id in range(request_per_client):
+            await group_commit_queue.submit((client_id, request_id))
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*[client(client_id) for client_id in range(client_count)])
+    return time.perf_counter() - start_time
+
+
+def run(client_count: int, request_per_client: int, round_trip_ms: float, per_doc_us: float,
+        max_batch_size: int) -> None:
+    total_requests = client_count * request_per_client
+    single_db = SimulatedDb(round_trip_ms / 1e3, per_doc_us / 1e6)
+    single_sec = asyncio.run(run_single(single_db, client_count, request_per_client))
+    coalesced_db = SimulatedDb(round_trip_ms / 1e3, per_doc_us / 1e6)
+    coalesced_sec = asyncio.run(run_coalesced(coalesced_db, client_count, request_per_client, max_batch_size))
+
+    logging.info(f"single:    {total_requests / single_sec:,.0f} req/s, {single_db.write_count} db writes")
+    logging.info(f"coalesced: {total_requests / coalesced_sec:,.0f} req/s, {coalesced_db.write_count} db writes, "
+                 f"avg batch {total_requests / coalesced_db.write_count:.1f}")
+    logging.info(f"speedup: {single_sec / coalesced_sec:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark single vs group commit create throughput.")
+    parser.add_argument("--client_count", type=int, default=64, help="Concurrent clients, one request in flight each.")
+    parser.add_argument("--request_per_client", type=int, default=50)
+    parser.add_argument("--round_trip_ms", type=float, default=0.5, help="Simulated db/ws round trip.")
+    parser.add_argument("--per_doc_us", type=float, default=20.0, help="Simulated per doc write cost.")
+    parser.add_argument("--max_batch_size", type=int, default=1000)
+    args = parser.parse_args()
+
+    run(args.client_count, args.request_per_client, args.round_trip_ms, args.per_doc_us, args.max_batch_size)
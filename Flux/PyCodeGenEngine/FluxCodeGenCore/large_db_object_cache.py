@@ -0,0 +1,90 @@
+# standard imports
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple, Type
+
+# 0/unset disables cache - budget is per model type
+large_db_object_cache_max_bytes: int = int(os.getenv("LARGE_DB_OBJECT_CACHE_MAX_BYTES") or 0)
+# max GridFS downloads in flight per read-all/id-filtered read
+large_db_object_download_concurrency: int = int(os.getenv("LARGE_DB_OBJECT_DOWNLOAD_CONCURRENCY") or 8)
+
+
+class LargeDbObjectCache:
+    """
+    LRU of GridFS file contents keyed by (_id, upload_date) - upload_date has ms resolution so two updates of
+    same obj (delete + re-upload) within a ms share it: update/delete routes invalidate obj's entry by _id once
+    written, downloads overlapping any invalidation are not cached. Raw bytes are cached instead of decoded dicts: callers mutate returned dicts in place and decoding cached bytes
+    is cheaper than deep copying a cached decoded object
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes: int = max_bytes
+        self.cached_bytes: int = 0
+        self.key_to_data_bytes_dict: OrderedDict[Tuple[Any, Any], bytes] = OrderedDict()
+        self.obj_id_to_key_dict: Dict[Any, Tuple[Any, Any]] = {}
+        # bumped by every invalidate - download started before an invalidation may hold pre-update bytes
+        self.invalidation_count: int = 0
+        self.hit_count: int = 0
+        self.miss_count: int = 0
+
+    def get(self, obj_id: Any, upload_date: Any) -> bytes | None:
+        cache_key = (obj_id, upload_date)
+        data_bytes = self.key_to_data_bytes_dict.get(cache_key)
+        if data_bytes is None:
+            self.miss_count += 1
+            return None
+        # else not required: cache hit
+        self.key_to_data_bytes_dict.move_to_end(cache_key)
+        self.hit_count += 1
+        return data_bytes
+
+    def _remove(self, cache_key: Tuple[Any, Any]):
+        data_bytes = self.key_to_data_bytes_dict.pop(cache_key)
+        self.cached_bytes -= len(data_bytes)
+        if self.obj_id_to_key_dict.get(cache_key[0]) == cache_key:
+            del self.obj_id_to_key_dict[cache_key[0]]
+        # else not required: newer version of obj already indexed
+
+    def invalidate(self, obj_id: Any):
+        self.invalidation_count += 1
+        if (cache_key := self.obj_id_to_key_dict.get(obj_id)) is not None:
+            self._remove(cache_key)
+        # else not required: obj not cached
+
+    def put(self, obj_id: Any, upload_date: Any, data_bytes: bytes):
+        if len(data_bytes) > self.max_bytes:
+            return
+        # else not required: obj fits in budget
+        cache_key = (obj_id, upload_date)
+        if (old_cache_key := self.obj_id_to_key_dict.get(obj_id)) is not None:
+            self._remove(old_cache_key)
+        # else not required: obj not cached yet
+        self.key_to_data_bytes_dict[cache_key] = data_bytes
+        self.obj_id_to_key_dict[obj_id] = cache_key
+        self.cached_bytes += len(data_bytes)
+        while self.cached_bytes > self.max_bytes:
+            self._remove(next(iter(self.key_to_data_bytes_dict)))
+
+
+model_type_name_to_large_db_object_cache_dict: Dict[str, LargeDbObjectCache] = {}
+
+
+def get_large_db_object_cache(model_class_type: Type) -> LargeDbObjectCache | None:
+    if not large_db_object_cache_max_bytes:
+        return None
+    # else not required: cache enabled
+    large_db_object_cache = model_type_name_to_large_db_object_cache_dict.get(model_class_type.__name__)
+    if large_db_object_cache is None:
+        large_db_object_cache = LargeDbObjectCache(large_db_object_cache_max_bytes)
+        model_type_name_to_large_db_object_cache_dict[model_class_type.__name__] = large_db_object_cache
+    # else not required: using existing cache of model type
+    return large_db_object_cache
+
+
+def invalidate_large_db_objects(model_class_type: Type, obj_id_list: List[Any]):
+    """drops cached content of passed objs - called by routes once their update/delete is written"""
+    large_db_object_cache = model_type_name_to_large_db_object_cache_dict.get(model_class_type.__name__)
+    if large_db_object_cache is not None:
+        for obj_id in obj_id_list:
+            large_db_object_cache.invalidate(obj_id)
+    # else not required: nothing cached for model type
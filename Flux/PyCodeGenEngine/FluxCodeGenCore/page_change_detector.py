@@ -0,0 +1,507 @@
+# standard imports
+import copy
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Type, Final, Tuple
+
+# 3rd party imports
+import orjson
+
+# project imports
+from FluxPythonUtils.scripts.general_utility_functions import non_jsonable_types_handler, parse_to_int
+from Flux.PyCodeGenEngine.FluxCodeGenCore.base_aggregate import (
+    create_cascading_multi_filter_pipeline, item_matches_filters, is_relevant_update, detect_multiple_page_changes,
+    dedupe_page_changes, sort_n_cleanup_page_changes)
+
+"""
+In-process page change detection for paginated/filtered ws subscribers:
+Each subscribed page window is kept as sorted list of page items - create/update/delete impact on page is decided
+locally using item_matches_filters & is_relevant_update. Only when window boundary is unknown (window not loaded yet,
+item shifts in/out from neighbour pages, sort ties, custom aggregation pages etc.) detection falls back to
+mongo based detect_multiple_page_changes
+"""
+
+local_page_change_detection: bool = \
+    parse_to_int(local_page_change_detection_env_var) == 1 \
+    if ((local_page_change_detection_env_var := os.getenv("LocalPageChangeDetection")) is not None and
+        len(local_page_change_detection_env_var)) else True
+
+
+class _UnknownPageBoundary(Exception):
+    """raised when page impact can't be decided locally - caller must fall back to db based detection"""
+
+
+class PageWindow:
+    # max items kept in-memory for a page - pages without pagination (filter only) having more matching items are
+    # not tracked and always use db based detection
+    max_window_size: Final[int] = 1000
+    # window is reloaded from db after this interval - guards against writes done outside generic routes
+    refresh_interval_sec: Final[float] = 30.0
+
+    def __init__(self, page_id: str, page_signature: str, filters: List[Dict] | None,
+                 sort_order: List[Dict] | None, pagination: Dict | None):
+        self.page_id: str = page_id
+        self.page_signature: str = page_signature
+        self.filters: List[Dict] = filters if filters else []
+        self.sort_order: List[Dict] = sort_order if sort_order else []
+        self.pagination: Dict = pagination if pagination else {}
+        self.page_number: int = self.pagination.get("page_number", 0) if self.pagination else 0
+        self.page_size: int = self.pagination.get("page_size", 0) if self.pagination else 0
+        self.items: List[Dict] | None = None     # None: window boundary unknown - requires reload from db
+        # window items after op whose db write is still in flight - moved to items once write succeeds
+        self.pending_items: List[Dict] | None = None
+        self.loaded_at: float = 0.0
+        self.is_trackable: bool = self._is_trackable()
+
+    def _is_trackable(self) -> bool:
+        if self.pagination and (self.page_number <= 0 or self.page_size <= 0):
+            return False
+        # nested filters/sort reshape nested arrays in aggregation - raw item comparison can't replicate it
+        for filter_def in self.filters:
+            if '.' in filter_def.get("column_name", ""):
+                return False
+        for sort_def in self.sort_order:
+            if '.' in sort_def.get("sort_by", ""):
+                return False
+        return True
+
+    def is_known(self) -> bool:
+        return self.items is not None and (time.monotonic() - self.loaded_at) < PageWindow.refresh_interval_sec
+
+    def invalidate(self):
+        self.items = None
+        self.pending_items = None
+
+    def set_items(self, items: List[Dict]):
+        if not self.pagination and len(items) > PageWindow.max_window_size:
+            # too large to track in-memory
+            self.is_trackable = False
+            self.items = None
+        else:
+            self.items = items
+            self.loaded_at = time.monotonic()
+
+    def get_load_pipeline(self, model_class: Type) -> List[Dict]:
+        pipeline = create_cascading_multi_filter_pipeline(model_class, self.filters, self.sort_order,
+                                                          self.pagination)
+        if not self.pagination:
+            pipeline.append({"$limit": PageWindow.max_window_size + 1})
+        return pipeline
+
+    def is_full(self) -> bool:
+        return bool(self.pagination) and len(self.items) >= self.page_size
+
+
+def _get_field_value(item: Dict, field_path: str) -> Any:
+    value = item
+    for part in field_path.split('.'):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return None
+    return value
+
+
+def _normalize_sort_value(value: Any) -> Any:
+    # db fetched datetime are naive utc while route passed objects are tz aware
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _compare_sort_values(value: Any, other_value: Any) -> int:
+    value = _normalize_sort_value(value)
+    other_value = _normalize_sort_value(other_value)
+    if value == other_value:
+        return 0
+    # mongo sorts null/missing before any other value
+    if value is None:
+        return -1
+    if other_value is None:
+        return 1
+    try:
+        return -1 if value < other_value else 1
+    except TypeError:
+        # mixed types - mongo's bson type ordering is not replicated here
+        raise _UnknownPageBoundary()
+
+
+def compare_items_by_sort_order(item: Dict, other_item: Dict, sort_order: List[Dict]) -> int:
+    """
+    Compares 2 items the way create_cascading_multi_filter_pipeline's $sort layer orders them
+    Returns -1/1 if item comes before/after other_item, 0 if both are tied on all sort fields
+    """
+    for sort_def in sort_order:
+        field = sort_def["sort_by"]
+        direction = sort_def["sort_direction"]
+        value = _get_field_value(item, field)
+        other_value = _get_field_value(other_item, field)
+        if sort_def.get("is_absolute_sort", False):
+            if isinstance(value, (int, float)) and isinstance(other_value, (int, float)):
+                res = _compare_sort_values(abs(value), abs(other_value))
+                if res != 0:
+                    return res * direction
+            else:
+                raise _UnknownPageBoundary()
+        res = _compare_sort_values(value, other_value)
+        if res != 0:
+            return res * direction
+    return 0
+
+
+class PageChangeDetector:
+    """
+    Per model in-process page change detector - keeps each subscribed page window as sorted list of page items
+    and detects page changes for create/update/delete locally, falls back to detect_multiple_page_changes only for
+    pages whose boundary is unknown
+    """
+    model_class_to_detector_dict: Dict[Type, "PageChangeDetector"] = {}
+
+    def __init__(self, model_class: Type):
+        self.model_class = model_class
+        self.page_id_to_window_dict: Dict[str, PageWindow] = {}
+        self.local_detection_count: int = 0
+        self.fallback_detection_count: int = 0
+
+    @classmethod
+    def get_detector(cls, model_class: Type) -> "PageChangeDetector":
+        detector = cls.model_class_to_detector_dict.get(model_class)
+        if detector is None:
+            detector = PageChangeDetector(model_class)
+            cls.model_class_to_detector_dict[model_class] = detector
+        return detector
+
+    @classmethod
+    def invalidate_model_windows(cls, model_class: Type):
+        """
+        must be called whenever model docs are changed without going through detect_page_changes (for ex: update
+        aggregation pipelines) - windows get reloaded from db on next detection
+        """
+        detector = cls.model_class_to_detector_dict.get(model_class)
+        if detector is not None:
+            for window in detector.page_id_to_window_dict.values():
+                window.invalidate()
+
+    @staticmethod
+    def _get_page_signature(page_definition: Dict) -> str:
+        return orjson.dumps([page_definition.get("filters"), page_definition.get("sort_order"),
+                             page_definition.get("pagination")],
+                            default=non_jsonable_types_handler, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+
+    def _sync_windows(self, page_definitions: List[Dict]) -> Dict[str, PageWindow]:
+        page_id_to_window_dict: Dict[str, PageWindow] = {}
+        for page_def in page_definitions:
+            page_id = page_def["page_id"]
+            if page_def.get("custom_aggregation_before_filter_sort_pagination"):
+                # custom aggregation may reshape docs - can't be decided on raw items
+                continue
+            page_signature = self._get_page_signature(page_def)
+            window = self.page_id_to_window_dict.get(page_id)
+            if window is None or window.page_signature != page_signature:
+                window = PageWindow(page_id, page_signature, page_def.get("filters"), page_def.get("sort_order"),
+                                    page_def.get("pagination"))
+            # else not required: reusing existing window of this page
+            page_id_to_window_dict[page_id] = window
+        # windows of disconnected ws are dropped here
+        self.page_id_to_window_dict = page_id_to_window_dict
+        return page_id_to_window_dict
+
+    async def _load_windows(self, window_list: List[PageWindow]):
+        if not window_list:
+            return
+        facet_stage = {window.page_id: window.get_load_pipeline(self.model_class) for window in window_list}
+        result = await self.model_class.collection_obj.aggregate([{"$facet": facet_stage}]).to_list(1)
+        all_pages_data = result[0] if result else {}
+        for window in window_list:
+            window.set_items(all_pages_data.get(window.page_id, []))
+
+    async def detect_page_changes(self, page_definitions: List[Dict], created_items: List[Dict],
+                                  deleted_item_ids: List[Any], updated_items: List[Dict] | None = None,
+                                  pending_window_list: List[Tuple[PageWindow, List[Dict]]] | None = None
+                                  ) -> List[Dict]:
+        """
+        Same contract as detect_multiple_page_changes: must be called before db operation, returns
+        [{"page_id": <page_id>, "changes": [<change>, ...]}, ...] in page_definitions order
+        Windows impacted by op are moved only after its db write: impacted windows are appended to passed
+        pending_window_list - caller must pass it to commit_page_windows once write succeeds or to
+        discard_page_windows if it fails. Without pending_window_list impacted windows are invalidated
+        """
+        if updated_items is None:
+            updated_items = []
+        page_id_to_window_dict = self._sync_windows(page_definitions)
+        await self._load_windows([window for window in page_id_to_window_dict.values()
+                                  if window.is_trackable and not window.is_known()])
+
+        page_id_to_changes_dict: Dict[str, List[Dict]] = {}
+        fallback_page_definitions: List[Dict] = []
+        for page_def in page_definitions:
+            page_id = page_def["page_id"]
+            window = page_id_to_window_dict.get(page_id)
+            if window is None or not window.is_trackable or not window.is_known():
+                fallback_page_definitions.append(page_def)
+                continue
+            if window.pending_items is not None:
+                # other op's db write is in flight - window isn't known till it completes
+                window.invalidate()
+                fallback_page_definitions.append(page_def)
+                continue
+            # else not required: window matches db
+            try:
+                changes, new_items = self._detect_window_changes(window, created_items, deleted_item_ids,
+                                                                 updated_items)
+            except _UnknownPageBoundary:
+                window.invalidate()
+                fallback_page_definitions.append(page_def)
+            else:
+                if new_items is not None:
+                    if pending_window_list is not None:
+                        window.pending_items = new_items
+                        pending_window_list.append((window, new_items))
+                    else:
+                        window.invalidate()
+                # else not required: window not impacted by this operation
+                page_id_to_changes_dict[page_id] = changes
+                self.local_detection_count += 1
+
+        if fallback_page_definitions:
+            self.fallback_detection_count += len(fallback_page_definitions)
+            fallback_reports = await detect_multiple_page_changes(
+                self.model_class.collection_obj, fallback_page_definitions, created_items, deleted_item_ids,
+                self.model_class, updated_items)
+            for page_report in fallback_reports:
+                page_id_to_changes_dict[page_report["page_id"]] = page_report["changes"]
+        # else not required: all pages were detected locally
+
+        logging.debug(f"page change detection for {self.model_class.__name__}: "
+                      f"local pages: {len(page_definitions) - len(fallback_page_definitions)}, "
+                      f"fallback pages: {len(fallback_page_definitions)}")
+        return [{"page_id": page_def["page_id"], "changes": page_id_to_changes_dict.get(page_def["page_id"], [])}
+                for page_def in page_definitions]
+
+    def _detect_window_changes(self, window: PageWindow, created_items: List[Dict], deleted_item_ids: List[Any],
+                               updated_items: List[Dict]) -> Tuple[List[Dict], List[Dict] | None]:
+        """
+        Returns tuple of (changes, new window items or None if window is unchanged)
+        raises _UnknownPageBoundary if page impact can't be decided without db
+        """
+        item_count = len(created_items) + len(deleted_item_ids) + len(updated_items)
+        if item_count > 1:
+            # bulk operations: only decided locally if no item impacts this page
+            for created_item in created_items:
+                if self._create_position(window, created_item) is not None:
+                    raise _UnknownPageBoundary()
+            for deleted_item_id in deleted_item_ids:
+                if self._delete_position(window, deleted_item_id) is not None:
+                    raise _UnknownPageBoundary()
+            for updated_item in updated_items:
+                if self._update_positions(window, updated_item) != (None, None):
+                    raise _UnknownPageBoundary()
+            return [], None
+        elif created_items:
+            created_item = created_items[0]
+            new_idx = self._create_position(window, created_item)
+            if new_idx is None:
+                return [], None
+            new_items = list(window.items)
+            new_items.insert(new_idx, copy.deepcopy(created_item))
+            return self._get_insert_changes(window, new_items, new_idx, created_item, flag_on_insert=True)
+        elif deleted_item_ids:
+            deleted_item_id = deleted_item_ids[0]
+            old_idx = self._delete_position(window, deleted_item_id)
+            if old_idx is None:
+                return [], None
+            deleted_item = window.items[old_idx]
+            new_items = window.items[:old_idx] + window.items[old_idx + 1:]
+            changes = [{"_id": deleted_item_id}]
+            changes = self._add_boundary_changes(window, new_items, changes)
+            return self._finalize_changes(window, changes, {deleted_item_id: deleted_item}), new_items
+        elif updated_items:
+            updated_item = updated_items[0]
+            old_idx, new_idx = self._update_positions(window, updated_item)
+            if old_idx is None and new_idx is None:
+                return [], None
+            if old_idx is None:
+                # update brings item in this page
+                new_items = list(window.items)
+                new_items.insert(new_idx, copy.deepcopy(updated_item))
+                # filter-aware detection marks newly entered updated items only via boundary detection
+                return self._get_insert_changes(window, new_items, new_idx, updated_item,
+                                                flag_on_insert=not window.filters,
+                                                item_data_map={updated_item["_id"]: updated_item})
+            new_items = window.items[:old_idx] + window.items[old_idx + 1:]
+            new_items.insert(new_idx, copy.deepcopy(updated_item))
+            change = copy.deepcopy(updated_item)
+            if window.sort_order and compare_items_by_sort_order(window.items[old_idx], updated_item,
+                                                                 window.sort_order) != 0:
+                # sort key changed - flagging if item is now at page boundary
+                if new_idx == 0:
+                    change["_new_top"] = True
+                elif new_idx == len(new_items) - 1:
+                    change["_new_bottom"] = True
+            # else not required: sort position unchanged, just return the updated item
+            changes = self._add_boundary_changes(window, new_items, [change])
+            return self._finalize_changes(window, changes, {updated_item["_id"]: updated_item}), new_items
+        return [], None
+
+    def _get_insert_position(self, window: PageWindow, item: Dict, other_items: List[Dict]) -> int | None:
+        """
+        Returns insert index of item in other_items if item lands in this page window, None if it lands after
+        window - raises _UnknownPageBoundary if it lands before window (shifts items from previous page) or is tied
+        """
+        if not window.sort_order:
+            # natural order: new items always go last
+            insert_idx = len(other_items)
+        else:
+            insert_idx = len(other_items)
+            for idx, other_item in enumerate(other_items):
+                res = compare_items_by_sort_order(item, other_item, window.sort_order)
+                if res == 0:
+                    # tied items order is not deterministic in db sort
+                    raise _UnknownPageBoundary()
+                if res < 0:
+                    insert_idx = idx
+                    break
+        if window.pagination:
+            if window.page_size <= len(other_items) and insert_idx == len(other_items):
+                # lands after full page
+                return None
+            if window.page_number > 1 and (insert_idx == 0 or not other_items):
+                # may land in previous pages
+                raise _UnknownPageBoundary()
+        return insert_idx
+
+    def _create_position(self, window: PageWindow, created_item: Dict) -> int | None:
+        if not item_matches_filters(created_item, window.filters):
+            return None
+        return self._get_insert_position(window, created_item, window.items)
+
+    def _delete_position(self, window: PageWindow, deleted_item_id: Any) -> int | None:
+        for idx, item in enumerate(window.items):
+            if item["_id"] == deleted_item_id:
+                if window.is_full():
+                    # next page item moves in
+                    raise _UnknownPageBoundary()
+                return idx
+        if window.pagination and window.page_number > 1:
+            # deleted item may be in previous page - shifts this page
+            raise _UnknownPageBoundary()
+        return None
+
+    def _update_positions(self, window: PageWindow, updated_item: Dict) -> Tuple[int | None, int | None]:
+        """
+        Returns tuple of (index before update, index after update) of updated_item in window, None for index if item
+        is not in window
+        """
+        item_id = updated_item["_id"]
+        old_idx: int | None = None
+        for idx, item in enumerate(window.items):
+            if item["_id"] == item_id:
+                old_idx = idx
+                break
+
+        if old_idx is None:
+            if window.pagination and window.page_number > 1 and (window.filters or window.sort_order):
+                # original item may be in previous page - can't be known without stored item
+                raise _UnknownPageBoundary()
+            if not item_matches_filters(updated_item, window.filters):
+                return None, None
+            if not window.filters and not window.sort_order:
+                # update can't bring item in page - must be already out of this page
+                return None, None
+            if not window.sort_order and window.pagination and window.is_full():
+                # natural order is not changed by update
+                return None, None
+            new_idx = self._get_insert_position(window, updated_item, window.items)
+            return None, new_idx
+
+        original_item = window.items[old_idx]
+        if not is_relevant_update(original_item, updated_item, window.filters, window.sort_order):
+            return old_idx, old_idx
+        if not item_matches_filters(updated_item, window.filters):
+            # item leaves page - next page item may move in
+            raise _UnknownPageBoundary()
+        if window.pagination and window.filters and not window.is_full():
+            # filter-aware detection looks up next item for non-full pages on relevant updates
+            raise _UnknownPageBoundary()
+        other_items = window.items[:old_idx] + window.items[old_idx + 1:]
+        new_idx = self._get_insert_position(window, updated_item, other_items)
+        if new_idx is None or (window.pagination and window.is_full() and new_idx == len(other_items)):
+            # item leaves page from bottom - next page item moves in
+            raise _UnknownPageBoundary()
+        return old_idx, new_idx
+
+    def _get_insert_changes(self, window: PageWindow, new_items: List[Dict], new_idx: int, inserted_item: Dict,
+                            flag_on_insert: bool, item_data_map: Dict | None = None) -> Tuple[List[Dict], List[Dict]]:
+        if window.pagination and len(new_items) > window.page_size:
+            # bottom item of page is pushed to next page
+            new_items.pop()
+        # copy - callers convert change fields in place while inserted_item is obj about to be written to db
+        change = copy.deepcopy(inserted_item)
+        if flag_on_insert and window.pagination:
+            if new_idx == 0:
+                change["_new_top"] = True
+            elif new_idx == len(new_items) - 1:
+                change["_new_bottom"] = True
+        changes = self._add_boundary_changes(window, new_items, [change])
+        return self._finalize_changes(window, changes, item_data_map if item_data_map else {}), new_items
+
+    def _add_boundary_changes(self, window: PageWindow, new_items: List[Dict], changes: List[Dict]) -> List[Dict]:
+        # --- Boundary Change Detection (only when pagination is provided) ---
+        old_items = window.items
+        if not (window.pagination and new_items and old_items):
+            return changes
+
+        new_top = new_items[0]
+        if old_items[0]["_id"] != new_top["_id"] or \
+                compare_items_by_sort_order(old_items[0], new_top, window.sort_order) != 0:
+            if not any(change.get("_new_top") and change["_id"] == new_top["_id"] for change in changes):
+                changes.append({**copy.deepcopy(new_top), "_new_top": True})
+
+        new_bottom = new_items[-1]
+        if old_items[-1]["_id"] != new_bottom["_id"] or \
+                compare_items_by_sort_order(old_items[-1], new_bottom, window.sort_order) != 0:
+            if not any(change.get("_new_bottom") and change["_id"] == new_bottom["_id"] for change in changes):
+                # For single item pages, ensure both flags are set
+                if len(new_items) == 1:
+                    existing_change = next((change for change in changes if change["_id"] == new_top["_id"]), None)
+                    if existing_change and existing_change.get("_new_top"):
+                        existing_change["_new_bottom"] = True
+                    else:
+                        changes.append({**copy.deepcopy(new_top), "_new_bottom": True})
+                else:
+                    changes.append({**copy.deepcopy(new_bottom), "_new_bottom": True})
+        return changes
+
+    def _finalize_changes(self, window: PageWindow, changes: List[Dict], item_data_map: Dict) -> List[Dict]:
+        final_changes = dedupe_page_changes(changes)
+        return sort_n_cleanup_page_changes(final_changes, window.sort_order, window.pagination, item_data_map)
+
+
+def commit_page_windows(pending_window_list: List[Tuple[PageWindow, List[Dict]]]):
+    """moves windows impacted by op to their new items - called once op's db write succeeded"""
+    for window, new_items in pending_window_list:
+        if window.pending_items is new_items:
+            window.items = new_items
+            window.pending_items = None
+        else:
+            # window was invalidated (and may be reloaded without this write) meanwhile
+            window.invalidate()
+
+
+def discard_page_windows(pending_window_list: List[Tuple[PageWindow, List[Dict]]]):
+    """called when op's db write failed - impacted windows are reloaded from db on next detection"""
+    for window, _ in pending_window_list:
+        window.invalidate()
+
+
+async def detect_page_changes(model_class: Type, page_definitions: List[Dict], created_items: List[Dict],
+                              deleted_item_ids: List[Any], updated_items: List[Dict] | None = None,
+                              pending_window_list: List[Tuple[PageWindow, List[Dict]]] | None = None) -> List[Dict]:
+    if local_page_change_detection:
+        return await PageChangeDetector.get_detector(model_class).detect_page_changes(
+            page_definitions, created_items, deleted_item_ids, updated_items, pending_window_list)
+    else:
+        return await detect_multiple_page_changes(model_class.collection_obj, page_definitions, created_items,
+                                                  deleted_item_ids, model_class, updated_items)
@@ -1,5 +1,7 @@
 # standard import
 import logging
+import os
+import time
 import timeit
 import functools
 
@@ -26,6 +28,14 @@ def get_time_it_log_pattern(callable_name: str, start_time: DateTime, delta: flo
     return pattern_str
 
 
+# "log" (default): timings logged as _timeit_ pattern lines and parsed back by log analyzers,
+# "ring": fixed size binary records in per process mmap ring drained by PerfBenchmarkRingCollector
+perf_benchmark_backend: str = os.getenv("PERF_BENCHMARK_BACKEND") or "log"
+is_ring_backend_enabled: bool = perf_benchmark_backend == "ring"
+if is_ring_backend_enabled:
+    from Flux.PyCodeGenEngine.FluxCodeGenCore.perf_benchmark_ring_buffer import record_perf_benchmark_timing
+# else not required: log backend
+
 # Decorator Function
 if hasattr(logging, "getLevelNamesMapping"):
     lvl_names_mapping = logging.getLevelNamesMapping()
@@ -37,7 +47,19 @@ if "TIMING" in lvl_names_mapping:
     if logger.getEffectiveLevel() <= logging.TIMING:
         is_timing_logging_enabled = True
 
-if is_timing_logging_enabled:
+if is_ring_backend_enabled:
+    def perf_benchmark(func_callable):
+        callable_name = func_callable.__name__
+
+        @functools.wraps(func_callable)
+        async def benchmarker(*args, **kwargs):
+            start_ns = time.time_ns()
+            start_perf_counter_ns = time.perf_counter_ns()
+            return_val = await func_callable(*args, **kwargs)
+            record_perf_benchmark_timing(callable_name, start_ns, time.perf_counter_ns() - start_perf_counter_ns)
+            return return_val
+        return benchmarker
+elif is_timing_logging_enabled:
     def perf_benchmark(func_callable):
         @functools.wraps(func_callable)
         async def benchmarker(*args, **kwargs):
@@ -60,7 +82,18 @@ else:
         return benchmarker
 
 
-if is_timing_logging_enabled:
+if is_ring_backend_enabled:
+    def perf_benchmark_sync_callable(func_callable):
+        callable_name = func_callable.__name__
+
+        def benchmarker(*args, **kwargs):
+            start_ns = time.time_ns()
+            start_perf_counter_ns = time.perf_counter_ns()
+            return_val = func_callable(*args, **kwargs)
+            record_perf_benchmark_timing(callable_name, start_ns, time.perf_counter_ns() - start_perf_counter_ns)
+            return return_val
+        return benchmarker
+elif is_timing_logging_enabled:
     def perf_benchmark_sync_callable(func_callable):
         def benchmarker(*args, **kwargs):
             call_date_time = DateTime.utcnow()
@@ -0,0 +1,315 @@
+# standard imports
+import ctypes
+import logging
+import mmap
+import os
+import re
+import sys
+import threading
+from functools import lru_cache
+from pathlib import PurePath
+from typing import Dict, Final, List, NamedTuple
+
+# project imports
+from FluxPythonUtils.scripts.general_utility_functions import parse_to_int
+
+PERF_BENCHMARK_RING_SIGNATURE: Final[int] = 0xFAFAFAFAFAFA0001
+MAX_PROJECT_NAME_LENGTH: Final[int] = 64
+MAX_CALLABLE_NAME_LENGTH: Final[int] = 128
+MAX_CALLABLE_COUNT: Final[int] = 4096
+DEFAULT_RING_CAPACITY: Final[int] = 65536   # records, ~1.5 MB per process
+RING_FILE_PREFIX: Final[str] = "perf_benchmark_ring_"
+
+
+def get_perf_benchmark_ring_dir() -> str:
+    return os.getenv("PERF_BENCHMARK_RING_DIR") or "/dev/shm/flux_perf_benchmark"
+
+
+class PerfBenchmarkRingHeader(ctypes.Structure):
+    _fields_ = [
+        ("signature", ctypes.c_uint64),
+        ("pid", ctypes.c_int64),
+        ("capacity", ctypes.c_uint64),
+        # total records ever written - slot of next record is write_index % capacity
+        ("write_index", ctypes.c_uint64),
+        ("callable_count", ctypes.c_uint32),
+        ("project_name", ctypes.c_char * MAX_PROJECT_NAME_LENGTH)
+    ]
+
+
+class PerfBenchmarkRecord(ctypes.Structure):
+    _fields_ = [
+        ("callable_id", ctypes.c_uint32),
+        ("start_ns", ctypes.c_int64),     # epoch ns
+        ("duration_ns", ctypes.c_int64)
+    ]
+
+
+@lru_cache(maxsize=None)
+def get_perf_benchmark_ring_type(capacity: int):
+    class PerfBenchmarkRing(ctypes.Structure):
+        _fields_ = [
+            ("header", PerfBenchmarkRingHeader),
+            ("callable_names", (ctypes.c_char * MAX_CALLABLE_NAME_LENGTH) * MAX_CALLABLE_COUNT),
+            ("records", PerfBenchmarkRecord * capacity)
+        ]
+    return PerfBenchmarkRing
+
+
+class PerfBenchmarkTiming(NamedTuple):
+    project_name: str
+    callable_name: str
+    start_ns: int
+    duration_ns: int
+
+
+def _get_default_project_name() -> str:
+    if project_name := os.getenv("PERF_BENCHMARK_PROJECT_NAME"):
+        return project_name
+    # else not required: deriving from launch script path - same service name log based path takes from log path
+    script_path = os.path.abspath(sys.argv[0]) if sys.argv and sys.argv[0] else ""
+    if match := re.search(r"(?:ProjectGroup|CodeGenProjects)/([^/]*)/", script_path):
+        return match.group(1)
+    return PurePath(script_path).stem or "unknown"
+
+
+class PerfBenchmarkRingWriter:
+    """
+    per process ring of fixed size timing records in a mmap file - writer never blocks on collector, once ring is
+    full oldest records are overwritten and collector counts them as dropped
+    """
+
+    def __init__(self, ring_dir: str, capacity: int, project_name: str):
+        os.makedirs(ring_dir, exist_ok=True)
+        self.pid = os.getpid()
+        self.file_path = os.path.join(ring_dir, f"{RING_FILE_PREFIX}{project_name}_{self.pid}.bin")
+        ring_type = get_perf_benchmark_ring_type(capacity)
+        with open(self.file_path, "w+b") as ring_file:
+            ring_file.truncate(ctypes.sizeof(ring_type))
+            self.mmap_obj = mmap.mmap(ring_file.fileno(), ctypes.sizeof(ring_type))
+        self.ring = ring_type.from_buffer(self.mmap_obj)
+        self.header: PerfBenchmarkRingHeader = self.ring.header
+        self.records = self.ring.records
+        self.capacity = capacity
+        self.callable_name_to_id_dict: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+        self.header.pid = self.pid
+        self.header.capacity = capacity
+        self.header.project_name = project_name.encode()[:MAX_PROJECT_NAME_LENGTH - 1]
+        # signature last - collector ignores ring until header is complete
+        self.header.signature = PERF_BENCHMARK_RING_SIGNATURE
+        logging.info(f"perf benchmark ring created: {self.file_path}, {capacity=}")
+
+    def _register_callable(self, callable_name: str) -> int | None:
+        # must be called with lock held
+        callable_id = self.header.callable_count
+        if callable_id >= MAX_CALLABLE_COUNT:
+            logging.error(f"perf benchmark ring {self.file_path} callable table full, "
+                          f"timings of {callable_name} are not recorded")
+            self.callable_name_to_id_dict[callable_name] = None
+            return None
+        # else not required: free callable slot available
+        self.ring.callable_names[callable_id].value = callable_name.encode()[:MAX_CALLABLE_NAME_LENGTH - 1]
+        self.header.callable_count = callable_id + 1
+        self.callable_name_to_id_dict[callable_name] = callable_id
+        return callable_id
+
+    def record(self, callable_name: str, start_ns: int, duration_ns: int):
+        with self.lock:
+            callable_id = self.callable_name_to_id_dict.get(callable_name, -1)
+            if callable_id == -1:
+                callable_id = self._register_callable(callable_name)
+            if callable_id is None:
+                return
+            # else not required: callable registered
+
+            write_index = self.header.write_index
+            record = self.records[write_index % self.capacity]
+            record.callable_id = callable_id
+            record.start_ns = start_ns
+            record.duration_ns = duration_ns
+            # publish after record is complete
+            self.header.write_index = write_index + 1
+
+
+_perf_benchmark_ring_writer: PerfBenchmarkRingWriter | None = None
+_perf_benchmark_ring_writer_lock = threading.Lock()
+
+
+def _reset_perf_benchmark_ring_writer_in_child():
+    # forked child must not share parent's ring - it creates its own on first record
+    global _perf_benchmark_ring_writer, _perf_benchmark_ring_writer_lock
+    _perf_benchmark_ring_writer = None
+    _perf_benchmark_ring_writer_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_perf_benchmark_ring_writer_in_child)
+
+
+def get_perf_benchmark_ring_writer() -> PerfBenchmarkRingWriter:
+    global _perf_benchmark_ring_writer
+    if _perf_benchmark_ring_writer is None:
+        with _perf_benchmark_ring_writer_lock:
+            if _perf_benchmark_ring_writer is None:
+                capacity = parse_to_int(os.getenv("PERF_BENCHMARK_RING_CAPACITY") or DEFAULT_RING_CAPACITY)
+                _perf_benchmark_ring_writer = PerfBenchmarkRingWriter(get_perf_benchmark_ring_dir(), capacity,
+                                                                      _get_default_project_name())
+            # else not required: other thread created it meanwhile
+    # else not required: using already created writer
+    return _perf_benchmark_ring_writer
+
+
+def record_perf_benchmark_timing(callable_name: str, start_ns: int, duration_ns: int):
+    get_perf_benchmark_ring_writer().record(callable_name, start_ns, duration_ns)
+
+
+class _PerfBenchmarkRingReader:
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, "rb") as ring_file:
+            self.mmap_obj = mmap.mmap(ring_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.header = PerfBenchmarkRingHeader.from_buffer_copy(self.mmap_obj)
+        self.ring_type = get_perf_benchmark_ring_type(self.header.capacity)
+        if len(self.mmap_obj) != ctypes.sizeof(self.ring_type):
+            self.mmap_obj.close()
+            raise Exception(f"perf benchmark ring {file_path} size {len(self.mmap_obj)} mismatches "
+                            f"capacity {self.header.capacity} in header")
+        # else not required: ring fully sized
+        self.project_name: str = self.header.project_name.decode()
+        self.pid: int = self.header.pid
+        self.capacity: int = self.header.capacity
+        self.read_index: int = 0
+        self.callable_names: List[str] = []
+        self.records_offset: int = self.ring_type.records.offset
+        self.callable_names_offset: int = self.ring_type.callable_names.offset
+
+    def _read_u64(self, offset: int) -> int:
+        return ctypes.c_uint64.from_buffer_copy(self.mmap_obj, offset).value
+
+    def _refresh_callable_names(self):
+        callable_count = ctypes.c_uint32.from_buffer_copy(
+            self.mmap_obj, PerfBenchmarkRingHeader.callable_count.offset).value
+        for callable_id in range(len(self.callable_names), callable_count):
+            name_offset = self.callable_names_offset + callable_id * MAX_CALLABLE_NAME_LENGTH
+            name_bytes = self.mmap_obj[name_offset: name_offset + MAX_CALLABLE_NAME_LENGTH]
+            self.callable_names.append(name_bytes.split(b"\0", 1)[0].decode())
+
+    def drain(self, timing_list: List[PerfBenchmarkTiming], max_records: int) -> int:
+        """
+        appends records written since last drain to timing_list, returns count of records lost to overwrite
+        """
+        write_index = self._read_u64(PerfBenchmarkRingHeader.write_index.offset)
+        dropped_count = 0
+        if write_index - self.read_index > self.capacity:
+            dropped_count = write_index - self.capacity - self.read_index
+            self.read_index = write_index - self.capacity
+        # else not required: nothing overwritten since last drain
+        end_index = min(write_index, self.read_index + max_records)
+        if end_index == self.read_index:
+            return dropped_count
+        # else not required: new records to read
+
+        self._refresh_callable_names()
+        # bulk copy - at most two contiguous slices when range wraps around ring end
+        record_size = ctypes.sizeof(PerfBenchmarkRecord)
+        start_slot = self.read_index % self.capacity
+        record_count = end_index - self.read_index
+        first_slice_count = min(record_count, self.capacity - start_slot)
+        record_list = list((PerfBenchmarkRecord * first_slice_count).from_buffer_copy(
+            self.mmap_obj, self.records_offset + start_slot * record_size))
+        if record_count > first_slice_count:
+            record_list.extend((PerfBenchmarkRecord * (record_count - first_slice_count)).from_buffer_copy(
+                self.mmap_obj, self.records_offset))
+        # else not required: range doesn't wrap
+
+        # writer may have lapped us while copying - records older than one ring behind its latest index are torn,
+        # slot of index write_index - capacity is the one writer may be overwriting right now
+        valid_from_index = self._read_u64(PerfBenchmarkRingHeader.write_index.offset) - self.capacity + 1
+        for index, record in zip(range(self.read_index, end_index), record_list):
+            if index < valid_from_index or record.callable_id >= len(self.callable_names):
+                dropped_count += 1
+                continue
+            # else not required: record intact
+            timing_list.append(PerfBenchmarkTiming(self.project_name, self.callable_names[record.callable_id],
+                                                   record.start_ns, record.duration_ns))
+        self.read_index = end_index
+        return dropped_count
+
+    def is_fully_drained(self) -> bool:
+        return self._read_u64(PerfBenchmarkRingHeader.write_index.offset) == self.read_index
+
+    def close(self):
+        self.mmap_obj.close()
+
+
+class PerfBenchmarkRingCollector:
+    """
+    drains all per process perf benchmark rings found in ring_dir in bulk, rings of exited processes are removed
+    once fully drained
+    """
+
+    def __init__(self, ring_dir: str | None = None):
+        self.ring_dir = ring_dir if ring_dir is not None else get_perf_benchmark_ring_dir()
+        self.file_path_to_reader_dict: Dict[str, _PerfBenchmarkRingReader] = {}
+        self.dropped_record_count: int = 0
+
+    def _refresh_readers(self):
+        try:
+            file_name_list = os.listdir(self.ring_dir)
+        except FileNotFoundError:
+            return
+        for file_name in file_name_list:
+            if not file_name.startswith(RING_FILE_PREFIX):
+                continue
+            file_path = os.path.join(self.ring_dir, file_name)
+            if file_path in self.file_path_to_reader_dict:
+                continue
+            # else not required: new ring
+            try:
+                with open(file_path, "rb") as ring_file:
+                    header_bytes = ring_file.read(ctypes.sizeof(PerfBenchmarkRingHeader))
+                if (len(header_bytes) < ctypes.sizeof(PerfBenchmarkRingHeader) or
+                        PerfBenchmarkRingHeader.from_buffer_copy(header_bytes).signature !=
+                        PERF_BENCHMARK_RING_SIGNATURE):
+                    # writer still initializing - picked up next drain
+                    continue
+                self.file_path_to_reader_dict[file_path] = _PerfBenchmarkRingReader(file_path)
+            except Exception as e:
+                logging.error(f"Failed to attach perf benchmark ring {file_path}: {e}")
+
+    @staticmethod
+    def _is_pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def drain(self, max_records_per_ring: int = DEFAULT_RING_CAPACITY) -> List[PerfBenchmarkTiming]:
+        self._refresh_readers()
+        timing_list: List[PerfBenchmarkTiming] = []
+        for file_path, reader in list(self.file_path_to_reader_dict.items()):
+            is_pid_alive = self._is_pid_alive(reader.pid)
+            dropped_count = reader.drain(timing_list, max_records_per_ring)
+            if dropped_count:
+                self.dropped_record_count += dropped_count
+                logging.warning(f"perf benchmark ring {file_path} overwrote {dropped_count} records before drain")
+            # else not required: no loss
+            if not is_pid_alive and reader.is_fully_drained():
+                reader.close()
+                del self.file_path_to_reader_dict[file_path]
+                try:
+                    os.remove(file_path)
+                except FileNotFoundError:
+                    pass
+                logging.info(f"removed perf benchmark ring of exited process: {file_path}")
+            # else not required: writer alive or records pending
+        return timing_list
+
+    def close(self):
+        for reader in self.file_path_to_reader_dict.values():
+            reader.close()
+        self.file_path_to_reader_dict.clear()
@@ -0,0 +1,129 @@
+# standard imports
+import asyncio
+import logging
+import os
+import weakref
+from functools import lru_cache
+from threading import Lock
+from typing import Any, List, Type
+
+# 3rd party imports
+import httpx
+import msgspec
+import requests
+from requests.adapters import HTTPAdapter
+
+# project imports
+from FluxPythonUtils.scripts.general_utility_functions import http_response_as_class_type, HTTPRequestType
+
+# max keep-alive connections per host (sync) / per event loop (async)
+web_client_pool_size: int = int(os.getenv("WEB_CLIENT_POOL_SIZE") or 64)
+# distinct host:port pools kept by sync session
+web_client_host_pool_count: int = int(os.getenv("WEB_CLIENT_HOST_POOL_COUNT") or 32)
+# default connect/read/write/pool timeout of async client calls - callers waiting on a hung server must not block
+# forever, per call timeout kwarg overrides it (e.g. large get-all reads)
+web_client_async_timeout_sec: float = float(os.getenv("WEB_CLIENT_ASYNC_TIMEOUT_SEC") or 10.0)
+
+
+class PooledRequests:
+    """
+    requests module look-alike (get/post/put/patch/delete) over one process wide keep-alive requests.Session -
+    module level requests.get opens and closes a tcp connection per call; session is re-created in forked child
+    processes so pooled sockets are never shared across processes
+    """
+
+    def __init__(self, pool_size: int, host_pool_count: int):
+        self.pool_size: int = pool_size
+        self.host_pool_count: int = host_pool_count
+        self.session: requests.Session | None = None
+        self.session_pid: int | None = None
+        self.session_lock: Lock = Lock()
+
+    def get_session(self) -> requests.Session:
+        if self.session_pid != os.getpid():
+            with self.session_lock:
+                if self.session_pid != os.getpid():
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.host_pool_count, pool_maxsize=self.pool_size)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self.session = session
+                    self.session_pid = os.getpid()
+                # else not required: created by other thread meanwhile
+        # else not required: session of this process exists
+        return self.session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.get_session().request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+
+pooled_requests: PooledRequests = PooledRequests(web_client_pool_size, web_client_host_pool_count)
+
+# httpx.AsyncClient connections are bound to the event loop that opened them - one client per loop
+_loop_to_async_client_dict: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary())
+_async_client_lock: Lock = Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """keep-alive httpx.AsyncClient of running event loop, created on first use"""
+    loop = asyncio.get_running_loop()
+    with _async_client_lock:
+        async_client = _loop_to_async_client_dict.get(loop)
+        if async_client is None:
+            async_client = httpx.AsyncClient(
+                timeout=web_client_async_timeout_sec,
+                limits=httpx.Limits(max_connections=web_client_pool_size,
+                                    max_keepalive_connections=web_client_pool_size))
+            _loop_to_async_client_dict[loop] = async_client
+        # else not required: reusing loop's client
+    return async_client
+
+
+async def close_async_client():
+    """closes keep-alive connections of running event loop's client - call before loop shutdown"""
+    with _async_client_lock:
+        async_client = _loop_to_async_client_dict.pop(asyncio.get_running_loop(), None)
+    if async_client is not None:
+        await async_client.aclose()
+    # else not required: no client used on this loop
+
+
+@lru_cache(maxsize=None)
+def get_model_decoder(model_type: Type[msgspec.Struct], is_list: bool) -> msgspec.json.Decoder:
+    decode_type = List[model_type] if is_list else model_type
+    return msgspec.json.Decoder(decode_type, dec_hook=getattr(model_type, "dec_hook", None))
+
+
+def http_response_as_model_type(url: str, response: requests.Response | httpx.Response, expected_status_code: int,
+                                model_type: Type, http_request_type: HTTPRequestType) -> Any:
+    """
+    http_response_as_class_type with success response bytes decoded straight into model_type (or list of it) by
+    cached msgspec decoder - no orjson dict intermediate and per obj from_dict; error status, non model payload
+    (e.g. bool ack of return_obj_copy=False) and non msgspec models are left to http_response_as_class_type
+    """
+    if response.status_code == expected_status_code and isinstance(model_type, type) and issubclass(
+            model_type, msgspec.Struct):
+        content: bytes = response.content
+        is_list = content[:64].lstrip()[:1] == b"["
+        try:
+            return get_model_decoder(model_type, is_list).decode(content)
+        except (msgspec.ValidationError, msgspec.DecodeError) as e:
+            logging.debug(f"direct decode of {url} response as {model_type.__name__} failed, falling back;;; {e}")
+    # else not required: error / non msgspec response handled below
+    return http_response_as_class_type(url, response, expected_status_code, model_type, http_request_type)
@@ -1,6 +1,9 @@
 # standard imports
+import json
+import logging
+import os
 import time
-from typing import Type, List, Dict, Any
+from typing import Type, List, Dict, Any, Set
 import pandas
 import asyncio
 
@@ -8,7 +11,8 @@ import asyncio
 from fastapi.encoders import jsonable_encoder
 # project imports
 from Flux.PyCodeGenEngine.FluxCodeGenCore.base_aggregate import get_raw_perf_data_callable_names_pipeline, \
-    get_raw_performance_data_from_callable_name_agg_pipeline
+    get_raw_performance_data_from_callable_name_agg_pipeline, get_raw_performance_data_after_id_agg_pipeline
+from Flux.PyCodeGenEngine.FluxCodeGenCore.streaming_perf_stats import CallablePerfStats
 from FluxPythonUtils.scripts.general_utility_functions import (read_mongo_collection_as_dataframe,
                                                                execute_tasks_list_with_all_completed)
 from FluxPythonUtils.scripts.model_base_utils import MsgspecBaseModel
@@ -23,12 +27,15 @@ class MongoConnectionReqs(MsgspecBaseModel):
     password: str | None = None
 
 
+PERCENTILE_LIST: List[float] = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+
+
 class RawPerformanceDataProcessor:
 
     def __init__(self, web_client_object,
                  processed_performance_analysis_model_type: Type[MsgspecBaseModel],
                  mongo_connection_reqs: MongoConnectionReqs,
-                 config_yaml_dict: Dict):
+                 config_yaml_dict: Dict, state_file_path: str | None = None):
         self.web_client_object = web_client_object
         self.processed_performance_analysis_model_type: Type[MsgspecBaseModel] = processed_performance_analysis_model_type
         self.mongo_connection_reqs: MongoConnectionReqs = mongo_connection_reqs
@@ -41,6 +48,18 @@ class RawPerformanceDataProcessor:
         if self.wait_time is None:
             self.wait_time = 2  # default
 
+        # incremental mode: per callable running moments + quantile sketch fed only by rows after watermark
+        self.incremental_mode: bool = bool(config_yaml_dict.get("raw_performance_data_processor_incremental_mode"))
+        self.incremental_fetch_limit: int = (
+            config_yaml_dict.get("raw_performance_data_processor_incremental_fetch_limit") or 50_000)
+        self.state_file_path: str | None = state_file_path
+        self.last_processed_id: int = 0
+        self.callable_name_to_perf_stats_dict: Dict[str, CallablePerfStats] = {}
+        self.unpublished_callable_name_set: Set[str] = set()
+        if self.incremental_mode:
+            self.load_incremental_state()
+        # else not required: full rescan mode keeps no state
+
     def get_callable_names_list(self) -> pandas.DataFrame:
         return read_mongo_collection_as_dataframe(self.mongo_connection_reqs.db,
                                                   self.mongo_connection_reqs.collection,
@@ -69,8 +88,12 @@ class RawPerformanceDataProcessor:
         avg_val = raw_perf_data_delta_series.mean().round(6)
         std_dev = raw_perf_data_delta_series.std(ddof=0).round(6)   # use ddof to return 0 if std_dev is not calculable
         percentiles: pandas.Series = (
-            raw_perf_data_delta_series.quantile([0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]).round(6))
+            raw_perf_data_delta_series.quantile(PERCENTILE_LIST).round(6))
 
+        self.publish_processed_performance_analysis(callable_name, min_val, max_val, avg_val, std_dev, percentiles)
+
+    def publish_processed_performance_analysis(self, callable_name: str, min_val: float, max_val: float,
+                                               avg_val: float, std_dev: float, percentiles) -> None:
         processed_perf_analysis = self.processed_performance_analysis_model_type(callable_name=callable_name,
                                                                                  min=min_val, max=max_val,
                                                                                  avg=avg_val, std_dev=std_dev,
@@ -110,5 +133,100 @@ class RawPerformanceDataProcessor:
 
             time.sleep(self.wait_time)
 
+    def load_incremental_state(self):
+        if self.state_file_path is None or not os.path.exists(self.state_file_path):
+            logging.info(f"no raw performance data processor state found at {self.state_file_path}, "
+                         f"consuming raw performance data from start")
+            return
+        # else not required: resuming from persisted watermark
+        with open(self.state_file_path) as state_file:
+            state_dict = json.load(state_file)
+        self.last_processed_id = state_dict["last_processed_id"]
+        self.callable_name_to_perf_stats_dict = {
+            callable_name: CallablePerfStats.from_dict(stats_dict)
+            for callable_name, stats_dict in state_dict["callable_name_to_perf_stats_dict"].items()}
+        # republished once so processed_performance_analysis matches loaded state
+        self.unpublished_callable_name_set.update(self.callable_name_to_perf_stats_dict)
+        logging.info(f"loaded raw performance data processor state: {self.last_processed_id=}, "
+                     f"callables: {len(self.callable_name_to_perf_stats_dict)}")
+
+    def persist_incremental_state(self):
+        if self.state_file_path is None:
+            return
+        # else not required: persisting so restart resumes from watermark instead of rescanning history
+        state_dict = {
+            "last_processed_id": self.last_processed_id,
+            "callable_name_to_perf_stats_dict": {
+                callable_name: perf_stats.to_dict()
+                for callable_name, perf_stats in self.callable_name_to_perf_stats_dict.items()}
+        }
+        temp_state_file_path = f"{self.state_file_path}.tmp"
+        with open(temp_state_file_path, "w") as state_file:
+            json.dump(state_dict, state_file)
+        os.replace(temp_state_file_path, self.state_file_path)
+
+    def consume_new_raw_performance_data(self) -> int:
+        """
+        folds raw performance data rows after last_processed_id into per callable stats, returns rows consumed.
+        Relies on server populated ids growing with insert order
+        """
+        consumed_row_count = 0
+        while True:
+            new_raw_perf_data_df: pandas.DataFrame = (
+                read_mongo_collection_as_dataframe(self.mongo_connection_reqs.db,
+                                                   self.mongo_connection_reqs.collection,
+                                                   get_raw_performance_data_after_id_agg_pipeline(
+                                                       self.last_processed_id,
+                                                       self.incremental_fetch_limit).get("agg"),
+                                                   self.mongo_connection_reqs.host,
+                                                   self.mongo_connection_reqs.port,
+                                                   self.mongo_connection_reqs.username,
+                                                   self.mongo_connection_reqs.password,
+                                                   no_id=False))
+            if new_raw_perf_data_df.empty:
+                break
+            # else not required: new rows to fold in
+
+            for callable_name, delta_series in new_raw_perf_data_df.groupby("callable_name")["delta"]:
+                perf_stats = self.callable_name_to_perf_stats_dict.get(callable_name)
+                if perf_stats is None:
+                    perf_stats = CallablePerfStats()
+                    self.callable_name_to_perf_stats_dict[callable_name] = perf_stats
+                # else not required: existing callable
+                perf_stats.add_values(delta_series.tolist())
+                self.unpublished_callable_name_set.add(callable_name)
+            self.last_processed_id = int(new_raw_perf_data_df["_id"].max())
+            consumed_row_count += len(new_raw_perf_data_df)
+            if len(new_raw_perf_data_df) < self.incremental_fetch_limit:
+                break
+            # else not required: more rows pending - fetching next batch
+        return consumed_row_count
+
+    def publish_callable_perf_stats(self, callable_name: str) -> None:
+        perf_stats = self.callable_name_to_perf_stats_dict[callable_name]
+        moments = perf_stats.moments
+        quantile_to_value_dict = perf_stats.sketch.get_quantiles(PERCENTILE_LIST)
+        percentiles = {quantile: round(value, 6) for quantile, value in quantile_to_value_dict.items()}
+        self.publish_processed_performance_analysis(callable_name, round(moments.min, 6), round(moments.max, 6),
+                                                    round(moments.mean, 6), round(moments.std_dev, 6), percentiles)
+
+    async def handle_incremental_processed_performance_analysis(self):
+        while True:
+            try:
+                if self.consume_new_raw_performance_data():
+                    # persisted before publish - a restart never double counts consumed rows
+                    self.persist_incremental_state()
+                # else not required: no new rows
+                for callable_name in list(self.unpublished_callable_name_set):
+                    self.publish_callable_perf_stats(callable_name)
+                    self.unpublished_callable_name_set.discard(callable_name)
+            except Exception as e:
+                logging.exception(f"handle_incremental_processed_performance_analysis failed, retrying after "
+                                  f"{self.wait_time} secs;;; exception: {e}")
+            time.sleep(self.wait_time)
+
     def run(self):
-        asyncio.run(self.handle_create_update_processed_performance_analysis())
+        if self.incremental_mode:
+            asyncio.run(self.handle_incremental_processed_performance_analysis())
+        else:
+            asyncio.run(self.handle_create_update_processed_performance_analysis())
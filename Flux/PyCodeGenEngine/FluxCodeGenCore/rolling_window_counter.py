@@ -0,0 +1,176 @@
+# standard imports
+import time
+from bisect import bisect_left
+from typing import Dict, List, Any, Hashable, Iterable
+
+
+class _KeyBuckets:
+    # time ordered buckets of one key + running sum of each queried window (window_ms -> [sum, first bucket index])
+    __slots__ = ("tick_list", "value_list", "window_ms_to_sum_n_left_index_dict")
+
+    def __init__(self):
+        self.tick_list: List[int] = []
+        self.value_list: List[float] = []
+        self.window_ms_to_sum_n_left_index_dict: Dict[int, List] = {}
+
+
+class RollingWindowCounter:
+    """
+    in memory replacement of "$match ts >= $$NOW - n sec" + "$setWindowFields $sum/$count" pipelines: values are
+    added per key to time buckets of bucket_ms width, every distinct queried window keeps a running sum and index of
+    its oldest in-window bucket - query only subtracts buckets that slid out since last query, so repeated queries of
+    same last_n_sec are amortized O(1) instead of a collection scan.
+    Values added to an old bucket (e.g. amend qty delta of an earlier chore) are applied to every window still
+    containing it, hence window sum always equals sum over events with ts >= now - n, same as pipeline.
+    Buckets older than retention_secs are dropped - covers() tells if a window is fully within retained history
+    (also not older than history_start_ms, the point from where feeding/db rebuild started), callers must fall back
+    to pipeline otherwise.
+    Not thread safe - feed and query from same event loop
+    """
+
+    def __init__(self, retention_secs: int, history_start_ms: int | None = None, bucket_ms: int = 1):
+        self.retention_ms: int = int(retention_secs * 1000)
+        self.bucket_ms: int = bucket_ms
+        self.history_start_ms: int = (history_start_ms if history_start_ms is not None else
+                                      self.get_now_ms() - self.retention_ms)
+        self.key_to_buckets_dict: Dict[Hashable, _KeyBuckets] = {}
+
+    @staticmethod
+    def get_now_ms() -> int:
+        return int(time.time() * 1000)
+
+    @staticmethod
+    def get_epoch_ms(date_time: Any) -> int:
+        # pendulum/datetime or already epoch ms int
+        if isinstance(date_time, int):
+            return date_time
+        return int(date_time.timestamp() * 1000)
+
+    def covers(self, last_n_sec: float, now_ms: int | None = None) -> bool:
+        window_ms = int(last_n_sec * 1000)
+        if window_ms > self.retention_ms:
+            return False
+        # else not required: window within retention
+        now_ms = now_ms if now_ms is not None else self.get_now_ms()
+        return now_ms - window_ms >= self.history_start_ms
+
+    def add(self, key: Hashable, event_ms: int, value: float = 1):
+        key_buckets = self.key_to_buckets_dict.get(key)
+        if key_buckets is None:
+            key_buckets = _KeyBuckets()
+            self.key_to_buckets_dict[key] = key_buckets
+        # else not required: key already tracked
+        tick_list = key_buckets.tick_list
+        tick = event_ms // self.bucket_ms
+        if tick_list and tick == tick_list[-1]:
+            bucket_index = len(tick_list) - 1
+            key_buckets.value_list[-1] += value
+        elif not tick_list or tick > tick_list[-1]:
+            bucket_index = len(tick_list)
+            tick_list.append(tick)
+            key_buckets.value_list.append(value)
+        else:
+            # out of order event - rare (amends, late feeds)
+            bucket_index = bisect_left(tick_list, tick)
+            if tick_list[bucket_index] == tick:
+                key_buckets.value_list[bucket_index] += value
+            else:
+                tick_list.insert(bucket_index, tick)
+                key_buckets.value_list.insert(bucket_index, value)
+                for sum_n_left_index in key_buckets.window_ms_to_sum_n_left_index_dict.values():
+                    if sum_n_left_index[1] > bucket_index:
+                        sum_n_left_index[1] += 1
+                    # else not required: new bucket is at/after window start - added to window sum below
+        for sum_n_left_index in key_buckets.window_ms_to_sum_n_left_index_dict.values():
+            # bucket left of window start is already out of window - time only moves forward so it stays out
+            if bucket_index >= sum_n_left_index[1]:
+                sum_n_left_index[0] += value
+            # else not required: bucket already slid out of this window
+
+    def _slide(self, key_buckets: _KeyBuckets, now_ms: int):
+        tick_list = key_buckets.tick_list
+        value_list = key_buckets.value_list
+        for window_ms, sum_n_left_index in key_buckets.window_ms_to_sum_n_left_index_dict.items():
+            boundary_tick = (now_ms - window_ms) // self.bucket_ms
+            left_index = sum_n_left_index[1]
+            while left_index < len(tick_list) and tick_list[left_index] < boundary_tick:
+                sum_n_left_index[0] -= value_list[left_index]
+                left_index += 1
+            sum_n_left_index[1] = left_index
+
+        # dropping buckets out of retention once enough piled up - amortizes list shift cost
+        drop_count = bisect_left(tick_list, (now_ms - self.retention_ms) // self.bucket_ms)
+        if drop_count and (drop_count >= 1024 or drop_count * 2 >= len(tick_list)):
+            del tick_list[:drop_count]
+            del value_list[:drop_count]
+            for sum_n_left_index in key_buckets.window_ms_to_sum_n_left_index_dict.values():
+                sum_n_left_index[1] = max(sum_n_left_index[1] - drop_count, 0)
+        # else not required: keeping few stale buckets till next slide
+
+    def get_window_sum(self, key: Hashable, last_n_sec: float, now_ms: int | None = None) -> float:
+        key_buckets = self.key_to_buckets_dict.get(key)
+        if key_buckets is None:
+            return 0
+        # else not required: key has buckets
+        now_ms = now_ms if now_ms is not None else self.get_now_ms()
+        window_ms = int(last_n_sec * 1000)
+        sum_n_left_index = key_buckets.window_ms_to_sum_n_left_index_dict.get(window_ms)
+        if sum_n_left_index is None:
+            # first query of this window - one time scan, incremental afterwards
+            left_index = bisect_left(key_buckets.tick_list, (now_ms - window_ms) // self.bucket_ms)
+            sum_n_left_index = [sum(key_buckets.value_list[left_index:]), left_index]
+            key_buckets.window_ms_to_sum_n_left_index_dict[window_ms] = sum_n_left_index
+        # else not required: window already tracked - slide below brings it to now
+        self._slide(key_buckets, now_ms)
+        return sum_n_left_index[0]
+
+    def get_multi_key_window_sum(self, key_iter: Iterable[Hashable], last_n_sec: float,
+                                 now_ms: int | None = None) -> float:
+        now_ms = now_ms if now_ms is not None else self.get_now_ms()
+        return sum(self.get_window_sum(key, last_n_sec, now_ms) for key in key_iter)
+
+
+class RollingWindowSumTracker:
+    """
+    RollingWindowCounter over objs whose summed value changes after creation (e.g. chore_snapshot qty on amends):
+    remembers last seen (key, create ms, value) per obj id so updates add only their delta to obj's create time
+    bucket, and objs loaded from db at startup that were already seen through live feed are not counted twice
+    """
+
+    def __init__(self, retention_secs: int, history_start_ms: int | None = None):
+        self.counter: RollingWindowCounter = RollingWindowCounter(retention_secs, history_start_ms)
+        self.obj_id_to_key_ms_n_value_dict: Dict[Any, List] = {}
+        self.next_expiry_check_ms: int = self.counter.get_now_ms() + self.counter.retention_ms
+
+    def track(self, obj_id: Any, key: Hashable, create_ms: int, value: float):
+        key_ms_n_value = self.obj_id_to_key_ms_n_value_dict.get(obj_id)
+        if key_ms_n_value is None:
+            now_ms = self.counter.get_now_ms()
+            if create_ms < max(self.counter.history_start_ms, now_ms - self.counter.retention_ms):
+                # older than tracked history (or dropped as expired) - no covered window can contain it
+                return
+            # else not required: obj within tracked history
+            if now_ms >= self.next_expiry_check_ms:
+                self.drop_expired_objs(now_ms)
+            # else not required: expiry checked recently
+            self.obj_id_to_key_ms_n_value_dict[obj_id] = [key, create_ms, value]
+            self.counter.add(key, create_ms, value)
+        elif value != key_ms_n_value[2]:
+            self.counter.add(key_ms_n_value[0], key_ms_n_value[1], value - key_ms_n_value[2])
+            key_ms_n_value[2] = value
+        # else not required: summed value unchanged
+
+    def track_if_unseen(self, obj_id: Any, key: Hashable, create_ms: int, value: float):
+        # db rebuild path - live feed already has latest value of seen objs
+        if obj_id not in self.obj_id_to_key_ms_n_value_dict:
+            self.track(obj_id, key, create_ms, value)
+        # else not required: obj seen via live feed
+
+    def drop_expired_objs(self, now_ms: int | None = None):
+        now_ms = now_ms if now_ms is not None else self.counter.get_now_ms()
+        expiry_ms = now_ms - self.counter.retention_ms
+        expired_obj_id_list = [obj_id for obj_id, key_ms_n_value in self.obj_id_to_key_ms_n_value_dict.items()
+                               if key_ms_n_value[1] < expiry_ms]
+        for obj_id in expired_obj_id_list:
+            del self.obj_id_to_key_ms_n_value_dict[obj_id]
+        self.next_expiry_check_ms = now_ms + self.counter.retention_ms // 2
@@ -0,0 +1,192 @@
+# standard imports
+import math
+from typing import Dict, Any, Iterable, Final
+
+DEFAULT_SKETCH_RELATIVE_ACCURACY: Final[float] = 0.01
+DEFAULT_SKETCH_MAX_BUCKET_COUNT: Final[int] = 2048
+# deltas at or below this are counted as zero - timings are in secs, far below timer resolution
+MIN_INDEXABLE_VALUE: Final[float] = 1e-9
+
+
+class RunningMoments:
+    """
+    count, min, max, mean and M2 (sum of squared diffs from mean) kept incrementally - batches are merged with
+    Chan's parallel formula so adding n values is O(n) and merging two moments is O(1)
+    """
+
+    def __init__(self):
+        self.count: int = 0
+        self.mean: float = 0.0
+        self.m2: float = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def merge(self, other: "RunningMoments"):
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2, self.min, self.max = (
+                other.count, other.mean, other.m2, other.min, other.max)
+            return
+        # else not required: both sides have values
+        total_count = self.count + other.count
+        mean_delta = other.mean - self.mean
+        self.mean += mean_delta * other.count / total_count
+        self.m2 += other.m2 + mean_delta * mean_delta * self.count * other.count / total_count
+        self.count = total_count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def add_values(self, values: Iterable[float]):
+        batch_moments = RunningMoments()
+        for value in values:
+            # Welford within batch
+            batch_moments.count += 1
+            value_delta = value - batch_moments.mean
+            batch_moments.mean += value_delta / batch_moments.count
+            batch_moments.m2 += value_delta * (value - batch_moments.mean)
+            if batch_moments.min is None or value < batch_moments.min:
+                batch_moments.min = value
+            if batch_moments.max is None or value > batch_moments.max:
+                batch_moments.max = value
+        self.merge(batch_moments)
+
+    @property
+    def std_dev(self) -> float:
+        # population std dev (ddof=0) - same as full rescan computed
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, moments_dict: Dict[str, Any]) -> "RunningMoments":
+        running_moments = cls()
+        running_moments.count = moments_dict["count"]
+        running_moments.mean = moments_dict["mean"]
+        running_moments.m2 = moments_dict["m2"]
+        running_moments.min = moments_dict["min"]
+        running_moments.max = moments_dict["max"]
+        return running_moments
+
+
+class DDSketch:
+    """
+    mergeable quantile sketch with relative accuracy guarantee (DDSketch): positive values go to log spaced
+    buckets of ratio gamma=(1+a)/(1-a), any quantile is answered within relative error a of an actual value.
+    Bucket count is bounded by collapsing lowest buckets, which only loses accuracy on the lowest quantiles
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_SKETCH_RELATIVE_ACCURACY,
+                 max_bucket_count: int = DEFAULT_SKETCH_MAX_BUCKET_COUNT):
+        self.relative_accuracy: float = relative_accuracy
+        self.max_bucket_count: int = max_bucket_count
+        self.gamma: float = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma: float = math.log(self.gamma)
+        self.zero_count: int = 0
+        self.bucket_index_to_count_dict: Dict[int, int] = {}
+        self.count: int = 0
+
+    def _get_bucket_value(self, bucket_index: int) -> float:
+        # value in middle of bucket (relative error wise) - within relative_accuracy of any value in bucket
+        return 2 * self.gamma ** bucket_index / (self.gamma + 1)
+
+    def _collapse_lowest_buckets(self):
+        sorted_bucket_indexes = sorted(self.bucket_index_to_count_dict)
+        collapse_count = len(sorted_bucket_indexes) - self.max_bucket_count
+        target_bucket_index = sorted_bucket_indexes[collapse_count]
+        for bucket_index in sorted_bucket_indexes[:collapse_count]:
+            self.bucket_index_to_count_dict[target_bucket_index] += self.bucket_index_to_count_dict.pop(bucket_index)
+
+    def add_values(self, values: Iterable[float]):
+        bucket_index_to_count_dict = self.bucket_index_to_count_dict
+        for value in values:
+            if value <= MIN_INDEXABLE_VALUE:
+                self.zero_count += 1
+            else:
+                bucket_index = math.ceil(math.log(value) / self.log_gamma)
+                bucket_index_to_count_dict[bucket_index] = bucket_index_to_count_dict.get(bucket_index, 0) + 1
+            self.count += 1
+        if len(bucket_index_to_count_dict) > self.max_bucket_count:
+            self._collapse_lowest_buckets()
+        # else not required: within bucket limit
+
+    def merge(self, other: "DDSketch"):
+        if not math.isclose(self.gamma, other.gamma):
+            raise Exception(f"can't merge DDSketch of relative_accuracy {other.relative_accuracy} into "
+                            f"{self.relative_accuracy}")
+        # else not required: compatible bucket boundaries
+        for bucket_index, bucket_count in other.bucket_index_to_count_dict.items():
+            self.bucket_index_to_count_dict[bucket_index] = (
+                self.bucket_index_to_count_dict.get(bucket_index, 0) + bucket_count)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if len(self.bucket_index_to_count_dict) > self.max_bucket_count:
+            self._collapse_lowest_buckets()
+        # else not required: within bucket limit
+
+    def get_quantiles(self, quantile_list: Iterable[float]) -> Dict[float, float | None]:
+        """
+        quantile to value dict - ranks follow pandas' default (q * (count - 1)) so values line up with full rescan
+        quantiles within sketch's relative accuracy, single walk over sorted buckets for all requested quantiles
+        """
+        sorted_quantile_list = sorted(quantile_list)
+        if not self.count:
+            return {quantile: None for quantile in sorted_quantile_list}
+        # else not required: sketch has values
+
+        quantile_to_value_dict: Dict[float, float | None] = {}
+        bucket_iter = iter(sorted(self.bucket_index_to_count_dict.items()))
+        cumulative_count = self.zero_count
+        bucket_value = 0.0
+        for quantile in sorted_quantile_list:
+            rank = quantile * (self.count - 1)
+            while cumulative_count <= rank:
+                bucket_index, bucket_count = next(bucket_iter)
+                cumulative_count += bucket_count
+                bucket_value = self._get_bucket_value(bucket_index)
+            quantile_to_value_dict[quantile] = bucket_value
+        return quantile_to_value_dict
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"relative_accuracy": self.relative_accuracy, "max_bucket_count": self.max_bucket_count,
+                "zero_count": self.zero_count, "count": self.count,
+                # json object keys must be str
+                "bucket_index_to_count_dict": {str(bucket_index): bucket_count for bucket_index, bucket_count in
+                                               self.bucket_index_to_count_dict.items()}}
+
+    @classmethod
+    def from_dict(cls, sketch_dict: Dict[str, Any]) -> "DDSketch":
+        sketch = cls(sketch_dict["relative_accuracy"], sketch_dict["max_bucket_count"])
+        sketch.zero_count = sketch_dict["zero_count"]
+        sketch.count = sketch_dict["count"]
+        sketch.bucket_index_to_count_dict = {int(bucket_index): bucket_count for bucket_index, bucket_count in
+                                             sketch_dict["bucket_index_to_count_dict"].items()}
+        return sketch
+
+
+class CallablePerfStats:
+    # running moments and quantile sketch of one callable's timing deltas
+
+    def __init__(self, relative_accuracy: float = DEFAULT_SKETCH_RELATIVE_ACCURACY):
+        self.moments: RunningMoments = RunningMoments()
+        self.sketch: DDSketch = DDSketch(relative_accuracy)
+
+    def add_values(self, values: Iterable[float]):
+        values = list(values)
+        self.moments.add_values(values)
+        self.sketch.add_values(values)
+
+    def merge(self, other: "CallablePerfStats"):
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"moments": self.moments.to_dict(), "sketch": self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, stats_dict: Dict[str, Any]) -> "CallablePerfStats":
+        callable_perf_stats = cls()
+        callable_perf_stats.moments = RunningMoments.from_dict(stats_dict["moments"])
+        callable_perf_stats.sketch = DDSketch.from_dict(stats_dict["sketch"])
+        return callable_perf_stats
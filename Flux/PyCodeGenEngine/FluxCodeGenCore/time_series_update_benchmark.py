@@ -0,0 +1,149 @@
+# TimeSeriesUpdateBenchmark.py
+# write amplification of time-series updates: intraday bars (--symbol_count symbols, --bar_count 1 min bars each,
+# every open bar patched --patch_count times before it closes) through TimeSeriesUpdateEngine with delete_reinsert
+# (former behaviour), in_place and latest_row_buffer strategies - against in-memory stand-in collections counting
+# db round trips and docs written per collection (each time-series doc write is a bucket rewrite); reads check that
+# buffered rows are merged transparently
+
+import argparse
+import asyncio
+import datetime
+import logging
+from typing import Any, Dict, List
+
+from pymongo import DeleteOne, ReplaceOne, UpdateMany
+
+from Flux.PyCodeGenEngine.FluxCodeGenCore.time_series_update_engine import (
+    TimeSeriesUpdateEngine, DELETE_REINSERT, IN_PLACE, LATEST_ROW_BUFFER)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class StandInCursor:
+    def __init__(self, doc_list: List[Dict[str, Any]]):
+        self.doc_list = doc_list
+
+    async def to_list(self, length: int | None):
+        return self.doc_list
+
+
+class StandInCollection:
+    """motor collection look-alike for ops used by TimeSeriesUpdateEngine - counts round trips and written docs"""
+
+    def __init__(self, name: str, database: "StandInDatabase"):
+        self.name = name
+        self.database = database
+        self.id_to_doc_dict: Dict[Any, Dict[str, Any]] = {}
+        self.round_trip_count: int = 0
+        self.doc_write_count: int = 0
+
+    @staticmethod
+    def _is_match(doc: Dict[str, Any], doc_filter: Dict[str, Any]) -> bool:
+        for key, cond in doc_filter.items():
+            val = doc.get(key)
+            if isinstance(cond, dict):
+                if "$in" in cond and val not in cond["$in"]:
+                    return False
+                if "$lte" in cond and not val <= cond["$lte"]:
+                    return False
+            elif val != cond:
+                return False
+        return True
+
+    def find(self, doc_filter: Dict[str, Any] | None = None, projection: Dict | None = None) -> StandInCursor:
+        self.round_trip_count += 1
+        return StandInCursor([dict(doc) for doc in self.id_to_doc_dict.values()
+                              if self._is_match(doc, doc_filter or {})])
+
+    async def find_one(self, doc_filter: Dict[str, Any] | None = None, projection: Dict | None = None):
+        self.round_trip_count += 1
+        for doc in self.id_to_doc_dict.values():
+            if self._is_match(doc, doc_filter or {}):
+                return dict(doc)
+        return None
+
+    async def insert_many(self, doc_list: List[Dict[str, Any]]):
+        self.round_trip_count += 1
+        for doc in doc_list:
+            self.id_to_doc_dict[doc["_id"]] = dict(doc)
+        self.doc_write_count += len(doc_list)
+
+    async def delete_many(self, doc_filter: Dict[str, Any]):
+        self.round_trip_count += 1
+        for doc in [doc for doc in self.id_to_doc_dict.values() if self._is_match(doc, doc_filter)]:
+            del self.id_to_doc_dict[doc["_id"]]
+            self.doc_write_count += 1
+
+    async def bulk_write(self, request_list: List[Any], ordered: bool = True):
+        self.round_trip_count += 1
+        for request in request_list:
+            doc = self.id_to_doc_dict.get(request._filter["_id"])
+            if isinstance(request, UpdateMany):
+                if doc is not None:
+                    doc.update(request._doc["$set"])
+                    self.doc_write_count += 1
+            elif isinstance(request, ReplaceOne):
+                self.id_to_doc_dict[request._filter["_id"]] = dict(request._doc)
+                self.doc_write_count += 1
+            elif isinstance(request, DeleteOne):
+                if doc is not None and self._is_match(doc, request._filter):
+                    del self.id_to_doc_dict[doc["_id"]]
+                    self.doc_write_count += 1
+
+
+class StandInDatabase:
+    def __init__(self):
+        self.name_to_collection_dict: Dict[str, StandInCollection] = {}
+
+    def __getitem__(self, name: str) -> StandInCollection:
+        if name not in self.name_to_collection_dict:
+            self.name_to_collection_dict[name] = StandInCollection(name, self)
+        return self.name_to_collection_dict[name]
+
+
+async def run_strategy(strategy: str, symbol_count: int, bar_count: int, patch_count: int) -> None:
+    database = StandInDatabase()
+    collection = database["BarData"]
+    engine = TimeSeriesUpdateEngine(collection, "bar_time", strategy=strategy)
+    base_time = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=bar_count + 1)
+    next_id = 1
+    for bar_index in range(bar_count):
+        bar_time = base_time + datetime.timedelta(minutes=bar_index)
+        bar_list = []
+        for symbol_index in range(symbol_count):
+            bar_list.append({"_id": next_id, "bar_time": bar_time, "symbol": f"SYM_{symbol_index}",
+                             "close": 100.0, "volume": 0})
+            next_id += 1
+        await collection.insert_many(bar_list)  # create is same for all strategies
+        for patch_index in range(patch_count):
+            for bar in bar_list:
+                bar["close"] += 0.01
+                bar["volume"] += 100
+            await engine.update([bar["_id"] for bar in bar_list], [dict(bar) for bar in bar_list])
+        # simulated clock - bars before the open one are final
+        engine.row_final_secs = int((datetime.datetime.now(datetime.timezone.utc) - bar_time).total_seconds()) + 1
+        await engine.compact_final_rows()
+
+    # transparent read: buffered (still open) bars overlaid on time-series rows
+    read_list = await engine.overlay_latest_rows(await collection.find().to_list(None))
+    assert all(bar["volume"] == 100 * patch_count for bar in read_list), "stale bar read"
+    side_collection = engine.latest_row_collection_obj
+    update_count = symbol_count * bar_count * patch_count
+    logging.info(f"{strategy}: {update_count} updates -> time-series docs written {collection.doc_write_count:,} "
+                 f"({collection.doc_write_count / update_count:.2f} per update, creates included), side docs written "
+                 f"{side_collection.doc_write_count:,}, round trips {collection.round_trip_count + side_collection.round_trip_count:,}, "
+                 f"{len(side_collection.id_to_doc_dict)} rows still buffered")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="time-series update write amplification benchmark")
+    parser.add_argument("--symbol_count", type=int, default=100)
+    parser.add_argument("--bar_count", type=int, default=60, help="1 min bars per symbol")
+    parser.add_argument("--patch_count", type=int, default=30, help="patches of each bar while it is open")
+    args = parser.parse_args()
+    for strategy in (DELETE_REINSERT, IN_PLACE, LATEST_ROW_BUFFER):
+        asyncio.run(run_strategy(strategy, args.symbol_count, args.bar_count, args.patch_count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# standard imports
+import asyncio
+import datetime
+import logging
+import os
+from copy import deepcopy
+from typing import List, Dict, Any, Final
+
+# 3rd party imports
+import motor.motor_asyncio
+import pymongo.errors
+import pymongo.results
+from pymongo import DeleteOne, ReplaceOne, UpdateMany
+
+# project imports
+from FluxPythonUtils.scripts.general_utility_functions import parse_to_int
+
+# auto: in_place if model's declared MongoVersion >= 7.0 else latest_row_buffer | in_place | latest_row_buffer |
+# delete_reinsert
+time_series_update_strategy: str = os.getenv("TIME_SERIES_UPDATE_STRATEGY") or "auto"
+# buffered row is final (compacted into time-series collection) once its time field is this old
+time_series_row_final_secs: int = parse_to_int(os.getenv("TIME_SERIES_ROW_FINAL_SECS") or 60)
+# how often final buffered rows are compacted
+time_series_compaction_interval_secs: float = float(os.getenv("TIME_SERIES_COMPACTION_INTERVAL_SECS") or 5.0)
+
+IN_PLACE: Final[str] = "in_place"
+LATEST_ROW_BUFFER: Final[str] = "latest_row_buffer"
+DELETE_REINSERT: Final[str] = "delete_reinsert"
+LATEST_ROW_COLLECTION_SUFFIX: Final[str] = "LatestRow"
+# first mongo version allowing arbitrary (non meta-only) update queries on time-series collections
+IN_PLACE_MIN_MONGO_VERSION: Final[tuple] = (7, 0)
+
+
+class TimeSeriesUpdateEngine:
+    """
+    put/patch of time-series model without delete-and-reinsert of every update: in_place applies bucket-aware
+    update_many by _id (mongo >= 7.0), latest_row_buffer upserts updated rows in regular <Model>LatestRow side
+    collection and compacts them into time-series collection (one delete+insert per row lifetime, batched) once
+    their time field is older than TIME_SERIES_ROW_FINAL_SECS. Reads overlay buffered rows on time-series rows -
+    get_latest_row_merged_agg_pipeline for aggregation reads, overlay_latest_rows for find reads. Row deletes go
+    through delete_rows, serialized with compaction so a row compacted meanwhile isn't re-inserted
+    """
+
+    def __init__(self, collection_obj: motor.motor_asyncio.AsyncIOMotorCollection, time_field: str | None,
+                 strategy: str = time_series_update_strategy, row_final_secs: int = time_series_row_final_secs,
+                 mongo_version: float | None = None):
+        self.collection_obj: motor.motor_asyncio.AsyncIOMotorCollection = collection_obj
+        self.latest_row_collection_obj: motor.motor_asyncio.AsyncIOMotorCollection = \
+            collection_obj.database[f"{collection_obj.name}{LATEST_ROW_COLLECTION_SUFFIX}"]
+        self.time_field: str | None = time_field
+        self.strategy: str = strategy
+        self.row_final_secs: int = row_final_secs
+        # MongoVersion declared in model's FluxMsgJsonRootTimeSeries option - decides auto strategy
+        self.mongo_version: float | None = mongo_version
+        self.strategy_resolved: bool = strategy != "auto"
+        self.compaction_task: asyncio.Task | None = None
+        # held by compaction and row deletes
+        self.compaction_lock: asyncio.Lock = asyncio.Lock()
+        # metrics
+        self.updated_row_count: int = 0
+        self.buffered_row_count: int = 0
+        self.compacted_row_count: int = 0
+
+    async def _resolve_strategy(self):
+        if not self.strategy_resolved:
+            # undeclared version - buffer works on every version
+            mongo_version = ((tuple(int(version_part) for version_part in str(self.mongo_version).split("."))
+                              + (0, 0))[:2] if self.mongo_version is not None else (0, 0))
+            self.strategy = IN_PLACE if mongo_version >= IN_PLACE_MIN_MONGO_VERSION else LATEST_ROW_BUFFER
+            self.strategy_resolved = True
+            logging.info(f"time-series updates of {self.collection_obj.name} use {self.strategy} strategy;;; "
+                         f"declared {self.mongo_version=}")
+            if self.strategy != LATEST_ROW_BUFFER:
+                # rows buffered by earlier run (e.g. before mongo upgrade) - reads won't look into buffer anymore
+                await self.compact_final_rows(force=True)
+            # else not required: buffer stays in use
+        # else not required: strategy already known
+
+    async def update(self, id_list: List[Any], updated_obj_dict_list: List[Dict[str, Any]]):
+        await self._resolve_strategy()
+        self.updated_row_count += len(updated_obj_dict_list)
+        if self.strategy == IN_PLACE:
+            try:
+                await self.collection_obj.bulk_write(
+                    [UpdateMany({"_id": obj_dict.get("_id")},
+                                {"$set": {key: val for key, val in obj_dict.items() if key != "_id"}})
+                     for obj_dict in updated_obj_dict_list], ordered=False)
+                return
+            except pymongo.errors.OperationFailure as e:
+                # e.g. server rejecting update of time field - buffering from now on
+                logging.error(f"in-place time-series update of {self.collection_obj.name} rejected, switching to "
+                              f"{LATEST_ROW_BUFFER} strategy;;; exception: {e}")
+                self.strategy = LATEST_ROW_BUFFER
+        # else not required: not in_place strategy
+
+        if self.strategy == LATEST_ROW_BUFFER:
+            await self.latest_row_collection_obj.bulk_write(
+                [ReplaceOne({"_id": obj_dict.get("_id")}, obj_dict, upsert=True)
+                 for obj_dict in updated_obj_dict_list], ordered=False)
+            self.buffered_row_count += len(updated_obj_dict_list)
+            self._start_compaction_task()
+        else:
+            # delete_reinsert: first deleting all update objects then creating new objects with updated values
+            await self.collection_obj.delete_many({"_id": {'$in': id_list}})
+            await self.collection_obj.insert_many(updated_obj_dict_list)
+
+    async def delete_rows(self, id_list: List[Any] | None = None) -> pymongo.results.DeleteResult:
+        """deletes time-series rows and their buffered latest rows (all if id_list is None)"""
+        id_filter = {} if id_list is None else {"_id": {'$in': id_list}}
+        async with self.compaction_lock:
+            delete_result = await self.collection_obj.delete_many(id_filter)
+            await self.latest_row_collection_obj.delete_many(id_filter)
+        return delete_result
+
+    def _start_compaction_task(self):
+        if self.compaction_task is None or self.compaction_task.done():
+            self.compaction_task = asyncio.get_running_loop().create_task(self._compaction_loop())
+        # else not required: compaction already running
+
+    async def _compaction_loop(self):
+        while True:
+            await asyncio.sleep(time_series_compaction_interval_secs)
+            try:
+                if not await self.compact_final_rows():
+                    if await self.latest_row_collection_obj.find_one({}, {"_id": 1}) is None:
+                        # nothing buffered - next buffered update restarts compaction
+                        return
+                    # else not required: buffered rows not final yet
+                # else not required: compacted some rows, more may turn final
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.exception(f"time-series compaction of {self.collection_obj.name} failed;;; exception: {e}")
+
+    async def compact_final_rows(self, force: bool = False) -> int:
+        """moves buffered rows whose time field is older than row_final_secs (all if force) into time-series"""
+        async with self.compaction_lock:
+            return await self._compact_final_rows(force)
+
+    async def _compact_final_rows(self, force: bool) -> int:
+        if force or self.time_field is None:
+            final_row_filter = {}
+        else:
+            final_row_filter = {self.time_field: {"$lte": datetime.datetime.now(datetime.timezone.utc) -
+                                                  datetime.timedelta(seconds=self.row_final_secs)}}
+        final_row_list = await self.latest_row_collection_obj.find(final_row_filter).to_list(None)
+        if not final_row_list:
+            return 0
+        # else not required: compacting final rows
+        final_row_id_list = [final_row.get("_id") for final_row in final_row_list]
+        await self.collection_obj.delete_many({"_id": {'$in': final_row_id_list}})
+        await self.collection_obj.insert_many(final_row_list)
+        # only rows not updated meanwhile are dropped from buffer - later update stays buffered for next compaction
+        await self.latest_row_collection_obj.bulk_write(
+            [DeleteOne(final_row) for final_row in final_row_list], ordered=False)
+        self.compacted_row_count += len(final_row_list)
+        return len(final_row_list)
+
+    async def has_latest_rows(self) -> bool:
+        await self._resolve_strategy()
+        if self.strategy != LATEST_ROW_BUFFER:
+            return False
+        return await self.latest_row_collection_obj.find_one({}, {"_id": 1}) is not None
+
+    async def get_latest_row_merged_agg_pipeline(self, agg_pipeline: List[Dict[str, Any]]
+                                                 ) -> List[Dict[str, Any]]:
+        """
+        time-series aggregation seeing buffered latest rows: leading $match stages of agg_pipeline stay first
+        (bucket pruning), buffered ids are excluded from time-series rows and buffered rows passing same $match
+        stages are unioned in before rest of pipeline
+        """
+        await self._resolve_strategy()
+        if self.strategy != LATEST_ROW_BUFFER:
+            return agg_pipeline
+        # else not required: reads may need buffered rows
+        latest_row_id_list = [latest_row.get("_id") for latest_row in await self.latest_row_collection_obj.find(
+            {}, {"_id": 1}).to_list(None)]
+        if not latest_row_id_list:
+            return agg_pipeline
+        # else not required: merging buffered rows
+        leading_match_stage_count = 0
+        for agg_stage in agg_pipeline:
+            if len(agg_stage) != 1 or "$match" not in agg_stage:
+                break
+            leading_match_stage_count += 1
+        leading_match_stage_list = list(agg_pipeline[:leading_match_stage_count])
+        return (leading_match_stage_list +
+                [{"$match": {"_id": {"$nin": latest_row_id_list}}},
+                 {"$unionWith": {"coll": self.latest_row_collection_obj.name,
+                                 "pipeline": deepcopy(leading_match_stage_list)}}] +
+                list(agg_pipeline[leading_match_stage_count:]))
+
+    async def overlay_latest_rows(self, obj_dict_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """replaces find read time-series rows having buffered latest row"""
+        if not obj_dict_list or not await self.has_latest_rows():
+            return obj_dict_list
+        # else not required: overlaying buffered rows
+        latest_row_list = await self.latest_row_collection_obj.find(
+            {"_id": {'$in': [obj_dict.get("_id") for obj_dict in obj_dict_list]}}).to_list(None)
+        if not latest_row_list:
+            return obj_dict_list
+        id_to_latest_row_dict = {latest_row.get("_id"): latest_row for latest_row in latest_row_list}
+        return [id_to_latest_row_dict.get(obj_dict.get("_id"), obj_dict) for obj_dict in obj_dict_list]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"collection_name": self.collection_obj.name, "strategy": self.strategy,
+                "updated_row_count": self.updated_row_count, "buffered_row_count": self.buffered_row_count,
+                "compacted_row_count": self.compacted_row_count}
+
+
+model_name_to_time_series_update_engine_dict: Dict[str, TimeSeriesUpdateEngine] = {}
+
+
+def get_time_series_update_engine(msgspec_class_type) -> TimeSeriesUpdateEngine:
+    time_series_update_engine = model_name_to_time_series_update_engine_dict.get(msgspec_class_type.__name__)
+    if time_series_update_engine is None:
+        time_series_update_engine = TimeSeriesUpdateEngine(
+            msgspec_class_type.collection_obj, getattr(msgspec_class_type, "time_series_time_field", None),
+            mongo_version=getattr(msgspec_class_type, "time_series_mongo_version", None))
+        model_name_to_time_series_update_engine_dict[msgspec_class_type.__name__] = time_series_update_engine
+    # else not required: using existing engine of model
+    return time_series_update_engine
@@ -0,0 +1,113 @@
+# WebClientBenchmark.py
+# get-all requests/sec against a local stand-in server (keep-alive http/1.1, pre-encoded json list of --obj_count
+# objs): former per call module level requests.get + orjson.loads + per obj convert (from_dict_list) vs
+# pooled_requests + direct msgspec decode vs async client with --concurrency coroutine callers
+
+import argparse
+import asyncio
+import datetime
+import logging
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import List
+
+import msgspec
+import orjson
+import requests
+
+from Flux.PyCodeGenEngine.FluxCodeGenCore.pooled_web_client import (
+    pooled_requests, get_async_client, close_async_client, get_model_decoder)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+class SampleChore(msgspec.Struct, kw_only=True):
+    id: int = msgspec.field(name="_id")
+    symbol: str
+    side: str
+    px: float
+    qty: int
+    chore_status: str
+    create_date_time: datetime.datetime
+
+
+def get_response_bytes(obj_count: int) -> bytes:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return msgspec.json.encode([SampleChore(id=i, symbol=f"SYM_{i % 50}", side="BUY" if i % 2 else "SELL",
+                                            px=100 + i / 100, qty=10 * i, chore_status="OE_ACKED",
+                                            create_date_time=now) for i in range(obj_count)])
+
+
+def start_stand_in_server(response_bytes: bytes) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True  # headers and body are separate writes on kept-alive socket
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(response_bytes)))
+            self.end_headers()
+            self.wfile.write(response_bytes)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def legacy_get_all(url: str) -> List[SampleChore]:
+    response = requests.get(url)
+    return [msgspec.convert(obj_dict, SampleChore) for obj_dict in orjson.loads(response.content)]
+
+
+def pooled_get_all(url: str) -> List[SampleChore]:
+    response = pooled_requests.get(url)
+    return get_model_decoder(SampleChore, True).decode(response.content)
+
+
+async def async_get_all(url: str, request_count: int, concurrency: int) -> None:
+    async def caller(caller_request_count: int):
+        for _ in range(caller_request_count):
+            response = await get_async_client().get(url)
+            get_model_decoder(SampleChore, True).decode(response.content)
+
+    await asyncio.gather(*[caller(request_count // concurrency) for _ in range(concurrency)])
+    await close_async_client()
+
+
+def report(name: str, request_count: int, elapsed_secs: float) -> None:
+    logging.info(f"{name}: {request_count / elapsed_secs:,.0f} requests/sec ({elapsed_secs * 1000 / request_count:.3f} "
+                 f"ms per request)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="generic web client get-all requests/sec benchmark")
+    parser.add_argument("--request_count", type=int, default=2000)
+    parser.add_argument("--obj_count", type=int, default=50, help="objs in each get-all response")
+    parser.add_argument("--concurrency", type=int, default=8, help="coroutine callers of async client")
+    args = parser.parse_args()
+
+    server = start_stand_in_server(get_response_bytes(args.obj_count))
+    url = f"http://127.0.0.1:{server.server_address[1]}/get-all-sample_chore"
+    assert legacy_get_all(url) == pooled_get_all(url)
+
+    for name, get_all in (("legacy", legacy_get_all), ("pooled", pooled_get_all)):
+        start_time = time.perf_counter()
+        for _ in range(args.request_count):
+            get_all(url)
+        report(name, args.request_count, time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    asyncio.run(async_get_all(url, args.request_count, args.concurrency))
+    report(f"async x{args.concurrency}", args.request_count, time.perf_counter() - start_time)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
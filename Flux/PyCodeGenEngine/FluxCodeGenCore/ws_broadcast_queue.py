@@ -0,0 +1,161 @@
+# standard imports
+import asyncio
+import logging
+import os
+import time
+from typing import List, Dict, Any, Tuple, Callable, Awaitable, Final
+
+# project imports
+from FluxPythonUtils.scripts.general_utility_functions import parse_to_int
+
+async_ws_publish: bool = \
+    parse_to_int(async_ws_publish_env_var) == 1 \
+    if ((async_ws_publish_env_var := os.getenv("AsyncWsPublish")) is not None and
+        len(async_ws_publish_env_var)) else False
+# writers wait (backpressure) once this many events are pending for a model
+ws_broadcast_max_queue_depth: int = parse_to_int(os.getenv("WS_BROADCAST_MAX_QUEUE_DEPTH") or 10_000)
+# oldest pending event older than this is logged as broadcast lag
+ws_broadcast_lag_warn_secs: float = float(os.getenv("WS_BROADCAST_LAG_WARN_SECS") or 1.0)
+
+
+class WsBroadcastEvent:
+    __slots__ = ("db_obj_id_list", "db_obj_dict_list", "has_links", "update_ws_with_id", "is_single", "kwargs",
+                 "enqueue_time")
+
+    def __init__(self, db_obj_id_list: List[Any], db_obj_dict_list: List[Dict[str, Any]], has_links: bool | None,
+                 update_ws_with_id: bool | None, is_single: bool, kwargs: Dict[str, Any]):
+        self.db_obj_id_list: List[Any] = db_obj_id_list
+        self.db_obj_dict_list: List[Dict[str, Any]] = db_obj_dict_list
+        self.has_links: bool | None = has_links
+        self.update_ws_with_id: bool | None = update_ws_with_id
+        self.is_single: bool = is_single
+        self.kwargs: Dict[str, Any] = kwargs
+        self.enqueue_time: float = time.perf_counter()
+
+    @property
+    def is_coalescable(self) -> bool:
+        # page changes are per write deltas of paginated subscribers - merging would drop them
+        return not self.kwargs.get("page_changes") and self.kwargs.keys() <= {"page_changes"}
+
+
+class WsBroadcastQueue:
+    """
+    per model ws publish pipeline: writes enqueue change events and return, one worker task at a time drains events
+    in enqueue order - consecutive coalescable events of same kind (publish_ws or publish_ws_all) and same
+    (has_links, update_ws_with_id) are merged with latest obj per _id winning: merged publish_ws_all events go out
+    as one publish_ws_all call, so each projection subscriber group is re-queried once per merged batch instead of
+    once per write, merged publish_ws events go out as one publish_ws call per _id, keeping their obj payload
+    shape. Events carrying page changes are published as-is and act as barriers, hence per subscriber
+    notifications never overtake earlier writes
+    """
+    max_batch_size: Final[int] = 1000
+
+    def __init__(self, model_name: str,
+                 publish_one_callable: Callable[..., Awaitable[None]],
+                 publish_all_callable: Callable[..., Awaitable[None]],
+                 max_queue_depth: int = ws_broadcast_max_queue_depth):
+        self.model_name: str = model_name
+        self.publish_one_callable: Callable[..., Awaitable[None]] = publish_one_callable
+        self.publish_all_callable: Callable[..., Awaitable[None]] = publish_all_callable
+        self.max_queue_depth: int = max_queue_depth
+        self.pending_event_list: List[WsBroadcastEvent] = []
+        self.worker_task: asyncio.Task | None = None
+        self.queue_drained_event: asyncio.Event = asyncio.Event()
+        # metrics
+        self.enqueued_event_count: int = 0
+        self.published_obj_count: int = 0
+        self.coalesced_obj_count: int = 0
+        self.last_batch_lag_secs: float = 0.0
+        self.max_batch_lag_secs: float = 0.0
+
+    async def enqueue(self, event: WsBroadcastEvent):
+        while len(self.pending_event_list) >= self.max_queue_depth:
+            logging.warning(f"ws broadcast queue of {self.model_name} full with {len(self.pending_event_list)} "
+                            f"events - writer waiting for broadcast worker")
+            self.queue_drained_event.clear()
+            await self.queue_drained_event.wait()
+        self.pending_event_list.append(event)
+        self.enqueued_event_count += 1
+        if self.worker_task is None:
+            self.worker_task = asyncio.get_running_loop().create_task(self._drain())
+        # else not required: running worker picks event up
+
+    def get_queue_metrics(self) -> Dict[str, Any]:
+        oldest_pending_lag_secs = (time.perf_counter() - self.pending_event_list[0].enqueue_time
+                                   if self.pending_event_list else 0.0)
+        return {"model_name": self.model_name, "queue_depth": len(self.pending_event_list),
+                "oldest_pending_lag_secs": oldest_pending_lag_secs,
+                "last_batch_lag_secs": self.last_batch_lag_secs, "max_batch_lag_secs": self.max_batch_lag_secs,
+                "enqueued_event_count": self.enqueued_event_count,
+                "published_obj_count": self.published_obj_count, "coalesced_obj_count": self.coalesced_obj_count}
+
+    async def _drain(self):
+        try:
+            while self.pending_event_list:
+                event_list = self.pending_event_list[:self.max_batch_size]
+                del self.pending_event_list[:self.max_batch_size]
+                self.queue_drained_event.set()
+
+                self.last_batch_lag_secs = time.perf_counter() - event_list[0].enqueue_time
+                self.max_batch_lag_secs = max(self.max_batch_lag_secs, self.last_batch_lag_secs)
+                if self.last_batch_lag_secs > ws_broadcast_lag_warn_secs:
+                    logging.warning(f"ws broadcast of {self.model_name} lagging writes by "
+                                    f"{self.last_batch_lag_secs:.3f} secs;;; {self.get_queue_metrics()}")
+                # else not required: broadcast keeping up with writes
+
+                await self._publish_event_list(event_list)
+        finally:
+            self.worker_task = None
+            self.queue_drained_event.set()
+
+    async def _publish_event_list(self, event_list: List[WsBroadcastEvent]):
+        segment_key: Tuple | None = None
+        segment_id_to_obj_dict: Dict[Any, Dict[str, Any]] = {}
+        for event in event_list:
+            if not event.is_coalescable:
+                await self._publish_segment(segment_key, segment_id_to_obj_dict)
+                segment_key, segment_id_to_obj_dict = None, {}
+                await self._publish(event.db_obj_id_list, event.db_obj_dict_list, event.has_links,
+                                    event.update_ws_with_id, event.is_single, **event.kwargs)
+                continue
+            # else not required: event can be merged into current segment
+
+            event_key = (event.has_links, event.update_ws_with_id, event.is_single)
+            if event_key != segment_key:
+                await self._publish_segment(segment_key, segment_id_to_obj_dict)
+                segment_key, segment_id_to_obj_dict = event_key, {}
+            # else not required: same kind and publish params - merging
+            for db_obj_id, db_obj_dict in zip(event.db_obj_id_list, event.db_obj_dict_list):
+                if db_obj_id in segment_id_to_obj_dict:
+                    self.coalesced_obj_count += 1
+                # else not required: first event of this _id in segment
+                # latest wins - dict keeps position of first occurrence
+                segment_id_to_obj_dict[db_obj_id] = db_obj_dict
+        await self._publish_segment(segment_key, segment_id_to_obj_dict)
+
+    async def _publish_segment(self, segment_key: Tuple | None, segment_id_to_obj_dict: Dict[Any, Dict[str, Any]]):
+        if not segment_id_to_obj_dict:
+            return
+        # else not required: segment has objs to publish
+        has_links, update_ws_with_id, is_single = segment_key
+        if is_single:
+            # publish_ws subscribers get obj payload - one publish per _id
+            for db_obj_id, db_obj_dict in segment_id_to_obj_dict.items():
+                await self._publish([db_obj_id], [db_obj_dict], has_links, update_ws_with_id, True)
+        else:
+            await self._publish(list(segment_id_to_obj_dict.keys()), list(segment_id_to_obj_dict.values()),
+                                has_links, update_ws_with_id, False)
+
+    async def _publish(self, db_obj_id_list: List[Any], db_obj_dict_list: List[Dict[str, Any]],
+                       has_links: bool | None, update_ws_with_id: bool | None, is_single: bool, **kwargs):
+        try:
+            if is_single:
+                await self.publish_one_callable(db_obj_id_list[0], db_obj_dict_list[0], has_links,
+                                                update_ws_with_id, **kwargs)
+            else:
+                await self.publish_all_callable(db_obj_id_list, db_obj_dict_list, has_links,
+                                                update_ws_with_id, **kwargs)
+            self.published_obj_count += len(db_obj_id_list)
+        except Exception as e:
+            logging.exception(f"ws broadcast of {self.model_name} failed for {len(db_obj_id_list)} objs;;; "
+                              f"exception: {e}")
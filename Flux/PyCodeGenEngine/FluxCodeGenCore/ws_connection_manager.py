@@ -5,6 +5,7 @@ import asyncio
 # 3rd party imports
 from fastapi import WebSocket, WebSocketDisconnect
 from msgspec import field
+import orjson
 
 # Project imports
 from FluxPythonUtils.scripts.async_rlock import AsyncRLock
@@ -19,10 +20,36 @@ class WSData(UniqueStrIdMsgspec, kw_only=True):
     projection_agg_pipeline_callable: Callable[..., Any] | None = None
     has_pagination_with_or_without_filters: bool = False
     allow_full_db_read_on_updates: bool = False
+    # subscribers with same broadcast_signature receive exactly same payload for any given update - used by
+    # broadcast to encode payload once and share it across all such subscribers
+    broadcast_signature: Tuple | None = None
 
     def __post_init__(self):
         if self.id is None:
             self.id = WSData.next_id()
+        if self.broadcast_signature is None:
+            self.broadcast_signature = self.get_broadcast_signature()
+
+    def get_broadcast_signature(self) -> Tuple:
+        if self.projection_agg_pipeline_callable is not None:
+            return ("projection", id(self.projection_agg_pipeline_callable),
+                    self._get_callable_kwargs_signature(), self.allow_full_db_read_on_updates)
+        elif self.has_pagination_with_or_without_filters:
+            return "pagination", self._get_callable_kwargs_signature()
+        else:
+            # without projection, filters, sort or pagination every subscriber gets the raw update as is
+            return ("plain",)
+
+    def _get_callable_kwargs_signature(self) -> str:
+        if not isinstance(self.filter_callable_kwargs, dict):
+            return ""
+        try:
+            return orjson.dumps(self.filter_callable_kwargs, default=str,
+                                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except Exception as e:
+            # signature unique to this ws_data - payload is never shared with any other subscriber
+            logging.debug(f"couldn't create callable kwargs signature for {self.id=}, exception: {e}")
+            return f"ws_data_id:{self.id}"
 
 
 class WSConnectionManager:
@@ -93,9 +120,16 @@ class WSConnectionManager:
 
 
 class PathWSConnectionManager(WSConnectionManager):
+    """
+    subscriber registry of a web-path: ws_id, ws and broadcast_signature indexes are kept in sync by
+    _add_ws_data/_remove_ws_data so connect/disconnect are O(1) and broadcast picks subscriber groups without scanning
+    """
+
     def __init__(self):
         super().__init__()
         self.active_ws_data_dict: Dict[str, WSData] = {}
+        self.ws_to_active_ws_data_dict: Dict[WebSocket, WSData] = {}
+        self.broadcast_signature_to_ws_id_to_active_ws_data_dict: Dict[Tuple, Dict[str, WSData]] = {}
 
     def __str__(self):
         ret_str = "active_ws_set: "
@@ -104,22 +138,33 @@ class PathWSConnectionManager(WSConnectionManager):
                 ret_str += str(ws_data.ws_object)
             return ret_str + "\n" + str(super)
 
+    def _add_ws_data(self, ws_data: WSData):
+        self.active_ws_data_dict[ws_data.id] = ws_data
+        self.ws_to_active_ws_data_dict[ws_data.ws_object] = ws_data
+        self.broadcast_signature_to_ws_id_to_active_ws_data_dict.setdefault(
+            ws_data.broadcast_signature, {})[ws_data.id] = ws_data
+
+    def _remove_ws_data(self, ws_data: WSData):
+        self.active_ws_data_dict.pop(ws_data.id, None)
+        self.ws_to_active_ws_data_dict.pop(ws_data.ws_object, None)
+        signature_ws_data_dict = self.broadcast_signature_to_ws_id_to_active_ws_data_dict.get(
+            ws_data.broadcast_signature)
+        if signature_ws_data_dict is not None:
+            signature_ws_data_dict.pop(ws_data.id, None)
+            if not signature_ws_data_dict:
+                del self.broadcast_signature_to_ws_id_to_active_ws_data_dict[ws_data.broadcast_signature]
+            # else not required: other subscribers still share this signature
+        # else not required: signature index already cleaned
+
     async def connect(self, ws: WebSocket, filter_callable: Callable[..., Any] | None = None,
                       callable_kwargs: Dict[Any, Any] | None = None,
                       projection_agg_pipeline_callable: Callable[..., Any] | None = None, **kwargs) -> Tuple[bool, str]:
 
         async with self.rlock:
             is_new_ws: bool = await WSConnectionManager.add_to_master_ws_set(ws)
-            # if ws not in self.active_ws_n_callable_tuple_set:
 
-            ws_exists: bool = False
-            for active_ws_data in self.active_ws_data_dict.values():
-                if ws == active_ws_data.ws_object:
-                    found_ws_data = active_ws_data
-                    ws_exists = True
-                    break
-
-            if not ws_exists:
+            found_ws_data: WSData | None = self.ws_to_active_ws_data_dict.get(ws)
+            if found_ws_data is None:
                 # old or new ws does not matter - may have been added to master via a different path
                 if callable_kwargs is None:
                     callable_kwargs = {}
@@ -135,7 +180,7 @@ class PathWSConnectionManager(WSConnectionManager):
                                  projection_agg_pipeline_callable,
                                  has_pagination_with_or_without_filters=has_pagination_with_or_without_filters,
                                  allow_full_db_read_on_updates=allow_full_db_read_on_updates)
-                self.active_ws_data_dict[ws_data.id] = ws_data
+                self._add_ws_data(ws_data)
                 return True, ws_data.id
             elif is_new_ws:
                 raise Exception(f"Unexpected! ws: {ws} is in active_ws_n_callable_tuple_set "
@@ -149,10 +194,9 @@ class PathWSConnectionManager(WSConnectionManager):
 
     async def disconnect(self, ws: WebSocket):
         async with self.rlock:
-            for fetched_ws_data in self.active_ws_data_dict.values():
-                if fetched_ws_data.ws_object == ws:
-                    del self.active_ws_data_dict[fetched_ws_data.id]
-                    break
+            fetched_ws_data: WSData | None = self.ws_to_active_ws_data_dict.get(ws)
+            if fetched_ws_data is not None:
+                self._remove_ws_data(fetched_ws_data)
             else:
                 logging.error(f"Unexpected! likely bug, ws: {ws} not in active_ws_n_callable_tuple_set: {str(self)}")
             await WSConnectionManager.remove_from_master_ws_set(ws)
@@ -192,13 +236,30 @@ class PathWSConnectionManager(WSConnectionManager):
     def get_activ_ws_data_list(self) -> List[WSData]:
         return list(self.active_ws_data_dict.values())
 
+    def get_broadcast_signature_to_active_ws_data_list_dict(self) -> Dict[Tuple, List[WSData]]:
+        """snapshot of subscribers grouped by broadcast_signature - each group receives exactly same payload"""
+        return {broadcast_signature: list(ws_id_to_active_ws_data_dict.values())
+                for broadcast_signature, ws_id_to_active_ws_data_dict in
+                self.broadcast_signature_to_ws_id_to_active_ws_data_dict.items()}
+
     def get_active_ws_data_by_ws_id(self, ws_id: str) -> WSData:
         return self.active_ws_data_dict.get(ws_id)
 
+    def get_active_ws_data_by_ws(self, ws: WebSocket) -> WSData | None:
+        return self.ws_to_active_ws_data_dict.get(ws)
+
+
 class PathWithIdWSConnectionManager(WSConnectionManager):
+    """
+    obj_id keyed subscriber registry of a web-path: (obj_id, ws) index makes connect/disconnect O(1), per obj_id
+    broadcast_signature index lets broadcast pick subscriber groups of an id without scanning
+    """
+
     def __init__(self):
         super().__init__()
         self.id_to_ws_id_to_active_ws_data_dict: Dict[Any, Dict[str, WSData]] = {}
+        self.id_n_ws_to_active_ws_data_dict: Dict[Tuple[Any, WebSocket], WSData] = {}
+        self.id_to_broadcast_signature_to_ws_id_to_active_ws_data_dict: Dict[Any, Dict[Tuple, Dict[str, WSData]]] = {}
 
     def __str__(self):
         ret_str = "active_ws_set: "
@@ -208,6 +269,35 @@ class PathWithIdWSConnectionManager(WSConnectionManager):
                 ret_str += f"obj_id: {obj_id} set: {set_as_str}\n"
             return ret_str + "\n" + str(super)
 
+    def _add_ws_data(self, obj_id: Any, ws_data: WSData):
+        self.id_to_ws_id_to_active_ws_data_dict.setdefault(obj_id, {})[ws_data.id] = ws_data
+        self.id_n_ws_to_active_ws_data_dict[(obj_id, ws_data.ws_object)] = ws_data
+        self.id_to_broadcast_signature_to_ws_id_to_active_ws_data_dict.setdefault(obj_id, {}).setdefault(
+            ws_data.broadcast_signature, {})[ws_data.id] = ws_data
+
+    def _remove_ws_data(self, obj_id: Any, ws_data: WSData):
+        self.id_n_ws_to_active_ws_data_dict.pop((obj_id, ws_data.ws_object), None)
+        active_ws_data_dict = self.id_to_ws_id_to_active_ws_data_dict.get(obj_id)
+        if active_ws_data_dict is not None:
+            active_ws_data_dict.pop(ws_data.id, None)
+            if not active_ws_data_dict:
+                del self.id_to_ws_id_to_active_ws_data_dict[obj_id]
+            # else not required: other subscribers of obj_id still active
+        # else not required: obj_id index already cleaned
+        signature_to_ws_data_dict = self.id_to_broadcast_signature_to_ws_id_to_active_ws_data_dict.get(obj_id)
+        if signature_to_ws_data_dict is not None:
+            signature_ws_data_dict = signature_to_ws_data_dict.get(ws_data.broadcast_signature)
+            if signature_ws_data_dict is not None:
+                signature_ws_data_dict.pop(ws_data.id, None)
+                if not signature_ws_data_dict:
+                    del signature_to_ws_data_dict[ws_data.broadcast_signature]
+                # else not required: other subscribers of obj_id still share this signature
+            # else not required: signature index already cleaned
+            if not signature_to_ws_data_dict:
+                del self.id_to_broadcast_signature_to_ws_id_to_active_ws_data_dict[obj_id]
+            # else not required: other signatures of obj_id still active
+        # else not required: obj_id signature index already cleaned
+
     async def connect(self, ws: WebSocket, obj_id: Any, filter_callable: Callable[..., Any] | None = None,
                       callable_kwargs: Dict[Any, Any] | None = None,
                       projection_agg_pipeline_callable: Callable[..., Any] | None = None, **kwargs) -> Tuple[bool, str]:
@@ -222,44 +312,30 @@ class PathWithIdWSConnectionManager(WSConnectionManager):
 
             allow_full_db_read_on_updates = kwargs.get("allow_full_db_read_on_updates", False)
 
-            # new or not, if id is not in dict, it's new for this path
-            if obj_id not in self.id_to_ws_id_to_active_ws_data_dict:
-                self.id_to_ws_id_to_active_ws_data_dict[obj_id] = {}
+            ws_data: WSData | None = self.id_n_ws_to_active_ws_data_dict.get((obj_id, ws))
+            if ws_data is None:
+                # new or not, if (obj_id, ws) is not registered, it's new for this path
                 ws_data = WSData(ws_object=ws, filter_callable=filter_callable, filter_callable_kwargs=callable_kwargs,
-                           projection_agg_pipeline_callable=projection_agg_pipeline_callable,
-                           has_pagination_with_or_without_filters=has_pagination_with_or_without_filters,
-                           allow_full_db_read_on_updates=allow_full_db_read_on_updates)
-                self.id_to_ws_id_to_active_ws_data_dict[obj_id][ws_data.id] = ws_data
-            elif is_new_ws:  # we have the obj_id in our dict but master did not have this websocket
-                active_ws_dict: Dict[str, WSData] = \
-                    self.id_to_ws_id_to_active_ws_data_dict[obj_id]
-                if not (ws in [ws_data.ws_object for ws_data in active_ws_dict.values()]):
-                    ws_data = WSData(ws_object=ws, filter_callable=filter_callable, filter_callable_kwargs=callable_kwargs,
-                               projection_agg_pipeline_callable=projection_agg_pipeline_callable,
-                               has_pagination_with_or_without_filters=has_pagination_with_or_without_filters,
-                               allow_full_db_read_on_updates=allow_full_db_read_on_updates)
-                    self.id_to_ws_id_to_active_ws_data_dict[obj_id][ws_data.id] = ws_data
-                    logging.debug("new client web-socket connect called on a pre-added obj_id-web-path")
-                else:
-                    raise Exception(
-                        f"Unexpected! ws: {ws} for id: {obj_id} found in active_ws_n_filter_callable_tuple_list "
-                        f"but not in master: {str(self)}, likely a bug")
+                                 projection_agg_pipeline_callable=projection_agg_pipeline_callable,
+                                 has_pagination_with_or_without_filters=has_pagination_with_or_without_filters,
+                                 allow_full_db_read_on_updates=allow_full_db_read_on_updates)
+                self._add_ws_data(obj_id, ws_data)
+            elif is_new_ws:  # we have the (obj_id, ws) in our index but master did not have this websocket
+                raise Exception(
+                    f"Unexpected! ws: {ws} for id: {obj_id} found in active_ws_n_filter_callable_tuple_list "
+                    f"but not in master: {str(self)}, likely a bug")
             else:
-                pass
+                logging.debug("connect called on a pre-added ws for obj_id-web-path, investigate: maybe ignorable bug")
         return is_new_ws, ws_data.id
 
     async def disconnect(self, ws: WebSocket, obj_id: Any):
         async with self.rlock:
-            fetched_active_ws_data_dict = self.id_to_ws_id_to_active_ws_data_dict.get(obj_id)
-            for fetched_ws_data in fetched_active_ws_data_dict.values():
-                if fetched_ws_data.ws_object == ws:
-                    del fetched_active_ws_data_dict[fetched_ws_data.id]
-                    break
+            fetched_ws_data: WSData | None = self.id_n_ws_to_active_ws_data_dict.get((obj_id, ws))
+            if fetched_ws_data is not None:
+                self._remove_ws_data(obj_id, fetched_ws_data)
             else:
                 logging.error(f"Unexpected! likely bug, ws: {ws} not in active_ws_n_callable_tuple_set "
                               f"for obj_id {obj_id}: {str(self)}")
-            if len(self.id_to_ws_id_to_active_ws_data_dict[obj_id]) == 0:
-                del self.id_to_ws_id_to_active_ws_data_dict[obj_id]
             await WSConnectionManager.remove_from_master_ws_set(ws)
 
     # async def receive_in_json(self, websocket: WebSocket):
@@ -275,6 +351,14 @@ class PathWithIdWSConnectionManager(WSConnectionManager):
             return list(fetched_active_ws_data_dict.values())
         return None
 
+    def get_broadcast_signature_to_active_ws_data_list_dict_with_id(self, obj_id) -> Dict[Tuple, List[WSData]] | None:
+        """snapshot of obj_id subscribers grouped by broadcast_signature - each group receives exactly same payload"""
+        signature_to_ws_data_dict = self.id_to_broadcast_signature_to_ws_id_to_active_ws_data_dict.get(obj_id)
+        if signature_to_ws_data_dict:
+            return {broadcast_signature: list(ws_id_to_active_ws_data_dict.values())
+                    for broadcast_signature, ws_id_to_active_ws_data_dict in signature_to_ws_data_dict.items()}
+        return None
+
     def get_activ_ws_with_id_n_ws_id(self, obj_id, ws_id: str) -> WSData:
         fetched_active_ws_data_dict = self.id_to_ws_id_to_active_ws_data_dict.get(obj_id)
         return fetched_active_ws_data_dict.get(ws_id)
@@ -308,6 +392,6 @@ class PathWithIdWSConnectionManager(WSConnectionManager):
                 logging.exception(f"Exception: {e}, ws: {remove_websocket}")
             finally:
                 if remove_websocket is not None:
-                    if remove_websocket in list(self.id_to_ws_id_to_active_ws_data_dict[obj_id].values()):
+                    if (obj_id, remove_websocket) in self.id_n_ws_to_active_ws_data_dict:
                         await self.disconnect(remove_websocket, obj_id)
-
+                    # else not required: already disconnected by other broadcast / recv loop
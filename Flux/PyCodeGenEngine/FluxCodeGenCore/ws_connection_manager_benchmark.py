@@ -0,0 +1,158 @@
+# WSConnectionManagerBenchmark.py
+# connect/disconnect churn against path and path-with-id ws connection managers at --ws_count sockets: former
+# registry (linear scan of active WSData per connect/disconnect, per-id ws_object list build) vs indexed registry -
+# reports churn time of connecting all sockets then disconnecting them in random order, and signature grouping
+# time of one broadcast pickup
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+from Flux.PyCodeGenEngine.FluxCodeGenCore.ws_connection_manager import (
+    WSConnectionManager, PathWSConnectionManager, PathWithIdWSConnectionManager, WSData)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class StandInWebSocket:
+    """hashable by identity like starlette WebSocket - accept/send are no-ops"""
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, json_str: str):
+        pass
+
+
+class LegacyPathWSConnectionManager(PathWSConnectionManager):
+    async def connect(self, ws, filter_callable=None, callable_kwargs=None, projection_agg_pipeline_callable=None,
+                      **kwargs) -> Tuple[bool, str]:
+        async with self.rlock:
+            await WSConnectionManager.add_to_master_ws_set(ws)
+            for active_ws_data in self.active_ws_data_dict.values():
+                if ws == active_ws_data.ws_object:
+                    return False, active_ws_data.id
+            callable_kwargs = callable_kwargs or {}
+            ws_data = WSData(ws_object=ws, filter_callable=filter_callable, filter_callable_kwargs=callable_kwargs,
+                             projection_agg_pipeline_callable=projection_agg_pipeline_callable,
+                             has_pagination_with_or_without_filters=bool(callable_kwargs.get("pagination") or
+                                                                         callable_kwargs.get("filters")))
+            self.active_ws_data_dict[ws_data.id] = ws_data
+            return True, ws_data.id
+
+    async def disconnect(self, ws):
+        async with self.rlock:
+            for fetched_ws_data in self.active_ws_data_dict.values():
+                if fetched_ws_data.ws_object == ws:
+                    del self.active_ws_data_dict[fetched_ws_data.id]
+                    break
+            await WSConnectionManager.remove_from_master_ws_set(ws)
+
+    def get_broadcast_signature_to_active_ws_data_list_dict(self) -> Dict[Tuple, List[WSData]]:
+        signature_to_ws_data_list_dict: Dict[Tuple, List[WSData]] = {}
+        for ws_data in self.active_ws_data_dict.values():
+            signature_to_ws_data_list_dict.setdefault(ws_data.broadcast_signature, []).append(ws_data)
+        return signature_to_ws_data_list_dict
+
+
+class LegacyPathWithIdWSConnectionManager(PathWithIdWSConnectionManager):
+    async def connect(self, ws, obj_id: Any, filter_callable=None, callable_kwargs=None,
+                      projection_agg_pipeline_callable=None, **kwargs) -> Tuple[bool, str]:
+        async with self.rlock:
+            is_new_ws = await WSConnectionManager.add_to_master_ws_set(ws)
+            active_ws_dict = self.id_to_ws_id_to_active_ws_data_dict.setdefault(obj_id, {})
+            if ws not in [ws_data.ws_object for ws_data in active_ws_dict.values()]:
+                ws_data = WSData(ws_object=ws, filter_callable=filter_callable,
+                                 filter_callable_kwargs=callable_kwargs or {},
+                                 projection_agg_pipeline_callable=projection_agg_pipeline_callable)
+                active_ws_dict[ws_data.id] = ws_data
+            return is_new_ws, ws_data.id
+
+    async def disconnect(self, ws, obj_id: Any):
+        async with self.rlock:
+            fetched_active_ws_data_dict = self.id_to_ws_id_to_active_ws_data_dict.get(obj_id)
+            for fetched_ws_data in fetched_active_ws_data_dict.values():
+                if fetched_ws_data.ws_object == ws:
+                    del fetched_active_ws_data_dict[fetched_ws_data.id]
+                    break
+            if len(fetched_active_ws_data_dict) == 0:
+                del self.id_to_ws_id_to_active_ws_data_dict[obj_id]
+            await WSConnectionManager.remove_from_master_ws_set(ws)
+
+
+def get_callable_kwargs(ws_index: int, filter_variant_count: int) -> Dict[str, Any]:
+    # ui tabs mostly subscribe with few distinct filters - grouped to few broadcast signatures
+    variant = ws_index % (filter_variant_count + 1)
+    if variant == 0:
+        return {}
+    return {"filters": [{"column_name": "symbol", "filtered_values": [f"SYM_{variant}"]}]}
+
+
+async def run_path_churn(name: str, manager: PathWSConnectionManager, ws_list: List[StandInWebSocket],
+                         filter_variant_count: int) -> None:
+    start_time = time.perf_counter()
+    for ws_index, ws in enumerate(ws_list):
+        await manager.connect(ws, callable_kwargs=get_callable_kwargs(ws_index, filter_variant_count))
+    connect_secs = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    signature_to_ws_data_list_dict = manager.get_broadcast_signature_to_active_ws_data_list_dict()
+    group_secs = time.perf_counter() - start_time
+    assert sum(len(ws_data_list) for ws_data_list in signature_to_ws_data_list_dict.values()) == len(ws_list)
+
+    disconnect_ws_list = list(ws_list)
+    random.shuffle(disconnect_ws_list)
+    start_time = time.perf_counter()
+    for ws in disconnect_ws_list:
+        await manager.disconnect(ws)
+    disconnect_secs = time.perf_counter() - start_time
+    assert not manager.active_ws_data_dict and not WSConnectionManager._master_ws_set
+    logging.info(f"{name} path: connect {len(ws_list)} ws in {connect_secs * 1000:,.1f} ms, disconnect in "
+                 f"{disconnect_secs * 1000:,.1f} ms, {len(signature_to_ws_data_list_dict)} broadcast groups picked in "
+                 f"{group_secs * 1000:.3f} ms")
+
+
+async def run_path_with_id_churn(name: str, manager: PathWithIdWSConnectionManager,
+                                 ws_list: List[StandInWebSocket], obj_id_count: int) -> None:
+    # subscribers concentrate on few obj ids (e.g. one plan/contact per ui tab)
+    ws_n_obj_id_list = [(ws, ws_index % obj_id_count) for ws_index, ws in enumerate(ws_list)]
+    start_time = time.perf_counter()
+    for ws, obj_id in ws_n_obj_id_list:
+        await manager.connect(ws, obj_id)
+    connect_secs = time.perf_counter() - start_time
+
+    random.shuffle(ws_n_obj_id_list)
+    start_time = time.perf_counter()
+    for ws, obj_id in ws_n_obj_id_list:
+        await manager.disconnect(ws, obj_id)
+    disconnect_secs = time.perf_counter() - start_time
+    assert not manager.id_to_ws_id_to_active_ws_data_dict and not WSConnectionManager._master_ws_set
+    logging.info(f"{name} path-with-id: connect {len(ws_list)} ws over {obj_id_count} ids in "
+                 f"{connect_secs * 1000:,.1f} ms, disconnect in {disconnect_secs * 1000:,.1f} ms")
+
+
+async def run_benchmark(ws_count: int, obj_id_count: int, filter_variant_count: int) -> None:
+    ws_list = [StandInWebSocket() for _ in range(ws_count)]
+    for name, manager in (("legacy", LegacyPathWSConnectionManager()), ("indexed", PathWSConnectionManager())):
+        await run_path_churn(name, manager, ws_list, filter_variant_count)
+    for name, manager in (("legacy", LegacyPathWithIdWSConnectionManager()),
+                          ("indexed", PathWithIdWSConnectionManager())):
+        await run_path_with_id_churn(name, manager, ws_list, obj_id_count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ws connection manager connect/disconnect churn benchmark")
+    parser.add_argument("--ws_count", type=int, default=10_000)
+    parser.add_argument("--obj_id_count", type=int, default=10, help="distinct obj ids of path-with-id subscribers")
+    parser.add_argument("--filter_variant_count", type=int, default=20,
+                        help="distinct filters across path subscribers")
+    args = parser.parse_args()
+    random.seed(0)
+    asyncio.run(run_benchmark(args.ws_count, args.obj_id_count, args.filter_variant_count))
+
+
+if __name__ == "__main__":
+    main()
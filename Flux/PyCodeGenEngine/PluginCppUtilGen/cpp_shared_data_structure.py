@@ -45,6 +45,7 @@ class CppSharedDataStructure(BaseProtoPlugin):
             output_content += f"\n\ntemplate <size_t N>\n"
             output_content += f"struct {message.proto.name}ShmContainer {{\n"
             output_content += "\tint64_t update_counter;\n"
+            output_content += "\tuint64_t seq_version;\n"
             output_content += f"\tstd::array<{message.proto.name}QueueElement, N> {message_name_snake_cased}_list_;\n\n"
             output_content += "\t[[nodiscard]] bool is_data_set() const {\n"
             output_content += "\t\treturn update_counter != 0;\n"
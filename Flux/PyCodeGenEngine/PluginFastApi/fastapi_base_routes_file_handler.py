@@ -272,6 +272,8 @@ class FastapiBaseRoutesFileHandler(BaseFastapiPlugin, ABC):
         perf_benchmark_decorators_path = self.import_path_from_os_path("PY_CODE_GEN_CORE_PATH",
                                                                       "perf_benchmark_decorators")
         output_str += f"from {perf_benchmark_decorators_path} import perf_benchmark\n"
+        group_commit_queue_path = self.import_path_from_os_path("PY_CODE_GEN_CORE_PATH", "group_commit_queue")
+        output_str += f"from {group_commit_queue_path} import GroupCommitQueue\n"
         output_str += f"from FluxPythonUtils.scripts.async_rlock import AsyncRLock\n"
         aggregate_file_path = self.import_path_from_os_path("PROJECT_DIR", "app.aggregate")
         output_str += f'from {aggregate_file_path} import *\n'
@@ -736,15 +736,26 @@ class FastapiCallbackFileHandler(BaseFastapiPlugin, ABC):
         output_str += "            task_list = []\n"
         update_agg_set_message_list: List[protogen.Message] = []
         filer_agg_set_message_list: List[protogen.Message] = []
+        # time-series models are polled (not watched) by stream consumer - streamed only if named here (comma sep)
+        stream_time_series_model_name_set = {model_name.strip() for model_name in
+                                             (os.getenv("STREAM_TIME_SERIES_MODELS") or "").split(",")
+                                             if model_name.strip()}
         for message in self.root_message_list:
             if FastapiCallbackFileHandler.is_option_enabled(message, FastapiCallbackFileHandler.flux_msg_json_root_time_series):
-                # if time-series model
-                continue
-            option_val = FastapiCallbackFileHandler.get_complex_option_value_from_proto(message, FastapiCallbackFileHandler.flux_msg_json_root)
+                if message.proto.name not in stream_time_series_model_name_set:
+                    # if time-series model not opted in
+                    continue
+                # else not required: opted in time-series model - its ops are in time-series json root option
+                option_val = FastapiCallbackFileHandler.get_complex_option_value_from_proto(
+                    message, FastapiCallbackFileHandler.flux_msg_json_root_time_series)
+            else:
+                option_val = FastapiCallbackFileHandler.get_complex_option_value_from_proto(
+                    message, FastapiCallbackFileHandler.flux_msg_json_root)
             if option_val.get(FastapiCallbackFileHandler.flux_json_root_enable_large_db_object_field):
                 # if gridfs based message
                 continue
-            # else not required for both above if cases - allowing only usual mongo collections as change stream is supported for them only
+            # else not required for both above if cases - allowing usual mongo collections and opted in time-series
+            # ones (tailed on time field by stream consumer)
             output_str += f"            task_list.append(asyncio.create_task(watch_specific_collection_with_stream({message.proto.name}"
             has_update_agg_set = False
             has_filter_agg_set_on_update = False
@@ -143,6 +143,90 @@ class FastapiHttpRoutesFileHandler(FastapiBaseRoutesFileHandler, ABC):
         output_str += " " * indent_count + f"        return True\n\n\n"
         return output_str
 
+    def _handle_msgspec_group_commit_post_gen(self, message: protogen.Message, aggregation_type, msg_has_links,
+                                              shared_lock_list) -> str:
+        message_name_snake_cased = convert_camel_case_to_specific_case(message.proto.name)
+        if aggregation_type in [FastapiHttpRoutesFileHandler.aggregation_type_filter,
+                                FastapiHttpRoutesFileHandler.aggregation_type_update,
+                                FastapiHttpRoutesFileHandler.aggregation_type_both]:
+            err_str = (f"{FastapiHttpRoutesFileHandler.flux_msg_group_commit} option is not supported with create "
+                       f"aggregation, found {aggregation_type=} for message {message.proto.name}")
+            logging.exception(err_str)
+            raise Exception(err_str)
+        # else not required: plain create - can be coalesced
+
+        obj_list_var_name = f"{message_name_snake_cased}_msgspec_obj_list"
+        output_str = (f"async def _group_commit_create_{message_name_snake_cased}_http("
+                      f"{obj_list_var_name}: List[{message.proto.name}]) -> List[Any]:\n")
+        output_str += f'    """\n'
+        output_str += (f'    Flushes creates of {message.proto.name} coalesced by '
+                       f'{message_name_snake_cased}_group_commit_queue - pre/post callbacks still run per obj, db write '
+                       f'and ws publish run once for batch\n')
+        output_str += f'    """\n'
+        output_str += f"    result_list: List[Any] = [None] * len({obj_list_var_name})\n"
+        mutex_handling_str, indent_count = self._handle_underlying_mutex_str(message, shared_lock_list)
+        output_str += mutex_handling_str
+        indent_str = " " * indent_count
+        output_str += indent_str + f"    commit_index_list: List[int] = []\n"
+        output_str += indent_str + (f"    for index, {message_name_snake_cased}_msgspec_obj in "
+                                    f"enumerate({obj_list_var_name}):\n")
+        output_str += indent_str + f"        try:\n"
+        output_str += indent_str + (f"            await callback_class.create_{message_name_snake_cased}_pre("
+                                    f"{message_name_snake_cased}_msgspec_obj)\n")
+        output_str += indent_str + f"        except Exception as e:\n"
+        output_str += indent_str + f"            result_list[index] = e\n"
+        output_str += indent_str + f"        else:\n"
+        output_str += indent_str + f"            commit_index_list.append(index)\n"
+        output_str += indent_str + (f"    {self.get_avoid_db_n_ws_update_var_name(message_name_snake_cased)}"
+                                    f" = config_yaml_dict.get("
+                                    f"'{self.get_avoid_db_n_ws_update_var_name(message_name_snake_cased)}')\n")
+        output_str += indent_str + (f"    if commit_index_list and not "
+                                    f"{self.get_avoid_db_n_ws_update_var_name(message_name_snake_cased)}:\n")
+        output_str += indent_str + (f"        commit_result_list = await generic_group_commit_post_http("
+                                    f"{message.proto.name}, {FastapiHttpRoutesFileHandler.proto_package_var_name}, "
+                                    f"[{obj_list_var_name}[index] for index in commit_index_list], "
+                                    f"has_links={msg_has_links})\n")
+        output_str += indent_str + (f"        for index, commit_result in zip(commit_index_list, "
+                                    f"commit_result_list):\n")
+        output_str += indent_str + f"            if isinstance(commit_result, Exception):\n"
+        output_str += indent_str + f"                result_list[index] = commit_result\n"
+        output_str += indent_str + f"            # else not required: committed - post callback sets result\n"
+        output_str += indent_str + f"    # else not required: nothing passed pre callback or db n ws update avoided\n"
+        output_str += indent_str + f"    for index in commit_index_list:\n"
+        output_str += indent_str + f"        if result_list[index] is None:\n"
+        output_str += indent_str + f"            try:\n"
+        output_str += indent_str + (f"                await callback_class.create_{message_name_snake_cased}_post("
+                                    f"{obj_list_var_name}[index])\n")
+        output_str += indent_str + f"                result_list[index] = {obj_list_var_name}[index]\n"
+        output_str += indent_str + f"            except Exception as e:\n"
+        output_str += indent_str + f"                result_list[index] = e\n"
+        output_str += indent_str + f"        # else not required: commit failed - no post callback\n"
+        output_str += f"    return result_list\n\n\n"
+        output_str += (f"{message_name_snake_cased}_group_commit_queue = GroupCommitQueue("
+                       f"_group_commit_create_{message_name_snake_cased}_http)\n\n\n")
+
+        output_str += f"@perf_benchmark\n"
+        output_str += (f"async def underlying_group_commit_create_{message_name_snake_cased}_http_bytes("
+                       f"{message_name_snake_cased}_bytes: bytes, return_obj_copy: bool | None = True):\n")
+        output_str += f'    """\n'
+        output_str += (f'    Create route for {message.proto.name} coalesced with concurrent creates into one db '
+                       f'write and one ws publish - only for callers not holding {message.proto.name} locks (http '
+                       f'route), in-process callers must use underlying_create_{message_name_snake_cased}_http\n')
+        output_str += f'    """\n'
+        output_str += self._add_view_check_code_in_route()
+        output_str += (f"    {message_name_snake_cased}_msgspec_obj = msgspec.json.decode("
+                       f"{message_name_snake_cased}_bytes, type={message.proto.name}, "
+                       f"dec_hook={message.proto.name}.dec_hook)\n")
+        output_str += (f"    return_obj = await {message_name_snake_cased}_group_commit_queue.submit("
+                       f"{message_name_snake_cased}_msgspec_obj)\n")
+        output_str += f"    if return_obj_copy:\n"
+        output_str += f"        return_obj_bytes = msgspec.json.encode(return_obj, enc_hook={message.proto.name}.enc_hook)\n"
+        output_str += f"        return CustomFastapiResponse(content=return_obj_bytes, status_code=201)\n"
+        output_str += f"    else:\n"
+        output_str += (f"        return CustomFastapiResponse(content=str(True).encode('utf-8'), "
+                       f"status_code=201)\n")
+        return output_str
+
     def handle_underlying_POST_one_gen(self, **kwargs) -> str:
         message, aggregation_type, shared_lock_list, model_type = (
             self._unpack_kwargs_without_id_field_type(**kwargs))
@@ -222,6 +306,11 @@ class FastapiHttpRoutesFileHandler(FastapiBaseRoutesFileHandler, ABC):
             output_str += f"    else:\n"
             output_str += (f"        return CustomFastapiResponse(content=str(return_obj).encode('utf-8'), "
                            f"status_code=201)\n")
+            if self.is_bool_option_enabled(message, FastapiHttpRoutesFileHandler.flux_msg_group_commit):
+                output_str += "\n\n"
+                output_str += self._handle_msgspec_group_commit_post_gen(message, aggregation_type, msg_has_links,
+                                                                         shared_lock_list)
+            # else not required: group commit not enabled for message
         else:
             if model_type == ModelType.Dataclass:
                 output_str = self._handle_missing_id_n_datetime_field_callable_generation(message, model_type)
@@ -420,6 +509,13 @@ class FastapiHttpRoutesFileHandler(FastapiBaseRoutesFileHandler, ABC):
             output_str += f"        data_body = await {message_name_snake_cased}_json_req.body()\n"
             output_str += f"        query_params = dict({message_name_snake_cased}_json_req.query_params)\n"
             output_str += f"        return_obj_copy = True if str(query_params.pop('return_obj_copy', True)).lower() == 'true' else False\n"
+            if self.is_bool_option_enabled(message, FastapiHttpRoutesFileHandler.flux_msg_group_commit):
+                output_str += f"        if not query_params:\n"
+                output_str += (f"            return await underlying_group_commit_create_{message_name_snake_cased}"
+                               f"_http_bytes(data_body, return_obj_copy=return_obj_copy)\n")
+                output_str += (f"        # else not required: requests with extra query params take regular "
+                               f"create path\n")
+            # else not required: group commit not enabled for message
             output_str += (f"        return await underlying_create_{message_name_snake_cased}_http_bytes("
                            f"data_body, return_obj_copy=return_obj_copy, **query_params)\n")
             output_str += f"    except Exception as e:\n"
@@ -784,6 +784,18 @@ class MsgspecModelPlugin(DataclassModelPlugin):
         output_str += self._handle_cache_n_ws_connection_manager_data_members_override(message, is_msg_root)
         if self.is_option_enabled(message, MsgspecModelPlugin.flux_msg_json_root_time_series):
             output_str += "    is_time_series: ClassVar[bool] = True\n"
+            time_field, meta_field, _, _ = self.get_time_series_data_from_msg(message)
+            # used by time-series update engine to find final rows
+            output_str += f"    time_series_time_field: ClassVar[str] = '{time_field}'\n"
+            if meta_field:
+                output_str += f"    time_series_meta_field: ClassVar[str] = '{meta_field}'\n"
+            else:
+                output_str += "    time_series_meta_field: ClassVar[str | None] = None\n"
+            # decides time-series update strategy of update engine instead of probing server
+            mongo_version = self.get_complex_option_value_from_proto(
+                message, MsgspecModelPlugin.flux_msg_json_root_time_series).get(
+                MsgspecModelPlugin.flux_json_root_ts_mongo_version_field)
+            output_str += f"    time_series_mongo_version: ClassVar[float | None] = {mongo_version}\n"
             output_str += "    enable_large_db_object: ClassVar[bool] = False\n"
         else:
             output_str += "    is_time_series: ClassVar[bool] = False\n"
@@ -0,0 +1,194 @@
+from typing import List, Tuple
+
+import pytest
+import pytest_asyncio  # Ensures asyncio plugin is active
+
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.base_book.app.sim_matching_engine import (
+    SimMatchingEngine, SimChore, SIM_ACK, SIM_CXL_ACK, SIM_CXL_REJ, SIM_AMD_ACK, SIM_ACKED, SIM_FILLED, SIM_DOD)
+
+SYMBOL = "SYM"
+
+
+class ChoreHandler:
+    def __init__(self):
+        self.chore_event_list: List[Tuple[str, str]] = []
+        self.fill_list: List[Tuple[str, float, int]] = []
+
+    async def handle_chore_event(self, chore: SimChore, sim_event: str, text: str):
+        self.chore_event_list.append((chore.chore_id, sim_event))
+
+    async def handle_fill(self, chore: SimChore, fill_px: float, fill_qty: int, fill_id: str):
+        self.fill_list.append((chore.chore_id, fill_px, fill_qty))
+
+
+@pytest.fixture
+def handler() -> ChoreHandler:
+    yield ChoreHandler()
+
+
+@pytest.fixture
+def engine(handler) -> SimMatchingEngine:
+    yield SimMatchingEngine(handler.handle_chore_event, handler.handle_fill, closed_chore_cache_size=2)
+
+
+async def place(engine: SimMatchingEngine, chore_id: str, is_buy: bool, px: float, qty: int) -> SimChore:
+    chore = SimChore(chore_id, SYMBOL, is_buy, px, qty)
+    engine.submit_new(chore)
+    await engine.drain()
+    return chore
+
+
+@pytest.mark.asyncio
+async def test_crossing_chore_fills_against_depth(engine, handler):
+    engine.update_market_depth(SYMBOL, False, [(10.1, 200), (10.0, 100)])
+    chore = await place(engine, "B1", True, 10.1, 250)
+
+    assert handler.fill_list == [("B1", 10.0, 100), ("B1", 10.1, 150)]
+    assert chore.state == SIM_FILLED
+    # depth consumed by sim chore stays consumed until next snapshot of side
+    assert engine.get_order_book(SYMBOL).ask_depth_level_list == [[10.1, 50]]
+
+
+@pytest.mark.asyncio
+async def test_partial_fill_rests_leaves_and_fills_at_passive_px(engine, handler):
+    engine.update_market_depth(SYMBOL, False, [(10.0, 100)])
+    buy_chore = await place(engine, "B1", True, 10.05, 400)
+
+    assert handler.fill_list == [("B1", 10.0, 100)]
+    assert buy_chore.state == SIM_ACKED and buy_chore.leaves_qty == 300
+
+    sell_chore = await place(engine, "S1", False, 10.0, 100)
+    assert handler.fill_list[1:] == [("S1", 10.05, 100), ("B1", 10.05, 100)]
+    assert sell_chore.state == SIM_FILLED
+    assert buy_chore.filled_qty == 200 and buy_chore.state == SIM_ACKED
+
+    # fresh depth snapshot crossing resting chore fills it at its own px
+    engine.update_market_depth(SYMBOL, False, [(10.02, 500)])
+    await engine.drain()
+    assert handler.fill_list[3:] == [("B1", 10.05, 200)]
+    assert buy_chore.state == SIM_FILLED
+
+
+@pytest.mark.asyncio
+async def test_fifo_within_px_level(engine, handler):
+    first_chore = await place(engine, "B1", True, 10.0, 100)
+    second_chore = await place(engine, "B2", True, 10.0, 100)
+    better_px_chore = await place(engine, "B3", True, 10.01, 100)
+
+    await place(engine, "S1", False, 10.0, 250)
+    # px priority first, then time priority within level
+    assert [fill for fill in handler.fill_list if fill[0] != "S1"] == [
+        ("B3", 10.01, 100), ("B1", 10.0, 100), ("B2", 10.0, 50)]
+    assert better_px_chore.state == SIM_FILLED and first_chore.state == SIM_FILLED
+    assert second_chore.leaves_qty == 50 and second_chore.state == SIM_ACKED
+
+
+@pytest.mark.asyncio
+async def test_last_barter_eats_queue_ahead_before_fill(engine, handler):
+    engine.update_market_depth(SYMBOL, True, [(10.0, 300)])
+    first_chore = await place(engine, "B1", True, 10.0, 100)
+    second_chore = await place(engine, "B2", True, 10.0, 100)
+    assert first_chore.queue_ahead_qty == 300 and second_chore.queue_ahead_qty == 300
+
+    engine.process_last_barter(SYMBOL, 10.0, 200)
+    await engine.drain()
+    assert handler.fill_list == []
+    assert first_chore.queue_ahead_qty == 100 and second_chore.queue_ahead_qty == 100
+
+    # 100 more depth ahead traded, then first chore gets rest - second one still queued behind it
+    engine.process_last_barter(SYMBOL, 10.0, 150)
+    await engine.drain()
+    assert handler.fill_list == [("B1", 10.0, 50)]
+    assert first_chore.queue_ahead_qty == 0 and second_chore.queue_ahead_qty == 0
+    assert second_chore.filled_qty == 0
+
+    # depth snapshot shrinking level shrinks queue ahead of chores joining later
+    engine.update_market_depth(SYMBOL, True, [(10.0, 40)])
+    third_chore = await place(engine, "B3", True, 10.0, 100)
+    assert third_chore.queue_ahead_qty == 40
+
+    # barter below level traded through it - whole queue ahead traded
+    engine.process_last_barter(SYMBOL, 9.99, 500)
+    await engine.drain()
+    assert handler.fill_list[1:] == [("B1", 10.0, 50), ("B2", 10.0, 100), ("B3", 10.0, 100)]
+    assert first_chore.state == second_chore.state == third_chore.state == SIM_FILLED
+
+
+@pytest.mark.asyncio
+async def test_amend_priority(engine, handler):
+    first_chore = await place(engine, "B1", True, 10.0, 100)
+    second_chore = await place(engine, "B2", True, 10.0, 100)
+
+    # qty down keeps time priority
+    assert engine.submit_amend("B1", qty=80)
+    await engine.drain()
+    assert ("B1", SIM_AMD_ACK) in handler.chore_event_list
+    await place(engine, "S1", False, 10.0, 50)
+    assert handler.fill_list[-1] == ("B1", 10.0, 50)
+
+    # qty up loses time priority
+    assert engine.submit_amend("B1", qty=200)
+    await engine.drain()
+    await place(engine, "S2", False, 10.0, 50)
+    assert handler.fill_list[-1] == ("B2", 10.0, 50)
+
+    # px change loses time priority even if moved back
+    assert engine.submit_amend("B2", px=9.99)
+    await engine.drain()
+    assert engine.submit_amend("B2", px=10.0)
+    await engine.drain()
+    await place(engine, "S3", False, 10.0, 50)
+    assert handler.fill_list[-1] == ("B1", 10.0, 50)
+    assert first_chore.filled_qty == 100 and second_chore.filled_qty == 50
+
+    # px amend crossing depth fills on arrival
+    engine.update_market_depth(SYMBOL, False, [(10.05, 500)])
+    assert engine.submit_amend("B2", px=10.05)
+    await engine.drain()
+    assert handler.fill_list[-1] == ("B2", 10.05, 50)
+    assert second_chore.state == SIM_FILLED
+
+
+@pytest.mark.asyncio
+async def test_cancel(engine, handler):
+    chore = await place(engine, "B1", True, 10.0, 100)
+    assert engine.submit_cxl("B1")
+    await engine.drain()
+    assert handler.chore_event_list == [("B1", SIM_ACK), ("B1", SIM_CXL_ACK)]
+    assert chore.state == SIM_DOD
+
+    # cancelled chore no longer matches
+    await place(engine, "S1", False, 10.0, 100)
+    assert handler.fill_list == []
+
+    # cxl of closed chore is rejected
+    assert engine.submit_cxl("B1")
+    await engine.drain()
+    assert handler.chore_event_list[-1] == ("B1", SIM_CXL_REJ)
+
+    assert not engine.submit_cxl("UNKNOWN")
+    await engine.drain()
+    assert handler.chore_event_list[-1] == ("UNKNOWN", SIM_CXL_REJ)
+
+
+@pytest.mark.asyncio
+async def test_closed_chores_leave_open_chore_dict(engine, handler):
+    cancelled_chore = await place(engine, "B1", True, 10.0, 100)
+    engine.submit_cxl("B1")
+    await engine.drain()
+    await place(engine, "S1", False, 10.5, 100)
+    await place(engine, "B2", True, 10.0, 100)
+    filled_chore = await place(engine, "S2", False, 10.0, 40)
+
+    assert set(engine.chore_id_to_chore_dict) == {"S1", "B2"}
+    assert engine.get_metrics()["open_chore_count"] == 2
+    # recently closed chores still resolve
+    assert engine.get_chore("B1") is cancelled_chore and cancelled_chore.state == SIM_DOD
+    assert engine.get_chore("S2") is filled_chore and filled_chore.state == SIM_FILLED
+
+    # B2 and S3 close - closed cache bounded to closed_chore_cache_size, oldest dropped
+    await place(engine, "S3", False, 10.0, 60)
+    assert set(engine.chore_id_to_chore_dict) == {"S1"}
+    assert set(engine.closed_chore_id_to_chore_dict) == {"B2", "S3"}
+    assert engine.get_chore("B1") is None and engine.get_chore("S2") is None
+    assert not engine.submit_amend("B1", qty=200)
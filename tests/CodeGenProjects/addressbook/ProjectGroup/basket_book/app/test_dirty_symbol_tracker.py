@@ -0,0 +1,43 @@
+import time
+
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.basket_book.app.dirty_symbol_tracker import DirtySymbolTracker
+
+
+def test_only_dirty_symbols_are_ready():
+    tracker = DirtySymbolTracker()
+    tracker.mark_dirty("SYM_1")
+    tracker.mark_dirty("SYM_2")
+    assert tracker.pop_ready_symbols() == {"SYM_1", "SYM_2"}
+    assert tracker.pop_ready_symbols() == set()
+
+
+def test_md_update_counter_change_marks_dirty():
+    tracker = DirtySymbolTracker()
+    symbol_to_md_update_counter_dict = {"SYM_1": 5, "SYM_2": 7, "SYM_3": None}
+    symbol_list = list(symbol_to_md_update_counter_dict)
+
+    tracker.mark_md_updated(symbol_list, symbol_to_md_update_counter_dict.get)
+    # first read of every symbol + unmapped shm symbol
+    assert tracker.pop_ready_symbols() == {"SYM_1", "SYM_2", "SYM_3"}
+
+    symbol_to_md_update_counter_dict["SYM_2"] = 8
+    tracker.mark_md_updated(symbol_list, symbol_to_md_update_counter_dict.get)
+    assert tracker.pop_ready_symbols() == {"SYM_2", "SYM_3"}
+
+
+def test_deadline_heap_rechecks_without_full_scan():
+    tracker = DirtySymbolTracker()
+    assert tracker.get_next_wait_sec() is None
+
+    tracker.schedule("SYM_1", 0.05)
+    tracker.schedule("SYM_2", 10)
+    tracker.schedule("SYM_1", 20)  # earlier pending deadline retained
+    assert 0 <= tracker.get_next_wait_sec() <= 0.05
+    assert tracker.pop_ready_symbols() == set()
+
+    time.sleep(0.06)
+    assert tracker.pop_ready_symbols() == {"SYM_1"}
+    assert 9 < tracker.get_next_wait_sec() <= 10
+
+    tracker.discard("SYM_2")
+    assert tracker.get_next_wait_sec() is None
@@ -0,0 +1,71 @@
+import random
+import re
+
+import pytest
+
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.log_book.app.alert_fingerprint import (
+    AlertFingerprinter, normalize_alert_brief)
+
+
+def _legacy_clean_alert_str(alert_str: str) -> str:
+    # 3 pass clean replaced by normalize_alert_brief
+    cleaned_alert_str: str = re.sub(r"0x[a-f0-9]*", "", alert_str)
+    cleaned_alert_str = re.sub(r"\'[a-fA-F0-9]{24}\' ", "", cleaned_alert_str)
+    cleaned_alert_str = re.sub(r"-?[0-9]*", "", cleaned_alert_str)
+    cleaned_alert_str = cleaned_alert_str.split("...check the file:")[0]
+    return cleaned_alert_str
+
+
+@pytest.mark.parametrize("alert_brief", [
+    "update failed with exception: <pymongo.errors.ServerSelectionTimeoutError object at 0x7f3a2c1b90d0>",
+    "Received fill for unknown chore_id: '65a1b2c3d4e5f60718293a4b' qty: -150, px: 10.25",
+    "breach potential max_open_baskets: 12 > 10 ...check the file: street_book.py:1042",
+    "offset 10x7f, seq-num 0x, -0",
+    "no volatile tokens here",
+    "",
+    # hex removal runs first - leaves quoted 24 char id for the id pass
+    "chore '" + "a" * 24 + "0xdead' qty",
+    "chore '" + "0x1f" + "b" * 24 + "' qty",
+    # digits removed before file ref split
+    "breach 1...check the file: a.py:1 ...check the file: b.py:2",
+    "breach...check 0the file: street_book.py:10",
+    "ids '" + "c" * 24 + "' '" + "D" * 24 + "' ...check the file: x.py",
+    "...check the file: street_book.py:1042",
+])
+def test_normalize_alert_brief_matches_legacy_clean(alert_brief: str):
+    assert normalize_alert_brief(alert_brief) == _legacy_clean_alert_str(alert_brief)
+
+
+def test_normalize_alert_brief_matches_legacy_clean_fuzz():
+    alphabet = "0x19-aF z'"
+    for _ in range(20_000):
+        alert_brief = "".join(random.choice(alphabet) for _ in range(random.randint(0, 40)))
+        assert normalize_alert_brief(alert_brief) == _legacy_clean_alert_str(alert_brief), f"{alert_brief=}"
+    # token sequences: quoted ids wrapping hex / digits, file ref markers
+    token_list = ["'", "' ", "a" * 24, "a" * 20, "0x", "0xdead", "1", "-", " ", "...check the file:", "q"]
+    for _ in range(20_000):
+        alert_brief = "".join(random.choice(token_list) for _ in range(random.randint(0, 10)))
+        assert normalize_alert_brief(alert_brief) == _legacy_clean_alert_str(alert_brief), f"{alert_brief=}"
+
+
+def test_normalize_alert_brief_pass_order():
+    # hex inside quoted id: removed before id pass, which then drops whole quoted id
+    assert normalize_alert_brief("chore '" + "a" * 24 + "0xdead' qty") == "chore qty"
+    # file ref split after digit removal
+    assert normalize_alert_brief("breach 12 > 10 ...check the file: street_book.py:1042") == "breach  >  "
+    assert normalize_alert_brief("breach...check 0the file: street_book.py:10") == "breach"
+
+
+def test_alert_fingerprint_dedups_volatile_tokens():
+    alert_fingerprinter = AlertFingerprinter(brief_cache_size=2)
+    alert_fingerprint = alert_fingerprinter.get_alert_fingerprint(
+        "Severity_ERROR", "chore '65a1b2c3d4e5f60718293a4b' qty 10 at 0x7f00", "street_book.py", 42)
+    assert alert_fingerprint == alert_fingerprinter.get_alert_fingerprint(
+        "Severity_ERROR", "chore 'aaaaaaaaaaaaaaaaaaaaaaaa' qty 25 at 0x7fff", "street_book.py", 42)
+    assert alert_fingerprint != alert_fingerprinter.get_alert_fingerprint(
+        "Severity_WARNING", "chore '65a1b2c3d4e5f60718293a4b' qty 10 at 0x7f00", "street_book.py", 42)
+    assert alert_fingerprint != alert_fingerprinter.get_alert_fingerprint(
+        "Severity_ERROR", "chore '65a1b2c3d4e5f60718293a4b' qty 10 at 0x7f00", "street_book.py", 43)
+    # stable across instances/processes - keys travel to verify queries
+    assert alert_fingerprint == AlertFingerprinter().get_alert_fingerprint(
+        "Severity_ERROR", "chore '65a1b2c3d4e5f60718293a4b' qty 10 at 0x7f00", "street_book.py", 42)
@@ -0,0 +1,151 @@
+import time
+from pathlib import PurePath
+from typing import List, Callable
+
+import pytest
+
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.log_book.app import md_session_manager
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.log_book.app.md_session_manager import (
+    MDSessionManager, MDSessionWorker)
+
+
+class NoMDProcessWorker(MDSessionWorker):
+    # applies cmds without launching md process
+    def start_md_process(self):
+        pass
+
+    def stop_md_process(self):
+        pass
+
+
+class NoMDProcessSessionManager(MDSessionManager):
+    md_session_worker_type = NoMDProcessWorker
+
+
+class StaticData:
+    def get_exchange_n_ticker_from_sec_id_n_source(self, sec_id: str, sec_id_source: str):
+        return "SSE" if sec_id.endswith(".SS") else "SZSE", sec_id
+
+
+class MobileBookHttpClient:
+    def __init__(self):
+        self.created_symbol_list: List[str] = []
+        self.removed_symbol_list: List[str] = []
+
+    def create_symbol_interests_client(self, symbol_interest):
+        self.created_symbol_list.append(symbol_interest.symbol_name)
+
+    def remove_symbol_interest_by_symbol_query_client(self, symbol: str):
+        self.removed_symbol_list.append(symbol)
+
+
+def wait_until(predicate: Callable[[], bool], timeout_sec: float = 20):
+    end_time = time.time() + timeout_sec
+    while not predicate():
+        if time.time() > end_time:
+            raise TimeoutError(f"condition not met in {timeout_sec} sec")
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def http_client(monkeypatch) -> MobileBookHttpClient:
+    http_client_ = MobileBookHttpClient()
+    monkeypatch.setattr(md_session_manager, "mobile_book_service_http_client", http_client_)
+    yield http_client_
+
+
+@pytest.fixture
+def md_manager(tmp_path, http_client) -> NoMDProcessSessionManager:
+    md_manager_ = NoMDProcessSessionManager(PurePath(tmp_path), "127.0.0.1", 8040, "test_db", "/test_semaphore",
+                                            worker_count=2, apply_batch_sec=0.3)
+    md_manager_.static_data = StaticData()
+    yield md_manager_
+    md_manager_.close()
+
+
+def test_subscribe_acked(md_manager, http_client):
+    symbol_list = ["A.SS", "B.SS", "C.SS", "D.SZ"]
+    md_manager.trigger_md_for_symbols([(symbol, "TICKER") for symbol in symbol_list])
+    wait_until(lambda: md_manager.subscribe_count == len(symbol_list))
+
+    assert not md_manager.cmd_id_to_sent_cmd_dict
+    assert sorted(http_client.created_symbol_list) == sorted(symbol_list)
+    assert set(md_manager.symbol_to_worker_handle_dict) == set(symbol_list)
+    # a worker streams one exchange
+    for worker_handle in md_manager.worker_handle_list:
+        assert len({symbol[-2:] for symbol in worker_handle.symbol_set}) <= 1
+
+    # already streaming - counter increment only
+    md_manager.trigger_md_for_symbols([("A.SS", "TICKER")])
+    assert md_manager.symbol_to_md_request_counter_dict["A.SS"] == 2
+    assert http_client.created_symbol_list.count("A.SS") == 1
+
+
+def test_unsubscribe_deregisters_on_ack(md_manager, http_client):
+    md_manager.trigger_md_for_symbols([("A.SS", "TICKER"), ("B.SS", "TICKER")])
+    wait_until(lambda: md_manager.subscribe_count == 2)
+
+    md_manager.stop_md_for_symbols(["A.SS"])
+    # interest must outlive md process of worker until unsubscribe is applied (acked after apply_batch_sec)
+    assert http_client.removed_symbol_list == []
+    assert "A.SS" in md_manager.symbol_to_unsubscribing_worker_n_cmd_id_dict
+    wait_until(lambda: http_client.removed_symbol_list == ["A.SS"])
+    assert "A.SS" not in md_manager.symbol_to_worker_handle_dict
+    assert "A.SS" not in md_manager.symbol_to_unsubscribing_worker_n_cmd_id_dict
+    assert "B.SS" in md_manager.symbol_to_worker_handle_dict
+
+
+def test_resubscribe_before_unsubscribe_ack_keeps_interest(md_manager, http_client):
+    md_manager.trigger_md_for_symbols([("A.SS", "TICKER")])
+    wait_until(lambda: md_manager.subscribe_count == 1)
+    worker_handle = md_manager.symbol_to_worker_handle_dict["A.SS"]
+
+    # unsubscribe + subscribe sent within apply_batch_sec - resubscribe precedes unsubscribe ack
+    md_manager.restart_md_for_symbols([("A.SS", "TICKER")])
+    wait_until(lambda: md_manager.subscribe_count == 2)
+    wait_until(lambda: not md_manager.cmd_id_to_sent_cmd_dict)
+
+    # resubscribe pinned to worker still streaming symbol, interest never dropped nor duplicated
+    assert md_manager.symbol_to_worker_handle_dict["A.SS"] is worker_handle
+    assert http_client.removed_symbol_list == []
+    assert http_client.created_symbol_list == ["A.SS"]
+
+
+def test_worker_crash_resubscribes_symbols_on_new_worker(md_manager, http_client):
+    symbol_list = ["A.SS", "B.SS", "C.SS"]
+    md_manager.trigger_md_for_symbols([(symbol, "TICKER") for symbol in symbol_list])
+    wait_until(lambda: md_manager.subscribe_count == len(symbol_list))
+
+    crashed_worker_handle = md_manager.symbol_to_worker_handle_dict["A.SS"]
+    crashed_symbol_set = set(crashed_worker_handle.symbol_set)
+    crashed_worker_index = crashed_worker_handle.worker_index
+    subscribe_count = md_manager.subscribe_count
+    crashed_worker_handle.process.kill()
+
+    wait_until(lambda: crashed_worker_handle not in md_manager.worker_handle_list)
+    wait_until(lambda: md_manager.subscribe_count == subscribe_count + len(crashed_symbol_set))
+
+    new_worker_handle = md_manager.worker_handle_list[crashed_worker_index]
+    assert new_worker_handle.process.is_alive()
+    assert new_worker_handle.process.pid != crashed_worker_handle.process.pid
+    assert new_worker_handle.symbol_set == crashed_symbol_set
+    for symbol in crashed_symbol_set:
+        assert md_manager.symbol_to_worker_handle_dict[symbol] is new_worker_handle
+    assert not md_manager.cmd_id_to_sent_cmd_dict
+    # worker restart is not a symbol interest change
+    assert http_client.removed_symbol_list == []
+
+
+def test_worker_crash_replays_pending_unsubscribe(md_manager, http_client):
+    md_manager.trigger_md_for_symbols([("A.SS", "TICKER"), ("B.SS", "TICKER")])
+    wait_until(lambda: md_manager.subscribe_count == 2)
+    crashed_worker_handle = md_manager.symbol_to_worker_handle_dict["A.SS"]
+
+    crashed_worker_handle.process.kill()
+    crashed_worker_handle.process.join()
+    md_manager.stop_md_for_symbols(["A.SS"])
+
+    # unsubscribe lost with crashed worker is resent to its replacement, ack drops interest
+    wait_until(lambda: http_client.removed_symbol_list == ["A.SS"])
+    assert "A.SS" not in md_manager.symbol_to_unsubscribing_worker_n_cmd_id_dict
+    assert crashed_worker_handle not in md_manager.worker_handle_list
@@ -0,0 +1,108 @@
+import random
+import time
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Generator
+
+import pytest
+from pymongo import MongoClient
+
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.post_book.app.aggregate import get_last_n_sec_chores_by_events
+from Flux.PyCodeGenEngine.FluxCodeGenCore.rolling_window_counter import RollingWindowCounter
+
+# --- Test Configuration ---
+MONGO_URI = "mongodb://localhost:27017/"
+TEST_DB_NAME = "test_rolling_window_parity_db"
+TEST_COLLECTION_NAME = "test_chore_ledgers"
+CHORE_EVENTS = ["OE_NEW", "OE_ACK", "OE_CXL", "OE_BRK_REJ", "OE_EXH_REJ"]
+RETENTION_SECS = 3600
+LAST_N_SEC_LIST = [1, 5, 30, 60, 300, 1800, 3600]
+CHORE_EVENT_LISTS = [["OE_NEW"], ["OE_BRK_REJ", "OE_EXH_REJ"], ["OE_CXL"]]
+
+
+@pytest.fixture(scope="module")
+def mongo_client() -> Generator[MongoClient, None, None]:
+    client = MongoClient(MONGO_URI)
+    yield client
+    client.drop_database(TEST_DB_NAME)
+    client.close()
+
+
+@pytest.fixture(scope="function")
+def chore_ledger_collection(mongo_client: MongoClient) -> Generator[Any, None, None]:
+    collection = mongo_client[TEST_DB_NAME][TEST_COLLECTION_NAME]
+    yield collection
+    collection.drop()
+
+
+def _get_chore_ledger_docs(now_ms: int, doc_count: int) -> List[Dict[str, Any]]:
+    # ledgers at whole secs + 500 ms in past - half a sec away from every window boundary, so $$NOW vs local clock
+    # skew within test run can't move a doc across boundary
+    chore_ledger_docs: List[Dict[str, Any]] = []
+    for doc_id in range(1, doc_count + 1):
+        event_ms = now_ms - random.randint(0, RETENTION_SECS + 600) * 1000 - 500
+        chore_ledger_docs.append({
+            "_id": doc_id,
+            "chore_event": random.choice(CHORE_EVENTS),
+            "chore_event_date_time": datetime.fromtimestamp(event_ms / 1000, tz=timezone.utc)
+        })
+    return chore_ledger_docs
+
+
+def _get_pipeline_count(collection, last_n_sec: int, chore_event_list: List[str]) -> int:
+    agg_list = list(collection.aggregate(get_last_n_sec_chores_by_events(last_n_sec, chore_event_list)["agg"]))
+    return agg_list[-1]["current_period_chore_count"] if agg_list else 0
+
+
+def _assert_counts_match(collection, counter: RollingWindowCounter):
+    for chore_event_list in CHORE_EVENT_LISTS:
+        for last_n_sec in LAST_N_SEC_LIST:
+            assert counter.covers(last_n_sec), f"{last_n_sec=} expected to be served by rolling window"
+            pipeline_count = _get_pipeline_count(collection, last_n_sec, chore_event_list)
+            window_count = counter.get_multi_key_window_sum(chore_event_list, last_n_sec)
+            assert window_count == pipeline_count, \
+                (f"Mismatched count for {chore_event_list=}, {last_n_sec=}: pipeline: {pipeline_count}, "
+                 f"rolling window: {window_count}")
+
+
+def test_rolling_chore_counts_match_pipeline_after_db_rebuild(chore_ledger_collection):
+    now_ms = int(time.time() * 1000)
+    chore_ledger_docs = _get_chore_ledger_docs(now_ms, 2000)
+    chore_ledger_collection.insert_many(chore_ledger_docs)
+
+    # same as post_book startup: counter rebuilt from db, unordered
+    counter = RollingWindowCounter(RETENTION_SECS, history_start_ms=now_ms - RETENTION_SECS * 1000 - 600_000)
+    for chore_ledger_doc in chore_ledger_docs:
+        counter.add(chore_ledger_doc["chore_event"], counter.get_epoch_ms(chore_ledger_doc["chore_event_date_time"]))
+
+    _assert_counts_match(chore_ledger_collection, counter)
+
+
+def test_rolling_chore_counts_match_pipeline_with_live_feed(chore_ledger_collection):
+    now_ms = int(time.time() * 1000)
+    counter = RollingWindowCounter(RETENTION_SECS, history_start_ms=now_ms - RETENTION_SECS * 1000 - 600_000)
+
+    # ledgers created in batches as post_book does (create_all_chore_ledger_post), windows queried in between so
+    # incremental sliding path is compared, not only first query scan
+    chore_ledger_docs = sorted(_get_chore_ledger_docs(now_ms, 1500), key=lambda doc: doc["chore_event_date_time"])
+    batch_size = 300
+    for batch_start in range(0, len(chore_ledger_docs), batch_size):
+        batch_docs = chore_ledger_docs[batch_start:batch_start + batch_size]
+        chore_ledger_collection.insert_many(batch_docs)
+        for chore_ledger_doc in batch_docs:
+            counter.add(chore_ledger_doc["chore_event"],
+                        counter.get_epoch_ms(chore_ledger_doc["chore_event_date_time"]))
+        _assert_counts_match(chore_ledger_collection, counter)
+
+    # window slides with time - a second later every window still matches
+    time.sleep(1)
+    _assert_counts_match(chore_ledger_collection, counter)
+
+
+def test_rolling_window_not_covering_falls_back():
+    now_ms = int(time.time() * 1000)
+    # just started - no history rebuilt
+    counter = RollingWindowCounter(RETENTION_SECS, history_start_ms=now_ms)
+    assert not counter.covers(60, now_ms)
+    counter = RollingWindowCounter(RETENTION_SECS, history_start_ms=now_ms - RETENTION_SECS * 1000)
+    assert counter.covers(60, now_ms)
+    assert not counter.covers(RETENTION_SECS + 1, now_ms)
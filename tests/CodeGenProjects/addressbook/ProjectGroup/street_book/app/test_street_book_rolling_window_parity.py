@@ -0,0 +1,128 @@
+import random
+import time
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Generator
+
+import pytest
+from pymongo import MongoClient
+
+from Flux.CodeGenProjects.AddressBook.ProjectGroup.street_book.app.aggregate import get_chore_total_sum_of_last_n_sec
+from Flux.PyCodeGenEngine.FluxCodeGenCore.rolling_window_counter import RollingWindowSumTracker
+
+# --- Test Configuration ---
+MONGO_URI = "mongodb://localhost:27017/"
+TEST_DB_NAME = "test_rolling_window_parity_db"
+TEST_COLLECTION_NAME = "test_chore_snapshots"
+SYMBOLS = ["Type1_Sec_1", "Type2_Sec_1", "Type1_Sec_2"]
+RETENTION_SECS = 3600
+LAST_N_SEC_LIST = [1, 5, 30, 60, 300, 1800, 3600]
+
+
+@pytest.fixture(scope="module")
+def mongo_client() -> Generator[MongoClient, None, None]:
+    client = MongoClient(MONGO_URI, tz_aware=True)
+    yield client
+    client.drop_database(TEST_DB_NAME)
+    client.close()
+
+
+@pytest.fixture(scope="function")
+def chore_snapshot_collection(mongo_client: MongoClient) -> Generator[Any, None, None]:
+    collection = mongo_client[TEST_DB_NAME][TEST_COLLECTION_NAME]
+    yield collection
+    collection.drop()
+
+
+def _get_chore_snapshot_docs(now_ms: int, doc_count: int) -> List[Dict[str, Any]]:
+    # snapshots at whole secs + 500 ms in past - half a sec away from every window boundary, so $$NOW vs local
+    # clock skew within test run can't move a doc across boundary
+    chore_snapshot_docs: List[Dict[str, Any]] = []
+    for doc_id in range(1, doc_count + 1):
+        create_ms = now_ms - random.randint(0, RETENTION_SECS + 600) * 1000 - 500
+        chore_snapshot_docs.append({
+            "_id": doc_id,
+            "chore_brief": {
+                "chore_id": f"chore-{doc_id}",
+                "security": {"sec_id": random.choice(SYMBOLS), "sec_id_source": "TICKER"},
+                "side": random.choice(["BUY", "SELL"]),
+                "qty": random.randint(1, 100) * 10
+            },
+            "create_date_time": datetime.fromtimestamp(create_ms / 1000, tz=timezone.utc)
+        })
+    return chore_snapshot_docs
+
+
+def _track(tracker: RollingWindowSumTracker, chore_snapshot_doc: Dict[str, Any], is_db_rebuild: bool = False):
+    track_callable = tracker.track_if_unseen if is_db_rebuild else tracker.track
+    track_callable(chore_snapshot_doc["_id"], chore_snapshot_doc["chore_brief"]["security"]["sec_id"],
+                   tracker.counter.get_epoch_ms(chore_snapshot_doc["create_date_time"]),
+                   chore_snapshot_doc["chore_brief"]["qty"])
+
+
+def _get_pipeline_qty(collection, symbol: str, last_n_sec: int) -> int:
+    agg_list = list(collection.aggregate(get_chore_total_sum_of_last_n_sec(symbol, last_n_sec)["agg"]))
+    return agg_list[-1]["last_n_sec_total_qty"] if agg_list else 0
+
+
+def _assert_qty_match(collection, tracker: RollingWindowSumTracker):
+    for symbol in SYMBOLS:
+        for last_n_sec in LAST_N_SEC_LIST:
+            assert tracker.counter.covers(last_n_sec), f"{last_n_sec=} expected to be served by rolling window"
+            pipeline_qty = _get_pipeline_qty(collection, symbol, last_n_sec)
+            window_qty = tracker.counter.get_window_sum(symbol, last_n_sec)
+            assert window_qty == pipeline_qty, \
+                (f"Mismatched last n sec chore qty for {symbol=}, {last_n_sec=}: pipeline: {pipeline_qty}, "
+                 f"rolling window: {window_qty}")
+
+
+def test_last_n_sec_chore_qty_matches_pipeline_after_db_rebuild(chore_snapshot_collection):
+    now_ms = int(time.time() * 1000)
+    chore_snapshot_docs = _get_chore_snapshot_docs(now_ms, 2000)
+    chore_snapshot_collection.insert_many(chore_snapshot_docs)
+
+    tracker = RollingWindowSumTracker(RETENTION_SECS, history_start_ms=now_ms - RETENTION_SECS * 1000 - 600_000)
+    for chore_snapshot_doc in chore_snapshot_docs:
+        _track(tracker, chore_snapshot_doc, is_db_rebuild=True)
+
+    _assert_qty_match(chore_snapshot_collection, tracker)
+
+
+def test_last_n_sec_chore_qty_matches_pipeline_with_amends(chore_snapshot_collection):
+    now_ms = int(time.time() * 1000)
+    tracker = RollingWindowSumTracker(RETENTION_SECS, history_start_ms=now_ms - RETENTION_SECS * 1000 - 600_000)
+
+    chore_snapshot_docs = _get_chore_snapshot_docs(now_ms, 1500)
+    chore_snapshot_collection.insert_many(chore_snapshot_docs)
+    for chore_snapshot_doc in chore_snapshot_docs:
+        _track(tracker, chore_snapshot_doc)
+    _assert_qty_match(chore_snapshot_collection, tracker)
+
+    # amend up/down of random chores - qty changes land on chore's create time, as pipeline sums current qty
+    for _ in range(3):
+        for chore_snapshot_doc in random.sample(chore_snapshot_docs, 200):
+            amend_qty = random.randint(1, 5) * 10
+            if random.random() < 0.5 and chore_snapshot_doc["chore_brief"]["qty"] > amend_qty:
+                amend_qty = -amend_qty
+            chore_snapshot_doc["chore_brief"]["qty"] += amend_qty
+            chore_snapshot_collection.update_one({"_id": chore_snapshot_doc["_id"]},
+                                                 {"$set": {"chore_brief.qty": chore_snapshot_doc["chore_brief"]["qty"]}})
+            _track(tracker, chore_snapshot_doc)
+        _assert_qty_match(chore_snapshot_collection, tracker)
+
+
+def test_db_rebuild_skips_chores_seen_by_live_feed(chore_snapshot_collection):
+    now_ms = int(time.time() * 1000)
+    tracker = RollingWindowSumTracker(RETENTION_SECS, history_start_ms=now_ms - RETENTION_SECS * 1000 - 600_000)
+
+    chore_snapshot_docs = _get_chore_snapshot_docs(now_ms, 500)
+    chore_snapshot_collection.insert_many(chore_snapshot_docs)
+    # live feed sees some chores (with amended qty) while rebuild reads db - rebuild must not double count them
+    for chore_snapshot_doc in chore_snapshot_docs[:100]:
+        chore_snapshot_doc["chore_brief"]["qty"] += 10
+        chore_snapshot_collection.update_one({"_id": chore_snapshot_doc["_id"]},
+                                             {"$set": {"chore_brief.qty": chore_snapshot_doc["chore_brief"]["qty"]}})
+        _track(tracker, chore_snapshot_doc)
+    for chore_snapshot_doc in chore_snapshot_collection.find():
+        _track(tracker, chore_snapshot_doc, is_db_rebuild=True)
+
+    _assert_qty_match(chore_snapshot_collection, tracker)
@@ -0,0 +1,118 @@
+import asyncio
+from datetime import datetime, timezone, timedelta
+from typing import List, Dict, Any, Callable
+
+import pytest
+import pytest_asyncio
+import motor.motor_asyncio
+
+from Flux.PyCodeGenEngine.FluxCodeGenCore import change_stream_consumer
+from Flux.PyCodeGenEngine.FluxCodeGenCore.change_stream_consumer import ChangeStreamConsumer
+
+# --- Test Configuration ---
+MONGO_URI = "mongodb://localhost:27017/"
+TEST_DB_NAME = "test_change_stream_consumer_db"
+TIME_FIELD = "start_time"
+TAIL_LAG_MS = 5000
+
+
+class Publisher:
+    def __init__(self):
+        self.change_list: List[Dict[str, Any]] = []
+
+    async def publish_batch(self, change_list: List[Dict[str, Any]]):
+        self.change_list.extend(change_list)
+
+    def get_published_id_list(self) -> List[Any]:
+        return [change["documentKey"]["_id"] for change in self.change_list]
+
+
+@pytest_asyncio.fixture
+async def time_series_collection(monkeypatch):
+    monkeypatch.setattr(change_stream_consumer, "time_series_tail_poll_ms", 10)
+    monkeypatch.setattr(change_stream_consumer, "time_series_tail_lag_ms", TAIL_LAG_MS)
+    client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI, tz_aware=True)
+    await client.drop_database(TEST_DB_NAME)
+    db = client[TEST_DB_NAME]
+    await db.create_collection("SampleTimeSeries", timeseries={"timeField": TIME_FIELD, "metaField": "meta",
+                                                               "granularity": "seconds"})
+    yield db["SampleTimeSeries"]
+    await client.drop_database(TEST_DB_NAME)
+    client.close()
+
+
+def _get_row(row_id: int, row_time: datetime) -> Dict[str, Any]:
+    return {"_id": row_id, TIME_FIELD: row_time, "meta": {"symbol": "SYM"}, "val": row_id}
+
+
+async def _wait_for(condition: Callable[[], bool], timeout_secs: float = 5.0):
+    wait_till = asyncio.get_running_loop().time() + timeout_secs
+    while not condition():
+        assert asyncio.get_running_loop().time() < wait_till, "timed out waiting for tailed rows"
+        await asyncio.sleep(0.01)
+
+
+async def _stop(consumer_task: asyncio.Task):
+    consumer_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await consumer_task
+
+
+@pytest.mark.asyncio
+async def test_time_series_tail_publishes_appends(time_series_collection):
+    base_time = datetime.now(timezone.utc).replace(microsecond=0)
+    # rows present before first start are taken as published
+    await time_series_collection.insert_many([_get_row(row_id, base_time + timedelta(seconds=row_id))
+                                              for row_id in range(1, 4)])
+    publisher = Publisher()
+    consumer = ChangeStreamConsumer(time_series_collection, publisher.publish_batch, is_time_series=True,
+                                    batch_max_size=2, time_field=TIME_FIELD)
+    consumer_task = asyncio.create_task(consumer.run())
+    await asyncio.sleep(0.05)
+
+    await time_series_collection.insert_many([_get_row(row_id, base_time + timedelta(seconds=row_id))
+                                              for row_id in range(4, 9)])
+    await _wait_for(lambda: len(publisher.change_list) == 5)
+    # committed after newer rows but within lag window - still published, once
+    await time_series_collection.insert_one(_get_row(100, base_time + timedelta(seconds=6, milliseconds=500)))
+    await _wait_for(lambda: len(publisher.change_list) == 6)
+    await asyncio.sleep(0.05)
+    await _stop(consumer_task)
+
+    assert publisher.get_published_id_list() == [4, 5, 6, 7, 8, 100]
+    assert all(change["operationType"] == "insert" and change["fullDocument"]["val"] == change["documentKey"]["_id"]
+               for change in publisher.change_list)
+    # saved position is latest tailed time field value
+    assert await consumer.resume_token_store.load() == base_time + timedelta(seconds=8)
+
+
+@pytest.mark.asyncio
+async def test_time_series_tail_resumes_from_saved_token(time_series_collection):
+    base_time = datetime.now(timezone.utc).replace(microsecond=0)
+    publisher = Publisher()
+    consumer = ChangeStreamConsumer(time_series_collection, publisher.publish_batch, is_time_series=True,
+                                    time_field=TIME_FIELD)
+    consumer_task = asyncio.create_task(consumer.run())
+    await asyncio.sleep(0.05)
+    # rows far apart - only last one stays within lag window of saved position
+    await time_series_collection.insert_many([_get_row(row_id, base_time + timedelta(seconds=row_id * 10))
+                                              for row_id in range(1, 4)])
+    await _wait_for(lambda: len(publisher.change_list) == 3)
+    await _stop(consumer_task)
+    saved_time = await consumer.resume_token_store.load()
+    assert saved_time == base_time + timedelta(seconds=30)
+
+    # appended while consumer is down
+    await time_series_collection.insert_many([_get_row(row_id, base_time + timedelta(seconds=row_id * 10))
+                                              for row_id in range(4, 6)])
+    resumed_publisher = Publisher()
+    resumed_consumer = ChangeStreamConsumer(time_series_collection, resumed_publisher.publish_batch,
+                                            is_time_series=True, time_field=TIME_FIELD)
+    resumed_consumer_task = asyncio.create_task(resumed_consumer.run())
+    await _wait_for(lambda: len(resumed_publisher.change_list) == 3)
+    await asyncio.sleep(0.05)
+    await _stop(resumed_consumer_task)
+
+    # row at saved time is in replayed lag window, older rows are not published again
+    assert resumed_publisher.get_published_id_list() == [3, 4, 5]
+    assert await resumed_consumer.resume_token_store.load() == base_time + timedelta(seconds=50)
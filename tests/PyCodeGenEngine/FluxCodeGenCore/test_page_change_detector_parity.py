@@ -0,0 +1,127 @@
+from typing import List, Dict, Any, Callable, Awaitable
+
+import pytest
+import pytest_asyncio
+import motor.motor_asyncio
+
+from Flux.PyCodeGenEngine.FluxCodeGenCore.base_aggregate import detect_multiple_page_changes
+from Flux.PyCodeGenEngine.FluxCodeGenCore.page_change_detector import PageChangeDetector, commit_page_windows
+
+# --- Test Configuration ---
+MONGO_URI = "mongodb://localhost:27017/"
+TEST_DB_NAME = "test_page_change_detector_parity_db"
+ITEM_COUNT = 20
+PAGE_DEFINITIONS: List[Dict[str, Any]] = [
+    {"page_id": "val_asc_page_1", "filters": [], "sort_order": [{"sort_by": "val", "sort_direction": 1}],
+     "pagination": {"page_number": 1, "page_size": 5}},
+    {"page_id": "val_asc_page_2", "filters": [], "sort_order": [{"sort_by": "val", "sort_direction": 1}],
+     "pagination": {"page_number": 2, "page_size": 5}},
+    {"page_id": "cat_a_val_desc_page_1", "filters": [{"column_name": "cat", "filtered_values": ["A"]}],
+     "sort_order": [{"sort_by": "val", "sort_direction": -1}], "pagination": {"page_number": 1, "page_size": 4}},
+    {"page_id": "cat_b_val_asc", "filters": [{"column_name": "cat", "filtered_values": ["B"]}],
+     "sort_order": [{"sort_by": "val", "sort_direction": 1}], "pagination": None},
+]
+
+
+class PageItem:
+    collection_obj: motor.motor_asyncio.AsyncIOMotorCollection | None = None
+
+
+@pytest_asyncio.fixture
+async def page_item_collection():
+    client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI, tz_aware=True)
+    await client.drop_database(TEST_DB_NAME)
+    collection = client[TEST_DB_NAME]["PageItem"]
+    # unique sort values - ties are never decided locally
+    await collection.insert_many([{"_id": item_id, "val": item_id * 10, "cat": "A" if item_id % 2 else "B",
+                                   "note": ""} for item_id in range(1, ITEM_COUNT + 1)])
+    PageItem.collection_obj = collection
+    yield collection
+    PageItem.collection_obj = None
+    await client.drop_database(TEST_DB_NAME)
+    client.close()
+
+
+async def _assert_parity(detector: PageChangeDetector, created_items: List[Dict], deleted_item_ids: List[Any],
+                         updated_items: List[Dict], write_callable: Callable[[], Awaitable[Any]]):
+    # both detections run before db write, same as generic routes
+    expected_page_changes = await detect_multiple_page_changes(
+        PageItem.collection_obj, PAGE_DEFINITIONS, created_items, deleted_item_ids, PageItem, updated_items)
+    pending_window_list = []
+    page_changes = await detector.detect_page_changes(PAGE_DEFINITIONS, created_items, deleted_item_ids,
+                                                      updated_items, pending_window_list)
+    await write_callable()
+    commit_page_windows(pending_window_list)
+
+    expected_page_id_to_changes_dict = {page_report["page_id"]: page_report["changes"]
+                                        for page_report in expected_page_changes}
+    for page_report in page_changes:
+        assert page_report["changes"] == expected_page_id_to_changes_dict.get(page_report["page_id"], []), \
+            f"{page_report['page_id']=}, {created_items=}, {deleted_item_ids=}, {updated_items=}"
+
+
+async def _create(detector: PageChangeDetector, item: Dict):
+    await _assert_parity(detector, [item], [], [], lambda: PageItem.collection_obj.insert_one(dict(item)))
+
+
+async def _delete(detector: PageChangeDetector, item_id: int):
+    await _assert_parity(detector, [], [item_id], [], lambda: PageItem.collection_obj.delete_one({"_id": item_id}))
+
+
+async def _update(detector: PageChangeDetector, item: Dict):
+    await _assert_parity(detector, [], [], [item],
+                         lambda: PageItem.collection_obj.update_one({"_id": item["_id"]}, {"$set": item}))
+
+
+@pytest.mark.asyncio
+async def test_unchanged_pages_parity(page_item_collection):
+    detector = PageChangeDetector(PageItem)
+    # non filter / sort field update - pages keep their items
+    await _update(detector, {"_id": 3, "note": "first"})
+    await _update(detector, {"_id": 8, "note": "second"})
+    # item past every paginated page and outside cat_b filter
+    await _update(detector, {"_id": 19, "note": "third"})
+    assert detector.local_detection_count > 0
+
+
+@pytest.mark.asyncio
+async def test_insert_parity(page_item_collection):
+    detector = PageChangeDetector(PageItem)
+    # into first page - its last item shifts to next page
+    await _create(detector, {"_id": 101, "val": 25, "cat": "A", "note": ""})
+    # into second page
+    await _create(detector, {"_id": 102, "val": 75, "cat": "B", "note": ""})
+    # new top of every sorted page
+    await _create(detector, {"_id": 103, "val": 1, "cat": "B", "note": ""})
+    # past paginated pages, top of cat_a desc page
+    await _create(detector, {"_id": 104, "val": 1000, "cat": "A", "note": ""})
+    assert detector.local_detection_count > 0
+
+
+@pytest.mark.asyncio
+async def test_delete_parity(page_item_collection):
+    detector = PageChangeDetector(PageItem)
+    # from first page - next page's top shifts in
+    await _delete(detector, 2)
+    # from second page
+    await _delete(detector, 9)
+    # top of cat_a desc page
+    await _delete(detector, 19)
+    # on no page
+    await _delete(detector, 17)
+    assert detector.local_detection_count > 0
+
+
+@pytest.mark.asyncio
+async def test_reorder_parity(page_item_collection):
+    detector = PageChangeDetector(PageItem)
+    # within first page
+    await _update(detector, {"_id": 4, "val": 15})
+    # from second page to first
+    await _update(detector, {"_id": 8, "val": 5})
+    # from first page to past paginated pages
+    await _update(detector, {"_id": 1, "val": 500})
+    # moves between cat filters
+    await _update(detector, {"_id": 6, "cat": "A"})
+    await _update(detector, {"_id": 7, "cat": "B", "val": 62})
+    assert detector.local_detection_count > 0
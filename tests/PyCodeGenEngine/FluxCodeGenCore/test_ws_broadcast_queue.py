@@ -0,0 +1,78 @@
+import asyncio
+from typing import List, Tuple, Any
+
+import pytest
+import pytest_asyncio  # Ensures asyncio plugin is active
+
+from Flux.PyCodeGenEngine.FluxCodeGenCore.ws_broadcast_queue import WsBroadcastQueue, WsBroadcastEvent
+
+
+class Publisher:
+    def __init__(self):
+        # (publish callable name, db_obj_id or db_obj_id_list, db_obj_dict or db_obj_dict_list, kwargs)
+        self.publish_list: List[Tuple[str, Any, Any, dict]] = []
+
+    async def publish_one(self, db_obj_id, db_obj_dict, has_links, update_ws_with_id, **kwargs):
+        self.publish_list.append(("publish_ws", db_obj_id, db_obj_dict, kwargs))
+        await asyncio.sleep(0)
+
+    async def publish_all(self, db_obj_id_list, db_obj_dict_list, has_links, update_ws_with_id, **kwargs):
+        self.publish_list.append(("publish_ws_all", db_obj_id_list, db_obj_dict_list, kwargs))
+        await asyncio.sleep(0)
+
+
+def single_event(db_obj_id: int, val: int, **kwargs) -> WsBroadcastEvent:
+    return WsBroadcastEvent([db_obj_id], [{"_id": db_obj_id, "val": val}], None, True, True, kwargs)
+
+
+def all_event(db_obj_id_n_val_list: List[Tuple[int, int]], **kwargs) -> WsBroadcastEvent:
+    return WsBroadcastEvent([db_obj_id for db_obj_id, _ in db_obj_id_n_val_list],
+                            [{"_id": db_obj_id, "val": val} for db_obj_id, val in db_obj_id_n_val_list],
+                            None, True, False, kwargs)
+
+
+async def publish_batch(event_list: List[WsBroadcastEvent]) -> Publisher:
+    # enqueued back to back - drained as one batch
+    publisher = Publisher()
+    ws_broadcast_queue = WsBroadcastQueue("TestModel", publisher.publish_one, publisher.publish_all)
+    for event in event_list:
+        await ws_broadcast_queue.enqueue(event)
+    await ws_broadcast_queue.worker_task
+    return publisher
+
+
+@pytest.mark.asyncio
+async def test_coalesced_publish_ws_events_keep_obj_payload():
+    publisher = await publish_batch([single_event(1, 1), single_event(2, 2), single_event(1, 3)])
+
+    # latest obj per _id, each still published through publish_ws as obj
+    assert publisher.publish_list == [("publish_ws", 1, {"_id": 1, "val": 3}, {}),
+                                      ("publish_ws", 2, {"_id": 2, "val": 2}, {})]
+
+
+@pytest.mark.asyncio
+async def test_coalesced_publish_ws_all_events_keep_list_payload():
+    publisher = await publish_batch([all_event([(1, 1)]), all_event([(2, 2), (1, 3)])])
+
+    assert publisher.publish_list == [("publish_ws_all", [1, 2], [{"_id": 1, "val": 3}, {"_id": 2, "val": 2}], {})]
+
+
+@pytest.mark.asyncio
+async def test_events_of_different_kind_not_merged():
+    publisher = await publish_batch([single_event(1, 1), all_event([(1, 2)]), single_event(2, 3),
+                                     single_event(2, 4)])
+
+    assert publisher.publish_list == [("publish_ws", 1, {"_id": 1, "val": 1}, {}),
+                                      ("publish_ws_all", [1], [{"_id": 1, "val": 2}], {}),
+                                      ("publish_ws", 2, {"_id": 2, "val": 4}, {})]
+
+
+@pytest.mark.asyncio
+async def test_page_change_events_published_as_is_in_order():
+    page_changes = [{"page_id": 1, "changes": [{"_id": 1}]}]
+    publisher = await publish_batch([single_event(1, 1), single_event(1, 2, page_changes=page_changes),
+                                     single_event(1, 3)])
+
+    assert publisher.publish_list == [("publish_ws", 1, {"_id": 1, "val": 1}, {}),
+                                      ("publish_ws", 1, {"_id": 1, "val": 2}, {"page_changes": page_changes}),
+                                      ("publish_ws", 1, {"_id": 1, "val": 3}, {})]